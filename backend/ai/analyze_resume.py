@@ -1,34 +1,83 @@
 # analyze_resume.py
 
-import os
-import google.generativeai as genai
 from dotenv import load_dotenv
+from .llm_client import LLMStream, get_llm_client
+from .resume_compaction import compact_resume
+from .result_cache import get_llm_cache
 
 # Load environment variables
 load_dotenv()
 
-# Get API key from environment
-api_key = os.getenv("GOOGLE_API_KEY")
-if not api_key:
-    raise RuntimeError("GOOGLE_API_KEY not set in environment. Please add it to your .env file")
+# Gemini model, called through the shared client (see llm_client.py)
+MODEL_NAME = "gemini-2.5-flash"
 
-# Configure Google Generative AI
-genai.configure(api_key=api_key)
+# Bump whenever the prompt below or the resume compaction changes so cached analyses are recomputed
+PROMPT_VERSION = "3"
 
-# Use Gemini model
-model = genai.GenerativeModel("gemini-2.5-flash")
-
-def analyze_resume(resume_text):
+def analyze_resume(resume_text, resume_id=None, user_id=None):
     """
     Analyze resume text using Google's Gemini AI
+    Results are cached per resume text, prompt version and model (see result_cache.py)
     
     Args:
         resume_text (str): The extracted text from the resume
+        resume_id (str): Optional resumes.id to also store the analysis on
+        user_id (str): Authenticated owner of resume_id; nothing is stored without it
         
     Returns:
         str: Detailed analysis of the resume in markdown format
     """
-    prompt = f"""
+    return get_llm_cache().get_or_compute(
+        "analysis",
+        resume_text,
+        PROMPT_VERSION,
+        MODEL_NAME,
+        lambda: _generate_analysis(resume_text),
+        is_valid=lambda text: not text.startswith("Error analyzing resume:"),
+        resume_id=resume_id,
+        user_id=user_id
+    )
+
+
+def stream_analysis(resume_text, resume_id=None, user_id=None):
+    """
+    Analyze resume text, streaming the report as the model writes it
+    A cached analysis is returned as a single chunk; a finished stream is cached
+    
+    Args:
+        resume_text (str): The extracted text from the resume
+        resume_id (str): Optional resumes.id to also store the analysis on
+        user_id (str): Authenticated owner of resume_id; nothing is stored without it
+        
+    Returns:
+        LLMStream: Iterates over markdown chunks; `metrics` holds time to first
+                   chunk, total latency and tokens once it is exhausted
+    """
+    cache = get_llm_cache()
+    cached = cache.lookup("analysis", resume_text, PROMPT_VERSION, MODEL_NAME, resume_id, user_id)
+    if cached is not None:
+        return LLMStream.from_text(cached)
+
+    def on_complete(text, metrics):
+        if text:
+            cache.save("analysis", resume_text, PROMPT_VERSION, MODEL_NAME, text, resume_id, metrics["total_ms"], user_id)
+
+    return get_llm_client().stream(build_prompt(resume_text), MODEL_NAME, on_complete=on_complete)
+
+
+def _generate_analysis(resume_text):
+    try:
+        return get_llm_client().generate(build_prompt(resume_text), MODEL_NAME)
+    except Exception as e:
+        print(f"Error analyzing resume: {str(e)}")
+        return f"Error analyzing resume: {str(e)}"
+
+
+def build_prompt(resume_text):
+    # Send only the sections the analysis needs, within its token budget
+    resume_text, report = compact_resume(resume_text, "analysis")
+    print(f"Resume compacted for analysis: {report['original_tokens']} -> {report['tokens']} tokens")
+    return f"""
 You are an expert career coach and HR professional. Analyze the following resume and provide a detailed, structured report. Be specific, concise, and insightful.
 
 Resume:
@@ -63,10 +112,3 @@ Return your analysis in the following sections:
 
 Respond in clean, markdown-style formatting for readability.
 """
-    
-    try:
-        response = model.generate_content(prompt)
-        return response.text
-    except Exception as e:
-        print(f"Error analyzing resume: {str(e)}")
-        return f"Error analyzing resume: {str(e)}"
@@ -3,31 +3,94 @@ Extract basic candidate information from resume text using Google's Gemini AI
 """
 
 import os
-import google.generativeai as genai
 from dotenv import load_dotenv
 import json
 import re
+from .llm_client import get_llm_client
+from .local_extractor import DEFAULTS, FIELDS, extract_local
+from .resume_compaction import compact_resume
+from .result_cache import get_llm_cache
 
 load_dotenv()
 
-# Configure Gemini API
-GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
-genai.configure(api_key=GOOGLE_API_KEY)
+# Gemini model, called through the shared client (see llm_client.py)
+MODEL_NAME = "gemini-1.5-flash"
 
-# Create the model
-model = genai.GenerativeModel("gemini-1.5-flash")
+# Bump whenever the prompt, the returned fields or the resume compaction change so cached results are recomputed
+PROMPT_VERSION = "3"
 
+# 'hybrid' (local parser, Gemini only for unsure fields), 'local' or 'llm'
+EXTRACTION_MODE = os.getenv("CANDIDATE_EXTRACTION_MODE", "hybrid").lower()
 
-def extract_candidate_info(resume_text):
+# Local fields at or above this confidence are not sent to Gemini
+MIN_LOCAL_CONFIDENCE = float(os.getenv("CANDIDATE_LOCAL_MIN_CONFIDENCE", "0.7"))
+
+
+def extract_candidate_info(resume_text, resume_id=None, user_id=None):
     """
     Extract basic candidate information from resume text
+    Email, mobile, experience, skills, domain and name are first parsed
+    locally (see local_extractor.py); Gemini is called only when some field
+    is missing or uncertain, and its answer fills those fields
     
     Args:
         resume_text (str): The extracted text from the resume
+        resume_id (str): Optional resumes.id to also store the Gemini result on
+        user_id (str): Authenticated owner of resume_id; nothing is stored without it
         
     Returns:
-        dict: Candidate information with name, email, mobile, experience, domain
+        dict: Candidate information with name, email, mobile, experience, domain,
+              skills, and 'source' ('local', 'hybrid' or 'llm')
     """
+    if EXTRACTION_MODE == "llm":
+        return {**extract_with_llm(resume_text, resume_id, user_id), "source": "llm"}
+
+    local, confidence = extract_local(resume_text)
+    unsure = [
+        field for field in FIELDS
+        if local[field] is None or confidence[field] < MIN_LOCAL_CONFIDENCE
+    ]
+    if not unsure or EXTRACTION_MODE == "local":
+        info = {field: DEFAULTS[field] if local[field] is None else local[field] for field in FIELDS}
+        info["source"] = "local"
+        return info
+
+    print(f"Asking Gemini for: {', '.join(unsure)}")
+    llm_info = extract_with_llm(resume_text, resume_id, user_id)
+    info = {}
+    for field in FIELDS:
+        llm_value = llm_info.get(field, DEFAULTS[field])
+        if field not in unsure or (llm_value == DEFAULTS[field] and local[field] is not None):
+            info[field] = local[field]
+        else:
+            info[field] = llm_value
+    if "error" in llm_info:
+        info["error"] = llm_info["error"]
+    info["source"] = "hybrid"
+    return info
+
+
+def extract_with_llm(resume_text, resume_id=None, user_id=None):
+    """
+    Extract candidate information with Gemini alone
+    Results are cached per resume text, prompt version and model (see result_cache.py)
+    """
+    return get_llm_cache().get_or_compute(
+        "candidate_info",
+        resume_text,
+        PROMPT_VERSION,
+        MODEL_NAME,
+        lambda: _extract(resume_text),
+        is_valid=lambda info: "error" not in info,
+        resume_id=resume_id,
+        user_id=user_id
+    )
+
+
+def _extract(resume_text):
+    # Contact lines, skills and experience first, within the prompt's token budget
+    resume_text, report = compact_resume(resume_text, "candidate_info")
+    print(f"Resume compacted for candidate info: {report['original_tokens']} -> {report['tokens']} tokens")
     prompt = f"""
 You are an expert resume parser. Extract ONLY the following basic information from the resume.
 Return the information in a clean, structured JSON format.
@@ -59,8 +122,7 @@ Return ONLY a valid JSON object in this exact format:
 """
     
     try:
-        response = model.generate_content(prompt)
-        response_text = response.text.strip()
+        response_text = get_llm_client().generate(prompt, MODEL_NAME).strip()
         
         # Extract JSON from response (in case AI adds extra text)
         json_match = re.search(r'\{[\s\S]*\}', response_text)
@@ -0,0 +1,637 @@
+"""
+Shared model client
+Every Gemini call goes through one process-wide client that caps concurrent
+calls, gives each call a deadline, retries transient errors with jittered
+backoff, stops calling a failing API for a while (circuit breaker) and
+coalesces identical in-flight prompts. The backend is Gemini in production,
+or a local fake model (LLM_BACKEND=fake) that streams a canned report with
+configurable delays, for tests and load tests without an API key.
+"""
+
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from collections import deque
+import contextlib
+import hashlib
+import os
+import random
+import threading
+import time
+from utils.job_cache import SingleFlight
+
+
+# Rough characters per token, used when the backend reports no token counts
+CHARS_PER_TOKEN = 4
+
+# HTTP statuses and google.api_core exception names worth retrying
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+RETRYABLE_ERROR_NAMES = {
+    "ResourceExhausted", "TooManyRequests", "ServiceUnavailable", "InternalServerError",
+    "DeadlineExceeded", "GatewayTimeout", "Aborted"
+}
+
+# Latest call latencies kept for percentiles
+LATENCY_WINDOW = 1000
+
+
+class LLMTimeoutError(TimeoutError):
+    """The call's deadline passed, waiting for a slot or for the model"""
+
+
+class LLMUnavailableError(RuntimeError):
+    """The circuit breaker is open after repeated failures"""
+
+
+def is_retryable(error: Exception) -> bool:
+    """Whether an error is transient (rate limit, overload, network), not a bad request"""
+    if isinstance(error, LLMTimeoutError):
+        return False
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    if type(error).__name__ in RETRYABLE_ERROR_NAMES:
+        return True
+    return getattr(error, "code", None) in RETRYABLE_STATUS_CODES
+
+
+class CircuitBreaker:
+    """
+    Opens after `threshold` consecutive transient failures or timeouts and
+    rejects calls for `cooldown` seconds; then lets one trial call through,
+    which closes it on success or reopens it on failure
+    """
+
+    def __init__(self, threshold: int = 5, cooldown: float = 30.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_running = False
+        self.opened = 0
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._trial_running or time.monotonic() - self._opened_at < self.cooldown:
+                return False
+            self._trial_running = True
+            return True
+
+    def record(self, ok: bool) -> None:
+        """Record a call outcome; errors that are not breaker failures count as ok"""
+        with self._lock:
+            trial = self._trial_running
+            self._trial_running = False
+            if ok:
+                self._failures = 0
+                self._opened_at = None
+                return
+            self._failures += 1
+            if trial or (self._opened_at is None and self._failures >= self.threshold):
+                self._opened_at = time.monotonic()
+                self.opened += 1
+
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            return "half-open" if time.monotonic() - self._opened_at >= self.cooldown else "open"
+
+
+class CallMetrics:
+    """Counters and latency percentiles of model calls"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {
+            "attempts": 0, "succeeded": 0, "failed": 0, "retries": 0, "timeouts": 0,
+            "rejected": 0, "coalesced": 0, "queue_wait_ms": 0.0
+        }
+        self._errors: Dict[str, int] = {}
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def count(self, name: str, amount: float = 1) -> None:
+        with self._lock:
+            self._counts[name] += amount
+
+    def error(self, error: Exception) -> None:
+        name = type(error).__name__
+        with self._lock:
+            self._errors[name] = self._errors.get(name, 0) + 1
+
+    def latency(self, seconds: float) -> None:
+        with self._lock:
+            self._latencies.append(seconds * 1000)
+
+    def enter(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def leave(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._counts)
+            stats["errors"] = dict(self._errors)
+            latencies = sorted(self._latencies)
+            stats["in_flight"] = self.in_flight
+            stats["max_in_flight"] = self.max_in_flight
+
+        attempts = stats["succeeded"] + stats["failed"]
+        stats["error_rate"] = round(stats["failed"] / attempts, 4) if attempts else 0.0
+        stats["avg_queue_wait_ms"] = round(stats.pop("queue_wait_ms") / attempts, 2) if attempts else 0.0
+        if latencies:
+            stats["latency_ms"] = {
+                "p50": round(latencies[len(latencies) // 2], 2),
+                "p95": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 2),
+                "max": round(latencies[-1], 2)
+            }
+        return stats
+
+
+class StreamStats:
+    """Aggregated metrics of finished streams"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals = {
+            "streams": 0, "errors": 0, "cancelled": 0, "chunks": 0, "output_tokens": 0,
+            "ttft_ms": 0.0, "total_ms": 0.0
+        }
+
+    def record(self, metrics: Dict, outcome: str = "completed") -> None:
+        with self._lock:
+            if outcome == "error":
+                self._totals["errors"] += 1
+                return
+            if outcome == "cancelled":
+                self._totals["cancelled"] += 1
+                return
+            self._totals["streams"] += 1
+            self._totals["chunks"] += metrics["chunks"]
+            self._totals["output_tokens"] += metrics["output_tokens"]
+            self._totals["ttft_ms"] += metrics["ttft_ms"] or 0.0
+            self._totals["total_ms"] += metrics["total_ms"]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            totals = dict(self._totals)
+        streams = totals["streams"]
+        return {
+            "streams": streams,
+            "errors": totals["errors"],
+            "cancelled": totals["cancelled"],
+            "output_tokens": totals["output_tokens"],
+            "avg_ttft_ms": round(totals["ttft_ms"] / streams, 2) if streams else 0.0,
+            "avg_total_ms": round(totals["total_ms"] / streams, 2) if streams else 0.0,
+            "avg_chunks": round(totals["chunks"] / streams, 2) if streams else 0.0
+        }
+
+
+class LLMStream:
+    """
+    Iterates over the text chunks of one generation and measures it.
+    After iteration `text` holds the full output and `metrics` the time to
+    first chunk, total latency, chunk count and output tokens.
+    """
+
+    def __init__(
+        self,
+        chunks: Iterator[Tuple[str, Optional[Dict]]],
+        stats: Optional[StreamStats] = None,
+        on_complete: Optional[Callable[[str, Dict], None]] = None,
+        cached: bool = False
+    ):
+        """
+        Args:
+            chunks: (text, usage) pairs; usage, when given, has 'output_tokens'
+            stats (StreamStats): Aggregate to record into
+            on_complete (Callable): Called with the full text and metrics when the stream finishes
+            cached (bool): The chunks come from the result cache, not the model
+        """
+        self._chunks = chunks
+        self._stats = stats
+        self._on_complete = on_complete
+        self.text = ""
+        self.metrics: Dict = {"cached": cached, "ttft_ms": None, "total_ms": None, "chunks": 0, "output_tokens": 0}
+
+    @classmethod
+    def from_text(cls, text: str, cached: bool = True) -> "LLMStream":
+        """A stream of one chunk holding an already available result"""
+        return cls(iter([(text, None)]), cached=cached)
+
+    def __iter__(self) -> Iterator[str]:
+        started = time.perf_counter()
+        parts: List[str] = []
+        usage = None
+        try:
+            for text, chunk_usage in self._chunks:
+                usage = chunk_usage or usage
+                if not text:
+                    continue
+                if self.metrics["ttft_ms"] is None:
+                    self.metrics["ttft_ms"] = round((time.perf_counter() - started) * 1000, 2)
+                parts.append(text)
+                self.metrics["chunks"] += 1
+                yield text
+        except GeneratorExit:
+            # The client went away: a partial answer is neither cached nor counted
+            if self._stats:
+                self._stats.record(self.metrics, "cancelled")
+            raise
+        except Exception:
+            if self._stats:
+                self._stats.record(self.metrics, "error")
+            raise
+
+        self.text = "".join(parts)
+        self.metrics["total_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        if usage and usage.get("output_tokens"):
+            self.metrics["output_tokens"] = usage["output_tokens"]
+        else:
+            self.metrics["output_tokens"] = len(self.text) // CHARS_PER_TOKEN
+            self.metrics["tokens_estimated"] = True
+        if self.metrics["total_ms"]:
+            self.metrics["tokens_per_second"] = round(
+                self.metrics["output_tokens"] / (self.metrics["total_ms"] / 1000), 1
+            )
+
+        if self._stats:
+            self._stats.record(self.metrics)
+        if self._on_complete:
+            self._on_complete(self.text, self.metrics)
+
+
+class LLMClient:
+    """
+    Base of model backends. Backends implement _generate and _stream_chunks;
+    generate() and stream() add the concurrency cap, deadline, retries,
+    circuit breaker and metrics.
+    """
+
+    name = "base"
+
+    def __init__(
+        self,
+        max_concurrency: int = 4,
+        timeout: float = 60.0,
+        max_retries: int = 2,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        breaker_threshold: int = 5,
+        breaker_cooldown: float = 30.0
+    ):
+        """
+        Args:
+            max_concurrency (int): Model calls running at once; others wait for a slot
+            timeout (float): Default seconds per call, including waiting and retries
+            max_retries (int): Retries of transient errors
+            backoff_base (float): First retry waits up to this many seconds, doubling after
+            backoff_max (float): Cap of the retry wait
+            breaker_threshold (int): Consecutive transient failures or timeouts that open the breaker
+            breaker_cooldown (float): Seconds the open breaker rejects calls
+        """
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self.max_concurrency = max_concurrency
+        self.breaker = CircuitBreaker(breaker_threshold, breaker_cooldown)
+        self.metrics = CallMetrics()
+        self.stream_stats = StreamStats()
+        self._single_flight = SingleFlight()
+
+    def _generate(self, prompt: str, model: str, timeout: float) -> str:
+        raise NotImplementedError
+
+    def _stream_chunks(self, prompt: str, model: str, timeout: float) -> Iterator[Tuple[str, Optional[Dict]]]:
+        raise NotImplementedError
+
+    def _is_retryable(self, error: Exception) -> bool:
+        return is_retryable(error)
+
+    @staticmethod
+    def _remaining(deadline: float) -> float:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise LLMTimeoutError("Model call deadline exceeded")
+        return remaining
+
+    @contextlib.contextmanager
+    def _slot(self, deadline: float):
+        started = time.perf_counter()
+        if not self._slots.acquire(timeout=self._remaining(deadline)):
+            raise LLMTimeoutError("Timed out waiting for a free model slot")
+        self.metrics.count("queue_wait_ms", (time.perf_counter() - started) * 1000)
+        self.metrics.enter()
+        try:
+            yield
+        finally:
+            self.metrics.leave()
+            self._slots.release()
+
+    def _admit(self) -> None:
+        self.metrics.count("attempts")
+        if not self.breaker.allow():
+            self.metrics.count("rejected")
+            raise LLMUnavailableError("Model temporarily unavailable after repeated failures")
+
+    def _failed(self, error: Exception, started: float, attempt: int, deadline: float) -> float:
+        """Record a failed attempt; return the seconds to wait before retrying, or raise"""
+        retryable = self._is_retryable(error)
+        self.metrics.count("failed")
+        self.metrics.error(error)
+        self.metrics.latency(time.perf_counter() - started)
+        if isinstance(error, TimeoutError):
+            self.metrics.count("timeouts")
+        # Timeouts are not retried (the deadline has passed) but still mean the
+        # model did not answer; bad requests say nothing about its health
+        self.breaker.record(not (retryable or isinstance(error, LLMTimeoutError)))
+
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        if not retryable or attempt >= self.max_retries or time.monotonic() + delay >= deadline:
+            raise error
+        self.metrics.count("retries")
+        return delay
+
+    def _succeeded(self, started: float) -> None:
+        self.metrics.count("succeeded")
+        self.metrics.latency(time.perf_counter() - started)
+        self.breaker.record(True)
+
+    def generate(self, prompt: str, model: str, timeout: Optional[float] = None) -> str:
+        """
+        Full response text; identical concurrent prompts share one call
+
+        Args:
+            prompt (str): Prompt text
+            model (str): Model name
+            timeout (float): Seconds for the whole call (default: client timeout)
+
+        Raises:
+            LLMTimeoutError, LLMUnavailableError, or the backend's last error
+        """
+        key = hashlib.sha256(f"{model}\0{prompt}".encode("utf-8")).hexdigest()
+        text, shared = self._single_flight.do(key, lambda: self._call(prompt, model, timeout))
+        if shared:
+            self.metrics.count("coalesced")
+        return text
+
+    def _call(self, prompt: str, model: str, timeout: Optional[float]) -> str:
+        deadline = time.monotonic() + (timeout or self.timeout)
+        attempt = 0
+        while True:
+            self._admit()
+            started = time.perf_counter()
+            try:
+                with self._slot(deadline):
+                    # Latency excludes the wait for a slot, reported as queue wait
+                    started = time.perf_counter()
+                    text = self._generate(prompt, model, self._remaining(deadline))
+            except Exception as e:
+                time.sleep(self._failed(e, started, attempt, deadline))
+                attempt += 1
+                continue
+            self._succeeded(started)
+            return text
+
+    def stream(
+        self,
+        prompt: str,
+        model: str,
+        on_complete: Optional[Callable[[str, Dict], None]] = None,
+        timeout: Optional[float] = None
+    ) -> LLMStream:
+        """
+        Stream the response; errors before the first chunk are retried
+
+        Args:
+            prompt (str): Prompt text
+            model (str): Model name
+            on_complete (Callable): Called with the full text and metrics if the stream finishes
+            timeout (float): Seconds for the whole stream (default: client timeout)
+
+        Returns:
+            LLMStream yielding text chunks as the model produces them
+        """
+        return LLMStream(
+            self._guarded_chunks(prompt, model, timeout),
+            stats=self.stream_stats,
+            on_complete=on_complete
+        )
+
+    def _guarded_chunks(self, prompt: str, model: str, timeout: Optional[float]) -> Iterator[Tuple[str, Optional[Dict]]]:
+        deadline = time.monotonic() + (timeout or self.timeout)
+        attempt = 0
+        while True:
+            self._admit()
+            started = time.perf_counter()
+            produced = False
+            delay = None
+            try:
+                with self._slot(deadline):
+                    started = time.perf_counter()
+                    for text, usage in self._stream_chunks(prompt, model, self._remaining(deadline)):
+                        self._remaining(deadline)
+                        produced = produced or bool(text)
+                        yield text, usage
+            except GeneratorExit:
+                # The reader stopped; the model was answering
+                self.breaker.record(True)
+                raise
+            except Exception as e:
+                if produced:
+                    # Part of the answer was already sent: cannot retry transparently
+                    self._failed(e, started, self.max_retries, deadline)
+                delay = self._failed(e, started, attempt, deadline)
+
+            if delay is None:
+                self._succeeded(started)
+                return
+            time.sleep(delay)
+            attempt += 1
+
+    def stats(self) -> Dict:
+        return {
+            "backend": self.name,
+            "max_concurrency": self.max_concurrency,
+            "breaker": {"state": self.breaker.state(), "times_opened": self.breaker.opened},
+            "calls": self.metrics.stats(),
+            "streaming": self.stream_stats.stats()
+        }
+
+
+class GeminiClient(LLMClient):
+    """Google Gemini through google-generativeai"""
+
+    name = "gemini"
+
+    def __init__(self, api_key: Optional[str] = None, **options):
+        super().__init__(**options)
+        api_key = api_key or os.getenv("GOOGLE_API_KEY")
+        if not api_key:
+            raise RuntimeError("GOOGLE_API_KEY not set in environment. Please add it to your .env file")
+        # Imported here: google.generativeai is slow to import and only needed once a model is called
+        import google.generativeai as genai
+        self._genai = genai
+        genai.configure(api_key=api_key)
+        self._models = {}
+
+    def _model(self, model: str):
+        if model not in self._models:
+            self._models[model] = self._genai.GenerativeModel(model)
+        return self._models[model]
+
+    def _generate(self, prompt: str, model: str, timeout: float) -> str:
+        return self._model(model).generate_content(prompt, request_options={"timeout": timeout}).text
+
+    def _stream_chunks(self, prompt: str, model: str, timeout: float) -> Iterator[Tuple[str, Optional[Dict]]]:
+        response = self._model(model).generate_content(prompt, stream=True, request_options={"timeout": timeout})
+        for chunk in response:
+            usage = getattr(chunk, "usage_metadata", None)
+            tokens = getattr(usage, "candidates_token_count", None) if usage else None
+            try:
+                text = chunk.text
+            except ValueError:
+                # A chunk without text parts (e.g. only a finish reason)
+                text = ""
+            yield text, {"output_tokens": tokens} if tokens else None
+
+
+FAKE_REPORT = """1. **Summary of Candidate**:
+   - Fake analysis of a {length}-character resume, produced locally without a model.
+
+2. **Strengths**:
+   - Clear structure and relevant skills.
+
+3. **Weaknesses & Gaps**:
+   - Few measurable outcomes.
+
+4. **ATS (Applicant Tracking System) Score**:
+   - 72/100, standard headings and parseable layout.
+
+5. **Suggested Improvements**:
+   - Quantify achievements and add role keywords.
+
+6. **Interview Questions (based on the resume)**:
+   - Walk through a recent project.
+
+7. **Course Recommendations**:
+   - A system design course on Coursera.
+"""
+
+
+class FakeLLMClient(LLMClient):
+    """
+    Local stand-in model: returns a canned report after a delay, streamed a
+    few words at a time. `failures` makes the first calls fail with a
+    transient error, to exercise retries and the circuit breaker.
+    """
+
+    name = "fake"
+
+    def __init__(self, first_chunk_delay: float = 0.2, chunk_delay: float = 0.02, words_per_chunk: int = 6,
+                 response: Optional[str] = None, failures: int = 0, **options):
+        """
+        Args:
+            first_chunk_delay (float): Seconds before the first chunk (model "thinking")
+            chunk_delay (float): Seconds between chunks
+            words_per_chunk (int): Words per streamed chunk
+            response (str): Fixed response text (default: a canned analysis report)
+            failures (int): Number of calls that fail with ConnectionError first
+            options: LLMClient limits (max_concurrency, timeout, max_retries, ...)
+        """
+        super().__init__(**options)
+        self.first_chunk_delay = first_chunk_delay
+        self.chunk_delay = chunk_delay
+        self.words_per_chunk = words_per_chunk
+        self.response = response
+        self._failures_left = failures
+        self._failures_lock = threading.Lock()
+
+    def _response(self, prompt: str) -> str:
+        return self.response if self.response is not None else FAKE_REPORT.format(length=len(prompt))
+
+    def _wait(self, seconds: float, timeout: float) -> None:
+        if seconds > timeout:
+            time.sleep(timeout)
+            raise TimeoutError("Fake model timed out")
+        time.sleep(seconds)
+
+    def _maybe_fail(self) -> None:
+        with self._failures_lock:
+            if self._failures_left > 0:
+                self._failures_left -= 1
+                raise ConnectionError("Fake transient failure")
+
+    def _generate(self, prompt: str, model: str, timeout: float) -> str:
+        self._maybe_fail()
+        text = self._response(prompt)
+        self._wait(self.first_chunk_delay + self.chunk_delay * len(text.split()) / self.words_per_chunk, timeout)
+        return text
+
+    def _stream_chunks(self, prompt: str, model: str, timeout: float) -> Iterator[Tuple[str, Optional[Dict]]]:
+        self._maybe_fail()
+        # Split on spaces only so the chunks join back to the exact text
+        words = self._response(prompt).split(" ")
+        self._wait(self.first_chunk_delay, timeout)
+        for start in range(0, len(words), self.words_per_chunk):
+            if start:
+                time.sleep(self.chunk_delay)
+            chunk = " ".join(words[start:start + self.words_per_chunk])
+            yield (chunk if start + self.words_per_chunk >= len(words) else chunk + " "), None
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def create_llm_client(backend: Optional[str] = None) -> LLMClient:
+    """
+    Create a model client, with limits from LLM_MAX_CONCURRENCY (default 4),
+    LLM_TIMEOUT_SECONDS (60), LLM_MAX_RETRIES (2), LLM_BREAKER_THRESHOLD (5)
+    and LLM_BREAKER_COOLDOWN_SECONDS (30)
+
+    Args:
+        backend (str): 'gemini' or 'fake' (default: LLM_BACKEND env var, then 'gemini')
+    """
+    backend = (backend or os.getenv("LLM_BACKEND", "gemini")).lower()
+    options = {
+        "max_concurrency": int(os.getenv("LLM_MAX_CONCURRENCY", "4")),
+        "timeout": float(os.getenv("LLM_TIMEOUT_SECONDS", "60")),
+        "max_retries": int(os.getenv("LLM_MAX_RETRIES", "2")),
+        "breaker_threshold": int(os.getenv("LLM_BREAKER_THRESHOLD", "5")),
+        "breaker_cooldown": float(os.getenv("LLM_BREAKER_COOLDOWN_SECONDS", "30"))
+    }
+    if backend == "fake":
+        return FakeLLMClient(
+            first_chunk_delay=float(os.getenv("LLM_FAKE_FIRST_CHUNK_DELAY", "0.2")),
+            chunk_delay=float(os.getenv("LLM_FAKE_CHUNK_DELAY", "0.02")),
+            **options
+        )
+    if backend == "gemini":
+        return GeminiClient(**options)
+    raise ValueError(f"Unknown LLM backend: {backend}")
+
+
+def get_llm_client() -> LLMClient:
+    """Get the process-wide model client, created on first use"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = create_llm_client()
+    return _client
+
+
+def set_llm_client(client: Optional[LLMClient]) -> None:
+    """Replace the process-wide client (e.g. with a FakeLLMClient in tests); None resets it"""
+    global _client
+    with _client_lock:
+        _client = client
@@ -0,0 +1,195 @@
+"""
+Local candidate info extraction
+Pulls email, mobile, years of experience, dictionary skills, a domain and a
+likely name out of resume text with regexes and the skill dictionary, with
+a confidence per field. extract_candidate_info only asks Gemini for the
+fields found here with low confidence.
+"""
+
+from typing import Dict, Optional, Tuple
+import re
+from utils.job_enrichment import classify_domain
+from .resume_compaction import HEADING_TO_SECTION
+from utils.skill_dictionary import get_skill_extractor
+
+
+# Fields returned by extract_candidate_info
+FIELDS = ("name", "email", "mobile", "experience", "domain", "skills")
+
+# Values used by the Gemini prompt when a field is not found
+DEFAULTS = {
+    "name": "Not Found",
+    "email": "Not Found",
+    "mobile": "Not Found",
+    "experience": 0,
+    "domain": "Not Found",
+    "skills": []
+}
+
+MAX_SKILLS = 10
+
+# Domain ids from utils/job_enrichment.py -> labels in the style Gemini returns
+DOMAIN_LABELS = {
+    "tech": "Software Development",
+    "design": "UI/UX Design",
+    "business": "Business",
+    "hr": "Human Resources",
+    "security": "Cybersecurity",
+    "healthcare": "Healthcare"
+}
+
+# Lines at the top of a resume that usually hold the name and headline
+HEADER_LINES = 6
+
+# Confidence of fields guessed from the layout (name, domain): below the
+# default CANDIDATE_LOCAL_MIN_CONFIDENCE, so the hybrid mode confirms them
+HEURISTIC_CONFIDENCE = 0.6
+
+# ...unless a second signal agrees: a name line at most CONTACT_DISTANCE
+# lines from the email or phone line, or a headline in the domain the
+# listed skills point to. Then the hybrid mode keeps the local answer.
+CORROBORATED_CONFIDENCE = 0.9
+CONTACT_DISTANCE = 2
+
+# A headline is a short line; longer ones are summary sentences
+MAX_TITLE_LENGTH = 80
+
+EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)*\.[a-zA-Z]{2,}")
+PHONE_PATTERN = re.compile(r"(?<![\w+])\+?\d[\d\s().-]{8,16}\d(?!\w)")
+EXPERIENCE_PATTERNS = [
+    # "5+ years of experience", "3.5 yrs of professional experience"
+    re.compile(
+        r"(\d{1,2}(?:\.\d{1,2})?)\s*\+?\s*(?:years?|yrs?)\b(?:\s+[a-z-]+){0,3}?\s+experience",
+        re.IGNORECASE
+    ),
+    # "Experience: 4 years", "total experience of 6 yrs"
+    re.compile(
+        r"experience\s*(?:of|:|-)?\s*(\d{1,2}(?:\.\d{1,2})?)\s*\+?\s*(?:years?|yrs?)\b",
+        re.IGNORECASE
+    ),
+]
+FRESHER_PATTERN = re.compile(r"\b(?:fresher|fresh graduate|recent graduate)\b", re.IGNORECASE)
+NAME_WORD_PATTERN = re.compile(r"^[A-Za-z][A-Za-z.'-]*$")
+# Words of headings and job titles, which are never part of a name
+NOT_NAME_WORDS = {
+    "resume", "curriculum", "vitae", "cv", "profile", "summary", "contact", "objective",
+    "work", "experience", "professional", "employment", "history", "education", "skills", "technical",
+    "projects", "certifications", "achievements", "personal", "details", "information", "career",
+    "senior", "junior", "lead", "principal", "staff", "chief", "head", "associate", "assistant",
+    "software", "engineer", "developer", "programmer", "manager", "analyst", "designer", "consultant",
+    "architect", "specialist", "intern", "trainee", "executive", "director", "officer", "scientist",
+    "administrator", "recruiter", "accountant", "nurse", "full", "stack", "frontend", "backend", "data"
+}
+# Phone-like runs that are years ("2016 2020 2021", "2018-2022")
+YEAR_PATTERN = re.compile(r"(?:19|20)\d\d")
+URL_PATTERN = re.compile(r"https?://|www\.|linkedin|github", re.IGNORECASE)
+
+
+def _find_email(text: str) -> Tuple[Optional[str], float]:
+    match = EMAIL_PATTERN.search(text)
+    return (match.group(0), 1.0) if match else (None, 0.0)
+
+
+def _find_mobile(text: str) -> Tuple[Optional[str], float]:
+    for match in PHONE_PATTERN.finditer(text):
+        candidate = " ".join(match.group(0).split())
+        digits = sum(char.isdigit() for char in candidate)
+        # 10 digits, or a country code on top; year ranges and ids fall outside
+        if not 10 <= digits <= 13:
+            continue
+        groups = re.findall(r"\d+", candidate)
+        if len(groups) > 1 and all(YEAR_PATTERN.fullmatch(group) for group in groups):
+            continue
+        return candidate, 0.85
+    return None, 0.0
+
+
+def _find_experience(text: str) -> Tuple[Optional[int], float]:
+    years = [
+        float(match.group(1))
+        for pattern in EXPERIENCE_PATTERNS
+        for match in pattern.finditer(text)
+    ]
+    if years:
+        # The summary usually states the total, job entries state less
+        return int(max(years)), 0.85
+    if FRESHER_PATTERN.search(text):
+        return 0, 0.8
+    return None, 0.0
+
+
+def _is_contact_line(line: str) -> bool:
+    return bool(EMAIL_PATTERN.search(line)) or _find_mobile(line)[0] is not None
+
+
+def _find_name(lines) -> Tuple[Optional[str], float]:
+    for index, line in enumerate(lines[:HEADER_LINES]):
+        words = line.replace(",", " ").split()
+        if not 2 <= len(words) <= 4:
+            continue
+        if not all(NAME_WORD_PATTERN.match(word) for word in words):
+            continue
+        if any(word.lower().strip(".") in NOT_NAME_WORDS for word in words):
+            continue
+        if get_skill_extractor().extract(line):
+            continue
+        nearby = lines[max(0, index - CONTACT_DISTANCE):index] + lines[index + 1:index + 1 + CONTACT_DISTANCE]
+        confidence = CORROBORATED_CONFIDENCE if any(_is_contact_line(other) for other in nearby) else HEURISTIC_CONFIDENCE
+        return (line.title() if line.isupper() else line), confidence
+    return None, 0.0
+
+
+def _find_title(lines, name: Optional[str]) -> Optional[str]:
+    """The headline: the first short line after the name that is not a heading or contact details"""
+    header = lines[:HEADER_LINES]
+    if name:
+        names = (name, name.upper())
+        header = header[next((index + 1 for index, line in enumerate(header) if line in names), 0):]
+    for line in header:
+        if len(line) > MAX_TITLE_LENGTH or EMAIL_PATTERN.search(line) or PHONE_PATTERN.search(line):
+            continue
+        if URL_PATTERN.search(line) or line.lower().strip(" :-|").strip() in HEADING_TO_SECTION:
+            continue
+        return line
+    return None
+
+
+def extract_local(resume_text: str) -> Tuple[Dict, Dict[str, float]]:
+    """
+    Extract candidate info without calling a model
+
+    Args:
+        resume_text (str): The extracted text from the resume
+
+    Returns:
+        (info, confidence): info has the fields of extract_candidate_info,
+        with None where nothing was found; confidence maps each field to 0-1
+    """
+    text = resume_text or ""
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    info, confidence = {}, {}
+
+    info["email"], confidence["email"] = _find_email(text)
+    info["mobile"], confidence["mobile"] = _find_mobile(text)
+    info["experience"], confidence["experience"] = _find_experience(text)
+    info["name"], confidence["name"] = _find_name(lines)
+
+    skills = get_skill_extractor().extract(text)[:MAX_SKILLS]
+    info["skills"] = skills or None
+    # A handful of dictionary hits means the resume lists its skills
+    confidence["skills"] = 0.9 if len(skills) >= 3 else 0.4 if skills else 0.0
+
+    # The headline names the role; the body mentions too many things to vote on
+    domain = classify_domain(_find_title(lines, info["name"]))
+    info["domain"] = DOMAIN_LABELS.get(domain)
+    # Corroborated when the resume lists its skills and every one of them that
+    # names a domain names the headline's
+    skill_domains = {classify_domain(skill) for skill in skills} - {None}
+    if not domain:
+        confidence["domain"] = 0.0
+    elif len(skills) >= 3 and skill_domains == {domain}:
+        confidence["domain"] = CORROBORATED_CONFIDENCE
+    else:
+        confidence["domain"] = HEURISTIC_CONFIDENCE
+
+    return info, confidence
@@ -0,0 +1,295 @@
+"""
+Persistent cache for Gemini results
+Results are keyed on a hash of the whitespace-normalized resume text, the
+prompt version and the model name, so re-uploading the same resume or
+re-running an analysis returns the stored answer, while a prompt or model
+change misses cleanly. Entries live in a local SQLite file with LRU
+eviction and a TTL; when a resume id is given they are also saved to
+resumes.analysis so they survive on other hosts.
+"""
+
+from typing import Any, Callable, Dict, Optional
+from pathlib import Path
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parents[1] / "data" / "llm_cache.sqlite3"
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so re-extracted copies of the same resume hash the same"""
+    return " ".join((text or "").split())
+
+
+def result_key(task: str, text: str, prompt_version: str, model: str) -> str:
+    payload = "\0".join([task, prompt_version, model, normalize_text(text)])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResultCache:
+    """
+    Disk-backed LRU + TTL store of model results, shared by all workers on a host
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 5000, ttl_seconds: float = 30 * 86400):
+        """
+        Args:
+            path (str): SQLite file (default: backend/data/llm_cache.sqlite3)
+            max_entries (int): Entries kept; the least recently used are evicted
+            ttl_seconds (float): Age after which an entry is recomputed
+        """
+        self.path = str(path or DEFAULT_CACHE_PATH)
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "stored_hits": 0, "misses": 0, "compute_time_ms": 0.0}
+
+        self._execute(
+            "CREATE TABLE IF NOT EXISTS llm_results ("
+            "key TEXT PRIMARY KEY, task TEXT NOT NULL, model TEXT NOT NULL, "
+            "prompt_version TEXT NOT NULL, value TEXT NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._execute("CREATE INDEX IF NOT EXISTS idx_llm_results_accessed_at ON llm_results(accessed_at)")
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections cannot be shared between threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        return self._connection().execute(sql, params)
+
+    def _count(self, name: str, amount: float = 1) -> None:
+        with self._lock:
+            self._stats[name] += amount
+
+    def get(self, key: str) -> Optional[Any]:
+        row = self._execute("SELECT value, created_at FROM llm_results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        now = time.time()
+        if row[1] + self.ttl_seconds < now:
+            self._execute("DELETE FROM llm_results WHERE key = ?", (key,))
+            return None
+        self._execute("UPDATE llm_results SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, task: str, prompt_version: str, model: str) -> None:
+        now = time.time()
+        self._execute(
+            "INSERT OR REPLACE INTO llm_results "
+            "(key, task, model, prompt_version, value, created_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, task, model, prompt_version, json.dumps(value), now, now)
+        )
+        excess = self._execute("SELECT COUNT(*) FROM llm_results").fetchone()[0] - self.max_entries
+        if excess > 0:
+            self._execute(
+                "DELETE FROM llm_results WHERE key IN "
+                "(SELECT key FROM llm_results ORDER BY accessed_at LIMIT ?)",
+                (excess,)
+            )
+
+    def lookup(
+        self,
+        task: str,
+        text: str,
+        prompt_version: str,
+        model: str,
+        resume_id: Optional[str] = None,
+        user_id: Optional[str] = None
+    ) -> Optional[Any]:
+        """
+        The stored result for this text, prompt and model, or None (counted as a miss)
+
+        Args:
+            task (str): Result kind, also the key under resumes.analysis ('analysis', 'candidate_info')
+            text (str): Resume text sent to the model
+            prompt_version (str): Bumped whenever the prompt changes
+            model (str): Model name
+            resume_id (str): Also read resumes.analysis[task] of this resume
+            user_id (str): Authenticated owner of the resume; required with resume_id
+        """
+        key = result_key(task, text, prompt_version, model)
+
+        try:
+            value = self.get(key)
+        except sqlite3.Error as e:
+            print(f"⚠️  Could not read LLM cache: {str(e)}")
+            value = None
+        if value is not None:
+            self._count('hits')
+            return value
+
+        if resume_id and user_id:
+            stored = _read_stored_result(resume_id, user_id, task)
+            if stored and stored.get('key') == key:
+                self._count('stored_hits')
+                self._store(key, stored['value'], task, prompt_version, model)
+                return stored['value']
+
+        self._count('misses')
+        return None
+
+    def save(
+        self,
+        task: str,
+        text: str,
+        prompt_version: str,
+        model: str,
+        value: Any,
+        resume_id: Optional[str] = None,
+        compute_ms: float = 0.0,
+        user_id: Optional[str] = None
+    ) -> None:
+        """
+        Store a computed result (and in resumes.analysis[task] when a resume id
+        and its owner are given)
+
+        Args:
+            compute_ms (float): Model time spent on it, reported as time saved by later hits
+        """
+        key = result_key(task, text, prompt_version, model)
+        self._count('compute_time_ms', compute_ms)
+        self._store(key, value, task, prompt_version, model)
+        if resume_id and user_id:
+            _save_stored_result(resume_id, user_id, task, key, value, text)
+
+    def get_or_compute(
+        self,
+        task: str,
+        text: str,
+        prompt_version: str,
+        model: str,
+        compute: Callable[[], Any],
+        is_valid: Optional[Callable[[Any], bool]] = None,
+        resume_id: Optional[str] = None,
+        user_id: Optional[str] = None
+    ) -> Any:
+        """
+        Return the stored result for this text, prompt and model, or compute and store it
+
+        Args:
+            task (str): Result kind, also the key under resumes.analysis ('analysis', 'candidate_info')
+            text (str): Resume text sent to the model
+            prompt_version (str): Bumped whenever the prompt changes
+            model (str): Model name
+            compute (Callable): Calls the model
+            is_valid (Callable): Whether a computed result may be stored (errors are not)
+            resume_id (str): Also read and write resumes.analysis[task] for this resume
+            user_id (str): Authenticated owner of the resume; required with resume_id
+
+        Returns:
+            The result, JSON-compatible
+        """
+        value = self.lookup(task, text, prompt_version, model, resume_id, user_id)
+        if value is not None:
+            return value
+
+        started = time.perf_counter()
+        value = compute()
+        compute_ms = (time.perf_counter() - started) * 1000
+
+        if is_valid is None or is_valid(value):
+            self.save(task, text, prompt_version, model, value, resume_id, compute_ms, user_id)
+        else:
+            self._count('compute_time_ms', compute_ms)
+        return value
+
+    def _store(self, key: str, value: Any, task: str, prompt_version: str, model: str) -> None:
+        try:
+            self.set(key, value, task, prompt_version, model)
+        except sqlite3.Error as e:
+            print(f"⚠️  Could not write LLM cache: {str(e)}")
+
+    def stats(self) -> Dict:
+        """Hit/miss counters, hit rate and the model time saved by hits"""
+        with self._lock:
+            stats = dict(self._stats)
+
+        hits = stats['hits'] + stats['stored_hits']
+        lookups = hits + stats['misses']
+        average_ms = stats['compute_time_ms'] / stats['misses'] if stats['misses'] else 0.0
+        stats['hit_rate'] = round(hits / lookups, 4) if lookups else 0.0
+        stats['avg_compute_ms'] = round(average_ms, 2)
+        stats['time_saved_ms'] = round(hits * average_ms, 2)
+        stats['compute_time_ms'] = round(stats['compute_time_ms'], 2)
+        try:
+            stats['entries'] = self._execute("SELECT COUNT(*) FROM llm_results").fetchone()[0]
+        except sqlite3.Error:
+            stats['entries'] = None
+        return stats
+
+
+def _read_stored_result(resume_id: str, user_id: str, task: str) -> Optional[Dict]:
+    try:
+        from utils.job_storage import get_job_storage
+        return (get_job_storage().get_resume_analysis(resume_id, user_id) or {}).get(task)
+    except Exception as e:
+        print(f"⚠️  Could not read stored resume analysis: {str(e)}")
+        return None
+
+
+def _save_stored_result(resume_id: str, user_id: str, task: str, key: str, value: Any, text: str) -> None:
+    try:
+        from utils.job_storage import get_job_storage
+        get_job_storage().save_resume_analysis(resume_id, user_id, {task: {'key': key, 'value': value}}, parsed_text=text)
+    except Exception as e:
+        print(f"⚠️  Could not save resume analysis: {str(e)}")
+
+
+class _NullCache:
+    """Stand-in used when the cache is disabled"""
+
+    def lookup(self, task, text, prompt_version, model, resume_id=None, user_id=None):
+        return None
+
+    def save(self, task, text, prompt_version, model, value, resume_id=None, compute_ms=0.0, user_id=None):
+        pass
+
+    def get_or_compute(self, task, text, prompt_version, model, compute, is_valid=None, resume_id=None, user_id=None):
+        return compute()
+
+    def stats(self) -> Dict:
+        return {"enabled": False}
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache():
+    """
+    Get the process-wide LLM result cache, configured from the environment:
+    LLM_CACHE_ENABLED (default true), LLM_CACHE_PATH, LLM_CACHE_MAX_ENTRIES
+    (default 5000) and LLM_CACHE_TTL_SECONDS (default 30 days)
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                if os.getenv("LLM_CACHE_ENABLED", "true").lower() in ("0", "false", "no"):
+                    _cache = _NullCache()
+                else:
+                    try:
+                        _cache = LLMResultCache(
+                            path=os.getenv("LLM_CACHE_PATH") or None,
+                            max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000")),
+                            ttl_seconds=float(os.getenv("LLM_CACHE_TTL_SECONDS", str(30 * 86400)))
+                        )
+                    except sqlite3.Error as e:
+                        print(f"⚠️  LLM result cache disabled: {str(e)}")
+                        _cache = _NullCache()
+    return _cache
@@ -0,0 +1,230 @@
+"""
+Resume text compaction before prompting
+Extracted resume text carries repeated whitespace, page headers and footers,
+page numbers and separator lines that cost prompt tokens without helping the
+model. compact_resume normalizes the text, drops those lines and splits it
+into sections at top-level headings. A resume within the prompt's token
+budget is sent whole; a longer one keeps the sections the prompt needs most
+until the budget is used, in their original order, and other sections
+(references, declarations, hobbies) are the first to go.
+"""
+
+from typing import Dict, List, Optional, Tuple
+from collections import Counter
+import os
+import re
+
+
+# Page separator written by utils/extract_text.py
+PAGE_BREAK = "\f"
+
+# Rough characters per token (same estimate as ai/llm_client.py)
+CHARS_PER_TOKEN = 4
+
+# Section id -> headings that start it (compared lowercased, without trailing ':')
+SECTION_HEADINGS = {
+    "summary": ["summary", "professional summary", "profile", "professional profile", "objective",
+                "career objective", "about me", "about"],
+    "skills": ["skills", "technical skills", "key skills", "core competencies", "skills & tools",
+               "skills and tools", "technologies", "tech stack", "tools"],
+    "experience": ["experience", "work experience", "professional experience", "employment history",
+                   "work history", "internships", "internship", "employment"],
+    "projects": ["projects", "academic projects", "personal projects", "key projects"],
+    "education": ["education", "academic background", "qualifications", "educational qualifications",
+                  "academics", "academic qualifications"],
+    "certifications": ["certifications", "certificates", "licenses & certifications", "courses", "training"],
+    "achievements": ["achievements", "awards", "honors", "accomplishments", "awards & achievements",
+                     "awards and achievements"],
+    "publications": ["publications", "research"],
+    "activities": ["extracurricular activities", "extra-curricular activities", "activities", "volunteering",
+                   "volunteer experience", "leadership", "positions of responsibility"],
+    "personal": ["personal details", "personal information", "contact", "contact information", "contact details"],
+    "languages": ["languages"],
+    "interests": ["interests", "hobbies", "hobbies & interests", "hobbies and interests"],
+    "references": ["references"],
+    "declaration": ["declaration"],
+}
+HEADING_TO_SECTION = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+
+# Headings that are also used as subheadings inside a section ("Languages" and
+# "Tools" under TECHNICAL SKILLS); there they do not start a new section
+SUBHEADINGS = {
+    "skills": {"languages", "tools", "technologies", "tech stack", "courses", "certifications", "training"},
+    "education": {"courses", "training", "achievements", "awards", "projects", "academic projects"},
+    "experience": {"projects", "key projects", "achievements", "tools", "technologies", "tech stack"},
+    "projects": {"tools", "technologies", "tech stack"},
+}
+
+# Sections each prompt needs, most important first; others are kept only
+# when the whole resume fits the budget.
+# "header" is the text before the first heading (name and contact lines).
+PROMPT_SECTIONS = {
+    "analysis": ["header", "summary", "experience", "skills", "projects", "education", "certifications",
+                 "achievements", "publications", "activities", "languages", "personal", "interests"],
+    "candidate_info": ["header", "personal", "skills", "summary", "experience", "education", "projects",
+                       "certifications"],
+}
+
+# Token budgets of the resume part of each prompt
+PROMPT_TOKEN_BUDGETS = {
+    "analysis": int(os.getenv("RESUME_ANALYSIS_TOKEN_BUDGET", "3000")),
+    "candidate_info": int(os.getenv("RESUME_CANDIDATE_TOKEN_BUDGET", "1500")),
+}
+
+BULLET_PATTERN = re.compile(r"^[•●▪■‣⁃∙◦*➢–—-]+\s*")
+SEPARATOR_PATTERN = re.compile(r"^[\s_=~.—–-]{3,}$")
+PAGE_NUMBER_PATTERN = re.compile(r"^(?:page\s*)?\d{1,3}(?:\s*(?:/|of)\s*\d{1,3})?$", re.IGNORECASE)
+DIGITS_PATTERN = re.compile(r"\d+")
+
+# Lines at each end of a page checked for running headers and footers
+PAGE_EDGE_LINES = 3
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN
+
+
+def _normalize_line(line: str) -> str:
+    line = " ".join(line.split())
+    return BULLET_PATTERN.sub("- ", line) if BULLET_PATTERN.match(line) else line
+
+
+def _running_lines(pages: List[List[str]]) -> set:
+    """Lines repeated at the top or bottom of at least half the pages (digits ignored)"""
+    if len(pages) < 2:
+        return set()
+    counts = Counter()
+    for lines in pages:
+        edges = lines[:PAGE_EDGE_LINES] + lines[-PAGE_EDGE_LINES:]
+        counts.update({DIGITS_PATTERN.sub("#", line.lower()) for line in edges})
+    return {line for line, count in counts.items() if count >= max(2, len(pages) / 2)}
+
+
+def _heading(line: str) -> Optional[str]:
+    if len(line) > 40:
+        return None
+    return HEADING_TO_SECTION.get(line.lower().strip(" :-|").strip())
+
+
+def clean_lines(text: str) -> Tuple[List[str], int]:
+    """
+    Normalized, non-empty lines of the text without page furniture
+
+    Returns:
+        (lines, removed): kept lines and the number of header, footer,
+        page number, separator and duplicate lines dropped
+    """
+    pages = [
+        [_normalize_line(line) for line in page.splitlines() if line.strip()]
+        for page in (text or "").split(PAGE_BREAK)
+    ]
+    running = _running_lines(pages)
+
+    lines, removed = [], 0
+    for page in pages:
+        for line in page:
+            if (
+                PAGE_NUMBER_PATTERN.match(line)
+                or SEPARATOR_PATTERN.match(line)
+                or DIGITS_PATTERN.sub("#", line.lower()) in running
+                or (lines and lines[-1] == line)
+            ):
+                removed += 1
+                continue
+            lines.append(line)
+    return lines, removed
+
+
+def _is_upper(line: str) -> bool:
+    return line.upper() == line and any(char.isalpha() for char in line)
+
+
+def split_sections(lines: List[str]) -> List[Tuple[str, List[str]]]:
+    """
+    Split lines into (section id, lines) at top-level headings, in document order
+
+    A known heading stays inside the current section when it is one of that
+    section's subheadings, or when the resume writes its headings in capitals
+    and this one is not.
+    """
+    headings = [line for line in lines if _heading(line)]
+    capital_headings = sum(map(_is_upper, headings)) > len(headings) / 2
+
+    sections = [("header", [])]
+    for line in lines:
+        section = _heading(line)
+        current = sections[-1][0]
+        if section and current != "header" and (
+            line.lower().strip(" :-|").strip() in SUBHEADINGS.get(current, ())
+            or (capital_headings and not _is_upper(line))
+        ):
+            section = None
+        if section:
+            sections.append((section, [line]))
+        else:
+            sections[-1][1].append(line)
+    return [(section, body) for section, body in sections if body]
+
+
+def compact_resume(text: str, prompt: str, budget_tokens: Optional[int] = None) -> Tuple[str, Dict]:
+    """
+    Compact resume text for one prompt
+
+    Args:
+        text (str): Extracted resume text
+        prompt (str): 'analysis' or 'candidate_info' (selects sections and budget)
+        budget_tokens (int): Override of the prompt's token budget
+
+    Returns:
+        (compacted text, report with original and compacted token counts and
+        the sections kept, truncated and dropped)
+    """
+    budget = budget_tokens or PROMPT_TOKEN_BUDGETS[prompt]
+    priorities = PROMPT_SECTIONS[prompt]
+
+    lines, removed = clean_lines(text)
+    sections = split_sections(lines)
+
+    # Budget whole sections, the prompt's sections by priority and then the
+    # rest in document order; a prompt section that does not fit is cut by lines
+    budget_chars = budget * CHARS_PER_TOKEN
+    kept: Dict[int, List[str]] = {}
+    truncated, dropped = [], []
+    order = sorted(
+        range(len(sections)),
+        key=lambda index: (
+            priorities.index(sections[index][0]) if sections[index][0] in priorities else len(priorities),
+            index
+        )
+    )
+    for index in order:
+        section, body = sections[index]
+        size = sum(len(line) + 1 for line in body)
+        if size <= budget_chars:
+            kept[index] = body
+            budget_chars -= size
+            continue
+        if section not in priorities:
+            dropped.append(section)
+            continue
+        partial = []
+        for line in body:
+            if len(line) + 1 > budget_chars:
+                break
+            partial.append(line)
+            budget_chars -= len(line) + 1
+        if len(partial) > 1 or (partial and section == "header"):
+            kept[index] = partial
+            truncated.append(section)
+        else:
+            dropped.append(section)
+
+    compacted = "\n\n".join("\n".join(kept[index]) for index in sorted(kept))
+    return compacted, {
+        "original_tokens": estimate_tokens(text or ""),
+        "tokens": estimate_tokens(compacted),
+        "lines_removed": removed,
+        "sections": [sections[index][0] for index in sorted(kept)],
+        "truncated": truncated,
+        "dropped": dropped
+    }
@@ -1,19 +1,50 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Request, request, jsonify, Response, stream_with_context, abort
 from flask_cors import CORS
+import json
 import os
-from utils.extract_text import extract_text_from_resume
-from ai.analyze_resume import analyze_resume
-from ai.extract_candidate_info import extract_candidate_info
-from scraper.naukri_scraper import NaukriScraper
-from scraper.job_scraper_manager import JobScraperManager
+import queue
+import tempfile
+import threading
+import time
+from utils.extract_text import save_upload
+from utils.background_tasks import get_background_tasks
+from utils.http_responses import finalize_response
+from utils.resume_processing import (
+    MAX_RESUME_BYTES, ResumeBatch, UnsupportedResumeError, get_resume_queue, process_resume_upload,
+    unpack_uploads
+)
+from ai.analyze_resume import analyze_resume, stream_analysis
+from ai.llm_client import get_llm_client
+from ai.result_cache import get_llm_cache
+from utils.auth import authenticated_user_id, require_auth
 from utils.job_database import JobDatabase
-from utils.background_scraper import BackgroundJobScraper
+from utils.job_storage import get_job_storage
+from utils.job_cache import get_job_cache
+from utils.job_write_buffer import get_job_writer
+from utils.job_enrichment import classify_domain
+from utils.job_normalization import SALARY_CURRENCIES
+from utils.skill_dictionary import get_skill_extractor
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+class UploadRequest(Request):
+    """
+    Request with a per-route body limit: MAX_BATCH_BYTES for /api/upload-resumes,
+    MAX_CONTENT_LENGTH everywhere else. Flask 3.0's request.max_content_length
+    is a read-only view of the config, so it is overridden here; werkzeug
+    applies it to the Content-Length header and to chunked bodies alike.
+    """
+    
+    @property
+    def max_content_length(self):
+        if self.endpoint == "upload_resumes":
+            return MAX_BATCH_BYTES
+        return super().max_content_length
+
 app = Flask(__name__)
+app.request_class = UploadRequest
 
 # Configure CORS to allow requests from the frontend
 CORS(app, resources={
@@ -24,17 +55,90 @@ CORS(app, resources={
     }
 })
 
-# Configure upload folder
+# Configure upload folder; resumes are read in memory and only kept on disk
+# (named by content hash) when RESUME_STORE_UPLOADS is enabled
 app.config["UPLOAD_FOLDER"] = "uploads"
-app.config["MAX_CONTENT_LENGTH"] = 10 * 1024 * 1024  # 10MB max file size
-os.makedirs(app.config["UPLOAD_FOLDER"], exist_ok=True)
+app.config["MAX_CONTENT_LENGTH"] = MAX_RESUME_BYTES  # 10MB max file size
+# Only /api/upload-resumes accepts bodies above MAX_RESUME_BYTES (see UploadRequest)
+MAX_BATCH_BYTES = int(os.getenv("RESUME_BATCH_MAX_MB", "200")) * 1024 * 1024
+STORE_UPLOADS = os.getenv("RESUME_STORE_UPLOADS", "false").lower() in ("1", "true", "yes")
 
 # Allowed file extensions
 ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx'}
 
+# Headless Chrome sessions per process; each takes a few hundred MB of memory
+SCRAPE_MAX_CONCURRENCY = int(os.getenv("SCRAPE_MAX_CONCURRENCY", "2"))
+scrape_slots = threading.BoundedSemaphore(SCRAPE_MAX_CONCURRENCY)
+
+# Limits of /api/recommend/batch
+MAX_BATCH_PROFILES = 1000
+MAX_BATCH_LIMIT = 50
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def scrapers_busy():
+    """503 response for a scrape started while every scrape slot is in use"""
+    response = jsonify({"error": "All scrapers are busy, retry shortly or pass 'async': true"})
+    response.headers["Retry-After"] = "30"
+    return response, 503
+
+def run_with_scrape_slot(fn, *args):
+    """Run a background scrape once a scrape slot is free"""
+    with scrape_slots:
+        return fn(*args)
+
+def sse_event(event, payload):
+    """Format one Server-Sent Events message with a JSON payload"""
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+def resume_owner(resume_id):
+    """
+    Check that the caller may store AI results on resumes.id resume_id
+    Returns: (user_id, None), or (None, error response) when the caller is
+             not signed in or does not own the resume
+    """
+    if not resume_id:
+        return None, None
+    user_id = authenticated_user_id()
+    if user_id is None:
+        return None, (jsonify({"error": "Authentication required to use resume_id"}), 401)
+    if not get_job_storage().resume_belongs_to(resume_id, user_id):
+        return None, (jsonify({"error": "Resume not found"}), 404)
+    return user_id, None
+
+def visible_processing(record):
+    """A resume processing record, or None if it belongs to another user"""
+    if record is None or (record.get('user_id') and record['user_id'] != authenticated_user_id()):
+        return None
+    return record
+
+@app.before_request
+def limit_request_size():
+    # Reject oversized bodies here: a 413 raised inside a view would be turned
+    # into a 500 by its error handling
+    if request.content_length is not None:
+        if request.content_length > request.max_content_length:
+            abort(413)
+    elif request.environ.get("wsgi.input_terminated") and "chunked" in request.headers.get("Transfer-Encoding", "").lower():
+        # A chunked body has no Content-Length: read it up to the route's limit
+        # into a spooled file and give it one
+        body = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+        size = 0
+        while chunk := request.environ["wsgi.input"].read(64 * 1024):
+            size += len(chunk)
+            if size > request.max_content_length:
+                abort(413)
+            body.write(chunk)
+        body.seek(0)
+        request.environ["wsgi.input"] = body
+        request.environ["CONTENT_LENGTH"] = str(size)
+
+@app.after_request
+def compress_and_tag(response):
+    # Compression, ETags and 304s for If-None-Match (utils/http_responses.py)
+    return finalize_response(request, response)
+
 @app.route("/api/health", methods=["GET"])
 def health_check():
     """Health check endpoint"""
@@ -44,8 +148,11 @@ def health_check():
 def upload_resume():
     """
     Upload and analyze resume endpoint - NOW RETURNS SIMPLIFIED CANDIDATE INFO
-    Accepts: multipart/form-data with 'file' field
-    Returns: JSON with basic candidate information
+    Accepts: multipart/form-data with 'file' field, optional 'resume_id' (the
+             caller's own resume; needs an Authorization bearer token) and
+             optional 'async' (form field or query arg)
+    Returns: JSON with basic candidate information, or with async=true
+             202 with a processing id to poll or follow over SSE
     """
     try:
         # Check if file is in request
@@ -62,41 +169,182 @@ def upload_resume():
         if not allowed_file(file.filename):
             return jsonify({"error": "Invalid file type. Only PDF, DOC, and DOCX are allowed"}), 400
         
-        # Save file
-        filepath = os.path.join(app.config["UPLOAD_FOLDER"], file.filename)
-        file.save(filepath)
-        print(f"File saved at: {filepath}")
+        # Read the upload in memory (bounded by MAX_CONTENT_LENGTH)
+        data = file.read()
+        if STORE_UPLOADS:
+            filepath = save_upload(data, file.filename, app.config["UPLOAD_FOLDER"])
+            print(f"File saved at: {filepath}")
         
-        # Extract text from the uploaded resume
-        resume_text = extract_text_from_resume(filepath)
-        print(f"Extracted Text: {resume_text[:200]}...")
+        resume_id = request.form.get('resume_id')
+        user_id, error = resume_owner(resume_id)
+        if error:
+            return error
+        run_async = (request.form.get('async') or request.args.get('async', 'false')).lower() in ("1", "true", "yes")
         
-        if resume_text == "Unsupported file format.":
-            return jsonify({"error": "Unsupported file format"}), 400
+        if run_async:
+            # Hand extraction and the AI call to the worker pool
+            try:
+                record = get_resume_queue().submit(data, file.filename, resume_id=resume_id, user_id=user_id)
+            except queue.Full:
+                response = jsonify({"error": "Too many resumes are being processed, retry shortly"})
+                response.headers["Retry-After"] = "5"
+                return response, 503
+            
+            status_url = f"/api/resume-processing/{record['id']}"
+            response = jsonify({
+                "success": True,
+                "processing_id": record['id'],
+                "status": record['status'],
+                "status_url": status_url,
+                "events_url": f"{status_url}/events"
+            })
+            response.headers["Location"] = status_url
+            return response, 202  # 202 Accepted
         
-        # Extract basic candidate information using AI
-        candidate_info = extract_candidate_info(resume_text)
-        print(f"Candidate Info: {candidate_info}")
+        result = process_resume_upload(data, file.filename, resume_id=resume_id, user_id=user_id)
+        print(f"Extracted Text: {result['resume_text'][:200]}...")
+        print(f"Candidate Info: {result['candidate_info']}")
         
-        # Clean up - optionally delete the file after processing
-        # os.remove(filepath)
+        return jsonify({"success": True, **result}), 200
         
-        return jsonify({
-            "success": True,
-            "filename": file.filename,
-            "candidate_info": candidate_info,
-            "resume_text": resume_text  # Full text for matching
-        }), 200
+    except UnsupportedResumeError:
+        return jsonify({"error": "Unsupported file format"}), 400
         
     except Exception as e:
         print(f"Error processing resume: {str(e)}")
         return jsonify({"error": f"Error processing resume: {str(e)}"}), 500
 
+@app.route("/api/upload-resumes", methods=["POST"])
+def upload_resumes():
+    """
+    Upload many resumes at once
+    Accepts: multipart/form-data with one or more 'files' fields (PDF, DOC,
+             DOCX, or ZIP archives of them)
+    Returns: text/event-stream with a 'result' event per file as it finishes
+             (the upload-resume fields, or an error), then one 'done' event
+             with counts and throughput in resumes per minute
+    """
+    try:
+        uploads = [file for file in request.files.getlist('files') if file.filename]
+        if not uploads:
+            return jsonify({"error": "No files provided"}), 400
+        
+        invalid = [
+            file.filename for file in uploads
+            if not (allowed_file(file.filename) or file.filename.lower().endswith(".zip"))
+        ]
+        if invalid:
+            return jsonify({
+                "error": "Invalid file type. Only PDF, DOC, DOCX and ZIP are allowed",
+                "files": invalid
+            }), 400
+        
+        # Files are read (and archives unpacked) one at a time as the batch runs
+        try:
+            files = unpack_uploads([(file.filename, file.stream) for file in uploads])
+        except UnsupportedResumeError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        if not files:
+            return jsonify({"error": "No PDF, DOC or DOCX files found"}), 400
+        
+        if STORE_UPLOADS:
+            def keep_copy(filename, read):
+                def read_and_save():
+                    data = read()
+                    save_upload(data, filename, app.config["UPLOAD_FOLDER"])
+                    return data
+                return read_and_save
+            files = [(filename, keep_copy(filename, read)) for filename, read in files]
+        
+        batch = ResumeBatch(files)
+        
+        def generate():
+            try:
+                yield sse_event("start", {"files": len(files)})
+                for result in batch:
+                    yield sse_event("result", result)
+                print(f"Batch upload: {batch.summary}")
+                yield sse_event("done", batch.summary)
+            except Exception as e:
+                print(f"Error processing resume batch: {str(e)}")
+                yield sse_event("error", {"error": f"Error processing resumes: {str(e)}"})
+        
+        return Response(
+            stream_with_context(generate()),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+        
+    except Exception as e:
+        print(f"Error processing resume batch: {str(e)}")
+        return jsonify({"error": f"Error processing resumes: {str(e)}"}), 500
+
+@app.route("/api/resume-processing/<processing_id>", methods=["GET"])
+def get_resume_processing(processing_id):
+    """
+    Get the state of an asynchronous resume upload
+    Returns: JSON with status (queued, running, done, failed), current stage,
+             per-stage timings and, once done, the upload-resume result
+    """
+    try:
+        record = visible_processing(get_resume_queue().get(processing_id))
+        if record is None:
+            return jsonify({"error": "Unknown or expired processing id"}), 404
+        
+        return jsonify({"success": True, "processing": record}), 200
+        
+    except Exception as e:
+        print(f"Error getting resume processing status: {str(e)}")
+        return jsonify({"error": f"Error getting resume processing status: {str(e)}"}), 500
+
+@app.route("/api/resume-processing/<processing_id>/events", methods=["GET"])
+def follow_resume_processing(processing_id):
+    """
+    Follow an asynchronous resume upload
+    Returns: text/event-stream with a 'status' event on every change, then one
+             'done' event with the record, or an 'error' event
+    """
+    try:
+        processing_queue = get_resume_queue()
+        if visible_processing(processing_queue.get(processing_id)) is None:
+            return jsonify({"error": "Unknown or expired processing id"}), 404
+        
+        def generate():
+            try:
+                record = None
+                for record in processing_queue.follow(processing_id):
+                    yield sse_event("status", {
+                        "status": record['status'],
+                        "stage": record['stage'],
+                        "timings_ms": record['timings_ms']
+                    })
+                if record and record['status'] == "done":
+                    yield sse_event("done", record)
+                elif record and record['status'] == "failed":
+                    yield sse_event("error", {"error": record['error']})
+                else:
+                    yield sse_event("error", {"error": "Timed out waiting for the resume"})
+            except Exception as e:
+                print(f"Error following resume processing: {str(e)}")
+                yield sse_event("error", {"error": f"Error processing resume: {str(e)}"})
+        
+        return Response(
+            stream_with_context(generate()),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+        
+    except Exception as e:
+        print(f"Error following resume processing: {str(e)}")
+        return jsonify({"error": f"Error following resume processing: {str(e)}"}), 500
+
 @app.route("/api/analyze-text", methods=["POST"])
 def analyze_text():
     """
     Analyze resume text directly without file upload
-    Accepts: JSON with 'text' field
+    Accepts: JSON with 'text' field and optional 'resume_id' (the caller's
+             own resume; needs an Authorization bearer token)
     Returns: JSON with analysis results
     """
     try:
@@ -110,8 +358,12 @@ def analyze_text():
         if not resume_text.strip():
             return jsonify({"error": "Empty text provided"}), 400
         
+        user_id, error = resume_owner(data.get('resume_id'))
+        if error:
+            return error
+        
         # Analyze the text using the AI model
-        analysis_result = analyze_resume(resume_text)
+        analysis_result = analyze_resume(resume_text, resume_id=data.get('resume_id'), user_id=user_id)
         
         return jsonify({
             "success": True,
@@ -122,6 +374,52 @@ def analyze_text():
         print(f"Error analyzing text: {str(e)}")
         return jsonify({"error": f"Error analyzing text: {str(e)}"}), 500
 
+@app.route("/api/analyze-text/stream", methods=["POST"])
+def analyze_text_stream():
+    """
+    Analyze resume text and stream the report as it is generated
+    Accepts: JSON with 'text' field and optional 'resume_id' (the caller's
+             own resume; needs an Authorization bearer token)
+    Returns: text/event-stream with 'chunk' events ({"text": ...}), then one
+             'done' event with latency and token metrics, or an 'error' event
+    """
+    try:
+        data = request.get_json()
+        
+        if not data or 'text' not in data:
+            return jsonify({"error": "No text provided"}), 400
+        
+        resume_text = data['text']
+        
+        if not resume_text.strip():
+            return jsonify({"error": "Empty text provided"}), 400
+        
+        user_id, error = resume_owner(data.get('resume_id'))
+        if error:
+            return error
+        
+        stream = stream_analysis(resume_text, resume_id=data.get('resume_id'), user_id=user_id)
+        
+        def generate():
+            try:
+                for chunk in stream:
+                    yield sse_event("chunk", {"text": chunk})
+                yield sse_event("done", stream.metrics)
+            except Exception as e:
+                print(f"Error streaming analysis: {str(e)}")
+                yield sse_event("error", {"error": f"Error analyzing resume: {str(e)}"})
+        
+        return Response(
+            stream_with_context(generate()),
+            mimetype="text/event-stream",
+            # Stop proxies from buffering the stream
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+        
+    except Exception as e:
+        print(f"Error analyzing text: {str(e)}")
+        return jsonify({"error": f"Error analyzing text: {str(e)}"}), 500
+
 @app.route("/api/scrape-jobs", methods=["POST"])
 def scrape_jobs():
     """
@@ -143,14 +441,22 @@ def scrape_jobs():
         if not isinstance(max_jobs, int) or max_jobs < 1 or max_jobs > 100:
             return jsonify({"error": "max_jobs must be between 1 and 100"}), 400
         
-        # Initialize scraper
-        scraper = NaukriScraper(headless=True)
+        # Selenium is imported on first use, not when a worker starts
+        from scraper.naukri_scraper import NaukriScraper
         
-        # Scrape jobs
-        if location:
-            jobs = scraper.scrape_jobs_by_location(keyword, location, max_jobs)
-        else:
-            jobs = scraper.scrape_jobs(keyword, max_jobs)
+        if not scrape_slots.acquire(blocking=False):
+            return scrapers_busy()
+        try:
+            # Initialize scraper
+            scraper = NaukriScraper(headless=True)
+            
+            # Scrape jobs
+            if location:
+                jobs = scraper.scrape_jobs_by_location(keyword, location, max_jobs)
+            else:
+                jobs = scraper.scrape_jobs(keyword, max_jobs)
+        finally:
+            scrape_slots.release()
         
         return jsonify({
             "success": True,
@@ -164,12 +470,40 @@ def scrape_jobs():
         print(f"Error scraping jobs: {str(e)}")
         return jsonify({"error": f"Error scraping jobs: {str(e)}"}), 500
 
+def scrape_all_sources_to_db(keyword, location, max_jobs_per_source, sources, save_to_db):
+    """Scrape every source for a keyword and optionally store the jobs"""
+    from scraper.job_scraper_manager import JobScraperManager
+    
+    # Initialize scraper manager
+    scraper_manager = JobScraperManager(headless=True)
+    
+    # Scrape jobs from all sources
+    result = scraper_manager.scrape_all_sources(
+        keyword=keyword,
+        location=location,
+        max_jobs_per_source=max_jobs_per_source,
+        sources=sources
+    )
+    
+    # Save to database if requested
+    if save_to_db and result['jobs']:
+        try:
+            db = JobDatabase()
+            db_result = db.insert_jobs(result['jobs'])
+            result['database'] = db_result
+        except Exception as db_error:
+            print(f"Database error: {str(db_error)}")
+            result['database'] = {"success": False, "message": "Database not configured"}
+    
+    return result
+
 @app.route("/api/scrape-all-sources", methods=["POST"])
 def scrape_all_sources():
     """
     Scrape jobs from all sources (Naukri, LinkedIn, Unstop) and store in database
     Accepts: JSON with 'keyword', optional 'location', 'max_jobs_per_source', 'sources', 'save_to_db'
-    Returns: JSON with scraped job listings
+             and 'async' (scrape in the background and save to the database)
+    Returns: JSON with scraped job listings, or 202 when run in the background
     """
     try:
         data = request.get_json()
@@ -182,31 +516,35 @@ def scrape_all_sources():
         max_jobs_per_source = data.get('max_jobs_per_source', 10)
         sources = data.get('sources', ['naukri', 'linkedin', 'unstop'])
         save_to_db = data.get('save_to_db', True)
+        run_async = data.get('async', False)
         
         # Validate max_jobs_per_source
         if not isinstance(max_jobs_per_source, int) or max_jobs_per_source < 1 or max_jobs_per_source > 50:
             return jsonify({"error": "max_jobs_per_source must be between 1 and 50"}), 400
         
-        # Initialize scraper manager
-        scraper_manager = JobScraperManager(headless=True)
-        
-        # Scrape jobs from all sources
-        result = scraper_manager.scrape_all_sources(
-            keyword=keyword,
-            location=location,
-            max_jobs_per_source=max_jobs_per_source,
-            sources=sources
-        )
-        
-        # Save to database if requested
-        if save_to_db and result['jobs']:
+        if run_async:
+            # Jobs only reach the caller through the database
             try:
-                db = JobDatabase()
-                db_result = db.insert_jobs(result['jobs'])
-                result['database'] = db_result
-            except Exception as db_error:
-                print(f"Database error: {str(db_error)}")
-                result['database'] = {"success": False, "message": "Database not configured"}
+                get_background_tasks().submit(
+                    "scrape_all_sources", run_with_scrape_slot, scrape_all_sources_to_db,
+                    keyword, location, max_jobs_per_source, sources, True
+                )
+            except queue.Full:
+                response = jsonify({"error": "Too many background scrapes queued, retry shortly"})
+                response.headers["Retry-After"] = "60"
+                return response, 503
+            return jsonify({
+                "success": True,
+                "message": "Scraping started; jobs will be saved to the database",
+                "keyword": keyword
+            }), 202  # 202 Accepted
+        
+        if not scrape_slots.acquire(blocking=False):
+            return scrapers_busy()
+        try:
+            result = scrape_all_sources_to_db(keyword, location, max_jobs_per_source, sources, save_to_db)
+        finally:
+            scrape_slots.release()
         
         return jsonify(result), 200
         
@@ -218,7 +556,9 @@ def scrape_all_sources():
 def search_jobs():
     """
     Search jobs in the database
-    Query params: keyword, location, domain, source, limit
+    Query params: keyword, location, domain, source, skills (comma-separated), job_type,
+                  work_mode (remote, hybrid, onsite), min_experience, max_experience (years), min_salary, max_salary (annual amount),
+                  salary_currency (INR, USD, EUR, GBP; default INR with a salary bound), limit
     Returns: JSON with job listings from database
     """
     try:
@@ -226,14 +566,33 @@ def search_jobs():
         location = request.args.get('location')
         domain = request.args.get('domain')
         source = request.args.get('source')
+        skills = [skill for skill in request.args.get('skills', '').split(',') if skill.strip()]
+        job_type = request.args.get('job_type')
+        work_mode = request.args.get('work_mode')
+        min_experience = request.args.get('min_experience', type=int)
+        max_experience = request.args.get('max_experience', type=int)
+        min_salary = request.args.get('min_salary', type=int)
+        max_salary = request.args.get('max_salary', type=int)
+        salary_currency = request.args.get('salary_currency', '').upper() or None
         limit = int(request.args.get('limit', 50))
         
+        if salary_currency and salary_currency not in SALARY_CURRENCIES:
+            return jsonify({"error": f"salary_currency must be one of {', '.join(SALARY_CURRENCIES)}"}), 400
+        
         db = JobDatabase()
         jobs = db.search_jobs(
             keyword=keyword,
             location=location,
             domain=domain,
             source=source,
+            skills=skills or None,
+            job_type=job_type,
+            work_mode=work_mode,
+            min_experience=min_experience,
+            max_experience=max_experience,
+            min_salary=min_salary,
+            max_salary=max_salary,
+            salary_currency=salary_currency,
             limit=limit
         )
         
@@ -311,13 +670,112 @@ def get_job_stats():
         print(f"Error getting job stats: {str(e)}")
         return jsonify({"error": f"Error getting job stats: {str(e)}"}), 500
 
+@app.route("/api/cache/stats", methods=["GET"])
+def get_cache_stats():
+    """
+    Get job query cache statistics
+    Returns: JSON with hit/miss counters for the job read cache
+    """
+    try:
+        return jsonify({
+            "success": True,
+            "cache": get_job_cache().stats()
+        }), 200
+        
+    except Exception as e:
+        print(f"Error getting cache stats: {str(e)}")
+        return jsonify({"error": f"Error getting cache stats: {str(e)}"}), 500
+
+@app.route("/api/llm-cache/stats", methods=["GET"])
+def get_llm_cache_stats():
+    """
+    Get AI result cache statistics
+    Returns: JSON with hit/miss counters and the model time saved by hits
+    """
+    try:
+        return jsonify({
+            "success": True,
+            "llm_cache": get_llm_cache().stats()
+        }), 200
+        
+    except Exception as e:
+        print(f"Error getting LLM cache stats: {str(e)}")
+        return jsonify({"error": f"Error getting LLM cache stats: {str(e)}"}), 500
+
+@app.route("/api/llm/stats", methods=["GET"])
+def get_llm_stats():
+    """
+    Get model client statistics
+    Returns: JSON with streaming time to first chunk, latency and token counts
+    """
+    try:
+        return jsonify({
+            "success": True,
+            "llm": get_llm_client().stats()
+        }), 200
+        
+    except Exception as e:
+        print(f"Error getting LLM stats: {str(e)}")
+        return jsonify({"error": f"Error getting LLM stats: {str(e)}"}), 500
+
+@app.route("/api/resume-processing/stats", methods=["GET"])
+def get_resume_processing_stats():
+    """
+    Get asynchronous resume processing statistics
+    Returns: JSON with queue depth, job counters and per-stage latency
+    """
+    try:
+        return jsonify({
+            "success": True,
+            "resume_processing": get_resume_queue().stats()
+        }), 200
+        
+    except Exception as e:
+        print(f"Error getting resume processing stats: {str(e)}")
+        return jsonify({"error": f"Error getting resume processing stats: {str(e)}"}), 500
+
+@app.route("/api/background-tasks/stats", methods=["GET"])
+def get_background_task_stats():
+    """
+    Get background task statistics
+    Returns: JSON with running and waiting tasks and average run time per task
+    """
+    try:
+        return jsonify({
+            "success": True,
+            "background_tasks": get_background_tasks().stats(),
+            "scrape_slots": SCRAPE_MAX_CONCURRENCY
+        }), 200
+        
+    except Exception as e:
+        print(f"Error getting background task stats: {str(e)}")
+        return jsonify({"error": f"Error getting background task stats: {str(e)}"}), 500
+
+@app.route("/api/write-buffer/stats", methods=["GET"])
+def get_write_buffer_stats():
+    """
+    Get background job write buffer statistics
+    Returns: JSON with pending jobs, batch sizes and flush latency
+    """
+    try:
+        return jsonify({
+            "success": True,
+            "write_buffer": get_job_writer().stats()
+        }), 200
+        
+    except Exception as e:
+        print(f"Error getting write buffer stats: {str(e)}")
+        return jsonify({"error": f"Error getting write buffer stats: {str(e)}"}), 500
+
 @app.route("/api/scrape-and-recommend", methods=["POST"])
 def scrape_and_recommend():
     """
     Get job recommendations from DATABASE based on resume analysis
     NO LONGER SCRAPES - uses pre-populated database
-    Accepts: JSON with 'resume_skills', 'domain', optional 'location'
-    Returns: JSON with matched jobs from database
+    Accepts: JSON with 'resume_skills', 'domain', optional 'location', 'resume_text'
+             and 'mode' ('keyword' (default) or 'semantic'); without 'resume_skills',
+             skills are extracted from 'resume_text'
+    Returns: JSON with matched jobs from database, most relevant first
     """
     try:
         data = request.get_json()
@@ -328,47 +786,175 @@ def scrape_and_recommend():
         resume_skills = data.get('resume_skills', [])
         domain = data.get('domain', None)
         location = data.get('location', None)
+        resume_text = data.get('resume_text', None)
+        mode = data.get('mode', 'keyword')
+        
+        if mode not in ('keyword', 'semantic'):
+            return jsonify({"error": "mode must be 'keyword' or 'semantic'"}), 400
+        
+        if not resume_skills and resume_text:
+            # Same extractor that tags jobs at ingest, so both sides share skill names
+            resume_skills = get_skill_extractor().extract(resume_text)
         
         # Get jobs from database (no scraping)
         db = JobDatabase()
         
-        # Search with domain as keyword if available
-        keyword = domain if domain and domain != "Not Found" else None
-        
-        jobs = db.search_jobs(
-            keyword=keyword,
-            location=location,
-            limit=100  # Get more jobs for better matching
-        )
+        # Map the resume's domain (e.g. "Software Development") to an indexed domain id
+        domain_id = classify_domain(domain) if domain and domain != "Not Found" else None
         
-        # Calculate match scores based on skills
-        if resume_skills:
-            for job in jobs:
-                # Calculate match score based on skills in job description
-                job_text = f"{job.get('title', '')} {job.get('description', '')}".lower()
-                matching_skills = [skill for skill in resume_skills if skill.lower() in job_text]
-                match_score = (len(matching_skills) / len(resume_skills)) * 100 if resume_skills else 0
-                job['match_score'] = round(match_score, 2)
-                job['matching_skills'] = matching_skills
-            
-            # Sort by match score and filter jobs with at least some match
-            jobs = [job for job in jobs if job.get('match_score', 0) > 0]
-            jobs.sort(key=lambda x: x.get('match_score', 0), reverse=True)
-            
-            # Limit to top 50 matches
-            jobs = jobs[:50]
+        if resume_skills or (mode == 'semantic' and resume_text):
+            # Top 50 matches across all active jobs: BM25 over skills, or
+            # nearest neighbours in the semantic index
+            jobs = db.recommend_jobs(
+                resume_skills,
+                domain=domain_id,
+                location=location,
+                resume_text=resume_text,
+                limit=50,
+                mode=mode
+            )
+        else:
+            jobs = db.search_jobs(domain=domain_id, location=location, limit=100) if domain_id else []
+            if not jobs:
+                # Jobs stored before enrichment have no domain: fall back to text search
+                keyword = domain if domain and domain != "Not Found" else None
+                jobs = db.search_jobs(
+                    keyword=keyword,
+                    location=location,
+                    limit=100
+                )
         
         return jsonify({
             "success": True,
             "total_jobs": len(jobs),
             "jobs": jobs,
-            "source": "database"
+            "source": "database",
+            "mode": mode
         }), 200
         
     except Exception as e:
         print(f"Error in scrape and recommend: {str(e)}")
         return jsonify({"error": f"Error: {str(e)}"}), 500
 
+@app.route("/api/recommend/batch", methods=["POST"])
+def recommend_batch():
+    """
+    Get job recommendations for many resumes in one request (e.g. a placement cell's batch)
+    Accepts: JSON with 'profiles' (list of {'id', 'resume_skills' or 'resume_text',
+             optional 'domain' and 'location'}) and optional 'limit' (jobs per profile, default 10)
+    Returns: NDJSON stream with one line per profile in input order, then a
+             'summary' line with throughput in candidates per second
+    """
+    try:
+        data = request.get_json()
+        
+        if not data or not isinstance(data.get('profiles'), list) or not data['profiles']:
+            return jsonify({"error": "No profiles provided"}), 400
+        
+        if len(data['profiles']) > MAX_BATCH_PROFILES:
+            return jsonify({"error": f"At most {MAX_BATCH_PROFILES} profiles per request"}), 400
+        
+        try:
+            limit = max(1, min(int(data.get('limit', 10)), MAX_BATCH_LIMIT))
+        except (TypeError, ValueError):
+            return jsonify({"error": "'limit' must be an integer"}), 400
+        
+        extractor = get_skill_extractor()
+        profiles = []
+        for index, profile in enumerate(data['profiles']):
+            if not isinstance(profile, dict):
+                return jsonify({"error": f"Profile {index} must be an object"}), 400
+            domain = profile.get('domain')
+            resume_text = profile.get('resume_text')
+            profiles.append({
+                'id': profile.get('id', index),
+                'skills': profile.get('resume_skills') or (extractor.extract(resume_text) if resume_text else []),
+                'resume_text': resume_text,
+                'domain': classify_domain(domain) if domain and domain != "Not Found" else None,
+                'location': profile.get('location')
+            })
+        
+        db = JobDatabase()
+        
+    except Exception as e:
+        print(f"Error in batch recommend: {str(e)}")
+        return jsonify({"error": f"Error: {str(e)}"}), 500
+    
+    def generate():
+        started = time.perf_counter()
+        completed = 0
+        try:
+            for result in db.recommend_batch(profiles, limit=limit):
+                completed += 1
+                yield json.dumps(result, default=str) + "\n"
+        except Exception as e:
+            print(f"Error in batch recommend: {str(e)}")
+            yield json.dumps({"error": f"Error: {str(e)}"}) + "\n"
+        
+        seconds = time.perf_counter() - started
+        summary = {
+            "candidates": completed,
+            "seconds": round(seconds, 3),
+            "candidates_per_second": round(completed / seconds, 1) if seconds else None
+        }
+        print(f"📦 Batch recommend: {completed} candidates in {seconds:.2f}s")
+        yield json.dumps({"summary": summary}) + "\n"
+    
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+@app.route("/api/recommendations/<user_id>", methods=["GET"])
+@require_auth
+def get_user_recommendations(user_id):
+    """
+    Get the caller's stored job recommendations, kept up to date as jobs are ingested
+    Requires: Authorization bearer token of the user in the path
+    Query params: limit (default 50)
+    Returns: JSON with matched jobs, best match first
+    """
+    if user_id != authenticated_user_id():
+        return jsonify({"error": "Not allowed to read another user's recommendations"}), 403
+    
+    try:
+        limit = int(request.args.get('limit', 50))
+        
+        db = JobDatabase()
+        jobs = db.get_user_recommendations(user_id, limit=limit)
+        
+        return jsonify({
+            "success": True,
+            "total_jobs": len(jobs),
+            "jobs": jobs,
+            "source": "materialized"
+        }), 200
+        
+    except Exception as e:
+        print(f"Error getting recommendations: {str(e)}")
+        return jsonify({"error": f"Error getting recommendations: {str(e)}"}), 500
+
+@app.route("/api/recommendations/refresh", methods=["POST"])
+@require_auth
+def refresh_recommendations():
+    """
+    Recompute the caller's stored job recommendations, e.g. after they uploaded
+    a new resume (every user is refreshed with `python -m utils.job_recommendations refresh`)
+    Requires: Authorization bearer token
+    Returns: JSON with the number of users and rows written
+    """
+    user_id = authenticated_user_id()
+    data = request.get_json(silent=True) or {}
+    if data.get('user_id') not in (None, user_id):
+        return jsonify({"error": "Not allowed to refresh another user's recommendations"}), 403
+    
+    try:
+        db = JobDatabase()
+        result = db.refresh_recommendations([user_id])
+        
+        return jsonify(result), 200 if result.get('success') else 500
+        
+    except Exception as e:
+        print(f"Error refreshing recommendations: {str(e)}")
+        return jsonify({"error": f"Error refreshing recommendations: {str(e)}"}), 500
+
 @app.route("/api/scrape-background", methods=["POST"])
 def scrape_background():
     """
@@ -383,11 +969,20 @@ def scrape_background():
         max_jobs_per_source = data.get('max_jobs_per_source', 5)
         run_async = data.get('async', False)  # Run in background thread
         
+        from utils.background_scraper import BackgroundJobScraper
         scraper = BackgroundJobScraper(headless=True)
         
         if run_async:
-            # Start scraping in background
-            scraper.scrape_async(keywords=keywords, max_jobs_per_source=max_jobs_per_source)
+            # Start scraping in background; drained before the process exits
+            try:
+                get_background_tasks().submit(
+                    "scrape_background", run_with_scrape_slot, scraper.scrape_keywords,
+                    keywords, max_jobs_per_source
+                )
+            except queue.Full:
+                response = jsonify({"error": "Too many background scrapes queued, retry shortly"})
+                response.headers["Retry-After"] = "60"
+                return response, 503
             return jsonify({
                 "success": True,
                 "message": "Background scraping started",
@@ -397,17 +992,22 @@ def scrape_background():
             # Run synchronously (will block)
             if keywords:
                 results = []
+                # Counts only this request's jobs; the writer is shared with other scrapes
+                receipt = scraper.writer.new_receipt()
                 for keyword in keywords:
-                    result = scraper.scrape_keyword(keyword, max_jobs_per_source)
+                    result = scraper.scrape_keyword(keyword, max_jobs_per_source, receipt)
                     results.append(result)
                 
+                # Wait for the write buffer so the saved count is final
+                write_stats = scraper.flush()
                 total_jobs = sum(r.get('total_jobs', 0) for r in results if r.get('success'))
-                total_saved = sum(r.get('database', {}).get('inserted_count', 0) for r in results)
                 
                 return jsonify({
                     "success": True,
                     "total_jobs_scraped": total_jobs,
-                    "total_jobs_saved": total_saved,
+                    "total_jobs_saved": receipt['jobs_saved'],
+                    "total_jobs_dead_lettered": receipt['jobs_dead_lettered'],
+                    "write_buffer": write_stats,
                     "results": results
                 }), 200
             else:
@@ -421,6 +1021,8 @@ def scrape_background():
 
 @app.errorhandler(413)
 def request_entity_too_large(error):
+    if request.endpoint == "upload_resumes":
+        return jsonify({"error": f"Upload too large. Maximum size is {MAX_BATCH_BYTES // (1024 * 1024)}MB"}), 413
     return jsonify({"error": "File too large. Maximum size is 10MB"}), 413
 
 @app.errorhandler(404)
@@ -432,4 +1034,10 @@ def internal_error(error):
     return jsonify({"error": "Internal server error"}), 500
 
 if __name__ == "__main__":
-    app.run(debug=True, host="0.0.0.0", port=5000)
+    # Development server; production runs gunicorn with wsgi.py (see README)
+    app.run(
+        debug=os.getenv("FLASK_DEBUG", "true").lower() in ("1", "true", "yes"),
+        host="0.0.0.0",
+        port=int(os.getenv("PORT", "5000")),
+        threaded=True
+    )
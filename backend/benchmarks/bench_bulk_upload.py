@@ -0,0 +1,87 @@
+"""
+Benchmark for batch resume uploads (utils/resume_processing.ResumeBatch)
+Renders synthetic resumes to PDF, then reports resumes per minute when they
+are processed one at a time (as separate /api/upload-resume calls would) and
+as one batch (process-pool extraction, candidate info on the model client's
+slots). Candidate info uses the local parser unless --mode says otherwise.
+
+Usage (from backend/):
+    python benchmarks/bench_bulk_upload.py
+    python benchmarks/bench_bulk_upload.py --count 300 --pages 3
+    python benchmarks/bench_bulk_upload.py --resumes uploads/
+    LLM_BACKEND=fake python benchmarks/bench_bulk_upload.py --mode llm
+"""
+
+from pathlib import Path
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+
+def make_pdf(text: str, pages: int) -> bytes:
+    import fitz  # PyMuPDF
+    doc = fitz.open()
+    lines = text.replace("\f", "\n").splitlines()
+    per_page = -(-len(lines) // pages)
+    for start in range(0, len(lines), per_page):
+        page = doc.new_page()
+        page.insert_text((50, 50), "\n".join(lines[start:start + per_page]), fontsize=8)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def load_files(folder: str):
+    return [
+        (path.name, path.read_bytes())
+        for path in sorted(Path(folder).iterdir())
+        if path.suffix.lower() in (".pdf", ".docx", ".doc")
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batch resume uploads")
+    parser.add_argument("--resumes", help="Folder of .pdf/.docx resumes (default: synthetic PDFs)")
+    parser.add_argument("--count", type=int, default=100, help="Synthetic resumes")
+    parser.add_argument("--pages", type=int, default=2, help="Pages per synthetic PDF")
+    parser.add_argument("--mode", default="local", help="CANDIDATE_EXTRACTION_MODE (local, hybrid or llm)")
+    args = parser.parse_args()
+
+    # Read when the extractor is first imported
+    os.environ["CANDIDATE_EXTRACTION_MODE"] = args.mode
+    from bench_resume_compaction import make_resume
+    from utils.extract_text import extract_text_from_bytes
+    from utils.resume_processing import ResumeBatch
+    from ai.extract_candidate_info import extract_candidate_info
+
+    if args.resumes:
+        files = load_files(args.resumes)
+        print(f"{len(files)} resumes from {args.resumes}")
+    else:
+        rng = random.Random(7)
+        files = [(f"resume_{number}.pdf", make_pdf(make_resume(rng), args.pages)) for number in range(args.count)]
+        print(f"{len(files)} synthetic {args.pages}-page PDFs")
+    if not files:
+        return
+
+    started = time.perf_counter()
+    for filename, data in files:
+        extract_candidate_info(extract_text_from_bytes(data, filename))
+    serial = time.perf_counter() - started
+    print(f"one at a time: {len(files) / serial * 60:,.0f} resumes/min ({serial:.2f} s)")
+
+    batch = ResumeBatch([(filename, lambda data=data: data) for filename, data in files])
+    failed = [result for result in batch if not result["success"]]
+    summary = batch.summary
+    print(f"batch:         {summary['resumes_per_minute']:,.0f} resumes/min ({summary['elapsed_ms'] / 1000:.2f} s, "
+          f"{summary['extract_workers']} extract processes, {summary['llm_concurrency']} model slots)")
+    print(f"speedup {serial / (summary['elapsed_ms'] / 1000):.1f}x, {len(failed)} failed")
+
+
+if __name__ == "__main__":
+    main()
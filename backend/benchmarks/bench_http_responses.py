@@ -0,0 +1,114 @@
+"""
+Benchmark for response compression and conditional GET (utils/http_responses.py)
+Fills a temporary SQLite job store with synthetic scraped jobs, then calls the
+read endpoints and /api/upload-resume through the Flask test client. Reports
+bytes sent uncompressed, gzip and (if installed) brotli, with the request
+time, and the bytes of a repeat request that revalidates with If-None-Match.
+
+Usage (from backend/):
+    python benchmarks/bench_http_responses.py
+    python benchmarks/bench_http_responses.py --jobs 5000 --limit 100
+"""
+
+from pathlib import Path
+import argparse
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_ranking import CITIES, MODES, SKILLS, TITLES
+
+
+def make_jobs(count: int, rng: random.Random):
+    jobs = []
+    for number in range(count):
+        skills = rng.sample(SKILLS, rng.randint(3, 8))
+        title = f"{rng.choice(skills)} {rng.choice(TITLES)}"
+        jobs.append({
+            'title': title,
+            'company': f"Company {number % 300}",
+            'description': (
+                f"We are hiring a {title} to join our team in {rng.choice(CITIES)}. "
+                f"You will work with {', '.join(skills)} on customer-facing products, "
+                "review code, mentor juniors and own features from design to production. "
+                f"{rng.randint(1, 8)}+ years of experience required."
+            ),
+            'location': rng.choice(CITIES),
+            'experience': f"{rng.randint(0, 5)}-{rng.randint(6, 12)} Yrs",
+            'salary': f"{rng.randint(4, 20)}-{rng.randint(21, 40)} Lacs PA",
+            'url': f"https://jobs.example.com/{number}",
+            'source': rng.choice(['Naukri', 'LinkedIn', 'Indeed']),
+            'keyword': rng.choice(skills),
+            'work_mode': rng.choice(MODES)
+        })
+    return jobs
+
+
+def measure(client, name: str, path: str, make_upload=None):
+    """make_upload returns the multipart form of a POST; requests are GETs without it"""
+    sizes = {}
+    for encoding in ("identity", "gzip", "br"):
+        kwargs = {"data": make_upload(), "content_type": "multipart/form-data"} if make_upload else {}
+        started = time.perf_counter()
+        response = (client.post if make_upload else client.get)(
+            path, headers={"Accept-Encoding": encoding}, **kwargs
+        )
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if encoding != "identity" and response.headers.get("Content-Encoding") != encoding:
+            continue  # brotli not installed
+        sizes[encoding] = (len(response.data), elapsed_ms, response.headers.get("ETag"))
+
+    raw = sizes["identity"][0]
+    parts = [f"{name:<22} {raw:>9,} B"]
+    for encoding in ("gzip", "br"):
+        if encoding in sizes:
+            size, elapsed_ms, _ = sizes[encoding]
+            parts.append(f"{encoding} {size:>8,} B ({1 - size / raw:.0%} saved, request {elapsed_ms:.1f} ms)")
+
+    etag = sizes.get("gzip", sizes["identity"])[2]
+    if not make_upload and etag:
+        response = client.get(path, headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+        parts.append(f"revalidate {response.status_code} {len(response.data)} B")
+    print("  ".join(parts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark response compression and ETags")
+    parser.add_argument("--jobs", type=int, default=2000, help="Synthetic jobs stored")
+    parser.add_argument("--limit", type=int, default=50, help="Jobs per list request")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_http_")
+    os.environ.update({
+        "JOB_STORAGE_BACKEND": "sqlite",
+        "JOB_SQLITE_PATH": os.path.join(workdir, "jobs.sqlite3"),
+        "JOB_CACHE_PATH": os.path.join(workdir, "job_cache.sqlite3"),
+        "CANDIDATE_EXTRACTION_MODE": "local"
+    })
+    import app as backend
+    from utils.job_database import JobDatabase
+    from bench_bulk_upload import make_pdf
+    from bench_resume_compaction import make_resume
+
+    rng = random.Random(7)
+    JobDatabase().insert_jobs(make_jobs(args.jobs, rng))
+    client = backend.app.test_client()
+    print(f"{args.jobs} jobs stored, {args.limit} per list request\n")
+
+    measure(client, "jobs/search", f"/api/jobs/search?keyword=python&limit={args.limit}")
+    measure(client, "jobs/recent", f"/api/jobs/recent?limit={args.limit}")
+    measure(client, "jobs/domain", f"/api/jobs/domain/tech?limit={args.limit}")
+    measure(client, "jobs/stats", "/api/jobs/stats")
+
+    pdf = make_pdf(make_resume(rng), 2)
+    measure(client, "upload-resume", "/api/upload-resume", lambda: {"file": (io.BytesIO(pdf), "resume.pdf")})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Import-time profile of a worker's cold start
+Imports a module (default: app) in fresh interpreters with
+`python -X importtime` and reports the wall time of the import and the
+cumulative cost of the heaviest modules it pulls in. Heavy libraries
+(Selenium, PyMuPDF, numpy/scipy, google-generativeai, supabase) should not
+appear: they are imported on first use.
+
+Usage (from backend/):
+    python benchmarks/bench_import_time.py
+    python benchmarks/bench_import_time.py --module utils.job_database --top 30
+    python benchmarks/bench_import_time.py --budget-ms 300   # exit 1 when over budget
+"""
+
+from pathlib import Path
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+# Libraries that must stay out of the startup import graph
+HEAVY_MODULES = [
+    "selenium", "webdriver_manager", "bs4", "fitz", "docx", "numpy", "scipy",
+    "google.generativeai", "supabase"
+]
+
+
+def profile_once(module: str):
+    """Import the module in a fresh interpreter; return (wall ms, [(module, self us, cumulative us, depth)])"""
+    env = dict(os.environ)
+    # The API key is checked on first model call, not at import
+    env.setdefault("GOOGLE_API_KEY", "profile")
+    code = (
+        "import time; started = time.perf_counter(); "
+        f"import {module}; "
+        "print((time.perf_counter() - started) * 1000)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        # Names are indented two spaces per nesting level after one separator space
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return float(result.stdout.strip().splitlines()[-1]), entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile module import time")
+    parser.add_argument("--module", default="app")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters; the median is reported")
+    parser.add_argument("--top", type=int, default=15, help="Heaviest imports listed")
+    parser.add_argument("--budget-ms", type=float, help="Fail when the median import takes longer")
+    args = parser.parse_args()
+
+    runs = [profile_once(args.module) for _ in range(args.runs)]
+    wall = statistics.median(ms for ms, _ in runs)
+    entries = runs[-1][1]
+    print(f"import {args.module}: median {wall:.0f} ms over {args.runs} fresh interpreters")
+
+    # Modules imported directly by the profiled module (depth of its children)
+    root_depth = min((depth for name, _, _, depth in entries if name == args.module), default=0)
+    children = [entry for entry in entries if entry[3] == root_depth + 1]
+    print(f"\nHeaviest direct imports of {args.module}:")
+    for name, _, cumulative_us, _ in sorted(children, key=lambda entry: -entry[2])[:args.top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+    loaded = {name for name, _, _, _ in entries}
+    heavy = [name for name in HEAVY_MODULES if name in loaded]
+    print(f"\nHeavy libraries imported at startup: {', '.join(heavy) if heavy else 'none'}")
+
+    if args.budget_ms is not None and wall > args.budget_ms:
+        print(f"Over budget: {wall:.0f} ms > {args.budget_ms:.0f} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,165 @@
+"""
+Benchmark for the BM25 job ranker (utils/job_ranking.py)
+Builds the ranker over synthetic job corpora and measures build time, matrix
+size and query latency, next to the substring scan used before it, and
+batch throughput (rank_many) in candidates per second.
+
+Usage (from backend/):
+    python benchmarks/bench_ranking.py
+    python benchmarks/bench_ranking.py --jobs 10000 100000 1000000 --queries 200
+    python benchmarks/bench_ranking.py --jobs 100000 --batch 1000
+"""
+
+from pathlib import Path
+import argparse
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils.job_storage import JobStorageBackend
+from utils.job_ranking import JobRanker
+from utils.skill_dictionary import SKILL_ALIASES
+
+
+SKILLS = list(SKILL_ALIASES)
+DOMAINS = ['tech', 'design', 'business', 'hr', 'security', 'healthcare']
+CITIES = ['Bengaluru', 'Pune', 'Hyderabad', 'Chennai', 'Mumbai', 'Delhi', 'Gurugram', 'Noida']
+MODES = ['onsite', 'hybrid', 'remote']
+TITLES = ['Developer', 'Engineer', 'Analyst', 'Designer', 'Manager', 'Consultant', 'Intern', 'Lead']
+
+
+class SyntheticJobStorage(JobStorageBackend):
+    """Generates active jobs on the fly instead of reading a database"""
+
+    name = "synthetic"
+
+    def __init__(self, count: int, description_words: int, seed: int = 7):
+        self.count = count
+        self.description_words = description_words
+        self.seed = seed
+        self.filler = [f"word{i}" for i in range(5000)]
+
+    def iter_active_jobs(self, columns, since=None, batch_size=1000):
+        rng = random.Random(self.seed)
+        for start in range(0, self.count, batch_size):
+            rows = []
+            for number in range(start, min(start + batch_size, self.count)):
+                skills = rng.sample(SKILLS, rng.randint(3, 8))
+                words = rng.choices(self.filler, k=self.description_words) + skills
+                rng.shuffle(words)
+                rows.append({
+                    'id': f"job-{number}",
+                    'title': f"{rng.choice(skills)} {rng.choice(TITLES)}",
+                    'description': " ".join(words),
+                    'domain': rng.choice(DOMAINS),
+                    'skills_required': skills,
+                    'cities': [rng.choice(CITIES)],
+                    'work_mode': rng.choice(MODES),
+                    'created_at': f"2026-01-01T00:00:{number:09d}"
+                })
+            yield rows
+
+
+class _StaticGeneration:
+    def generation(self) -> int:
+        return 0
+
+
+def substring_scan(jobs, resume_skills):
+    """Previous scrape-and-recommend scoring: substring test per job and skill"""
+    scored = []
+    for job in jobs:
+        job_text = f"{job['title']} {job['description']}".lower()
+        matching = [skill for skill in resume_skills if skill.lower() in job_text]
+        if matching:
+            scored.append((len(matching) / len(resume_skills), job['id']))
+    scored.sort(reverse=True)
+    return scored[:50]
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run(count: int, queries: int, description_words: int, baseline: bool, batch: int):
+    print("\n" + "=" * 60)
+    print(f"{count:,} jobs")
+    print("=" * 60)
+
+    storage = SyntheticJobStorage(count, description_words)
+    ranker = JobRanker(storage=storage, cache=_StaticGeneration())
+
+    started = time.perf_counter()
+    ranker.rebuild()
+    build_seconds = time.perf_counter() - started
+    stats = ranker.stats()
+    print(f"Build: {build_seconds:.2f}s, {stats['terms']:,} terms, "
+          f"{stats['matrix_nonzeros']:,} non-zeros, {stats['matrix_bytes'] / 1e6:.1f} MB matrix")
+
+    rng = random.Random(11)
+    resumes = [rng.sample(SKILLS, rng.randint(4, 12)) for _ in range(queries)]
+
+    timings = {"skills only": [], "skills + domain + city": []}
+    for resume in resumes:
+        started = time.perf_counter()
+        ranker.rank(resume, limit=50)
+        timings["skills only"].append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        ranker.rank(resume, domain=rng.choice(DOMAINS), location=rng.choice(CITIES), limit=50)
+        timings["skills + domain + city"].append(time.perf_counter() - started)
+
+    for name, values in timings.items():
+        print(f"Rank ({name}): p50 {statistics.median(values) * 1000:.1f} ms, "
+              f"p95 {percentile(values, 0.95) * 1000:.1f} ms")
+
+    if batch:
+        profiles = [
+            {
+                'skills': rng.sample(SKILLS, rng.randint(4, 12)),
+                'domain': rng.choice(DOMAINS + [None]),
+                'location': rng.choice(CITIES + [None])
+            }
+            for _ in range(batch)
+        ]
+        started = time.perf_counter()
+        for profile in profiles:
+            ranker.rank(profile['skills'], domain=profile['domain'], location=profile['location'], limit=10)
+        sequential = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for _ in ranker.rank_many(profiles, limit=10):
+            pass
+        batched = time.perf_counter() - started
+        print(f"Batch of {batch:,}: rank_many {batch / batched:,.0f} candidates/s, "
+              f"one rank() per candidate {batch / sequential:,.0f} candidates/s")
+
+    if baseline:
+        jobs = [job for rows in storage.iter_active_jobs([]) for job in rows]
+        values = []
+        for resume in resumes[:min(queries, 10)]:
+            started = time.perf_counter()
+            substring_scan(jobs, resume)
+            values.append(time.perf_counter() - started)
+        print(f"Substring scan (previous scoring): p50 {statistics.median(values) * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the BM25 job ranker")
+    parser.add_argument("--jobs", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--description-words", type=int, default=60)
+    parser.add_argument("--no-baseline", action="store_true", help="Skip the substring scan comparison")
+    parser.add_argument("--batch", type=int, default=500, help="Profiles in the batch throughput run (0 skips it)")
+    args = parser.parse_args()
+
+    for count in args.jobs:
+        run(count, args.queries, args.description_words, not args.no_baseline, args.batch)
+
+
+if __name__ == "__main__":
+    main()
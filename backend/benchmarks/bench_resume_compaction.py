@@ -0,0 +1,140 @@
+"""
+Benchmark for resume compaction (ai/resume_compaction.py)
+Reports prompt tokens before and after compaction and the compaction time,
+per prompt, on a corpus of synthetic multi-page resumes (running headers,
+page numbers, ragged whitespace, references and declarations) or on real
+resume files. With --live it also times Gemini on the raw and compacted
+text of a few resumes.
+
+Usage (from backend/):
+    python benchmarks/bench_resume_compaction.py
+    python benchmarks/bench_resume_compaction.py --resumes uploads/
+    python benchmarks/bench_resume_compaction.py --live 5
+"""
+
+from pathlib import Path
+import argparse
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from ai.resume_compaction import PAGE_BREAK, PROMPT_SECTIONS, compact_resume, estimate_tokens
+from utils.skill_dictionary import SKILL_ALIASES
+
+
+SKILLS = list(SKILL_ALIASES)
+FIRST_NAMES = ["Aarav", "Diya", "Kabir", "Meera", "Rohan", "Ananya", "Vikram", "Isha"]
+LAST_NAMES = ["Sharma", "Iyer", "Patel", "Reddy", "Nair", "Gupta", "Das", "Khan"]
+VERBS = ["Built", "Designed", "Led", "Migrated", "Optimized", "Automated", "Maintained", "Shipped"]
+OBJECTS = ["a payments service", "the data pipeline", "an internal dashboard", "CI/CD workflows",
+           "a recommendation engine", "REST APIs", "the mobile app", "monitoring and alerting"]
+BULLETS = ["•", "●", "▪", "-", "➢"]
+
+
+def make_resume(rng: random.Random) -> str:
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    skills = rng.sample(SKILLS, rng.randint(8, 20))
+
+    def bullet(text):
+        return f"  {rng.choice(BULLETS)}   {text}    "
+
+    lines = [
+        name.upper(), "Software Engineer",
+        f"{name.split()[0].lower()}@example.com  |  +91 98{rng.randint(10000000, 99999999)}  |  Bengaluru",
+        "", "PROFESSIONAL SUMMARY",
+        f"Engineer with {rng.randint(1, 12)} years of experience in {', '.join(skills[:4])}.",
+        "", "SKILLS", ", ".join(skills), "", "WORK EXPERIENCE"
+    ]
+    for job in range(rng.randint(2, 5)):
+        lines += ["", f"Company {job}    |    {2024 - 2 * job - 2} - {2024 - 2 * job}", "Software Engineer"]
+        lines += [
+            bullet(f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(skills)} and {rng.choice(skills)}.")
+            for _ in range(rng.randint(4, 9))
+        ]
+    lines += ["", "PROJECTS"]
+    for project in range(rng.randint(3, 8)):
+        lines += [f"Project {project}: {rng.choice(OBJECTS).title()}"]
+        lines += [bullet(f"{rng.choice(VERBS)} it with {rng.choice(skills)}.") for _ in range(rng.randint(2, 4))]
+    lines += ["", "EDUCATION", "B.Tech in Computer Science, 2016", "", "CERTIFICATIONS",
+              "AWS Certified Developer", "", "HOBBIES & INTERESTS", "Reading, travel, chess, cricket", "",
+              "REFERENCES"]
+    for reference in range(rng.randint(2, 4)):
+        lines += [f"Reference {reference}", "Engineering Manager, Company", "ref@example.com", "+91 9000000000", ""]
+    lines += ["DECLARATION",
+              "I hereby declare that the information furnished above is true to the best of my knowledge "
+              "and belief, and I bear the responsibility for the correctness of the above-mentioned particulars.",
+              "", f"Place: Bengaluru          Date:          ({name})"]
+
+    # Paginate with a running header and footer, as PDF text extraction returns them
+    per_page = rng.randint(35, 50)
+    pages = [lines[start:start + per_page] for start in range(0, len(lines), per_page)]
+    return PAGE_BREAK.join(
+        "\n".join([f"{name} - Resume", ""] + page + ["", f"Page {number} of {len(pages)}"])
+        for number, page in enumerate(pages, 1)
+    )
+
+
+def load_resumes(folder: str):
+    from utils.extract_text import extract_text_from_resume
+    texts = []
+    for path in sorted(Path(folder).iterdir()):
+        if path.suffix.lower() in (".pdf", ".docx", ".doc"):
+            texts.append(extract_text_from_resume(str(path)))
+        elif path.suffix.lower() == ".txt":
+            texts.append(path.read_text(encoding="utf-8", errors="ignore"))
+    return [text for text in texts if text and not text.startswith("Error extracting text")]
+
+
+def time_model(texts, live: int):
+    from ai.analyze_resume import MODEL_NAME
+    from ai.llm_client import get_llm_client
+    client = get_llm_client()
+    prompt = "Summarize this resume in five bullet points:\n\n{}"
+    timings = {"raw": [], "compacted": []}
+    for text in texts[:live]:
+        for name, body in (("raw", text), ("compacted", compact_resume(text, "analysis")[0])):
+            started = time.perf_counter()
+            client.generate(prompt.format(body), MODEL_NAME)
+            timings[name].append(time.perf_counter() - started)
+    for name, values in timings.items():
+        print(f"Gemini latency ({name} text): mean {statistics.mean(values) * 1000:.0f} ms over {len(values)} calls")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark resume compaction")
+    parser.add_argument("--resumes", help="Folder of .pdf/.docx/.txt resumes (default: synthetic corpus)")
+    parser.add_argument("--count", type=int, default=500, help="Synthetic resumes")
+    parser.add_argument("--live", type=int, default=0, help="Time Gemini on this many resumes (needs an API key)")
+    args = parser.parse_args()
+
+    if args.resumes:
+        texts = load_resumes(args.resumes)
+        print(f"{len(texts)} resumes from {args.resumes}")
+    else:
+        rng = random.Random(7)
+        texts = [make_resume(rng) for _ in range(args.count)]
+        print(f"{len(texts)} synthetic resumes")
+    if not texts:
+        return
+
+    for prompt in PROMPT_SECTIONS:
+        before, after, timings = [], [], []
+        for text in texts:
+            started = time.perf_counter()
+            compacted, report = compact_resume(text, prompt)
+            timings.append(time.perf_counter() - started)
+            before.append(estimate_tokens(text))
+            after.append(report["tokens"])
+        saved = 1 - sum(after) / sum(before)
+        print(f"{prompt}: {statistics.mean(before):.0f} -> {statistics.mean(after):.0f} tokens per resume "
+              f"({saved:.0%} saved), compaction p50 {statistics.median(timings) * 1000:.2f} ms")
+
+    if args.live:
+        time_model(texts, args.live)
+
+
+if __name__ == "__main__":
+    main()
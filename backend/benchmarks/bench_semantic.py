@@ -0,0 +1,110 @@
+"""
+Benchmark for the semantic job index (utils/job_semantic_index.py)
+Measures encoding throughput on synthetic job text, then IVF build time,
+top-k latency and recall against exact search at 10k / 100k / 1M jobs.
+Large sizes use clustered random vectors so the run is not dominated by
+encoding time.
+
+Usage (from backend/):
+    python benchmarks/bench_semantic.py
+    python benchmarks/bench_semantic.py --jobs 10000 100000 1000000 --nprobe 8 16 32
+"""
+
+from pathlib import Path
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils.job_semantic_index import HashedNgramEncoder, JobSemanticIndex
+from utils.skill_dictionary import SKILL_ALIASES
+
+
+def bench_encoding(count: int, dim: int) -> None:
+    rng = random.Random(3)
+    skills = list(SKILL_ALIASES)
+    filler = [f"word{i}" for i in range(5000)]
+    jobs = [
+        {
+            'title': f"{rng.choice(skills)} Engineer",
+            'description': " ".join(rng.choices(filler, k=60) + rng.sample(skills, 5)),
+            'skills_required': rng.sample(skills, 5)
+        }
+        for _ in range(count)
+    ]
+    encoder = HashedNgramEncoder(dim)
+    started = time.perf_counter()
+    for job in jobs:
+        encoder.encode_job(job)
+    seconds = time.perf_counter() - started
+    print(f"Encoding: {count / seconds:,.0f} jobs/s ({seconds / count * 1e6:.0f} µs per job)")
+
+
+def clustered_vectors(count: int, dim: int, clusters: int = 2000, seed: int = 5) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    # Jobs cluster by role and skill set; noise keeps neighbourhoods non-trivial
+    vectors = centers[rng.integers(0, clusters, count)] + 0.35 * rng.standard_normal((count, dim)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def run(count: int, dim: int, nprobes, queries: int, limit: int) -> None:
+    print("\n" + "=" * 60)
+    print(f"{count:,} jobs")
+    print("=" * 60)
+
+    vectors = clustered_vectors(count, dim)
+    ids = [f"job-{number}" for number in range(count)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        index = JobSemanticIndex(path=directory, dim=dim)
+        started = time.perf_counter()
+        index.build_from_vectors(vectors, ids)
+        print(f"Build: {time.perf_counter() - started:.1f}s, {index.meta['nlist']} lists")
+
+        # Resumes resemble some jobs: perturbed copies of random corpus vectors
+        rng = np.random.default_rng(9)
+        query_vectors = vectors[rng.integers(0, count, queries)] + 0.35 / np.sqrt(dim) * rng.standard_normal((queries, dim))
+        query_vectors = (query_vectors / np.linalg.norm(query_vectors, axis=1, keepdims=True)).astype(np.float32)
+        exact = [set(np.argpartition(-(vectors @ query), limit)[:limit]) for query in query_vectors]
+
+        for nprobe in nprobes:
+            index.nprobe = nprobe
+            timings, recalls = [], []
+            for query, truth in zip(query_vectors, exact):
+                # Bypass text encoding: search with the vector itself
+                index.encoder.encode = lambda text, skills=None, query=query: query
+                started = time.perf_counter()
+                results = index.search("", limit=limit)
+                timings.append(time.perf_counter() - started)
+                found = {int(job_id.split("-")[1]) for job_id, _ in results}
+                recalls.append(len(found & truth) / limit)
+            timings.sort()
+            print(f"nprobe {nprobe:>3}: p50 {statistics.median(timings) * 1000:.2f} ms, "
+                  f"p95 {timings[int(len(timings) * 0.95) - 1] * 1000:.2f} ms, "
+                  f"recall@{limit} {statistics.mean(recalls):.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the semantic job index")
+    parser.add_argument("--jobs", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[8, 16, 32])
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    bench_encoding(10_000, args.dim)
+    for count in args.jobs:
+        run(count, args.dim, args.nprobe, args.queries, args.limit)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Load test for a running backend (python app.py or gunicorn wsgi:app)
+Sends requests of one type from concurrent clients for a fixed time and
+reports throughput, latency percentiles and status codes. Use it to check the
+per-node capacity figures in README.md ("Production Serving") on your hardware.
+
+Usage (from backend/, with the server running):
+    python benchmarks/bench_serving.py --scenario search --clients 32
+    python benchmarks/bench_serving.py --scenario analyze --clients 16 --seconds 30
+    python benchmarks/bench_serving.py --url http://10.0.0.5:5000 --scenario upload
+"""
+
+from pathlib import Path
+import argparse
+import json
+import statistics
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+
+RESUME_TEXT = (
+    "Python developer with 5 years of experience building Flask APIs, PostgreSQL "
+    "schemas and React frontends. Led the migration of a payments service to AWS. "
+)
+
+
+def make_requests(scenario: str, base_url: str):
+    """Return a function building the next urllib Request of the scenario"""
+    if scenario == "health":
+        return lambda: urllib.request.Request(f"{base_url}/api/health")
+    if scenario == "search":
+        return lambda: urllib.request.Request(
+            f"{base_url}/api/jobs/search?keyword=python&limit=50", headers={"Accept-Encoding": "gzip"}
+        )
+    if scenario == "analyze":
+        # A distinct text per request so the result cache does not answer
+        return lambda: urllib.request.Request(
+            f"{base_url}/api/analyze-text",
+            data=json.dumps({"text": f"{RESUME_TEXT} {uuid.uuid4().hex}"}).encode(),
+            headers={"Content-Type": "application/json"}
+        )
+    if scenario == "upload":
+        from bench_bulk_upload import make_pdf
+        from bench_resume_compaction import make_resume
+        import random
+        pdf = make_pdf(make_resume(random.Random(7)), 2)
+        boundary = uuid.uuid4().hex
+        body = (
+            f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"resume.pdf\"\r\n"
+            "Content-Type: application/pdf\r\n\r\n"
+        ).encode() + pdf + f"\r\n--{boundary}--\r\n".encode()
+        return lambda: urllib.request.Request(
+            f"{base_url}/api/upload-resume",
+            data=body,
+            headers={"Content-Type": f"multipart/form-data; boundary={boundary}"}
+        )
+    raise ValueError(f"Unknown scenario: {scenario}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test a running backend")
+    parser.add_argument("--url", default="http://127.0.0.1:5000")
+    parser.add_argument("--scenario", default="search", choices=["health", "search", "analyze", "upload"])
+    parser.add_argument("--clients", type=int, default=16, help="Concurrent clients")
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    next_request = make_requests(args.scenario, args.url.rstrip("/"))
+    latencies, statuses = [], {}
+    lock = threading.Lock()
+    deadline = time.monotonic() + args.seconds
+
+    def client():
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            try:
+                with urllib.request.urlopen(next_request(), timeout=120) as response:
+                    response.read()
+                    status = response.status
+            except urllib.error.HTTPError as e:
+                status = e.code
+            except OSError:
+                status = "error"
+            with lock:
+                latencies.append(time.perf_counter() - started)
+                statuses[status] = statuses.get(status, 0) + 1
+
+    threads = [threading.Thread(target=client) for _ in range(args.clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(f"{args.scenario}: {len(latencies)} requests from {args.clients} clients in {elapsed:.1f} s "
+          f"= {len(latencies) / elapsed:,.1f} req/s")
+    print(f"latency p50 {statistics.median(latencies) * 1000:.0f} ms, "
+          f"p95 {latencies[int(len(latencies) * 0.95)] * 1000:.0f} ms, statuses {statuses}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark for skill extraction (utils/skill_dictionary.py)
+Measures throughput in MB/s of the Aho-Corasick extractor on synthetic job
+descriptions, next to the single alternation regex used before it, and
+checks that both find the same skills.
+
+Usage (from backend/):
+    python benchmarks/bench_skill_extraction.py
+    python benchmarks/bench_skill_extraction.py --documents 20000 --skill-density 0.05
+"""
+
+from pathlib import Path
+import argparse
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils.skill_dictionary import SkillExtractor
+
+
+PROSE = (
+    "we are looking for a motivated engineer to join our growing team you will design "
+    "build and maintain scalable services collaborate with product managers review code "
+    "and mentor junior developers strong communication skills and ownership are required "
+    "experience in an agile environment is a plus"
+).split()
+SEPARATORS = [" ", " ", " ", ", ", " / ", ". ", " (", ") ", " - "]
+
+
+class RegexSkillExtractor:
+    """Previous extractor: one alternation regex, longest alias first"""
+
+    def __init__(self, alias_to_skill):
+        self.alias_to_skill = alias_to_skill
+        aliases = sorted(alias_to_skill, key=len, reverse=True)
+        self.pattern = re.compile(
+            r"(?<![\w+#.])(" + "|".join(re.escape(alias) for alias in aliases) + r")(?![\w+#]|\.\w)",
+            re.IGNORECASE
+        )
+
+    def extract(self, text):
+        skills = []
+        seen = set()
+        for match in self.pattern.finditer(text):
+            skill = self.alias_to_skill[match.group(1).lower()]
+            if skill not in seen:
+                seen.add(skill)
+                skills.append(skill)
+        return skills
+
+
+def make_documents(count: int, words: int, skill_density: float, aliases, seed: int = 7):
+    rng = random.Random(seed)
+    documents = []
+    for _ in range(count):
+        parts = []
+        for _ in range(words):
+            word = rng.choice(aliases) if rng.random() < skill_density else rng.choice(PROSE)
+            if rng.random() < 0.1:
+                word = word.title()
+            parts.append(word)
+            parts.append(rng.choice(SEPARATORS))
+        documents.append("".join(parts))
+    return documents
+
+
+def throughput(extractor, documents, megabytes: float, repeat: int):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for document in documents:
+            extractor.extract(document)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return megabytes / best, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark skill extraction throughput")
+    parser.add_argument("--documents", type=int, default=5000)
+    parser.add_argument("--words", type=int, default=300, help="Words per document")
+    parser.add_argument("--skill-density", type=float, default=0.03, help="Fraction of words that are skill aliases")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    extractor = SkillExtractor()
+    build_ms = (time.perf_counter() - started) * 1000
+    baseline = RegexSkillExtractor(extractor.alias_to_skill)
+
+    documents = make_documents(args.documents, args.words, args.skill_density, list(extractor.alias_to_skill))
+    megabytes = sum(len(document.encode("utf-8")) for document in documents) / 1e6
+    print(f"{args.documents:,} documents, {megabytes:.1f} MB, "
+          f"{len(extractor.alias_to_skill):,} aliases, automaton built in {build_ms:.1f} ms")
+
+    mismatches = sum(extractor.extract(document) != baseline.extract(document) for document in documents)
+    print(f"Documents with different results: {mismatches}")
+
+    for name, candidate in (("Aho-Corasick", extractor), ("Regex (previous)", baseline)):
+        rate, seconds = throughput(candidate, documents, megabytes, args.repeat)
+        print(f"{name}: {rate:.1f} MB/s ({seconds * 1000 / len(documents):.3f} ms per document)")
+
+
+if __name__ == "__main__":
+    main()
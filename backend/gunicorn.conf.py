@@ -0,0 +1,70 @@
+"""
+Gunicorn configuration for the backend (gunicorn wsgi:app)
+
+Concurrency model (see "Production Serving" in README.md): WEB_CONCURRENCY
+worker processes, each serving GUNICORN_THREADS requests at once on threads.
+Requests spend most of their time waiting on Gemini, the database or Chrome,
+which releases the GIL, so threads give cheap concurrency; CPU-bound text
+extraction runs in a separate process pool per worker.
+"""
+
+import multiprocessing
+import os
+import threading
+
+
+cores = multiprocessing.cpu_count()
+
+bind = os.getenv("GUNICORN_BIND", f"0.0.0.0:{os.getenv('PORT', '5000')}")
+
+# One process per core (max 8): each holds its own caches, model client and
+# scrape slots, so more processes mostly add memory
+workers = int(os.getenv("WEB_CONCURRENCY", str(min(cores, 8))))
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", "16"))
+
+# Split the cores between the extraction pools of all workers instead of
+# starting one process per core in every worker
+os.environ.setdefault("RESUME_EXTRACT_WORKERS", str(max(1, cores // workers)))
+os.environ.setdefault("RESUME_BATCH_EXTRACT_WORKERS", str(max(1, cores // workers)))
+
+# gthread workers keep heartbeating while requests run, so this only catches
+# a wedged worker; long Gemini calls and event streams are not cut off
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+
+# On SIGTERM or a reload, workers stop accepting connections, finish
+# in-flight requests, then drain background scrapes, queued uploads and the
+# job write buffer (up to SHUTDOWN_DRAIN_SECONDS each, 30 s for the buffer)
+# before they are killed
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "90"))
+keepalive = 5
+
+# Workers are not recycled by default: a new worker rebuilds the job ranker
+# and skill index. Set GUNICORN_MAX_REQUESTS to return memory held by Chrome
+# and PyMuPDF every N requests; new workers warm their indexes on start.
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "0"))
+max_requests_jitter = max_requests // 10
+
+# Heartbeat files in memory, not on a possibly slow disk
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
+
+
+def post_worker_init(worker):
+    """Build the worker's in-memory indexes in the background, before its first search"""
+    def warm():
+        try:
+            from utils.skill_dictionary import get_skill_extractor
+            from utils.job_ranking import get_job_ranker
+            from utils.job_semantic_index import get_job_semantic_index
+            get_skill_extractor()
+            get_job_ranker().warm()
+            # One worker builds a missing index under its file lock; the rest load it
+            get_job_semantic_index().warm()
+        except Exception as e:
+            worker.log.warning(f"Could not warm job indexes: {str(e)}")
+
+    threading.Thread(target=warm, name="warm-indexes", daemon=True).start()
@@ -0,0 +1,79 @@
+"""
+Shared test setup: every test runs offline against a temporary SQLite job
+store and the local fake model (no Supabase, no Gemini key)
+"""
+
+from pathlib import Path
+import os
+import sys
+import tempfile
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+# Set before app and the process-wide singletons are imported
+_workdir = tempfile.mkdtemp(prefix="elevare_tests_")
+os.environ.update({
+    "JOB_STORAGE_BACKEND": "sqlite",
+    "JOB_SQLITE_PATH": os.path.join(_workdir, "jobs.sqlite3"),
+    "JOB_CACHE_PATH": os.path.join(_workdir, "job_cache.sqlite3"),
+    "JOB_SEMANTIC_INDEX_PATH": os.path.join(_workdir, "semantic_index"),
+    "JOB_WRITE_SPILL_PATH": os.path.join(_workdir, "job_write_buffer.jsonl"),
+    "RESUME_JOBS_PATH": os.path.join(_workdir, "resume_jobs.sqlite3"),
+    "LLM_BACKEND": "fake",
+    "LLM_CACHE_ENABLED": "false",
+    "CANDIDATE_EXTRACTION_MODE": "local",
+    "SUPABASE_JWT_SECRET": "test-secret",
+})
+
+from ai.llm_client import FakeLLMClient, set_llm_client  # noqa: E402
+
+
+@pytest.fixture
+def make_llm():
+    """Build fake models that answer at once and retry without waiting"""
+    def make(**options) -> FakeLLMClient:
+        settings = {"first_chunk_delay": 0.0, "chunk_delay": 0.0, "backoff_base": 0.001, "backoff_max": 0.001}
+        settings.update(options)
+        return FakeLLMClient(**settings)
+    return make
+
+
+@pytest.fixture
+def fake_llm(make_llm):
+    """Install a fresh fake model as the process-wide client"""
+    client = make_llm(response="## Summary\nStrong backend profile with Python and SQL experience.")
+    set_llm_client(client)
+    yield client
+    set_llm_client(None)
+
+
+@pytest.fixture
+def make_pdf():
+    """Build a one-page PDF resume holding the given lines"""
+    def make(*lines: str) -> bytes:
+        import fitz  # PyMuPDF
+        with fitz.open() as doc:
+            doc.new_page().insert_text((72, 72), "\n".join(lines))
+            return doc.tobytes()
+    return make
+
+
+@pytest.fixture(scope="session")
+def app():
+    import app as backend
+    backend.app.config["TESTING"] = True
+    return backend.app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture(scope="session")
+def job_db():
+    from utils.job_database import JobDatabase
+    return JobDatabase()
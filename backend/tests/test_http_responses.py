@@ -0,0 +1,132 @@
+"""
+Response compression and conditional GET (utils/http_responses.py), on a
+small app with the same after_request hook and on the job routes
+"""
+
+import gzip
+
+import pytest
+from flask import Flask, Response, jsonify, request
+
+import utils.http_responses as http_responses
+from utils.http_responses import finalize_response
+
+ROWS = [{'title': f'Python Developer {number}', 'company': 'Acme'} for number in range(100)]
+
+
+@pytest.fixture(autouse=True)
+def without_brotli(monkeypatch):
+    # Results must not depend on whether the optional brotli package is installed
+    monkeypatch.setattr(http_responses, "_brotli", False)
+
+
+@pytest.fixture
+def small_app():
+    app = Flask(__name__)
+
+    @app.route("/rows", methods=["GET", "POST"])
+    def rows():
+        return jsonify({"rows": ROWS})
+
+    @app.route("/small")
+    def small():
+        return jsonify({"status": "ok"})
+
+    @app.route("/missing")
+    def missing():
+        return jsonify({"error": "Not found", "rows": ROWS}), 404
+
+    @app.route("/events")
+    def events():
+        return Response((f"data: {number}\n\n" for number in range(200)), mimetype="text/event-stream")
+
+    app.after_request(lambda response: finalize_response(request, response))
+    return app.test_client()
+
+
+def test_large_json_is_gzipped_for_clients_that_accept_it(small_app):
+    plain = small_app.get("/rows")
+    compressed = small_app.get("/rows", headers={"Accept-Encoding": "gzip, deflate"})
+
+    assert "Content-Encoding" not in plain.headers
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in compressed.headers["Vary"]
+    assert gzip.decompress(compressed.data) == plain.data
+    assert len(compressed.data) < len(plain.data)
+
+
+def test_each_encoding_gets_its_own_etag(small_app):
+    plain = small_app.get("/rows")
+    compressed = small_app.get("/rows", headers={"Accept-Encoding": "gzip"})
+
+    assert plain.headers["ETag"] != compressed.headers["ETag"]
+    assert compressed.headers["ETag"].endswith('-gzip"')
+    assert plain.headers["Cache-Control"] == "no-cache"
+
+
+def test_matching_if_none_match_is_answered_with_304(small_app):
+    first = small_app.get("/rows", headers={"Accept-Encoding": "gzip"})
+
+    second = small_app.get("/rows", headers={"Accept-Encoding": "gzip", "If-None-Match": first.headers["ETag"]})
+
+    assert second.status_code == 304
+    assert second.data == b""
+    assert second.headers["ETag"] == first.headers["ETag"]
+
+
+def test_etag_of_another_encoding_does_not_match(small_app):
+    plain = small_app.get("/rows")
+
+    response = small_app.get("/rows", headers={"Accept-Encoding": "gzip", "If-None-Match": plain.headers["ETag"]})
+
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+
+
+def test_small_bodies_are_tagged_but_not_compressed(small_app):
+    response = small_app.get("/small", headers={"Accept-Encoding": "gzip"})
+
+    assert "Content-Encoding" not in response.headers
+    assert "ETag" in response.headers
+
+
+def test_only_successful_gets_are_tagged(small_app):
+    posted = small_app.post("/rows", headers={"Accept-Encoding": "gzip"})
+    assert "ETag" not in posted.headers
+    assert posted.headers["Content-Encoding"] == "gzip"
+
+    missing = small_app.get("/missing", headers={"Accept-Encoding": "gzip"})
+    assert missing.status_code == 404
+    assert "ETag" not in missing.headers and "Content-Encoding" not in missing.headers
+
+
+def test_event_streams_pass_through(small_app):
+    response = small_app.get("/events", headers={"Accept-Encoding": "gzip"})
+
+    assert "Content-Encoding" not in response.headers and "ETag" not in response.headers
+    assert response.get_data(as_text=True).startswith("data: 0\n\n")
+
+
+def test_brotli_is_preferred_when_installed(small_app, monkeypatch):
+    brotli = pytest.importorskip("brotli")
+    monkeypatch.setattr(http_responses, "_brotli", brotli)
+
+    response = small_app.get("/rows", headers={"Accept-Encoding": "gzip, br"})
+
+    assert response.headers["Content-Encoding"] == "br"
+    assert brotli.decompress(response.data) == small_app.get("/rows").data
+
+
+def test_unchanged_job_listing_is_not_sent_again(client, job_db):
+    job_db.insert_jobs([
+        {'title': f'Scala Developer {number}', 'company': 'Acme', 'description': 'Scala and Spark services',
+         'location': 'Pune', 'url': f'https://jobs.example.com/etag/{number}', 'source': 'Naukri'}
+        for number in range(20)
+    ])
+    first = client.get("/api/jobs/recent?limit=20", headers={"Accept-Encoding": "gzip"})
+
+    again = client.get("/api/jobs/recent?limit=20",
+                       headers={"Accept-Encoding": "gzip", "If-None-Match": first.headers["ETag"]})
+
+    assert first.status_code == 200 and first.headers["Content-Encoding"] == "gzip"
+    assert again.status_code == 304 and again.data == b""
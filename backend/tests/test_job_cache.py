@@ -0,0 +1,109 @@
+"""
+Job query cache (utils/job_cache.py): in-process and shared SQLite tiers,
+generation-based invalidation across processes and a bounded shared file
+"""
+
+import time
+
+from utils.job_cache import JobQueryCache, SharedSQLiteCache
+
+
+def counting_loader(result):
+    calls = []
+
+    def load():
+        calls.append(1)
+        return result
+    return load, calls
+
+
+def test_second_lookup_is_a_local_hit(tmp_path):
+    cache = JobQueryCache(shared_path=str(tmp_path / "cache.sqlite3"))
+    load, calls = counting_loader([{"id": "1"}])
+
+    assert cache.get_or_load("search_jobs", {"keyword": "python"}, load) == [{"id": "1"}]
+    assert cache.get_or_load("search_jobs", {"keyword": "python"}, load) == [{"id": "1"}]
+
+    assert len(calls) == 1
+    stats = cache.stats()
+    assert stats['misses'] == 1 and stats['local_hits'] == 1
+
+
+def test_other_process_reads_the_shared_tier(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    writer, reader = JobQueryCache(shared_path=path), JobQueryCache(shared_path=path)
+    load, calls = counting_loader({"total": 3})
+
+    writer.get_or_load("get_job_stats", {}, load)
+    assert reader.get_or_load("get_job_stats", {}, load) == {"total": 3}
+
+    assert len(calls) == 1
+    assert reader.stats()['shared_hits'] == 1
+
+
+def test_invalidation_in_one_process_reaches_the_other(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    writer, reader = JobQueryCache(shared_path=path), JobQueryCache(shared_path=path)
+    reader.get_or_load("search_jobs", {}, lambda: ["old"])
+
+    writer.invalidate()
+
+    assert reader.get_or_load("search_jobs", {}, lambda: ["new"]) == ["new"]
+    assert reader.generation() == writer.generation() == 1
+
+
+def test_results_are_copies(tmp_path):
+    cache = JobQueryCache(shared_path=str(tmp_path / "cache.sqlite3"))
+    first = cache.get_or_load("search_jobs", {}, lambda: [{"id": "1"}])
+    first.append({"id": "mutated"})
+
+    assert cache.get_or_load("search_jobs", {}, lambda: []) == [{"id": "1"}]
+
+
+def test_failed_load_is_not_cached(tmp_path):
+    cache = JobQueryCache(shared_path=str(tmp_path / "cache.sqlite3"))
+
+    def fail():
+        raise RuntimeError("database down")
+
+    try:
+        cache.get_or_load("search_jobs", {}, fail)
+    except RuntimeError:
+        pass
+    assert cache.get_or_load("search_jobs", {}, lambda: ["ok"]) == ["ok"]
+
+
+def rows(shared):
+    return shared._execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+
+def test_shared_tier_is_capped(tmp_path):
+    shared = SharedSQLiteCache(str(tmp_path / "cache.sqlite3"), max_entries=5)
+
+    for number in range(12):
+        shared.set(f"0:key{number}", 0, "value")
+
+    assert rows(shared) == 5
+    assert shared.get("0:key11") == "value"
+    assert shared.get("0:key0") is None
+
+
+def test_expired_entries_are_pruned_while_writing(tmp_path):
+    shared = SharedSQLiteCache(str(tmp_path / "cache.sqlite3"), ttl_seconds=0.05, prune_every=4)
+    for number in range(3):
+        shared.set(f"0:old{number}", 0, "value")
+    time.sleep(0.06)
+
+    shared.set("0:new", 0, "value")
+
+    assert rows(shared) == 1
+
+
+def test_invalidation_drops_older_generations_and_expired_rows(tmp_path):
+    shared = SharedSQLiteCache(str(tmp_path / "cache.sqlite3"))
+    shared.set("0:key", 0, "value")
+
+    generation = shared.bump_generation()
+
+    assert generation == 1
+    assert rows(shared) == 0
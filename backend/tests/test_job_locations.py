@@ -0,0 +1,43 @@
+"""
+Normalized job locations: city searches against the temporary SQLite store,
+including rows stored before locations were parsed
+"""
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def located_jobs(job_db):
+    """Parsed jobs in Bengaluru and Pune and one row stored before locations were parsed"""
+    job_db.insert_jobs([
+        {'title': 'Quokkascript Developer', 'description': 'Build Quokkascript services',
+         'location': 'Bangalore', 'url': 'https://jobs.example.com/quokka/1', 'source': 'Naukri'},
+        {'title': 'Quokkascript Engineer', 'description': 'Maintain Quokkascript tooling',
+         'location': 'Pune', 'url': 'https://jobs.example.com/quokka/2', 'source': 'Naukri'},
+    ])
+    # Legacy rows have the location text only: no cities, no work mode
+    job_db.storage.insert_jobs([{
+        'title': 'Quokkascript Lead', 'company': 'Legacy Co', 'description': 'Lead the Quokkascript team',
+        'location': 'Bangalore, Karnataka', 'url': 'https://jobs.example.com/quokka/3', 'source': 'Naukri',
+        'cities': None, 'work_mode': None
+    }])
+    job_db.cache.invalidate()
+
+
+def search_titles(client, **params):
+    response = client.get("/api/jobs/search", query_string={"keyword": "quokkascript", **params})
+    assert response.status_code == 200
+    return sorted(job['title'] for job in response.get_json()['jobs'])
+
+
+def test_city_search_keeps_rows_without_parsed_cities(client, located_jobs):
+    assert search_titles(client, location="Bangalore") == ["Quokkascript Developer", "Quokkascript Lead"]
+
+
+def test_city_alias_matches_parsed_rows(client, located_jobs):
+    assert search_titles(client, location="Bengaluru") == ["Quokkascript Developer"]
+    assert search_titles(client, location="Pune") == ["Quokkascript Engineer"]
+
+
+def test_unknown_place_falls_back_to_location_text(client, located_jobs):
+    assert search_titles(client, location="Karnataka") == ["Quokkascript Lead"]
@@ -0,0 +1,128 @@
+"""
+BM25 ranking (utils/job_ranking.py): field weighting, filters, explanations
+and batch ranking with rank_many against a private SQLite store
+"""
+
+import pytest
+
+from utils.job_cache import JobQueryCache
+from utils.job_ranking import JobRanker
+from utils.sqlite_job_storage import SQLiteJobStorage
+
+
+JOBS = [
+    {'title': 'Python Developer', 'skills_required': ['Python', 'Django'], 'domain': 'software',
+     'location': 'Pune', 'description': 'Build Django APIs'},
+    {'title': 'Data Analyst', 'skills_required': ['SQL', 'Excel'], 'domain': 'data',
+     'location': 'Mumbai', 'description': 'Reports, with some Python scripting'},
+    {'title': 'Backend Engineer', 'skills_required': ['Go', 'PostgreSQL'], 'domain': 'software',
+     'location': 'Bangalore', 'description': 'Services in Go'},
+    {'title': 'Django Engineer', 'skills_required': ['Python', 'Django', 'PostgreSQL'], 'domain': 'software',
+     'location': 'Bangalore', 'description': 'Django and PostgreSQL'},
+]
+
+
+@pytest.fixture
+def ranker(tmp_path):
+    storage = SQLiteJobStorage(str(tmp_path / "jobs.sqlite3"))
+    rows = storage.insert_jobs([
+        dict(job, company='Acme', url=f'https://jobs.example.com/rank/{number}', source='Naukri',
+             created_at=f'2026-01-0{number + 1}T00:00:00')
+        for number, job in enumerate(JOBS)
+    ])
+    ranker = JobRanker(storage=storage, cache=JobQueryCache())
+    ranker.titles = {row['id']: row['title'] for row in rows}
+    return ranker
+
+
+def titles(ranker, results):
+    return [ranker.titles[result['job_id']] for result in results]
+
+
+def test_listed_skills_outrank_description_mentions(ranker):
+    results = ranker.rank(["Python"])
+
+    assert titles(ranker, results)[-1] == "Data Analyst"
+    assert set(titles(ranker, results[:2])) == {"Python Developer", "Django Engineer"}
+
+
+def test_more_matching_skills_rank_higher(ranker):
+    results = ranker.rank(["Python", "Django", "PostgreSQL"])
+
+    assert titles(ranker, results)[0] == "Django Engineer"
+    assert results[0]['matching_skills'][0] in {"Python", "Django", "PostgreSQL"}
+    assert set(results[0]['matching_skills']) == {"Python", "Django", "PostgreSQL"}
+    assert results[0]['score'] > results[1]['score']
+
+
+def test_domain_and_location_filters(ranker):
+    results = ranker.rank(["Python", "Go"], domain="software", location="Bangalore")
+
+    assert sorted(titles(ranker, results)) == ["Backend Engineer", "Django Engineer"]
+    assert ranker.rank(["Python"], domain="unknown") == []
+    assert titles(ranker, ranker.rank(["Python"], location="Mumbai")) == ["Data Analyst"]
+
+
+def test_unknown_skills_match_nothing(ranker):
+    assert ranker.rank(["Quokkascript"]) == []
+    assert ranker.rank([]) == []
+
+
+def test_limit(ranker):
+    assert len(ranker.rank(["Python", "Go", "SQL"], limit=2)) == 2
+
+
+PROFILES = [
+    {'skills': ["Python", "Django"]},
+    {'skills': ["Go"], 'location': "Bangalore"},
+    {'skills': ["SQL"], 'domain': "software"},
+    {'skills': ["Python"], 'text': "Django reporting scripts"},
+    {'skills': []},
+]
+
+
+def test_rank_many_matches_rank(ranker):
+    batch = list(ranker.rank_many(PROFILES, limit=3))
+
+    assert len(batch) == len(PROFILES)
+    for profile, results in zip(PROFILES, batch):
+        expected = ranker.rank(profile['skills'], text=profile.get('text'), domain=profile.get('domain'),
+                               location=profile.get('location'), limit=3)
+        assert [result['job_id'] for result in results] == [result['job_id'] for result in expected]
+        assert [result['score'] for result in results] == pytest.approx([result['score'] for result in expected])
+        assert [result['matching_skills'] for result in results] == [result['matching_skills'] for result in expected]
+
+
+def test_rank_many_gives_the_same_results_when_chunked(ranker):
+    whole = list(ranker.rank_many(PROFILES, limit=3))
+    chunked = list(ranker.rank_many(PROFILES, limit=3, max_scores=1))
+
+    assert [[result['job_id'] for result in results] for results in chunked] == \
+        [[result['job_id'] for result in results] for results in whole]
+
+
+def test_jobs_added_after_the_build_are_ranked(ranker):
+    ranker.warm()
+    rows = ranker.storage.insert_jobs([{
+        'title': 'Rust Developer', 'company': 'Acme', 'skills_required': ['Rust'],
+        'url': 'https://jobs.example.com/rank/rust', 'source': 'Naukri'
+    }])
+    ranker.cache.invalidate()
+    ranker.add_jobs(rows)
+
+    assert [result['job_id'] for result in ranker.rank(["Rust"])] == [rows[0]['id']]
+
+
+def test_ranking_index_failure_does_not_fail_the_insert(job_db, monkeypatch):
+    def fail(rows):
+        raise RuntimeError("index broken")
+
+    monkeypatch.setattr(job_db.ranker, "add_jobs", fail)
+    result = job_db.insert_jobs([{
+        'title': 'Elixir Developer', 'description': 'Phoenix services', 'location': 'Pune',
+        'url': 'https://jobs.example.com/rank/elixir', 'source': 'Naukri'
+    }])
+
+    assert result['success'] is True
+    assert result['inserted_count'] == 1
+    assert job_db.ranker.stats()['built'] is False
@@ -0,0 +1,98 @@
+"""
+Materialized recommendations (utils/job_recommendations.py): full refreshes,
+incremental scoring of inserted jobs and the per-user top N
+"""
+
+import json
+
+import pytest
+
+from utils.job_cache import JobQueryCache
+from utils.job_ranking import JobRanker
+from utils.job_recommendations import RecommendationMaterializer
+from utils.sqlite_job_storage import SQLiteJobStorage
+
+
+def job(name, skills):
+    return {'title': f'{name} Developer', 'company': 'Acme', 'skills_required': skills,
+            'url': f'https://jobs.example.com/materialized/{name.lower()}', 'source': 'Naukri'}
+
+
+@pytest.fixture
+def storage(tmp_path):
+    storage = SQLiteJobStorage(str(tmp_path / "jobs.sqlite3"))
+    storage.insert_jobs([
+        job("Django", ["Python", "Django"]),
+        job("Flask", ["Python", "Flask"]),
+        job("React", ["React", "JavaScript"]),
+    ])
+    resumes = [
+        ("resume-1", "alice", ["Python", "Django"]),
+        ("resume-2", "bob", ["React"]),
+        ("resume-3", "carol", []),
+    ]
+    for resume_id, user_id, skills in resumes:
+        storage._connection().execute(
+            "INSERT INTO resumes (id, user_id, skills, updated_at) VALUES (?, ?, ?, '2026-01-01')",
+            (resume_id, user_id, json.dumps(skills))
+        )
+    return storage
+
+
+@pytest.fixture
+def materializer(storage):
+    ranker = JobRanker(storage=storage, cache=JobQueryCache())
+    return RecommendationMaterializer(storage=storage, ranker=ranker, top_n=2)
+
+
+def recommended(storage, user_id):
+    return [(job['title'], job['match_score']) for job in storage.get_recommendations(user_id)]
+
+
+def test_refresh_keeps_each_users_best_jobs(storage, materializer):
+    report = materializer.refresh()
+
+    assert report['users'] == 2
+    assert recommended(storage, "alice") == [("Django Developer", 100.0), ("Flask Developer", 50.0)]
+    assert recommended(storage, "bob") == [("React Developer", 100.0)]
+
+
+def test_refresh_of_a_user_without_skills_marks_them_computed(storage, materializer):
+    materializer.refresh(["carol"])
+
+    assert recommended(storage, "carol") == []
+    assert storage.recommendations_computed("carol")
+
+
+def test_new_jobs_are_merged_into_the_top_n(storage, materializer):
+    materializer.refresh()
+    rows = storage.insert_jobs([job("Wagtail", ["Python", "Django"]), job("Vue", ["Vue"])])
+
+    report = materializer.score_new_jobs(rows)
+
+    assert report['users'] == 1
+    # Flask (50%) is pushed out of the top 2; equal scores have no set order
+    assert sorted(recommended(storage, "alice")) == [("Django Developer", 100.0), ("Wagtail Developer", 100.0)]
+    assert recommended(storage, "bob") == [("React Developer", 100.0)]
+
+
+def test_scheduled_jobs_are_scored_on_the_scoring_thread(storage, materializer):
+    materializer.refresh()
+    materializer.schedule_new_jobs(storage.insert_jobs([job("Next", ["React"])]))
+
+    assert materializer.drain(timeout=5)
+    assert ("Next Developer", 100.0) in recommended(storage, "bob")
+
+
+def test_scoring_failure_does_not_fail_the_insert(job_db, monkeypatch):
+    def fail(jobs):
+        raise RuntimeError("can't start new thread")
+
+    monkeypatch.setattr(job_db.recommendations, "schedule_new_jobs", fail)
+    result = job_db.insert_jobs([{
+        'title': 'Haskell Developer', 'description': 'Haskell services', 'location': 'Pune',
+        'url': 'https://jobs.example.com/materialized/haskell', 'source': 'Naukri'
+    }])
+
+    assert result['success'] is True
+    assert result['inserted_count'] == 1
@@ -0,0 +1,76 @@
+"""
+Job retention (utils/job_retention.py): expired jobs move to jobs_archive in
+bounded batches, fresh jobs stay, dry runs move nothing
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from utils.job_retention import JobRetentionEngine
+from utils.sqlite_job_storage import SQLiteJobStorage
+
+
+def days_ago(days):
+    return (datetime.now() - timedelta(days=days)).isoformat()
+
+
+@pytest.fixture
+def storage(tmp_path):
+    """Private store with 5 jobs scraped 60 days ago and 2 scraped today"""
+    storage = SQLiteJobStorage(str(tmp_path / "jobs.sqlite3"))
+    storage.insert_jobs([
+        {'title': f'Old Job {number}', 'company': 'Acme', 'url': f'https://jobs.example.com/old/{number}',
+         'source': 'Naukri', 'scraped_at': days_ago(60)}
+        for number in range(5)
+    ] + [
+        {'title': f'New Job {number}', 'company': 'Acme', 'url': f'https://jobs.example.com/new/{number}',
+         'source': 'Naukri', 'scraped_at': days_ago(0)}
+        for number in range(2)
+    ])
+    return storage
+
+
+def titles(storage, table):
+    return sorted(row['title'] for row in storage._query(f"SELECT title FROM {table}"))
+
+
+def test_expired_jobs_move_in_bounded_batches(storage):
+    report = JobRetentionEngine(db=storage, batch_size=2).run(days=30)
+
+    assert report['success'] is True
+    assert report['eligible_count'] == 5
+    assert report['rows_moved'] == 5
+    assert [batch['rows_moved'] for batch in report['batches']] == [2, 2, 1]
+    assert titles(storage, "jobs") == ["New Job 0", "New Job 1"]
+    assert titles(storage, "jobs_archive") == [f"Old Job {number}" for number in range(5)]
+
+
+def test_archived_rows_are_inactive(storage):
+    JobRetentionEngine(db=storage).run(days=30)
+
+    assert {row['is_active'] for row in storage._query("SELECT is_active FROM jobs_archive")} == {0}
+
+
+def test_max_batches_leaves_the_rest_for_the_next_run(storage):
+    report = JobRetentionEngine(db=storage, batch_size=2, max_batches=1).run(days=30)
+
+    assert report['rows_moved'] == 2
+    assert storage.count_expired_jobs(days_ago(30)) == 3
+
+
+def test_dry_run_only_counts(storage):
+    report = JobRetentionEngine(db=storage).run(days=30, dry_run=True)
+
+    assert report['eligible_count'] == 5
+    assert report['rows_moved'] == 0
+    assert len(titles(storage, "jobs")) == 7
+    assert titles(storage, "jobs_archive") == []
+
+
+def test_old_archive_rows_are_purged(storage):
+    report = JobRetentionEngine(db=storage).run(days=30, archive_retention_days=45)
+
+    assert report['rows_moved'] == 5
+    assert report['partitions_dropped'] == 5
+    assert titles(storage, "jobs_archive") == []
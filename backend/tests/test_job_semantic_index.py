@@ -0,0 +1,158 @@
+"""
+Semantic index (utils/job_semantic_index.py): delta appends, tombstones,
+background compaction and version switches seen by other processes
+"""
+
+import pytest
+
+from utils.job_semantic_index import JobSemanticIndex
+from utils.sqlite_job_storage import SQLiteJobStorage
+
+
+def job(name, skills, domain="software"):
+    return {'title': f'{name} Engineer', 'company': 'Acme', 'description': f'{name} work',
+            'skills_required': skills, 'domain': domain,
+            'url': f'https://jobs.example.com/semantic/{name.lower()}', 'source': 'Naukri'}
+
+
+@pytest.fixture
+def storage(tmp_path):
+    storage = SQLiteJobStorage(str(tmp_path / "jobs.sqlite3"))
+    storage.ids = {
+        row['title']: row['id'] for row in storage.insert_jobs([
+            job("PyTorch", ["PyTorch", "Python"], "data"),
+            job("React", ["React", "JavaScript"]),
+            job("Kubernetes", ["Kubernetes", "Docker"]),
+        ])
+    }
+    return storage
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    return str(tmp_path / "semantic_index")
+
+
+def make_index(storage, index_path, **options):
+    return JobSemanticIndex(path=index_path, storage=storage, dim=64, **options)
+
+
+def top(index, skills, **options):
+    results = index.search(" ".join(skills), skills, **options)
+    return results[0][0] if results else None
+
+
+def versions(index):
+    return sorted(path.name for path in index.path.glob("v*"))
+
+
+def add(storage, index, name, skills):
+    rows = storage.insert_jobs([job(name, skills)])
+    index.add_jobs(rows)
+    return rows[0]['id']
+
+
+def test_search_finds_the_closest_job(storage, index_path):
+    index = make_index(storage, index_path)
+    index.warm()
+
+    assert top(index, ["PyTorch"]) == storage.ids["PyTorch Engineer"]
+    assert top(index, ["React"]) == storage.ids["React Engineer"]
+    assert top(index, ["PyTorch"], domain="software") != storage.ids["PyTorch Engineer"]
+
+
+def test_search_never_builds_on_the_request_thread(storage, index_path):
+    index = make_index(storage, index_path)
+
+    assert index.search("react", ["React"]) == []
+    index._build_thread.join(timeout=10)
+    assert top(index, ["React"]) == storage.ids["React Engineer"]
+
+
+def test_added_jobs_are_searchable_in_every_process(storage, index_path):
+    writer, reader = make_index(storage, index_path), make_index(storage, index_path)
+    writer.warm()
+    reader.warm()
+
+    job_id = add(storage, writer, "Terraform", ["Terraform"])
+
+    assert writer.stats()['delta_jobs'] == 1
+    assert top(reader, ["Terraform"]) == job_id
+
+
+def test_removed_jobs_are_skipped_in_every_process(storage, index_path):
+    writer, reader = make_index(storage, index_path), make_index(storage, index_path)
+    writer.warm()
+    delta_id = add(storage, writer, "Terraform", ["Terraform"])
+
+    assert writer.remove_jobs([storage.ids["React Engineer"], delta_id]) == 2
+    assert writer.remove_jobs([delta_id]) == 0
+
+    assert top(reader, ["React"]) != storage.ids["React Engineer"]
+    assert top(reader, ["Terraform"]) != delta_id
+    assert reader.stats()['jobs'] == 2
+
+
+def test_compaction_runs_off_the_insert_path(storage, index_path):
+    index = make_index(storage, index_path, compact_min_jobs=1)
+    index.warm()
+    removed = storage.ids["React Engineer"]
+    index.remove_jobs([removed])
+
+    job_id = add(storage, index, "Terraform", ["Terraform"])
+    index._compact_thread.join(timeout=10)
+
+    stats = index.stats()
+    assert stats['delta_jobs'] == 0 and stats['removed_jobs'] == 0
+    assert stats['jobs'] == 3
+    assert top(index, ["Terraform"]) == job_id
+    assert top(index, ["React"]) != removed
+
+
+def test_previous_version_is_kept_for_readers(storage, index_path):
+    index = make_index(storage, index_path)
+    index.warm()
+    first = index.version
+
+    add(storage, index, "Terraform", ["Terraform"])
+    assert index.compact()
+    second = index.version
+    assert versions(index) == sorted([first, second])
+
+    add(storage, index, "Ansible", ["Ansible"])
+    assert index.compact()
+    assert versions(index) == sorted([second, index.version])
+
+
+def test_reader_two_versions_behind_loads_the_current_one(storage, index_path):
+    reader, writer = make_index(storage, index_path), make_index(storage, index_path)
+    reader.warm()
+    for name in ("Terraform", "Ansible"):
+        add(storage, writer, name, [name])
+        writer.compact()
+
+    assert reader.stats()['version'] == writer.version
+    assert reader.stats()['jobs'] == 5
+
+
+def test_jobs_added_during_compaction_are_carried_over(storage, index_path, monkeypatch):
+    index, other = make_index(storage, index_path), make_index(storage, index_path)
+    index.warm()
+    first_id = add(storage, index, "Terraform", ["Terraform"])
+    write_files = index._write_files
+    added = []
+
+    def write_files_while_inserting(*args, **kwargs):
+        version = write_files(*args, **kwargs)
+        # Another process inserts and removes while the new version is being written
+        added.append(add(storage, other, "Ansible", ["Ansible"]))
+        other.remove_jobs([first_id])
+        return version
+
+    monkeypatch.setattr(index, "_write_files", write_files_while_inserting)
+    assert index.compact()
+
+    stats = index.stats()
+    assert stats['delta_jobs'] == 1 and stats['removed_jobs'] == 1
+    assert top(index, ["Ansible"]) == added[0]
+    assert top(index, ["Terraform"]) != first_id
@@ -0,0 +1,41 @@
+"""
+Skill index (utils/job_skill_index.py): jobs inserted by this process and by
+other processes sharing the database both reach the index
+"""
+
+from utils.job_cache import JobQueryCache
+from utils.job_skill_index import JobSkillIndex
+from utils.sqlite_job_storage import SQLiteJobStorage
+
+
+def job(number, created_at):
+    return {'title': f'Go Developer {number}', 'company': 'Acme', 'skills_required': ['Go'],
+            'url': f'https://jobs.example.com/go/{number}', 'source': 'Naukri', 'created_at': created_at}
+
+
+def test_add_jobs_catches_up_with_other_processes_first(tmp_path):
+    storage = SQLiteJobStorage(str(tmp_path / "jobs.sqlite3"))
+    cache_path = str(tmp_path / "cache.sqlite3")
+    storage.insert_jobs([job(0, "2026-01-01T00:00:00")])
+    index = JobSkillIndex(storage=storage, cache=JobQueryCache(shared_path=cache_path))
+    index.warm()
+
+    # Another worker stores a job and bumps the shared generation
+    other = storage.insert_jobs([job(1, "2026-01-02T00:00:00")])
+    JobQueryCache(shared_path=cache_path).invalidate()
+    # Then this worker stores a newer one
+    mine = storage.insert_jobs([job(2, "2026-01-03T00:00:00")])
+    index.cache.invalidate()
+
+    assert index.add_jobs(mine) == 2
+    assert other[0]['id'] in index.doc_by_id and mine[0]['id'] in index.doc_by_id
+    assert index.generation == index.cache.generation()
+    assert index.stats()['tombstones'] == 0
+
+
+def test_add_jobs_before_the_first_build_is_a_no_op(tmp_path):
+    storage = SQLiteJobStorage(str(tmp_path / "jobs.sqlite3"))
+    index = JobSkillIndex(storage=storage, cache=JobQueryCache())
+
+    assert index.add_jobs(storage.insert_jobs([job(0, "2026-01-01T00:00:00")])) == 0
+    assert index.stats()['built'] is False
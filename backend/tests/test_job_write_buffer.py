@@ -0,0 +1,131 @@
+"""
+Write-behind buffer (utils/job_write_buffer.py): batching, spill file
+recovery after a crash, flush checkpoints, dead letters and per-caller receipts
+"""
+
+import json
+
+import pytest
+
+from utils.job_write_buffer import BufferedJobWriter
+
+
+class RecordingDatabase:
+    """Stands in for JobDatabase.insert_jobs; fails every call after `succeed` calls"""
+
+    def __init__(self, succeed=None):
+        self.succeed = succeed
+        self.batches = []
+        self.calls = 0
+
+    def insert_jobs(self, jobs):
+        self.calls += 1
+        if self.succeed is not None and self.calls > self.succeed:
+            return {"success": False, "message": "database down"}
+        self.batches.append([job['url'] for job in jobs])
+        return {"success": True, "inserted_count": len(jobs)}
+
+
+def make_jobs(count, prefix="job"):
+    return [{'title': f'{prefix} {number}', 'url': f'https://jobs.example.com/{prefix}/{number}'}
+            for number in range(count)]
+
+
+@pytest.fixture
+def spill_path(tmp_path):
+    return str(tmp_path / "job_write_buffer.jsonl")
+
+
+def make_writer(db, spill_path, **options):
+    settings = {"max_delay_seconds": 60, "retry_seconds": 0.01}
+    settings.update(options)
+    return BufferedJobWriter(db=db, spill_path=spill_path, **settings)
+
+
+def test_flush_inserts_in_batches_in_submit_order(spill_path):
+    db = RecordingDatabase()
+    writer = make_writer(db, spill_path, max_batch_jobs=2)
+
+    writer.submit(make_jobs(5))
+    assert writer.flush(timeout=5)
+    writer.close()
+
+    assert [len(batch) for batch in db.batches] == [2, 2, 1]
+    assert [url for batch in db.batches for url in batch] == [job['url'] for job in make_jobs(5)]
+    assert writer.stats()['jobs_flushed'] == 5
+
+
+def test_receipt_counts_only_its_own_jobs(spill_path):
+    writer = make_writer(RecordingDatabase(), spill_path)
+    mine, other = writer.new_receipt(), writer.new_receipt()
+
+    writer.submit(make_jobs(3, "mine"), receipt=mine)
+    writer.submit(make_jobs(4, "other"), receipt=other)
+    writer.flush(timeout=5)
+    writer.close()
+
+    assert mine == {"jobs_saved": 3, "jobs_dead_lettered": 0}
+    assert other['jobs_saved'] == 4
+
+
+def test_unflushed_jobs_are_recovered_on_restart(spill_path):
+    crashed = make_writer(RecordingDatabase(succeed=0), spill_path, max_attempts=1000)
+    crashed.submit(make_jobs(3))
+    crashed.close(timeout=0.2)
+
+    db = RecordingDatabase()
+    writer = make_writer(db, spill_path)
+    assert writer.stats()['recovered_jobs'] == 3
+    writer.flush(timeout=5)
+    writer.close()
+
+    assert db.batches == [[job['url'] for job in make_jobs(3)]]
+
+
+def test_checkpoint_skips_flushed_jobs_on_restart(spill_path):
+    # The first batch is saved and checkpointed, then the database goes down
+    crashed = make_writer(RecordingDatabase(succeed=1), spill_path, max_batch_jobs=2, max_attempts=1000)
+    crashed.submit(make_jobs(5))
+    crashed.close(timeout=0.3)
+
+    db = RecordingDatabase()
+    writer = make_writer(db, spill_path)
+    assert writer.stats()['recovered_jobs'] == 3
+    writer.flush(timeout=5)
+    writer.close()
+
+    assert db.batches == [[job['url'] for job in make_jobs(5)[2:]]]
+
+
+def test_failing_batch_is_dead_lettered_after_max_attempts(spill_path):
+    db = RecordingDatabase(succeed=0)
+    writer = make_writer(db, spill_path, max_attempts=2)
+    receipt = writer.new_receipt()
+
+    writer.submit(make_jobs(2), receipt=receipt)
+    assert writer.flush(timeout=5)
+    writer.close()
+
+    assert db.calls == 2
+    assert receipt == {"jobs_saved": 0, "jobs_dead_lettered": 2}
+    assert writer.stats()['jobs_dead_lettered'] == 2
+
+    with open(writer.dead_letter_path) as handle:
+        letters = [json.loads(line) for line in handle]
+    assert [letter['job']['url'] for letter in letters] == [job['url'] for job in make_jobs(2)]
+    assert letters[0]['error'] == "database down"
+
+    # Dead-lettered jobs are out of the spill file, so a restart does not retry them
+    restarted = make_writer(RecordingDatabase(), spill_path)
+    assert restarted.stats()['recovered_jobs'] == 0
+    restarted.close()
+
+
+def test_submit_times_out_when_the_buffer_stays_full(spill_path):
+    writer = make_writer(RecordingDatabase(succeed=0), spill_path, max_pending_jobs=2, max_attempts=1000)
+    writer.submit(make_jobs(2))
+
+    with pytest.raises(TimeoutError):
+        writer.submit(make_jobs(1, "late"), timeout=0.05)
+    assert writer.stats()['backpressure_waits'] == 1
+    writer.close(timeout=0.2)
@@ -0,0 +1,177 @@
+"""
+Model client limits (ai/llm_client.py) driven by FakeLLMClient: retries,
+circuit breaker and coalescing of identical prompts
+"""
+
+import threading
+import time
+
+import pytest
+
+from ai.llm_client import FakeLLMClient, LLMTimeoutError, LLMUnavailableError
+
+
+class CountingFakeLLMClient(FakeLLMClient):
+    """Counts the calls that reach the model"""
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.calls = 0
+
+    def _generate(self, prompt, model, timeout):
+        self.calls += 1
+        return super()._generate(prompt, model, timeout)
+
+
+def test_transient_failures_are_retried(make_llm):
+    llm = make_llm(response="ok", failures=2, max_retries=2)
+
+    assert llm.generate("prompt", "model") == "ok"
+    stats = llm.metrics.stats()
+    assert stats["retries"] == 2
+    assert stats["failed"] == 2
+    assert stats["succeeded"] == 1
+    assert stats["errors"] == {"ConnectionError": 2}
+
+
+def test_last_error_is_raised_when_retries_run_out(make_llm):
+    llm = make_llm(response="ok", failures=3, max_retries=1)
+
+    with pytest.raises(ConnectionError):
+        llm.generate("prompt", "model")
+    assert llm.metrics.stats()["retries"] == 1
+
+
+def test_breaker_opens_after_threshold_and_rejects_calls(make_llm):
+    llm = make_llm(response="ok", failures=3, max_retries=0, breaker_threshold=3, breaker_cooldown=60)
+
+    for number in range(3):
+        with pytest.raises(ConnectionError):
+            llm.generate(f"prompt {number}", "model")
+    assert llm.breaker.state() == "open"
+
+    with pytest.raises(LLMUnavailableError):
+        llm.generate("prompt", "model")
+    assert llm.metrics.stats()["rejected"] == 1
+
+
+def test_half_open_trial_success_closes_breaker(make_llm):
+    llm = make_llm(response="ok", failures=1, max_retries=0, breaker_threshold=1, breaker_cooldown=0.05)
+
+    with pytest.raises(ConnectionError):
+        llm.generate("first", "model")
+    assert llm.breaker.state() == "open"
+
+    time.sleep(0.06)
+    assert llm.breaker.state() == "half-open"
+    assert llm.generate("second", "model") == "ok"
+    assert llm.breaker.state() == "closed"
+
+
+def test_half_open_trial_timeout_reopens_breaker(make_llm):
+    llm = make_llm(response="ok", max_retries=0, max_concurrency=1, breaker_threshold=1, breaker_cooldown=0.05)
+    llm.breaker.record(False)
+    time.sleep(0.06)
+    assert llm.breaker.state() == "half-open"
+
+    # The only slot is busy, so the trial call times out waiting for it
+    llm._slots.acquire()
+    try:
+        with pytest.raises(LLMTimeoutError):
+            llm.generate("trial", "model", timeout=0.05)
+    finally:
+        llm._slots.release()
+
+    assert llm.breaker.state() == "open"
+    assert llm.breaker.opened == 2
+
+
+def test_bad_requests_do_not_open_breaker(make_llm):
+    llm = make_llm(response="ok", max_retries=0, breaker_threshold=1)
+    llm._generate = lambda prompt, model, timeout: (_ for _ in ()).throw(ValueError("bad prompt"))
+
+    with pytest.raises(ValueError):
+        llm.generate("prompt", "model")
+    assert llm.breaker.state() == "closed"
+
+
+def test_identical_concurrent_prompts_share_one_call():
+    llm = CountingFakeLLMClient(response="shared", first_chunk_delay=0.2, chunk_delay=0.0)
+    results = []
+
+    def call():
+        results.append(llm.generate("same prompt", "model"))
+
+    threads = [threading.Thread(target=call) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["shared"] * 5
+    assert llm.calls == 1
+    assert llm.metrics.stats()["coalesced"] == 4
+
+
+def test_different_prompts_are_not_coalesced():
+    llm = CountingFakeLLMClient(response="answer", first_chunk_delay=0.0, chunk_delay=0.0)
+
+    llm.generate("first", "model")
+    llm.generate("second", "model")
+    assert llm.calls == 2
+    assert llm.metrics.stats()["coalesced"] == 0
+
+
+def test_stream_chunks_join_to_the_full_text(make_llm):
+    text = "one two three four five six seven eight nine ten eleven twelve thirteen"
+    llm = make_llm(response=text, words_per_chunk=3)
+
+    stream = llm.stream("prompt", "model")
+    chunks = list(stream)
+
+    assert len(chunks) == 5
+    assert "".join(chunks) == text
+    assert stream.text == text
+    assert stream.metrics["chunks"] == 5
+    assert stream.metrics["ttft_ms"] is not None
+
+
+def test_stream_retries_before_the_first_chunk(make_llm):
+    llm = make_llm(response="streamed answer", failures=1, max_retries=1)
+
+    assert "".join(llm.stream("prompt", "model")) == "streamed answer"
+    assert llm.metrics.stats()["retries"] == 1
+
+
+def test_calls_beyond_max_concurrency_wait_for_a_slot(make_llm):
+    llm = make_llm(response="ok", first_chunk_delay=0.05, max_concurrency=2)
+    results = []
+
+    def call(number):
+        results.append(llm.generate(f"prompt {number}", "model"))
+
+    threads = [threading.Thread(target=call, args=(number,)) for number in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = llm.metrics.stats()
+    assert results == ["ok"] * 6
+    assert stats["max_in_flight"] == 2
+    assert stats["succeeded"] == 6
+    assert stats["in_flight"] == 0
+
+
+def test_waiting_for_a_slot_counts_against_the_deadline(make_llm):
+    llm = make_llm(response="ok", max_retries=0, max_concurrency=1)
+
+    llm._slots.acquire()
+    try:
+        with pytest.raises(LLMTimeoutError):
+            llm.generate("prompt", "model", timeout=0.05)
+    finally:
+        llm._slots.release()
+
+    assert llm.metrics.stats()["timeouts"] == 1
+    assert llm.generate("prompt", "model") == "ok"
@@ -0,0 +1,119 @@
+"""
+Local candidate info parser (ai/local_extractor.py): headings, years and body
+text must not come back as answers, and hybrid mode only asks the model
+about fields the parser is unsure of
+"""
+
+import json
+
+import pytest
+
+import ai.extract_candidate_info as candidate_info
+from ai.llm_client import set_llm_client
+from ai.local_extractor import CORROBORATED_CONFIDENCE, HEURISTIC_CONFIDENCE, extract_local
+
+
+RESUME = """WORK EXPERIENCE
+Priya Sharma
+Senior HR Executive
+priya.sharma@example.com | +91 98765 43210
+linkedin.com/in/priya
+Summary
+Recruited engineers at Acme 2016 - 2019 2019 - 2023 and ran Python payroll reports.
+"""
+
+
+def test_heading_is_not_taken_as_the_name():
+    info, confidence = extract_local(RESUME)
+
+    assert info['name'] == "Priya Sharma"
+    # Two lines above the contact line
+    assert confidence['name'] == CORROBORATED_CONFIDENCE
+
+
+def test_domain_comes_from_the_headline():
+    info, confidence = extract_local(RESUME)
+
+    assert info['domain'] == "Human Resources"
+    # Python and Payroll point to different domains, so the headline stands alone
+    assert confidence['domain'] == HEURISTIC_CONFIDENCE
+
+
+def test_contact_details_are_found():
+    info, confidence = extract_local(RESUME)
+
+    assert info['email'] == "priya.sharma@example.com"
+    assert info['mobile'] == "+91 98765 43210"
+    assert confidence['email'] == 1.0
+
+
+def test_year_ranges_are_not_a_mobile_number():
+    info, confidence = extract_local("Experience\nAcme 2015 2019 2020 2023\nBeta 2016 - 2019 2019 - 2023\n")
+
+    assert info['mobile'] is None
+    assert confidence['mobile'] == 0.0
+
+
+def test_body_text_does_not_decide_name_or_domain():
+    info, confidence = extract_local(
+        "Work Experience\nEducation\n"
+        "Developed Java services for payments, worked with designers on UX and led QA reviews.\n"
+    )
+
+    assert info['name'] is None
+    assert info['domain'] is None
+    assert confidence['domain'] == 0.0
+    assert "Java" in info['skills']
+
+
+def test_name_away_from_contact_details_is_a_guess():
+    info, confidence = extract_local("Priya Sharma\nSummary\nBackend developer\nNotes\npriya@example.com\n")
+
+    assert info['name'] == "Priya Sharma"
+    assert confidence['name'] == HEURISTIC_CONFIDENCE
+
+
+CLEAN_RESUME = """Priya Sharma
+Backend Developer
+priya.sharma@example.com | +91 98765 43210
+Summary
+Backend developer with 5 years of experience building APIs.
+Skills
+Python, Django, PostgreSQL, Docker
+"""
+
+MODEL_ANSWER = {
+    "name": "Priya S.", "email": "priya.sharma@example.com", "mobile": "+91 98765 43210",
+    "experience": 5, "domain": "Human Resources", "skills": ["Python"]
+}
+
+
+@pytest.fixture
+def hybrid_llm(make_llm, monkeypatch):
+    monkeypatch.setattr(candidate_info, "EXTRACTION_MODE", "hybrid")
+    llm = make_llm(response=json.dumps(MODEL_ANSWER))
+    set_llm_client(llm)
+    yield llm
+    set_llm_client(None)
+
+
+def test_well_formed_resume_makes_no_model_call(hybrid_llm):
+    info = candidate_info.extract_candidate_info(CLEAN_RESUME)
+
+    assert info['source'] == "local"
+    assert info['name'] == "Priya Sharma"
+    assert info['domain'] == "Software Development"
+    assert info['experience'] == 5
+    assert hybrid_llm.metrics.stats()['attempts'] == 0
+
+
+def test_unsure_fields_are_asked_of_the_model(hybrid_llm):
+    info = candidate_info.extract_candidate_info(RESUME)
+
+    assert info['source'] == "hybrid"
+    assert hybrid_llm.metrics.stats()['attempts'] == 1
+    # Corroborated locally, so the model's answer does not replace it
+    assert info['name'] == "Priya Sharma"
+    # Unsure locally (no stated experience, a lone headline), so the model's answer is used
+    assert info['experience'] == 5
+    assert info['domain'] == "Human Resources"
@@ -0,0 +1,86 @@
+"""
+POST /api/recommend/batch: NDJSON results per profile against the temporary
+SQLite store, limit clamping and request validation
+"""
+
+import json
+
+import pytest
+
+from app import MAX_BATCH_LIMIT, MAX_BATCH_PROFILES
+
+
+@pytest.fixture(scope="module")
+def python_jobs(job_db):
+    job_db.insert_jobs([
+        {'title': f'Python Developer {number}', 'description': 'Python, Django and PostgreSQL APIs',
+         'location': 'Pune', 'url': f'https://jobs.example.com/python/{number}', 'source': 'Naukri'}
+        for number in range(MAX_BATCH_LIMIT + 10)
+    ])
+
+
+def recommend_batch(client, limit):
+    response = client.post("/api/recommend/batch", json={
+        "profiles": [{"id": "candidate", "resume_skills": ["Python", "Django"]}],
+        "limit": limit
+    })
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    return response, lines
+
+
+@pytest.mark.parametrize("limit, expected", [(10_000, MAX_BATCH_LIMIT), (-5, 1), (0, 1), ("3", 3)])
+def test_batch_limit_is_clamped(client, python_jobs, limit, expected):
+    response, lines = recommend_batch(client, limit)
+
+    assert response.status_code == 200
+    assert lines[0]['id'] == "candidate"
+    assert len(lines[0]['jobs']) == expected
+    assert lines[-1]['summary']['candidates'] == 1
+
+
+@pytest.mark.parametrize("limit", ["ten", None, [5], {"value": 5}])
+def test_batch_limit_must_be_an_integer(client, limit):
+    response = client.post("/api/recommend/batch", json={
+        "profiles": [{"resume_skills": ["Python"]}],
+        "limit": limit
+    })
+
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "'limit' must be an integer"}
+
+
+def test_profiles_are_answered_in_input_order(client, python_jobs):
+    response = client.post("/api/recommend/batch", json={
+        "profiles": [
+            {"id": "skills", "resume_skills": ["Django"]},
+            {"id": "text", "resume_text": "Five years building PostgreSQL backed Python APIs"},
+            {"id": "nothing", "resume_skills": ["Quenya"]},
+        ],
+        "limit": 2
+    })
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+    assert [line['id'] for line in lines[:-1]] == ["skills", "text", "nothing"]
+    assert len(lines[0]['jobs']) == 2 and len(lines[1]['jobs']) == 2
+    assert lines[2]['jobs'] == []
+    assert lines[-1]['summary']['candidates'] == 3
+
+
+@pytest.mark.parametrize("body, error", [
+    ({}, "No profiles provided"),
+    ({"profiles": []}, "No profiles provided"),
+    ({"profiles": ["Python"]}, "Profile 0 must be an object"),
+])
+def test_invalid_batches_are_rejected(client, body, error):
+    response = client.post("/api/recommend/batch", json=body)
+
+    assert response.status_code == 400
+    assert response.get_json() == {"error": error}
+
+
+def test_too_many_profiles_are_rejected(client):
+    response = client.post("/api/recommend/batch", json={
+        "profiles": [{"resume_skills": ["Python"]}] * (MAX_BATCH_PROFILES + 1)
+    })
+
+    assert response.status_code == 400
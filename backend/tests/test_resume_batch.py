@@ -0,0 +1,128 @@
+"""
+Batch resume uploads (utils/resume_processing.py): zip archives unpacked on
+demand, limits of a batch and POST /api/upload-resumes streaming one result
+per file
+"""
+
+import io
+import json
+import zipfile
+
+import pytest
+
+import utils.resume_processing as resume_processing
+from utils.resume_processing import ResumeBatch, UnsupportedResumeError, read_bounded, unpack_uploads
+
+
+def make_zip(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    buffer.seek(0)
+    return buffer
+
+
+def parse_events(body: str):
+    """(event, payload) pairs of an SSE body"""
+    events = []
+    for message in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in message.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_zip_members_are_unpacked_when_read():
+    archive = make_zip({
+        "resumes/alice.pdf": b"alice",
+        "resumes/bob.docx": b"bob",
+        "resumes/notes.txt": b"skipped",
+        "__MACOSX/resumes/._alice.pdf": b"skipped",
+    })
+
+    files = unpack_uploads([("carol.pdf", io.BytesIO(b"carol")), ("batch.zip", archive)])
+
+    assert [filename for filename, _ in files] == ["carol.pdf", "alice.pdf", "bob.docx"]
+    assert [read() for _, read in files] == [b"carol", b"alice", b"bob"]
+
+
+def test_corrupt_archive_is_rejected():
+    with pytest.raises(UnsupportedResumeError, match="not a valid zip archive"):
+        unpack_uploads([("batch.zip", io.BytesIO(b"not a zip"))])
+
+
+def test_batch_limits(monkeypatch):
+    monkeypatch.setattr(resume_processing, "MAX_BATCH_FILES", 2)
+    with pytest.raises(UnsupportedResumeError, match="Too many resumes"):
+        unpack_uploads([(f"{number}.pdf", io.BytesIO(b"")) for number in range(3)])
+
+    monkeypatch.setattr(resume_processing, "MAX_BATCH_UNPACKED_BYTES", 10)
+    with pytest.raises(UnsupportedResumeError, match="unpacks to more than"):
+        unpack_uploads([("batch.zip", make_zip({"a.pdf": b"x" * 6, "b.pdf": b"x" * 6}))])
+
+
+def test_oversized_file_fails_only_when_read():
+    with pytest.raises(UnsupportedResumeError, match="larger than"):
+        read_bounded(io.BytesIO(b"x" * 11), "big.pdf", limit=10)
+    assert read_bounded(io.BytesIO(b"x" * 10), "small.pdf", limit=10) == b"x" * 10
+
+
+def test_batch_yields_every_file_and_a_summary(make_pdf):
+    def unreadable():
+        raise UnsupportedResumeError("big.pdf is larger than 10MB")
+
+    files = [(f"resume-{number}.pdf", lambda number=number: make_pdf(f"Candidate {number}", "Skills: Python"))
+             for number in range(5)]
+    files += [("notes.doc", lambda: b"not a document"), ("big.pdf", unreadable)]
+    batch = ResumeBatch(files)
+
+    results = sorted(batch, key=lambda result: result['index'])
+
+    assert [result['filename'] for result in results] == [filename for filename, _ in files]
+    assert [result['success'] for result in results] == [True] * 5 + [False, False]
+    assert "Candidate 3" in results[3]['resume_text']
+    assert set(results[0]['timings_ms']) == {"extract", "candidate_info"}
+    assert results[5]['error'].startswith("Error extracting text")
+    assert results[6]['error'] == "big.pdf is larger than 10MB"
+    assert batch.summary['files'] == 7
+    assert batch.summary['succeeded'] == 5 and batch.summary['failed'] == 2
+
+
+def test_upload_resumes_streams_a_result_per_file(client, make_pdf):
+    response = client.post("/api/upload-resumes", data={'files': [
+        (io.BytesIO(make_pdf("Jane Doe", "Skills: Python")), "jane.pdf"),
+        (make_zip({"john.pdf": make_pdf("John Roe", "Skills: SQL"), "readme.txt": b"skipped"}), "more.zip"),
+    ]})
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/event-stream"
+    events = parse_events(response.get_data(as_text=True))
+    names = [name for name, _ in events]
+    assert names == ["start", "result", "result", "done"]
+    assert events[0][1] == {"files": 2}
+    assert sorted(payload['filename'] for name, payload in events if name == "result") == ["jane.pdf", "john.pdf"]
+    assert all(payload['success'] for name, payload in events if name == "result")
+    assert events[-1][1]['succeeded'] == 2
+
+
+def test_upload_resumes_validates_the_files(client):
+    assert client.post("/api/upload-resumes", data={}).status_code == 400
+
+    response = client.post("/api/upload-resumes", data={'files': [(io.BytesIO(b"x"), "notes.txt")]})
+    assert response.status_code == 400
+    assert response.get_json()['files'] == ["notes.txt"]
+
+    response = client.post("/api/upload-resumes", data={'files': [(make_zip({"a.txt": b"x"}), "empty.zip")]})
+    assert response.get_json() == {"error": "No PDF, DOC or DOCX files found"}
+
+
+def test_only_batch_uploads_accept_bodies_over_the_resume_limit(client):
+    big = b"x" * (resume_processing.MAX_RESUME_BYTES + 1024)
+
+    single = client.post("/api/upload-resume", data={'file': (io.BytesIO(big), "big.pdf")})
+    assert single.status_code == 413
+
+    batch = client.post("/api/upload-resumes", data={'files': [(io.BytesIO(big), "big.pdf")]})
+    events = parse_events(batch.get_data(as_text=True))
+    assert batch.status_code == 200
+    assert events[1][1]['success'] is False and "larger than" in events[1][1]['error']
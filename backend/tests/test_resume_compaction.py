@@ -0,0 +1,94 @@
+"""
+Resume compaction (ai/resume_compaction.py): sections split only at top-level
+headings, and sections dropped only when the resume is over its budget
+"""
+
+from ai.resume_compaction import clean_lines, compact_resume, split_sections
+
+
+RESUME = """Priya Sharma
+priya@example.com
+SUMMARY
+Backend engineer with 5 years of experience.
+TECHNICAL SKILLS
+Languages
+Python, Go
+Tools
+Docker, Kubernetes
+Courses
+Distributed systems
+EXPERIENCE
+Acme Corp, Senior Engineer
+Built payment APIs.
+REFERENCES
+Available on request.
+"""
+
+
+def sections_of(text):
+    lines, _ = clean_lines(text)
+    return [(section, len(body)) for section, body in split_sections(lines)]
+
+
+def test_subheadings_stay_in_their_section():
+    assert sections_of(RESUME) == [
+        ("header", 2), ("summary", 2), ("skills", 7), ("experience", 3), ("references", 2)
+    ]
+
+
+def test_lowercase_heading_inside_capitalized_resume_is_not_a_section():
+    text = "Name\nEXPERIENCE\nAcme Corp\nEducation\nMentored interns\nEDUCATION\nB.Tech\n"
+
+    assert sections_of(text) == [("header", 1), ("experience", 4), ("education", 2)]
+
+
+def test_resume_within_budget_is_sent_whole():
+    compacted, report = compact_resume(RESUME, "analysis")
+
+    assert report['sections'] == ["header", "summary", "skills", "experience", "references"]
+    assert report['dropped'] == [] and report['truncated'] == []
+    assert "Available on request." in compacted
+
+
+def test_over_budget_drops_other_sections_before_prompt_sections():
+    compacted, report = compact_resume(RESUME, "analysis", budget_tokens=60)
+
+    assert report['sections'] == ["header", "summary", "skills", "experience"]
+    assert report['dropped'] == ["references"]
+    assert "Docker, Kubernetes" in compacted
+    assert "Available on request." not in compacted
+
+
+def test_kept_sections_keep_document_order():
+    compacted, _ = compact_resume(RESUME, "candidate_info", budget_tokens=60)
+
+    positions = [compacted.index(marker) for marker in ("Priya Sharma", "SUMMARY", "TECHNICAL SKILLS", "EXPERIENCE")]
+    assert positions == sorted(positions)
+
+
+def test_prompt_section_over_budget_is_cut_by_lines():
+    experience = "\n".join(f"Built service number {number} for payments." for number in range(40))
+    text = f"Priya Sharma\npriya@example.com\nEXPERIENCE\n{experience}\n"
+
+    compacted, report = compact_resume(text, "candidate_info", budget_tokens=60)
+
+    assert report['truncated'] == ["experience"]
+    assert "Built service number 0 for payments." in compacted
+    assert "Built service number 39 for payments." not in compacted
+    assert report['tokens'] <= 60
+
+
+def test_page_furniture_is_removed():
+    bodies = [
+        ["EXPERIENCE", "Acme Corp, Senior Engineer", "- Built payment APIs", "- Led the data team", "-----"],
+        ["EDUCATION", "B.Tech, IIT Delhi", "- Graduated 2016", "- Robotics club lead", "-----"],
+    ]
+    text = "\f".join(
+        "\n".join(["Priya Sharma - Resume"] + body + [f"Page {number} of 2"])
+        for number, body in enumerate(bodies, start=1)
+    )
+
+    lines, removed = clean_lines(text)
+
+    assert lines == bodies[0][:-1] + bodies[1][:-1]
+    assert removed == 6
@@ -0,0 +1,129 @@
+"""
+Asynchronous resume uploads (utils/resume_processing.py): the bounded worker
+queue, job records shared through SQLite and the status routes that poll them
+"""
+
+import io
+import queue
+
+import pytest
+
+from utils.resume_processing import ResumeProcessingQueue, get_resume_queue
+
+RESUME = ("Jane Doe", "jane@example.com", "Skills: Python, Django, SQL")
+
+
+@pytest.fixture
+def jobs_path(tmp_path):
+    return str(tmp_path / "resume_jobs.sqlite3")
+
+
+def test_upload_moves_through_the_stages_to_done(jobs_path, make_pdf):
+    processing = ResumeProcessingQueue(workers=2, path=jobs_path)
+    record = processing.submit(make_pdf(*RESUME), "jane.pdf")
+
+    assert record['status'] == "queued"
+    assert processing.drain(timeout=10)
+
+    done = processing.get(record['id'])
+    assert done['status'] == "done" and done['stage'] is None
+    assert done['result']['filename'] == "jane.pdf"
+    assert "jane@example.com" in done['result']['resume_text']
+    assert set(done['timings_ms']) == {"queue", "extract", "candidate_info", "total"}
+    stats = processing.stats()
+    assert stats['submitted'] == 1 and stats['completed'] == 1
+    assert set(stats['stage_ms']) == set(done['timings_ms'])
+
+
+def test_unreadable_upload_fails_with_the_error(jobs_path):
+    processing = ResumeProcessingQueue(workers=1, path=jobs_path)
+    record = processing.submit(b"not a resume", "notes.txt")
+    processing.drain(timeout=10)
+
+    failed = processing.get(record['id'])
+    assert failed['status'] == "failed"
+    assert failed['error'] == "Unsupported file format"
+    assert processing.stats()['failed'] == 1
+
+
+def test_full_queue_rejects_and_forgets_the_upload(jobs_path):
+    # No workers, so the first upload stays queued
+    processing = ResumeProcessingQueue(workers=0, max_queued=1, path=jobs_path)
+    processing.submit(b"first", "first.pdf")
+
+    with pytest.raises(queue.Full):
+        processing.submit(b"second", "second.pdf")
+
+    count = processing._execute("SELECT COUNT(*) FROM resume_jobs").fetchone()[0]
+    assert count == 1
+    assert processing.stats()['rejected'] == 1
+
+
+def test_records_are_readable_from_another_process(jobs_path, make_pdf):
+    processing = ResumeProcessingQueue(workers=1, path=jobs_path)
+    record = processing.submit(make_pdf(*RESUME), "jane.pdf")
+    processing.drain(timeout=10)
+
+    # A second queue on the same file stands in for another worker process
+    other = ResumeProcessingQueue(workers=1, path=jobs_path)
+    assert other.get(record['id'])['status'] == "done"
+    assert [update['status'] for update in other.follow(record['id'], timeout=5)] == ["done"]
+
+
+def test_follow_yields_each_change_until_done(jobs_path, make_pdf):
+    processing = ResumeProcessingQueue(workers=0, path=jobs_path)
+    record = processing.submit(make_pdf(*RESUME), "jane.pdf")
+    updates = processing.follow(record['id'], timeout=10)
+
+    assert next(updates)['status'] == "queued"
+    # Start the worker only once the reader has seen the queued record
+    processing.workers = 1
+    processing._start_workers()
+    assert [update['status'] for update in updates][-1] == "done"
+
+
+def test_expired_records_are_forgotten(jobs_path):
+    processing = ResumeProcessingQueue(workers=0, path=jobs_path, ttl_seconds=0)
+    first = processing.submit(b"first", "first.pdf")
+    processing.submit(b"second", "second.pdf")
+
+    assert processing.get(first['id']) is None
+
+
+def test_async_upload_returns_a_processing_id_to_poll(client, make_pdf):
+    response = client.post("/api/upload-resume", data={
+        'file': (io.BytesIO(make_pdf(*RESUME)), "jane.pdf"),
+        'async': "true"
+    })
+
+    assert response.status_code == 202
+    body = response.get_json()
+    assert response.headers["Location"] == body['status_url']
+    assert body['events_url'] == f"{body['status_url']}/events"
+
+    assert get_resume_queue().drain(timeout=10)
+    status = client.get(body['status_url'])
+    assert status.status_code == 200
+    processing = status.get_json()['processing']
+    assert processing['id'] == body['processing_id']
+    assert processing['status'] == "done"
+    assert processing['result']['filename'] == "jane.pdf"
+
+
+def test_full_queue_answers_503(client, make_pdf, monkeypatch):
+    def full(*args, **kwargs):
+        raise queue.Full
+
+    monkeypatch.setattr(get_resume_queue(), "submit", full)
+    response = client.post("/api/upload-resume?async=true", data={'file': (io.BytesIO(make_pdf(*RESUME)), "jane.pdf")})
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "5"
+
+
+def test_unknown_and_other_users_processing_ids_are_not_found(client):
+    record = get_resume_queue().submit(b"not a resume", "notes.txt", user_id="someone-else")
+
+    assert client.get("/api/resume-processing/unknown").status_code == 404
+    assert client.get(f"/api/resume-processing/{record['id']}").status_code == 404
+    assert client.get(f"/api/resume-processing/{record['id']}/events").status_code == 404
@@ -0,0 +1,56 @@
+"""
+POST /api/analyze-text/stream: Server-Sent Events from the fake model
+"""
+
+import json
+
+from ai.llm_client import set_llm_client
+
+
+def parse_events(body: str):
+    """(event, payload) pairs of an SSE body"""
+    events = []
+    for message in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in message.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_stream_sends_chunks_then_metrics(client, fake_llm):
+    response = client.post("/api/analyze-text/stream", json={"text": "Python developer with 5 years of Flask"})
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/event-stream"
+    assert response.headers["Cache-Control"] == "no-cache"
+
+    events = parse_events(response.get_data(as_text=True))
+    names = [name for name, _ in events]
+    assert names[-1] == "done"
+    assert set(names[:-1]) == {"chunk"}
+    assert "".join(payload["text"] for name, payload in events if name == "chunk") == fake_llm.response
+
+    metrics = events[-1][1]
+    assert metrics["cached"] is False
+    assert metrics["chunks"] == len(events) - 1
+    assert metrics["output_tokens"] > 0
+    assert metrics["ttft_ms"] is not None and metrics["total_ms"] >= metrics["ttft_ms"]
+
+
+def test_stream_reports_model_failure_as_error_event(client, make_llm):
+    set_llm_client(make_llm(response="unused", failures=5, max_retries=1))
+    try:
+        response = client.post("/api/analyze-text/stream", json={"text": "Python developer"})
+    finally:
+        set_llm_client(None)
+
+    assert response.status_code == 200
+    events = parse_events(response.get_data(as_text=True))
+    assert [name for name, _ in events] == ["error"]
+    assert "Fake transient failure" in events[0][1]["error"]
+
+
+def test_stream_rejects_empty_text(client, fake_llm):
+    response = client.post("/api/analyze-text/stream", json={"text": "   "})
+
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "Empty text provided"}
@@ -1 +1 @@
-from .extract_text import extract_text_from_resume
+from .extract_text import extract_text_from_bytes, extract_text_from_resume
@@ -0,0 +1,104 @@
+"""
+Authentication of API callers
+The frontend signs users in with Supabase Auth and sends the session's access
+token as `Authorization: Bearer <token>`. Tokens are verified locally with
+SUPABASE_JWT_SECRET (HS256) when it is set, otherwise by asking Supabase Auth
+for the token's user (answers are cached for a minute). Routes that read or
+write a user's data use require_auth and take the user id from the token,
+never from the request body.
+"""
+
+from functools import wraps
+from typing import Callable, Optional
+import base64
+import hashlib
+import hmac
+import json
+import os
+import time
+
+from flask import g, jsonify, request
+
+from utils.job_cache import LRUTTLCache
+
+
+JWT_SECRET = os.getenv("SUPABASE_JWT_SECRET")
+
+# Supabase signs user sessions for this audience
+JWT_AUDIENCE = "authenticated"
+
+# Remote verifications are cached briefly; a revoked token stays valid this long
+_verified_tokens = LRUTTLCache(max_entries=1024, ttl_seconds=60)
+
+
+def _b64decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def _verify_locally(token: str, secret: str) -> Optional[str]:
+    """User id of an HS256 token signed with the project's JWT secret, or None"""
+    try:
+        header_b64, payload_b64, signature_b64 = token.split(".")
+        if json.loads(_b64decode(header_b64)).get("alg") != "HS256":
+            return None
+        expected = hmac.new(secret.encode(), f"{header_b64}.{payload_b64}".encode(), hashlib.sha256).digest()
+        if not hmac.compare_digest(expected, _b64decode(signature_b64)):
+            return None
+        claims = json.loads(_b64decode(payload_b64))
+    except (ValueError, TypeError):
+        return None
+
+    audience = claims.get("aud")
+    if audience is not None and JWT_AUDIENCE not in (audience if isinstance(audience, list) else [audience]):
+        return None
+    if not isinstance(claims.get("exp"), (int, float)) or claims["exp"] <= time.time():
+        return None
+    return claims.get("sub") or None
+
+
+def _verify_with_supabase(token: str) -> Optional[str]:
+    """User id Supabase Auth reports for the token, or None"""
+    hit, user_id = _verified_tokens.get(token)
+    if hit:
+        return user_id
+    try:
+        from utils.supabase_client import get_supabase_client
+        response = get_supabase_client().auth.get_user(token)
+        user_id = response.user.id if response and response.user else None
+    except Exception as e:
+        print(f"⚠️  Could not verify access token: {str(e)}")
+        return None
+    _verified_tokens.set(token, user_id)
+    return user_id
+
+
+def verify_token(token: str) -> Optional[str]:
+    """
+    Verify a Supabase access token
+
+    Returns:
+        str: The user id (the token's subject), or None if the token is invalid or expired
+    """
+    if not token:
+        return None
+    if JWT_SECRET:
+        return _verify_locally(token, JWT_SECRET)
+    return _verify_with_supabase(token)
+
+
+def authenticated_user_id() -> Optional[str]:
+    """The verified user id of the current request, or None without a valid token"""
+    if "user_id" not in g:
+        scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+        g.user_id = verify_token(token.strip()) if scheme.lower() == "bearer" else None
+    return g.user_id
+
+
+def require_auth(view: Callable) -> Callable:
+    """Answer 401 unless the request carries a valid access token"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if authenticated_user_id() is None:
+            return jsonify({"error": "Authentication required"}), 401
+        return view(*args, **kwargs)
+    return wrapper
@@ -4,7 +4,7 @@ Scrapes jobs from multiple sources for common keywords and stores in database
 """
 
 from scraper.job_scraper_manager import JobScraperManager
-from utils.job_database import JobDatabase
+from utils.job_write_buffer import get_job_writer
 from datetime import datetime
 import threading
 
@@ -42,15 +42,17 @@ class BackgroundJobScraper:
         """
         self.headless = headless
         self.scraper_manager = JobScraperManager(headless=headless)
-        self.db = JobDatabase()
+        # Shared by every scrape in this process; inserts happen in batches in the background
+        self.writer = get_job_writer()
     
-    def scrape_keyword(self, keyword: str, max_jobs_per_source: int = 5) -> dict:
+    def scrape_keyword(self, keyword: str, max_jobs_per_source: int = 5, receipt: dict = None) -> dict:
         """
         Scrape jobs for a single keyword and save to database
         
         Args:
             keyword (str): Job search keyword
             max_jobs_per_source (int): Max jobs to scrape per source
+            receipt (dict): From writer.new_receipt(); counts this caller's saved jobs
             
         Returns:
             dict: Scraping results
@@ -66,11 +68,11 @@ class BackgroundJobScraper:
                 sources=['naukri', 'linkedin', 'unstop']
             )
             
-            # Save to database
+            # Queue for batched insertion (blocks only if the database falls behind)
             if result['jobs']:
-                db_result = self.db.insert_jobs(result['jobs'])
-                result['database'] = db_result
-                print(f"✅ Saved {db_result.get('inserted_count', 0)} jobs for '{keyword}'")
+                queued_count = self.writer.submit(result['jobs'], receipt=receipt)
+                result['database'] = {"success": True, "queued_count": queued_count}
+                print(f"✅ Queued {queued_count} jobs for '{keyword}'")
             
             return result
             
@@ -82,6 +84,21 @@ class BackgroundJobScraper:
                 "error": str(e)
             }
     
+    def flush(self, timeout: float = 120) -> dict:
+        """
+        Wait for queued jobs to reach the database
+        
+        Args:
+            timeout (float): Maximum seconds to wait
+            
+        Returns:
+            dict: Write buffer metrics, with 'flushed' False if it did not drain in time
+        """
+        flushed = self.writer.flush(timeout=timeout)
+        stats = self.writer.stats()
+        stats['flushed'] = flushed
+        return stats
+    
     def scrape_all_popular_keywords(self, max_jobs_per_source: int = 5) -> dict:
         """
         Scrape jobs for all popular keywords
@@ -100,15 +117,18 @@ class BackgroundJobScraper:
         start_time = datetime.now()
         results = []
         total_jobs_scraped = 0
-        total_jobs_saved = 0
+        # Other scrapes share the writer, so its stats are not ours to report as saved
+        receipt = self.writer.new_receipt()
         
         for keyword in self.POPULAR_KEYWORDS:
-            result = self.scrape_keyword(keyword, max_jobs_per_source)
+            result = self.scrape_keyword(keyword, max_jobs_per_source, receipt)
             results.append(result)
             
             if result.get('success'):
                 total_jobs_scraped += result.get('total_jobs', 0)
-                total_jobs_saved += result.get('database', {}).get('inserted_count', 0)
+        
+        write_stats = self.flush()
+        total_jobs_saved = receipt['jobs_saved']
         
         end_time = datetime.now()
         duration = (end_time - start_time).total_seconds()
@@ -118,9 +138,11 @@ class BackgroundJobScraper:
             "total_keywords": len(self.POPULAR_KEYWORDS),
             "total_jobs_scraped": total_jobs_scraped,
             "total_jobs_saved": total_jobs_saved,
+            "total_jobs_dead_lettered": receipt['jobs_dead_lettered'],
             "duration_seconds": duration,
             "started_at": start_time.isoformat(),
             "completed_at": end_time.isoformat(),
+            "write_buffer": write_stats,
             "results": results
         }
         
@@ -133,6 +155,18 @@ class BackgroundJobScraper:
         
         return summary
     
+    def scrape_keywords(self, keywords: list = None, max_jobs_per_source: int = 5) -> None:
+        """
+        Scrape keywords one after another and wait for their jobs to be saved
+        
+        Args:
+            keywords (list): List of keywords to scrape (None = use popular keywords)
+            max_jobs_per_source (int): Max jobs per source per keyword
+        """
+        for keyword in keywords or self.POPULAR_KEYWORDS:
+            self.scrape_keyword(keyword, max_jobs_per_source)
+        self.flush()
+    
     def scrape_async(self, keywords: list = None, max_jobs_per_source: int = 5) -> None:
         """
         Start background scraping in a separate thread (non-blocking)
@@ -144,10 +178,6 @@ class BackgroundJobScraper:
         if keywords is None:
             keywords = self.POPULAR_KEYWORDS
         
-        def scrape_task():
-            for keyword in keywords:
-                self.scrape_keyword(keyword, max_jobs_per_source)
-        
-        thread = threading.Thread(target=scrape_task, daemon=True)
+        thread = threading.Thread(target=self.scrape_keywords, args=(keywords, max_jobs_per_source), daemon=True)
         thread.start()
         print(f"🚀 Started background scraping for {len(keywords)} keywords")
@@ -0,0 +1,139 @@
+"""
+Bounded pool for work started by a request but finished after the response
+Scrapes dispatched with async=true run here instead of on a request thread or
+an unbounded thread per call. The pool is drained when the process exits, so
+a graceful restart lets running scrapes finish and flush their jobs.
+"""
+
+from typing import Callable, Dict, List, Optional
+import atexit
+import os
+import queue
+import threading
+import time
+
+
+class BackgroundTasks:
+    """Fixed pool of worker threads with a cap on waiting tasks"""
+
+    def __init__(self, workers: int = 2, max_pending: int = 20):
+        """
+        Args:
+            workers (int): Tasks running at once
+            max_pending (int): Tasks running or waiting before new ones are rejected
+        """
+        self.workers = workers
+        self.max_pending = max_pending
+        self._queue = queue.Queue()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._pending = 0
+        self._running = 0
+        self._counts = {"submitted": 0, "rejected": 0, "completed": 0, "failed": 0}
+        # Per task name: runs and total seconds
+        self._task_stats: Dict[str, Dict[str, float]] = {}
+
+    def _start_workers(self) -> None:
+        # Daemon threads: the exit-time drain decides how long to wait for them
+        with self._lock:
+            if self._threads:
+                return
+            for number in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"background-task-{number}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, name: str, fn: Callable, *args, **kwargs) -> None:
+        """
+        Run fn(*args, **kwargs) on the pool
+
+        Args:
+            name (str): Task name used in stats (e.g. 'scrape_all_sources')
+
+        Raises:
+            queue.Full: max_pending tasks are already running or waiting
+        """
+        self._start_workers()
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._counts["rejected"] += 1
+                raise queue.Full(f"{self._pending} background tasks pending")
+            self._pending += 1
+            self._counts["submitted"] += 1
+        self._queue.put((name, fn, args, kwargs))
+
+    def _work(self) -> None:
+        while True:
+            self._run(*self._queue.get())
+
+    def _run(self, name: str, fn: Callable, args: tuple, kwargs: Dict) -> None:
+        with self._lock:
+            self._running += 1
+        started = time.perf_counter()
+        outcome = "completed"
+        try:
+            fn(*args, **kwargs)
+        except Exception as e:
+            print(f"Error in background task {name}: {str(e)}")
+            outcome = "failed"
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._pending -= 1
+                self._counts[outcome] += 1
+                task = self._task_stats.setdefault(name, {"runs": 0, "seconds": 0.0})
+                task["runs"] += 1
+                task["seconds"] += time.perf_counter() - started
+                self._idle.notify_all()
+
+    def drain(self, timeout: Optional[float] = 30) -> bool:
+        """
+        Wait for running and waiting tasks to finish
+
+        Returns:
+            bool: True if the pool is idle, False if the timeout expired first
+        """
+        with self._idle:
+            drained = self._idle.wait_for(lambda: self._pending == 0, timeout=timeout)
+            pending = self._pending
+        if not drained:
+            print(f"⚠️  {pending} background tasks still running at shutdown")
+        return drained
+
+    def stats(self) -> Dict:
+        """Task counters, pool occupancy and average run time per task name"""
+        with self._lock:
+            stats = dict(self._counts)
+            stats["running"] = self._running
+            stats["waiting"] = self._pending - self._running
+            task_stats = {name: dict(task) for name, task in self._task_stats.items()}
+        stats["workers"] = self.workers
+        stats["max_pending"] = self.max_pending
+        stats["tasks"] = {
+            name: {"runs": int(task["runs"]), "avg_seconds": round(task["seconds"] / task["runs"], 2)}
+            for name, task in sorted(task_stats.items())
+        }
+        return stats
+
+
+_background_tasks = None
+_background_tasks_lock = threading.Lock()
+
+
+def get_background_tasks() -> BackgroundTasks:
+    """
+    Get the process-wide background task pool, configured from the
+    environment: BACKGROUND_TASK_WORKERS (default 2), BACKGROUND_TASK_MAX_PENDING
+    (default 20) and SHUTDOWN_DRAIN_SECONDS (default 25, the wait at exit)
+    """
+    global _background_tasks
+    if _background_tasks is None:
+        with _background_tasks_lock:
+            if _background_tasks is None:
+                _background_tasks = BackgroundTasks(
+                    workers=int(os.getenv("BACKGROUND_TASK_WORKERS", "2")),
+                    max_pending=int(os.getenv("BACKGROUND_TASK_MAX_PENDING", "20"))
+                )
+                atexit.register(_background_tasks.drain, float(os.getenv("SHUTDOWN_DRAIN_SECONDS", "25")))
+    return _background_tasks
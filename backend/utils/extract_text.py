@@ -1,28 +1,154 @@
-import fitz  # PyMuPDF
-import docx
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import hashlib
+import io
+import os
+import threading
 
-def extract_text_from_resume(filepath):
+# Separates PDF pages in the extracted text, so running headers and footers
+# can be recognised (see ai/resume_compaction.py)
+PAGE_BREAK = "\f"
+
+# Pages read from a PDF; a resume longer than this is padding or not a resume
+MAX_PDF_PAGES = int(os.getenv("RESUME_MAX_PAGES", "20"))
+
+# PDFs with at least this many pages are split across worker processes
+PARALLEL_MIN_PAGES = int(os.getenv("RESUME_PARALLEL_MIN_PAGES", "8"))
+
+# Worker processes for page-parallel extraction of single uploads (default: one per core)
+EXTRACT_WORKERS = int(os.getenv("RESUME_EXTRACT_WORKERS", "0")) or os.cpu_count() or 1
+
+# Worker processes for batch uploads, a separate pool so single uploads never
+# queue behind a batch (default: same as RESUME_EXTRACT_WORKERS)
+BATCH_EXTRACT_WORKERS = int(os.getenv("RESUME_BATCH_EXTRACT_WORKERS", "0")) or EXTRACT_WORKERS
+
+_extract_pool = None
+_batch_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_extract_pool():
+    """Process pool for the pages of long PDFs, started on first use"""
+    global _extract_pool
+    if _extract_pool is None:
+        with _pool_lock:
+            if _extract_pool is None:
+                _extract_pool = ProcessPoolExecutor(max_workers=EXTRACT_WORKERS)
+    return _extract_pool
+
+
+def _get_batch_pool():
+    """Process pool for the files of batch uploads, started on first use"""
+    global _batch_pool
+    if _batch_pool is None:
+        with _pool_lock:
+            if _batch_pool is None:
+                _batch_pool = ProcessPoolExecutor(max_workers=BATCH_EXTRACT_WORKERS)
+    return _batch_pool
+
+
+def _extract_pdf_pages(data, start, stop):
+    """Text of pages [start, stop) of a PDF; runs in a worker process"""
+    import fitz  # PyMuPDF
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        return [doc[number].get_text() for number in range(start, stop)]
+
+
+def _extract_pdf(data, parallel=True):
+    # PyMuPDF and python-docx are imported on first use to keep app startup fast
+    import fitz  # PyMuPDF
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        page_count = min(doc.page_count, MAX_PDF_PAGES)
+        if not parallel or EXTRACT_WORKERS <= 1 or page_count < PARALLEL_MIN_PAGES:
+            return PAGE_BREAK.join(doc[number].get_text() for number in range(page_count))
+
+    # Each worker opens its own copy: a fitz document cannot be shared
+    step = -(-page_count // EXTRACT_WORKERS)
+    futures = [
+        _get_extract_pool().submit(_extract_pdf_pages, data, start, min(start + step, page_count))
+        for start in range(0, page_count, step)
+    ]
+    return PAGE_BREAK.join(text for future in futures for text in future.result())
+
+
+def extract_text_from_bytes(data, filename, parallel=True):
     """
-    Extract text from resume files (PDF or DOCX)
-    
+    Extract text from an uploaded resume without writing it to disk
+
     Args:
-        filepath (str): Path to the resume file
-        
+        data (bytes): File contents
+        filename (str): Original file name, used for the file type
+        parallel (bool): Split long PDFs across worker processes
+
     Returns:
         str: Extracted text from the resume
     """
     try:
-        # Check file type and extract text accordingly
-        if filepath.endswith(".pdf"):
-            doc = fitz.open(filepath)
-            text = "\n".join([page.get_text() for page in doc])
-            doc.close()
-            return text
-        elif filepath.endswith(".docx") or filepath.endswith(".doc"):
-            doc = docx.Document(filepath)
+        name = filename.lower()
+        if name.endswith(".pdf"):
+            return _extract_pdf(data, parallel)
+        elif name.endswith(".docx") or name.endswith(".doc"):
+            import docx
+            doc = docx.Document(io.BytesIO(data))
             return "\n".join([para.text for para in doc.paragraphs])
         else:
             return "Unsupported file format."
     except Exception as e:
+        print(f"Error extracting text from {filename}: {str(e)}")
+        return f"Error extracting text: {str(e)}"
+
+
+def submit_extraction(data, filename):
+    """
+    Extract text from an uploaded resume in a batch worker process
+
+    Used for batch uploads: whole files are spread across the batch pool,
+    so pages are not split further.
+
+    Returns:
+        Future: Resolves to the text returned by extract_text_from_bytes
+    """
+    return _get_batch_pool().submit(extract_text_from_bytes, data, filename, False)
+
+
+def extract_text_from_resume(filepath):
+    """
+    Extract text from resume files (PDF or DOCX)
+
+    Args:
+        filepath (str): Path to the resume file
+
+    Returns:
+        str: Extracted text from the resume
+    """
+    try:
+        with open(filepath, "rb") as f:
+            data = f.read()
+    except OSError as e:
         print(f"Error extracting text from {filepath}: {str(e)}")
         return f"Error extracting text: {str(e)}"
+    return extract_text_from_bytes(data, filepath)
+
+
+def save_upload(data, filename, folder):
+    """
+    Store an uploaded file under the SHA-256 of its contents
+    Identical uploads share one file, and client-supplied names never
+    reach the filesystem
+
+    Args:
+        data (bytes): File contents
+        filename (str): Original file name (only its extension is kept)
+        folder (str): Upload folder
+
+    Returns:
+        str: Path of the stored file
+    """
+    extension = Path(filename).suffix.lower()
+    path = Path(folder) / f"{hashlib.sha256(data).hexdigest()}{extension}"
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        temporary.write_bytes(data)
+        os.replace(temporary, path)
+    return str(path)
@@ -0,0 +1,107 @@
+"""
+Compression and conditional GET for API responses
+finalize_response runs after every request. GET responses get a strong ETag
+computed from the body, and a matching If-None-Match is answered with 304 Not
+Modified and no body. JSON and text bodies of at least COMPRESS_MIN_BYTES are
+compressed with brotli (when the brotli package is installed) or gzip,
+whichever the client accepts. Streamed responses (Server-Sent Events) pass
+through untouched.
+"""
+
+from typing import Optional
+import gzip
+import hashlib
+import os
+
+from flask import Request, Response
+
+
+COMPRESSION_ENABLED = os.getenv("RESPONSE_COMPRESSION_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Smaller bodies fit in one packet; compressing them only costs CPU
+COMPRESS_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESS_MIN_BYTES", "1024"))
+
+# Favour speed: most of the size gain comes at low levels
+GZIP_LEVEL = int(os.getenv("RESPONSE_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("RESPONSE_BROTLI_QUALITY", "5"))
+
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+_brotli = None
+
+
+def _load_brotli():
+    """The brotli module, or False when it is not installed"""
+    global _brotli
+    if _brotli is None:
+        try:
+            import brotli
+            _brotli = brotli
+        except ImportError:
+            _brotli = False
+    return _brotli
+
+
+def choose_encoding(request: Request) -> Optional[str]:
+    """The best encoding the client accepts ('br' or 'gzip'), or None"""
+    accepted = request.accept_encodings
+    if accepted.quality("br") > 0 and _load_brotli():
+        return "br"
+    if accepted.quality("gzip") > 0:
+        return "gzip"
+    return None
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """Compress a body with 'br' or 'gzip'"""
+    if encoding == "br":
+        return _load_brotli().compress(data, quality=BROTLI_QUALITY)
+    # mtime=0 keeps the output identical for identical bodies
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def body_etag(data: bytes) -> str:
+    """Strong validator for a response body"""
+    return hashlib.sha256(data).hexdigest()[:32]
+
+
+def finalize_response(request: Request, response: Response) -> Response:
+    """
+    Add ETags, answer conditional GETs and compress a response
+
+    Args:
+        request (Request): The current request
+        response (Response): The response produced by the view
+
+    Returns:
+        Response: The response to send (a 304 for a matching If-None-Match)
+    """
+    if response.is_streamed or response.direct_passthrough:
+        return response
+    if "Content-Encoding" in response.headers or not 200 <= response.status_code < 300:
+        return response
+
+    data = response.get_data()
+    encoding = None
+    if (COMPRESSION_ENABLED and len(data) >= COMPRESS_MIN_BYTES
+            and (response.mimetype or "").startswith(COMPRESSIBLE_TYPES)):
+        encoding = choose_encoding(request)
+        response.vary.add("Accept-Encoding")
+
+    if request.method in ("GET", "HEAD") and response.status_code == 200:
+        # Each encoding is a different representation, so it gets its own tag
+        etag = body_etag(data) + (f"-{encoding}" if encoding else "")
+        response.set_etag(etag)
+        # Revalidate on every use instead of trusting a heuristic lifetime
+        if "Cache-Control" not in response.headers:
+            response.headers["Cache-Control"] = "no-cache"
+        if request.if_none_match.contains_weak(etag):
+            response.status_code = 304
+            response.set_data(b"")
+            response.headers.pop("Content-Length", None)
+            return response
+
+    if encoding:
+        response.set_data(compress(data, encoding))
+        response.headers["Content-Encoding"] = encoding
+    return response
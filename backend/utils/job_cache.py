@@ -0,0 +1,404 @@
+"""
+Read-through cache for job queries
+Two tiers: an in-process LRU with TTL and a SQLite file shared by all worker
+processes on the host. Identical concurrent misses are coalesced into one
+database call, and every write to the jobs table bumps a shared generation
+number so cached results from before the write are never served again.
+"""
+
+from typing import Any, Callable, Dict, Optional, Tuple
+from collections import OrderedDict
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+
+class LRUTTLCache:
+    """
+    Thread-safe in-process LRU cache whose entries expire after a TTL
+    """
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 300):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Return (hit, value) for a key"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return False, None
+
+            self._entries.move_to_end(key)
+            return True, value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full"""
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SharedSQLiteCache:
+    """
+    Cache tier backed by a local SQLite file, shared across processes on a host.
+    Also stores the generation number used for cross-process invalidation.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float = 300, max_entries: int = 4096, prune_every: int = 256):
+        """
+        Args:
+            path (str): SQLite file
+            ttl_seconds (float): Lifetime of an entry
+            max_entries (int): Entries kept; those closest to expiry are evicted first
+            prune_every (int): Delete expired entries after this many writes
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.prune_every = prune_every
+        self._local = threading.local()
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+        self._execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, generation INTEGER NOT NULL, "
+            "value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._execute("CREATE INDEX IF NOT EXISTS idx_cache_expires_at ON cache(expires_at)")
+        self._execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        self._execute("INSERT OR IGNORE INTO meta (name, value) VALUES ('generation', 0)")
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections cannot be shared between threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        return self._connection().execute(sql, params)
+
+    def generation(self) -> int:
+        row = self._execute("SELECT value FROM meta WHERE name = 'generation'").fetchone()
+        return row[0] if row else 0
+
+    def bump_generation(self) -> int:
+        """Advance the generation and drop entries written under older ones or expired"""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("UPDATE meta SET value = value + 1 WHERE name = 'generation'")
+            generation = conn.execute("SELECT value FROM meta WHERE name = 'generation'").fetchone()[0]
+            conn.execute("DELETE FROM cache WHERE generation < ? OR expires_at < ?", (generation, time.time()))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return generation
+
+    def get(self, key: str) -> Optional[str]:
+        row = self._execute(
+            "SELECT value FROM cache WHERE key = ? AND expires_at >= ?",
+            (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, generation: int, value: str) -> None:
+        self._execute(
+            "INSERT OR REPLACE INTO cache (key, generation, value, expires_at) VALUES (?, ?, ?, ?)",
+            (key, generation, value, time.time() + self.ttl_seconds)
+        )
+        excess = self._execute("SELECT COUNT(*) FROM cache").fetchone()[0] - self.max_entries
+        if excess > 0:
+            self._execute(
+                "DELETE FROM cache WHERE key IN "
+                "(SELECT key FROM cache ORDER BY expires_at LIMIT ?)",
+                (excess,)
+            )
+
+        with self._writes_lock:
+            self._writes += 1
+            due = self._writes % self.prune_every == 0
+        if due:
+            self.prune()
+
+    def prune(self) -> int:
+        """Delete expired entries"""
+        return self._execute("DELETE FROM cache WHERE expires_at < ?", (time.time(),)).rowcount
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into one execution; the other
+    callers wait and receive the same result (or exception)
+    """
+
+    class _Call:
+        __slots__ = ('event', 'result', 'error')
+
+        def __init__(self):
+            self.event = threading.Event()
+            self.result = None
+            self.error = None
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run fn once per key among concurrent callers
+
+        Returns:
+            (result, shared) where shared is True if another caller's result was reused
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+        return call.result, False
+
+
+class JobQueryCache:
+    """
+    Read-through cache combining both tiers, single-flight loading and
+    generation-based invalidation
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        ttl_seconds: float = 300,
+        shared_path: Optional[str] = None,
+        shared_max_entries: int = 4096
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries (int): Capacity of the in-process tier
+            ttl_seconds (float): Lifetime of an entry in either tier
+            shared_path (str): SQLite file for the shared tier (None = in-process only)
+            shared_max_entries (int): Capacity of the shared tier
+        """
+        self.local = LRUTTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self.shared = None
+        if shared_path:
+            try:
+                self.shared = SharedSQLiteCache(shared_path, ttl_seconds=ttl_seconds, max_entries=shared_max_entries)
+            except sqlite3.Error as e:
+                print(f"⚠️  Shared job cache disabled: {str(e)}")
+
+        self._flight = SingleFlight()
+        self._local_generation = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            "local_hits": 0,
+            "shared_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "invalidations": 0,
+            "load_time_ms": 0.0
+        }
+        # Per query name: hits, misses and time spent loading
+        self._query_stats: Dict[str, Dict[str, float]] = {}
+
+    def _count(self, name: str, amount: float = 1, query: Optional[str] = None, field: Optional[str] = None) -> None:
+        with self._lock:
+            self._stats[name] += amount
+            if query is not None:
+                counters = self._query_stats.setdefault(query, {"hits": 0, "misses": 0, "load_time_ms": 0.0})
+                counters[field or name] += amount
+
+    def generation(self) -> int:
+        if self.shared is not None:
+            try:
+                return self.shared.generation()
+            except sqlite3.Error:
+                pass
+        return self._local_generation
+
+    @staticmethod
+    def make_key(name: str, params: Dict) -> str:
+        return f"{name}:{json.dumps(params, sort_keys=True, default=str)}"
+
+    def get_or_load(self, name: str, params: Dict, loader: Callable[[], Any]) -> Any:
+        """
+        Return the cached result of a query or load, cache and return it
+
+        Args:
+            name (str): Query name (e.g. 'search_jobs')
+            params (Dict): Query parameters, part of the cache key
+            loader (Callable): Runs the query; exceptions propagate and nothing is cached
+
+        Returns:
+            A fresh copy of the query result, safe for the caller to mutate
+        """
+        generation = self.generation()
+        key = f"{generation}:{self.make_key(name, params)}"
+
+        hit, payload = self.local.get(key)
+        if hit:
+            self._count('local_hits', query=name, field='hits')
+            return json.loads(payload)
+
+        if self.shared is not None:
+            try:
+                payload = self.shared.get(key)
+            except sqlite3.Error:
+                payload = None
+            if payload is not None:
+                self._count('shared_hits', query=name, field='hits')
+                self.local.set(key, payload)
+                return json.loads(payload)
+
+        def load() -> str:
+            start = time.perf_counter()
+            encoded = json.dumps(loader(), default=str)
+            self._count('load_time_ms', (time.perf_counter() - start) * 1000, query=name)
+
+            self.local.set(key, encoded)
+            if self.shared is not None:
+                try:
+                    self.shared.set(key, generation, encoded)
+                except sqlite3.Error as e:
+                    print(f"⚠️  Could not write shared job cache: {str(e)}")
+            return encoded
+
+        payload, shared = self._flight.do(key, load)
+        self._count('coalesced' if shared else 'misses', query=name, field='hits' if shared else 'misses')
+        return json.loads(payload)
+
+    def invalidate(self) -> None:
+        """Drop every cached result; called after any write to the jobs table"""
+        with self._lock:
+            self._local_generation += 1
+            self._stats['invalidations'] += 1
+        self.local.clear()
+
+        if self.shared is not None:
+            try:
+                self.shared.bump_generation()
+            except sqlite3.Error as e:
+                print(f"⚠️  Could not invalidate shared job cache: {str(e)}")
+
+    def stats(self) -> Dict:
+        """
+        Hit/miss counters and derived hit rate, overall and per query name.
+        latency_saved_ms estimates the time hits saved at the query's
+        average load time.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            query_stats = {name: dict(counters) for name, counters in self._query_stats.items()}
+
+        lookups = stats['local_hits'] + stats['shared_hits'] + stats['misses'] + stats['coalesced']
+        hits = stats['local_hits'] + stats['shared_hits'] + stats['coalesced']
+        stats['hit_rate'] = round(hits / lookups, 4) if lookups else 0.0
+        stats['load_time_ms'] = round(stats['load_time_ms'], 2)
+        stats['local_entries'] = len(self.local)
+        stats['generation'] = self.generation()
+        stats['shared_tier'] = self.shared is not None
+
+        stats['queries'] = {}
+        for name, counters in sorted(query_stats.items()):
+            lookups = counters['hits'] + counters['misses']
+            average_load_ms = counters['load_time_ms'] / counters['misses'] if counters['misses'] else 0.0
+            stats['queries'][name] = {
+                "hits": int(counters['hits']),
+                "misses": int(counters['misses']),
+                "hit_rate": round(counters['hits'] / lookups, 4) if lookups else 0.0,
+                "avg_load_ms": round(average_load_ms, 2),
+                "latency_saved_ms": round(counters['hits'] * average_load_ms, 2)
+            }
+        stats['latency_saved_ms'] = round(sum(query['latency_saved_ms'] for query in stats['queries'].values()), 2)
+        return stats
+
+
+class _NullCache:
+    """Stand-in used when caching is disabled"""
+
+    def get_or_load(self, name: str, params: Dict, loader: Callable[[], Any]) -> Any:
+        return loader()
+
+    def invalidate(self) -> None:
+        pass
+
+    def generation(self) -> int:
+        return 0
+
+    def stats(self) -> Dict:
+        return {"enabled": False}
+
+
+_job_cache = None
+_job_cache_lock = threading.Lock()
+
+
+def get_job_cache():
+    """
+    Get the process-wide job query cache, configured from the environment:
+    JOB_CACHE_ENABLED (default true), JOB_CACHE_TTL_SECONDS (default 300),
+    JOB_CACHE_MAX_ENTRIES (default 512), JOB_CACHE_SHARED_MAX_ENTRIES
+    (default 4096) and JOB_CACHE_PATH (shared SQLite file, default in the
+    system temp directory; empty disables the shared tier)
+    """
+    global _job_cache
+    if _job_cache is None:
+        with _job_cache_lock:
+            if _job_cache is None:
+                if os.getenv("JOB_CACHE_ENABLED", "true").lower() in ("0", "false", "no"):
+                    _job_cache = _NullCache()
+                else:
+                    _job_cache = JobQueryCache(
+                        max_entries=int(os.getenv("JOB_CACHE_MAX_ENTRIES", "512")),
+                        ttl_seconds=float(os.getenv("JOB_CACHE_TTL_SECONDS", "300")),
+                        shared_path=os.getenv(
+                            "JOB_CACHE_PATH",
+                            os.path.join(tempfile.gettempdir(), "elevare_job_cache.sqlite3")
+                        ),
+                        shared_max_entries=int(os.getenv("JOB_CACHE_SHARED_MAX_ENTRIES", "4096"))
+                    )
+    return _job_cache
@@ -2,9 +2,28 @@
 Database operations for jobs
 """
 
-from typing import List, Dict, Optional
-from .supabase_client import get_supabase_client
+from typing import Iterator, List, Dict, Optional
+from .job_storage import JobStorageBackend, get_job_storage
+from .job_cache import get_job_cache
+from .job_recommendations import get_recommendation_materializer
+from .job_enrichment import enrich_jobs
+from .job_normalization import DEFAULT_SALARY_CURRENCY, normalize_jobs, parse_location_query
+from .skill_dictionary import canonicalize_skills, normalize_skill, skill_profile
 from datetime import datetime
+import hashlib
+
+
+# Job fields returned per match by recommend_batch
+BATCH_JOB_FIELDS = ['id', 'title', 'company', 'location', 'experience', 'salary', 'url', 'source', 'domain', 'work_mode']
+# Profiles whose matched jobs are fetched from storage in one query
+BATCH_FETCH_SIZE = 50
+
+
+def _text_digest(text: Optional[str]) -> Optional[str]:
+    """Whitespace-insensitive hash of free text, for cache keys"""
+    if not text or not text.strip():
+        return None
+    return hashlib.sha1(" ".join(text.split()).encode("utf-8")).hexdigest()
 
 
 class JobDatabase:
@@ -12,8 +31,27 @@ class JobDatabase:
     Handles all database operations for jobs
     """
     
-    def __init__(self):
-        self.supabase = get_supabase_client()
+    def __init__(self, storage: Optional[JobStorageBackend] = None):
+        """
+        Initialize the job database
+        
+        Args:
+            storage (JobStorageBackend): Storage backend (default: selected by JOB_STORAGE_BACKEND)
+        """
+        self.storage = storage or get_job_storage()
+        self.cache = get_job_cache()
+        self.recommendations = get_recommendation_materializer()
+    
+    @property
+    def ranker(self):
+        # numpy/scipy are imported on first use, not when the app starts
+        from .job_ranking import get_job_ranker
+        return get_job_ranker()
+    
+    @property
+    def semantic_index(self):
+        from .job_semantic_index import get_job_semantic_index
+        return get_job_semantic_index()
     
     def insert_jobs(self, jobs: List[Dict]) -> Dict:
         """
@@ -29,6 +67,11 @@ class JobDatabase:
             if not jobs:
                 return {"success": False, "message": "No jobs to insert"}
             
+            # Derive domain, skills and job type for the whole batch
+            jobs = enrich_jobs([dict(job) for job in jobs])
+            # Parse experience, salary and location text into filterable columns
+            normalize_jobs(jobs)
+            
             # Prepare jobs for insertion
             jobs_to_insert = []
             for job in jobs:
@@ -42,18 +85,48 @@ class JobDatabase:
                     'url': job.get('url', ''),
                     'source': job.get('source', 'Unknown'),
                     'keyword': job.get('keyword', ''),
+                    'domain': job.get('domain'),
+                    'skills_required': job.get('skills_required', []),
+                    'job_type': job.get('job_type'),
+                    'experience_min': job.get('experience_min'),
+                    'experience_max': job.get('experience_max'),
+                    'salary_min': job.get('salary_min'),
+                    'salary_max': job.get('salary_max'),
+                    'salary_currency': job.get('salary_currency'),
+                    'salary_period': job.get('salary_period'),
+                    'cities': job.get('cities', []),
+                    'work_mode': job.get('work_mode'),
                     'scraped_at': job.get('scraped_at', datetime.now().isoformat()),
                     'is_active': True
                 }
                 jobs_to_insert.append(job_data)
             
-            # Insert into Supabase
-            response = self.supabase.table('jobs').insert(jobs_to_insert).execute()
+            # Insert into the configured storage backend
+            inserted = self.storage.insert_jobs(jobs_to_insert)
+            self.cache.invalidate()
+            # The rows are committed: index failures must not report the insert as failed
+            try:
+                self.ranker.add_jobs(inserted)
+            except Exception as e:
+                # A half-applied update is not trusted: the next query rebuilds the index
+                print(f"⚠️  Could not add jobs to the ranking index: {str(e)}")
+                self.ranker.invalidate()
+            try:
+                self.semantic_index.add_jobs(inserted)
+            except Exception as e:
+                # The jobs are stored; the next index build picks them up
+                print(f"⚠️  Could not add jobs to the semantic index: {str(e)}")
+            # Score only the new jobs against stored resume profiles, off the insert path
+            try:
+                self.recommendations.schedule_new_jobs(inserted)
+            except Exception as e:
+                # The next full refresh scores the jobs
+                print(f"⚠️  Could not schedule recommendation scoring: {str(e)}")
             
             return {
                 "success": True,
-                "inserted_count": len(response.data),
-                "message": f"Successfully inserted {len(response.data)} jobs"
+                "inserted_count": len(inserted),
+                "message": f"Successfully inserted {len(inserted)} jobs"
             }
         
         except Exception as e:
@@ -69,6 +142,14 @@ class JobDatabase:
         location: Optional[str] = None,
         domain: Optional[str] = None,
         source: Optional[str] = None,
+        skills: Optional[List[str]] = None,
+        job_type: Optional[str] = None,
+        work_mode: Optional[str] = None,
+        min_experience: Optional[int] = None,
+        max_experience: Optional[int] = None,
+        min_salary: Optional[int] = None,
+        max_salary: Optional[int] = None,
+        salary_currency: Optional[str] = None,
         limit: int = 50
     ) -> List[Dict]:
         """
@@ -76,41 +157,336 @@ class JobDatabase:
         
         Args:
             keyword (str): Search keyword (searches in title and description)
-            location (str): Location filter
+            location (str): Location filter ("Bangalore", "Pune, Mumbai", "Remote")
             domain (str): Domain filter
             source (str): Source filter (Naukri, LinkedIn, Unstop)
+            skills (List[str]): Jobs requiring any of these skills
+            job_type (str): Job type filter (Full-time, Part-time, Contract, Internship)
+            work_mode (str): Work mode filter (remote, hybrid, onsite)
+            min_experience (int): Jobs accepting at least this many years of experience
+            max_experience (int): Jobs accepting at most this many years of experience
+            min_salary (int): Jobs paying at least this annual amount
+            max_salary (int): Jobs paying at most this annual amount
+            salary_currency (str): Currency of the salary bounds and of the jobs
+                                   returned (default: INR when a bound is given)
             limit (int): Maximum number of results
         
         Returns:
             List of job dictionaries
         """
+        skills = canonicalize_skills(skills) if skills else None
+        # Amounts in different currencies are not comparable
+        salary_currency = (salary_currency or '').upper() or None
+        if salary_currency is None and (min_salary is not None or max_salary is not None):
+            salary_currency = DEFAULT_SALARY_CURRENCY
+        
+        # Known cities and work modes use the indexed cities / work_mode
+        # columns; anything else falls back to a text match on location, as
+        # do rows stored before locations were parsed
+        cities, location_mode = parse_location_query(location)
+        work_mode = (work_mode or location_mode or '').lower() or None
+        location_fallback = None
+        if cities or location_mode:
+            location, location_fallback = None, location
+        
+        def load():
+            return self.storage.search_jobs(
+                keyword=keyword,
+                location=location,
+                domain=domain,
+                source=source,
+                skills=skills,
+                job_type=job_type,
+                cities=cities or None,
+                work_mode=work_mode,
+                min_experience=min_experience,
+                max_experience=max_experience,
+                min_salary=min_salary,
+                max_salary=max_salary,
+                salary_currency=salary_currency,
+                limit=limit,
+                location_fallback=location_fallback
+            )
+        
         try:
-            query = self.supabase.table('jobs').select('*').eq('is_active', True)
-            
-            # Apply filters
-            if keyword:
-                # Search in title and description
-                query = query.or_(f"title.ilike.%{keyword}%,description.ilike.%{keyword}%")
-            
-            if location:
-                query = query.ilike('location', f'%{location}%')
-            
-            if domain:
-                query = query.eq('domain', domain)
-            
-            if source:
-                query = query.eq('source', source)
-            
-            # Order by created_at descending and limit
-            query = query.order('created_at', desc=True).limit(limit)
-            
-            response = query.execute()
-            return response.data
+            params = {
+                'keyword': keyword,
+                'location': location,
+                'domain': domain,
+                'source': source,
+                'skills': sorted(skills) if skills else None,
+                'job_type': job_type,
+                'cities': sorted(cities) if cities else None,
+                'work_mode': work_mode,
+                'min_experience': min_experience,
+                'max_experience': max_experience,
+                'min_salary': min_salary,
+                'max_salary': max_salary,
+                'salary_currency': salary_currency,
+                'limit': limit,
+                'location_fallback': location_fallback
+            }
+            return self.cache.get_or_load('search_jobs', params, load)
         
         except Exception as e:
             print(f"Error searching jobs: {str(e)}")
             return []
     
+    def recommend_jobs(
+        self,
+        resume_skills: List[str],
+        domain: Optional[str] = None,
+        location: Optional[str] = None,
+        resume_text: Optional[str] = None,
+        limit: int = 50,
+        mode: str = "keyword"
+    ) -> List[Dict]:
+        """
+        Rank all active jobs against a resume
+        
+        Args:
+            resume_skills (List[str]): Skills from the resume
+            domain (str): Domain id; if no job in the domain matches, all domains are used
+            location (str): Location filter
+            resume_text (str): Optional resume text, weighted below the skills
+            limit (int): Maximum number of results
+            mode (str): 'keyword' for BM25 over skills and terms (utils/job_ranking.py),
+                        'semantic' for nearest neighbours in the semantic index
+                        (utils/job_semantic_index.py), which also finds related skills;
+                        keyword ranking answers until the index has been built
+        
+        Returns:
+            List of job dictionaries, most relevant first, with 'match_score'
+            and 'matching_skills'. Keyword mode scores the percent of resume
+            skills matched and adds 'relevance' (BM25 score) and 'term_scores';
+            semantic mode scores cosine similarity as a percent.
+        """
+        # Canonical skill -> the skill as this resume wrote it. Results are
+        # computed and cached for the canonical profile, so resumes listing
+        # the same skills in another order or spelling share one entry.
+        wanted = skill_profile(resume_skills)
+        skills = sorted(wanted)
+        
+        def load():
+            if mode == "semantic":
+                return self._recommend_semantic(skills, domain, location, resume_text, limit)
+            return self._recommend_keyword(skills, domain, location, resume_text, limit)
+        
+        try:
+            if mode == "semantic" and not self.semantic_index.ready():
+                # The index is being built in the background: rank by keyword meanwhile
+                mode = "keyword"
+            params = {
+                'skills': skills,
+                'domain': domain,
+                'location': " ".join(location.lower().split()) if location else None,
+                'text': _text_digest(resume_text),
+                'limit': limit,
+                'mode': mode
+            }
+            jobs = self.cache.get_or_load('recommend_jobs', params, load)
+        
+        except Exception as e:
+            print(f"Error recommending jobs: {str(e)}")
+            return []
+        
+        for job in jobs:
+            job['matching_skills'] = [wanted.get(skill, skill) for skill in job['matching_skills']]
+            if mode != "semantic":
+                job['match_score'] = round(len(job['matching_skills']) / len(wanted) * 100, 2) if wanted else 0.0
+        return jobs
+    
+    def recommend_batch(self, profiles: List[Dict], limit: int = 10) -> Iterator[Dict]:
+        """
+        Rank all active jobs for many resumes at once
+        
+        Args:
+            profiles (List[Dict]): Dicts with 'skills' and optional 'id', 'resume_text',
+                                   'domain' (domain id) and 'location'
+            limit (int): Maximum number of jobs per profile
+        
+        Yields:
+            One dict per profile, in input order, with 'id', 'total_jobs' and
+            'jobs' (BATCH_JOB_FIELDS plus 'match_score', 'matching_skills'
+            and 'relevance'). Profiles are scored by the ranker in a few
+            matrix products, and job rows are fetched once per group of
+            BATCH_FETCH_SIZE profiles.
+        """
+        wanted = [skill_profile(profile.get('skills')) for profile in profiles]
+        queries = [
+            {
+                'skills': sorted(skills),
+                'text': profile.get('resume_text'),
+                'domain': profile.get('domain'),
+                'location': profile.get('location')
+            }
+            for profile, skills in zip(profiles, wanted)
+        ]
+        
+        pending = []
+        for index, matches in enumerate(self.ranker.rank_many(queries, limit=limit)):
+            pending.append((index, matches))
+            if len(pending) == BATCH_FETCH_SIZE or index == len(queries) - 1:
+                # Like recommend_jobs, retry without the domain when nothing in it matched
+                retry = [position for position, (number, found) in enumerate(pending)
+                         if not found and queries[number]['domain']]
+                if retry:
+                    retried = self.ranker.rank_many(
+                        [dict(queries[pending[position][0]], domain=None) for position in retry], limit=limit
+                    )
+                    for position, found in zip(retry, retried):
+                        pending[position] = (pending[position][0], found)
+                
+                jobs_by_id = {
+                    job['id']: job
+                    for job in self.storage.get_jobs_by_ids(
+                        list({match['job_id'] for _, found in pending for match in found})
+                    )
+                }
+                for number, found in pending:
+                    skills = wanted[number]
+                    jobs = []
+                    for match in found:
+                        job = jobs_by_id.get(match['job_id'])
+                        if job is None:
+                            continue
+                        job = {field: job.get(field) for field in BATCH_JOB_FIELDS}
+                        job['matching_skills'] = [skills.get(skill, skill) for skill in match['matching_skills']]
+                        job['match_score'] = round(len(job['matching_skills']) / len(skills) * 100, 2) if skills else 0.0
+                        job['relevance'] = round(match['score'], 4)
+                        jobs.append(job)
+                    yield {
+                        'id': profiles[number].get('id', number),
+                        'total_jobs': len(jobs),
+                        'jobs': jobs
+                    }
+                pending = []
+    
+    def _recommend_keyword(
+        self,
+        skills: List[str],
+        domain: Optional[str],
+        location: Optional[str],
+        resume_text: Optional[str],
+        limit: int
+    ) -> List[Dict]:
+        matches = self.ranker.rank(skills, text=resume_text, domain=domain, location=location, limit=limit)
+        if not matches and domain:
+            matches = self.ranker.rank(skills, text=resume_text, location=location, limit=limit)
+        if not matches:
+            return []
+        
+        jobs_by_id = {
+            job['id']: job
+            for job in self.storage.get_jobs_by_ids([match['job_id'] for match in matches])
+        }
+        
+        jobs = []
+        for match in matches:
+            job = jobs_by_id.get(match['job_id'])
+            if job is None:
+                # Deactivated since the index was built
+                continue
+            job['matching_skills'] = match['matching_skills']
+            job['relevance'] = round(match['score'], 4)
+            job['term_scores'] = match['term_scores']
+            jobs.append(job)
+        return jobs
+    
+    def _recommend_semantic(
+        self,
+        resume_skills: List[str],
+        domain: Optional[str],
+        location: Optional[str],
+        resume_text: Optional[str],
+        limit: int
+    ) -> List[Dict]:
+        # Location is checked on the fetched rows, so fetch extra candidates
+        fetch = limit * 4 if location else limit + 10
+        
+        def search():
+            matches = self.semantic_index.search(resume_text, skills=resume_skills, domain=domain, limit=fetch)
+            if not matches and domain:
+                matches = self.semantic_index.search(resume_text, skills=resume_skills, limit=fetch)
+            jobs_by_id = {job['id']: job for job in self.storage.get_jobs_by_ids([job_id for job_id, _ in matches])}
+            return matches, jobs_by_id
+        
+        matches, jobs_by_id = search()
+        # Jobs archived or deactivated since they were indexed leave the index
+        # here, and the search is repeated once so they do not shorten the list
+        stale = [job_id for job_id, _ in matches if job_id not in jobs_by_id]
+        if stale and self.semantic_index.remove_jobs(stale):
+            matches, jobs_by_id = search()
+        if not matches:
+            return []
+        
+        cities, work_mode = parse_location_query(location)
+        resume_by_canonical = {normalize_skill(skill) or skill: skill for skill in resume_skills or []}
+        
+        jobs = []
+        for job_id, similarity in matches:
+            job = jobs_by_id.get(job_id)
+            if job is None:
+                continue
+            if cities and not set(cities) & set(job.get('cities') or []):
+                continue
+            if work_mode and job.get('work_mode') != work_mode:
+                continue
+            if location and not cities and not work_mode and location.lower() not in (job.get('location') or '').lower():
+                continue
+            
+            job['match_score'] = round(similarity * 100, 2)
+            job['matching_skills'] = [
+                resume_by_canonical[skill] for skill in job.get('skills_required') or []
+                if skill in resume_by_canonical
+            ]
+            jobs.append(job)
+            if len(jobs) == limit:
+                break
+        return jobs
+    
+    def get_user_recommendations(self, user_id: str, limit: int = 50) -> List[Dict]:
+        """
+        Get a user's materialized recommendations (job_recommendations table)
+        
+        Args:
+            user_id (str): User UUID
+            limit (int): Maximum number of results
+        
+        Returns:
+            List of job dictionaries, best match first, with 'match_score',
+            'matching_skills' and 'recommendation_reason'
+        """
+        try:
+            jobs = self.storage.get_recommendations(user_id, limit=limit)
+            if not jobs and not self.storage.recommendations_computed(user_id):
+                # First visit: compute once; a user with no matches stays marked as computed
+                if self.recommendations.refresh([user_id])['rows']:
+                    jobs = self.storage.get_recommendations(user_id, limit=limit)
+            return jobs
+        
+        except Exception as e:
+            print(f"Error getting recommendations: {str(e)}")
+            return []
+    
+    def refresh_recommendations(self, user_ids: Optional[List[str]] = None) -> Dict:
+        """
+        Recompute materialized recommendations (e.g. after a resume changed)
+        
+        Args:
+            user_ids (List[str]): Users to refresh (default: all users, which
+                                  takes long; API requests pass one user)
+        
+        Returns:
+            Dict with success status and the number of users and rows written
+        """
+        try:
+            return {"success": True, **self.recommendations.refresh(user_ids)}
+        
+        except Exception as e:
+            print(f"Error refreshing recommendations: {str(e)}")
+            return {"success": False, "message": f"Error refreshing recommendations: {str(e)}"}
+    
     def get_job_by_id(self, job_id: str) -> Optional[Dict]:
         """
         Get a single job by ID
@@ -122,8 +498,7 @@ class JobDatabase:
             Job dictionary or None
         """
         try:
-            response = self.supabase.table('jobs').select('*').eq('id', job_id).execute()
-            return response.data[0] if response.data else None
+            return self.storage.get_job_by_id(job_id)
         
         except Exception as e:
             print(f"Error getting job: {str(e)}")
@@ -140,16 +515,11 @@ class JobDatabase:
         Returns:
             List of job dictionaries
         """
+        def load():
+            return self.storage.get_jobs_by_domain(domain, limit=limit)
+        
         try:
-            response = self.supabase.table('jobs')\
-                .select('*')\
-                .eq('domain', domain)\
-                .eq('is_active', True)\
-                .order('created_at', desc=True)\
-                .limit(limit)\
-                .execute()
-            
-            return response.data
+            return self.cache.get_or_load('get_jobs_by_domain', {'domain': domain, 'limit': limit}, load)
         
         except Exception as e:
             print(f"Error getting jobs by domain: {str(e)}")
@@ -165,15 +535,11 @@ class JobDatabase:
         Returns:
             List of job dictionaries
         """
+        def load():
+            return self.storage.get_recent_jobs(limit=limit)
+        
         try:
-            response = self.supabase.table('jobs')\
-                .select('*')\
-                .eq('is_active', True)\
-                .order('created_at', desc=True)\
-                .limit(limit)\
-                .execute()
-            
-            return response.data
+            return self.cache.get_or_load('get_recent_jobs', {'limit': limit}, load)
         
         except Exception as e:
             print(f"Error getting recent jobs: {str(e)}")
@@ -186,60 +552,74 @@ class JobDatabase:
         Returns:
             Dict with job statistics
         """
+        def load():
+            return self.storage.get_job_stats()
+        
         try:
-            # Total active jobs
-            total_response = self.supabase.table('jobs')\
-                .select('id', count='exact')\
-                .eq('is_active', True)\
-                .execute()
-            
-            # Jobs by source
-            sources_response = self.supabase.table('jobs')\
-                .select('source')\
-                .eq('is_active', True)\
-                .execute()
-            
-            source_counts = {}
-            for job in sources_response.data:
-                source = job['source']
-                source_counts[source] = source_counts.get(source, 0) + 1
-            
-            return {
-                "total_jobs": total_response.count,
-                "jobs_by_source": source_counts
-            }
+            return self.cache.get_or_load('get_job_stats', {}, load)
         
         except Exception as e:
             print(f"Error getting job stats: {str(e)}")
             return {"total_jobs": 0, "jobs_by_source": {}}
     
-    def delete_old_jobs(self, days: int = 30) -> Dict:
+    def count_expired_jobs(self, cutoff: str) -> int:
+        """
+        Count jobs scraped (or created, if never stamped) before the cutoff
+        
+        Args:
+            cutoff (str): ISO timestamp
+        
+        Returns:
+            Number of expired jobs still in the jobs table
+        """
+        return self.storage.count_expired_jobs(cutoff)
+    
+    def archive_expired_jobs_batch(self, cutoff: str, batch_size: int) -> Dict:
+        """
+        Move one bounded batch of expired jobs into jobs_archive
+        
+        Args:
+            cutoff (str): ISO timestamp; older jobs are archived
+            batch_size (int): Maximum number of rows handled in this batch
+        
+        Returns:
+            Dict with 'moved' and 'deactivated' row counts
+        """
+        result = self.storage.archive_expired_jobs_batch(cutoff, batch_size)
+        if result['moved'] or result['deactivated']:
+            self.cache.invalidate()
+            self.ranker.invalidate()
+        return result
+    
+    def drop_archive_partitions(self, before: str) -> int:
+        """
+        Drop monthly jobs_archive partitions that end on or before a date
+        
+        Args:
+            before (str): ISO date
+        
+        Returns:
+            Number of partitions dropped
+        """
+        return self.storage.drop_archive_partitions(before)
+    
+    def delete_old_jobs(self, days: int = 30, dry_run: bool = False) -> Dict:
         """
-        Mark jobs older than specified days as inactive
+        Archive jobs older than specified days in bounded batches
         
         Args:
             days (int): Number of days
+            dry_run (bool): Only count the jobs that would be archived
         
         Returns:
-            Dict with success status
+            Dict with success status and the retention report
         """
-        try:
-            from datetime import timedelta
-            cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
-            
-            response = self.supabase.table('jobs')\
-                .update({'is_active': False})\
-                .lt('created_at', cutoff_date)\
-                .execute()
-            
-            return {
-                "success": True,
-                "message": f"Marked old jobs as inactive"
-            }
+        from .job_retention import JobRetentionEngine
         
-        except Exception as e:
-            print(f"Error deleting old jobs: {str(e)}")
-            return {
-                "success": False,
-                "message": f"Error: {str(e)}"
-            }
+        report = JobRetentionEngine(db=self).run(days=days, dry_run=dry_run)
+        if report.get('success'):
+            report['message'] = (
+                f"{report['eligible_count']} old jobs eligible for archival" if dry_run
+                else f"Archived {report['rows_moved']} old jobs"
+            )
+        return report
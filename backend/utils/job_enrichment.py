@@ -0,0 +1,169 @@
+"""
+Ingest-time job enrichment
+Derives domain, required skills and job type for scraped jobs so that
+domain and skill filters can use indexed columns instead of text scans.
+"""
+
+from typing import Dict, List, Optional
+import re
+from .skill_dictionary import get_skill_extractor
+
+
+# Domain ids match the ones used by the frontend (Frontend/src/pages/Domain.tsx).
+# Rules are checked in order; the first domain with a matching phrase wins, so
+# specific domains come before the broad 'tech' catch-all. Phrases match whole
+# words only. Phrases written with capitals are acronyms: in titles they
+# match with that case and in descriptions not at all, where "12 hr shifts"
+# or "qa" in passing would otherwise decide the domain. Search keywords are
+# typed in any case, so there they match like other phrases.
+DOMAIN_RULES = [
+    ("security", [
+        "cybersecurity", "cyber security", "security engineer", "security analyst",
+        "information security", "infosec", "soc analyst", "penetration", "ethical hacker",
+        "vulnerability", "appsec", "devsecops"
+    ]),
+    ("design", [
+        "designer", "ui ux", "ui/ux", "UX", "ui design", "graphic", "visual design",
+        "product design", "interaction design", "illustrator", "motion design", "creative"
+    ]),
+    ("hr", [
+        "human resources", "HR", "hr executive", "hr manager", "hrbp", "recruiter",
+        "recruitment", "talent acquisition", "payroll", "people operations"
+    ]),
+    ("healthcare", [
+        "healthcare", "health care", "medical", "clinical", "nurse", "nursing", "doctor",
+        "pharma", "pharmacist", "pharmacovigilance", "hospital", "biotech", "physician",
+        "life sciences", "dental"
+    ]),
+    ("business", [
+        "business analyst", "product manager", "product owner", "project manager",
+        "marketing", "sales", "business development", "account manager", "consultant",
+        "finance", "financial", "accountant", "operations manager", "SEO", "content writer",
+        "customer success", "strategy"
+    ]),
+    ("tech", [
+        "developer", "engineer", "software", "programmer", "data scientist", "data analyst",
+        "data engineer", "machine learning", "devops", "cloud", "full stack", "frontend",
+        "front end", "backend", "back end", "mobile app", "android", "iOS", "QA", "tester",
+        "testing", "SDE", "architect", "technical", "python", "java", "web"
+    ]),
+]
+
+JOB_TYPE_RULES = [
+    ("Internship", ["internship", "intern", "trainee", "apprentice"]),
+    ("Contract", ["contract", "contractual", "freelance", "temporary", "c2h", "contract to hire"]),
+    ("Part-time", ["part-time", "part time"]),
+    ("Full-time", ["full-time", "full time", "permanent"]),
+]
+
+
+class _RuleMatcher:
+    """
+    All rules of a table in one regex, one named group per rule, so a text is
+    scanned once instead of once per rule; the earliest rule that matched wins
+    """
+
+    def __init__(self, rules, acronyms: str = "exact"):
+        """
+        Args:
+            rules: (label, phrases) pairs in priority order
+            acronyms (str): How capitalized phrases match: 'exact' (that case),
+                            'any' (any case, like other phrases) or 'skip'
+        """
+        self.labels = [label for label, _ in rules]
+        groups = []
+        for number, (_, phrases) in enumerate(rules):
+            alternatives = []
+            words = [
+                re.escape(phrase) for phrase in phrases
+                if phrase.islower() or acronyms == "any"
+            ]
+            if words:
+                alternatives.append(f"(?i:{'|'.join(words)})")
+            if acronyms == "exact":
+                alternatives.extend(re.escape(phrase) for phrase in phrases if not phrase.islower())
+            if alternatives:
+                groups.append(f"(?P<r{number}>{'|'.join(alternatives)})")
+        self.pattern = re.compile(r"(?<!\w)(?:" + "|".join(groups) + r")(?!\w)")
+
+    def match(self, text: Optional[str]) -> Optional[str]:
+        if not text:
+            return None
+        best = None
+        for match in self.pattern.finditer(text):
+            number = int(match.lastgroup[1:])
+            if best is None or number < best:
+                best = number
+                if number == 0:
+                    break
+        return self.labels[best] if best is not None else None
+
+
+_DOMAIN_MATCHER = _RuleMatcher(DOMAIN_RULES)
+_KEYWORD_DOMAIN_MATCHER = _RuleMatcher(DOMAIN_RULES, acronyms="any")
+_DESCRIPTION_DOMAIN_MATCHER = _RuleMatcher(DOMAIN_RULES, acronyms="skip")
+_JOB_TYPE_MATCHER = _RuleMatcher(JOB_TYPE_RULES)
+
+
+def classify_domain(*texts: Optional[str]) -> Optional[str]:
+    """
+    Classify a job into a domain from the given texts, checked in order
+
+    Args:
+        texts (str): e.g. the search keyword, then the job title
+
+    Returns:
+        Domain id ('tech', 'design', 'business', 'hr', 'security', 'healthcare') or None
+    """
+    for text in texts:
+        domain = _DOMAIN_MATCHER.match(text)
+        if domain:
+            return domain
+    return None
+
+
+def detect_job_type(*texts: Optional[str]) -> Optional[str]:
+    """
+    Detect the job type from the given texts, checked in order
+
+    Returns:
+        'Internship', 'Contract', 'Part-time', 'Full-time' or None if not stated
+    """
+    for text in texts:
+        job_type = _JOB_TYPE_MATCHER.match(text)
+        if job_type:
+            return job_type
+    return None
+
+
+def enrich_jobs(jobs: List[Dict]) -> List[Dict]:
+    """
+    Fill domain, skills_required and job_type on a batch of scraped jobs.
+    Values already provided by a scraper are kept.
+
+    Args:
+        jobs (List[Dict]): Scraped jobs (modified in place)
+
+    Returns:
+        The same list, enriched
+    """
+    extractor = get_skill_extractor()
+    texts = [f"{job.get('title') or ''}\n{job.get('description') or ''}" for job in jobs]
+    skills_per_job = extractor.extract_many(texts)
+
+    # A scrape batch repeats its keyword and many titles: classify each once
+    by_heading: Dict[tuple, Optional[str]] = {}
+    for job, skills in zip(jobs, skills_per_job):
+        if not job.get('domain'):
+            heading = (job.get('keyword'), job.get('title'))
+            if heading not in by_heading:
+                by_heading[heading] = (
+                    _KEYWORD_DOMAIN_MATCHER.match(heading[0]) or _DOMAIN_MATCHER.match(heading[1])
+                )
+            job['domain'] = by_heading[heading] or _DESCRIPTION_DOMAIN_MATCHER.match(job.get('description'))
+        if not job.get('skills_required'):
+            job['skills_required'] = skills
+        if not job.get('job_type'):
+            job['job_type'] = detect_job_type(job.get('title'), job.get('description'))
+
+    return jobs
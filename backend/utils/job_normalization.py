@@ -0,0 +1,259 @@
+"""
+Normalization of free-text job fields into filterable columns
+Experience ("3-5 Yrs", "Fresher", "5+ years") becomes experience_min /
+experience_max in years, salary ("15-25 LPA", "₹25,000/month",
+"$80k - $100k") becomes salary_min / salary_max as annual amounts with
+currency and the period stated in the posting, and location
+("Hybrid - Hyderabad, Bangalore") becomes a canonical city array plus a
+work mode.
+"""
+
+from typing import Dict, List, Optional, Tuple
+import re
+
+
+NUMBER_PATTERN = re.compile(r"\d+(?:[.,]\d+)*")
+
+EXPERIENCE_RANGE_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*(?:-|–|to)\s*(\d+(?:\.\d+)?)")
+EXPERIENCE_PLUS_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*\+")
+FRESHER_PATTERN = re.compile(r"\bfreshers?\b|\bentry[\s-]level\b|\bno experience\b", re.IGNORECASE)
+
+UNDISCLOSED_PATTERN = re.compile(
+    r"not\s+disclosed|undisclosed|as per|negotiable|competitive|best in (?:the )?industry|unpaid",
+    re.IGNORECASE
+)
+
+# (pattern, currency code); checked in order, default is INR for Indian job boards
+CURRENCY_PATTERNS = [
+    (re.compile(r"₹|\binr\b|\brs\.?(?=\s|\d|$)", re.IGNORECASE), "INR"),
+    (re.compile(r"\$|\busd\b", re.IGNORECASE), "USD"),
+    (re.compile(r"€|\beur\b", re.IGNORECASE), "EUR"),
+    (re.compile(r"£|\bgbp\b", re.IGNORECASE), "GBP"),
+]
+
+# Currencies salaries are parsed into; postings without a symbol are INR
+SALARY_CURRENCIES = [code for _, code in CURRENCY_PATTERNS]
+DEFAULT_SALARY_CURRENCY = "INR"
+
+# (pattern, multiplier) for amount units
+UNIT_PATTERNS = [
+    (re.compile(r"\bcrores?\b|\bcr\b", re.IGNORECASE), 10_000_000),
+    (re.compile(r"\blpa\b|\blakhs?\b|\blacs?\b|\blac\b|\d\s*l\b", re.IGNORECASE), 100_000),
+    (re.compile(r"\d\s*k\b", re.IGNORECASE), 1_000),
+]
+
+# (pattern, period, factor to annualize)
+PERIOD_PATTERNS = [
+    (re.compile(r"per\s+hour|/\s*h(?:ou)?r\b|\bhourly\b|\bph\b", re.IGNORECASE), "hour", 2080),
+    (re.compile(r"per\s+day|/\s*day\b|\bdaily\b", re.IGNORECASE), "day", 260),
+    (re.compile(r"per\s+week|/\s*w(?:ee)?k\b|\bweekly\b", re.IGNORECASE), "week", 52),
+    (re.compile(r"per\s+month|/\s*mo(?:nth)?\b|\bmonthly\b|\bp\.?\s?m\.?(?!\w)|\bstipend\b", re.IGNORECASE), "month", 12),
+]
+
+
+def _to_number(text: str) -> float:
+    # Indian grouping ("3,00,000") and western grouping ("300,000") both drop commas
+    return float(text.replace(",", ""))
+
+
+def parse_experience(text: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Parse an experience requirement into whole years
+
+    Args:
+        text (str): e.g. "3-5 Yrs", "5+ years", "Fresher", "2 years"
+
+    Returns:
+        (min_years, max_years); max is None for open-ended ranges, both None if unknown
+    """
+    if not text:
+        return None, None
+
+    if FRESHER_PATTERN.search(text):
+        return 0, 0
+
+    match = EXPERIENCE_RANGE_PATTERN.search(text)
+    if match:
+        low, high = sorted((float(match.group(1)), float(match.group(2))))
+        return int(low), int(round(high + 0.49))
+
+    match = EXPERIENCE_PLUS_PATTERN.search(text)
+    if match:
+        return int(float(match.group(1))), None
+
+    match = NUMBER_PATTERN.search(text)
+    if match and re.search(r"\b(?:yrs?|years?)\b", text, re.IGNORECASE):
+        years = int(_to_number(match.group(0)))
+        return years, years
+
+    return None, None
+
+
+def parse_salary(text: Optional[str]) -> Dict:
+    """
+    Parse a salary or stipend into an annual range
+
+    Args:
+        text (str): e.g. "15-25 LPA", "₹ 3,00,000 - 5,00,000 P.A.", "$80k - $100k", "₹10,000/month"
+
+    Returns:
+        Dict with salary_min, salary_max (annual, whole currency units),
+        salary_currency and salary_period; values are None when not disclosed
+    """
+    empty = {"salary_min": None, "salary_max": None, "salary_currency": None, "salary_period": None}
+    if not text or UNDISCLOSED_PATTERN.search(text):
+        return empty
+
+    numbers = [_to_number(number) for number in NUMBER_PATTERN.findall(text)]
+    if not numbers:
+        return empty
+
+    currency = next((code for pattern, code in CURRENCY_PATTERNS if pattern.search(text)), DEFAULT_SALARY_CURRENCY)
+    multiplier = next((factor for pattern, factor in UNIT_PATTERNS if pattern.search(text)), 1)
+    period, annualize = next(
+        ((name, factor) for pattern, name, factor in PERIOD_PATTERNS if pattern.search(text)),
+        ("year", 1)
+    )
+
+    low, high = (numbers[0], numbers[1]) if len(numbers) > 1 else (numbers[0], numbers[0])
+    low, high = sorted((low, high))
+
+    return {
+        "salary_min": int(low * multiplier * annualize),
+        "salary_max": int(high * multiplier * annualize),
+        "salary_currency": currency,
+        "salary_period": period
+    }
+
+
+# Canonical city -> lowercase aliases (the canonical name itself is always an alias)
+CITY_ALIASES: Dict[str, List[str]] = {
+    "Bengaluru": ["bangalore", "bengaluru", "banglore", "blr", "bangalore urban"],
+    "Mumbai": ["mumbai", "bombay", "mumbai suburban"],
+    "Navi Mumbai": ["navi mumbai"],
+    "Thane": ["thane"],
+    "Delhi": ["delhi", "new delhi", "delhi ncr", "ncr", "delhi / ncr", "delhi/ncr"],
+    "Gurugram": ["gurugram", "gurgaon"],
+    "Noida": ["noida", "greater noida"],
+    "Ghaziabad": ["ghaziabad"],
+    "Faridabad": ["faridabad"],
+    "Hyderabad": ["hyderabad", "secunderabad", "hyd"],
+    "Chennai": ["chennai", "madras"],
+    "Kolkata": ["kolkata", "calcutta"],
+    "Pune": ["pune", "poona", "pimpri chinchwad"],
+    "Ahmedabad": ["ahmedabad", "amdavad"],
+    "Gandhinagar": ["gandhinagar"],
+    "Surat": ["surat"],
+    "Vadodara": ["vadodara", "baroda"],
+    "Jaipur": ["jaipur"],
+    "Chandigarh": ["chandigarh", "mohali", "panchkula", "tricity"],
+    "Kochi": ["kochi", "cochin", "ernakulam"],
+    "Thiruvananthapuram": ["thiruvananthapuram", "trivandrum"],
+    "Coimbatore": ["coimbatore"],
+    "Madurai": ["madurai"],
+    "Mysuru": ["mysuru", "mysore"],
+    "Mangaluru": ["mangaluru", "mangalore"],
+    "Visakhapatnam": ["visakhapatnam", "vizag"],
+    "Vijayawada": ["vijayawada"],
+    "Indore": ["indore"],
+    "Bhopal": ["bhopal"],
+    "Lucknow": ["lucknow"],
+    "Kanpur": ["kanpur"],
+    "Nagpur": ["nagpur"],
+    "Nashik": ["nashik", "nasik"],
+    "Bhubaneswar": ["bhubaneswar", "bhubaneshwar"],
+    "Patna": ["patna"],
+    "Goa": ["goa", "panaji"],
+    "Dehradun": ["dehradun"],
+    "Singapore": ["singapore"],
+    "Dubai": ["dubai"],
+    "London": ["london"],
+    "New York": ["new york", "nyc"],
+    "San Francisco": ["san francisco", "sf bay area", "bay area"],
+}
+
+# Lowercase alias -> canonical city
+ALIAS_TO_CITY: Dict[str, str] = {}
+for _city, _aliases in CITY_ALIASES.items():
+    for _alias in [_city.lower()] + _aliases:
+        ALIAS_TO_CITY.setdefault(_alias, _city)
+
+_CITY_PATTERN = re.compile(
+    r"(?<!\w)(" + "|".join(re.escape(alias) for alias in sorted(ALIAS_TO_CITY, key=len, reverse=True)) + r")(?!\w)",
+    re.IGNORECASE
+)
+
+# (work mode, pattern); checked in order
+WORK_MODE_PATTERNS = [
+    ("hybrid", re.compile(r"\bhybrid\b", re.IGNORECASE)),
+    ("remote", re.compile(r"\bremote\b|work\s+from\s+home|\bwfh\b|\banywhere\b|\bwork from anywhere\b", re.IGNORECASE)),
+    ("onsite", re.compile(r"\bon[\s-]?site\b|\bin[\s-]office\b|work\s+from\s+office|\bwfo\b", re.IGNORECASE)),
+]
+
+
+def normalize_city(name: Optional[str]) -> Optional[str]:
+    """Canonical city for an alias ("Bangalore" -> "Bengaluru"), or None if unknown"""
+    if not name:
+        return None
+    return ALIAS_TO_CITY.get(" ".join(name.lower().split()))
+
+
+def parse_location(text: Optional[str]) -> Tuple[List[str], Optional[str]]:
+    """
+    Parse a location string into canonical cities and a work mode
+
+    Args:
+        text (str): e.g. "Hybrid - Hyderabad, Chennai, Bengaluru", "Remote", "Bangalore Urban"
+
+    Returns:
+        (cities, work_mode) where work_mode is 'remote', 'hybrid', 'onsite' or None.
+        Only cities in CITY_ALIASES are returned; other places ("Uttar Pradesh",
+        "CA") stay searchable through the location text. Jobs that name a city
+        without a mode are treated as onsite.
+    """
+    if not text:
+        return [], None
+
+    work_mode = next((mode for mode, pattern in WORK_MODE_PATTERNS if pattern.search(text)), None)
+
+    cities = list(dict.fromkeys(ALIAS_TO_CITY[match.lower()] for match in _CITY_PATTERN.findall(text)))
+    if cities and work_mode is None:
+        work_mode = "onsite"
+    return cities, work_mode
+
+
+def parse_location_query(location: Optional[str]) -> Tuple[List[str], Optional[str]]:
+    """
+    Interpret a user's location filter
+
+    Returns:
+        (cities, work_mode) to filter on. Only cities in the alias table are
+        returned, so callers can fall back to a text match for other places;
+        work_mode is only set when the query names a mode ("remote", "hybrid Pune")
+    """
+    if not location:
+        return [], None
+    work_mode = next((mode for mode, pattern in WORK_MODE_PATTERNS if pattern.search(location)), None)
+    cities = list(dict.fromkeys(ALIAS_TO_CITY[match.lower()] for match in _CITY_PATTERN.findall(location)))
+    return cities, work_mode
+
+
+def normalize_jobs(jobs: List[Dict]) -> List[Dict]:
+    """
+    Add numeric experience and salary columns and parsed location columns
+    to a batch of jobs (in place)
+
+    Args:
+        jobs (List[Dict]): Jobs with free-text 'experience', 'salary' and 'location'
+
+    Returns:
+        The same list
+    """
+    for job in jobs:
+        if job.get('experience_min') is None and job.get('experience_max') is None:
+            job['experience_min'], job['experience_max'] = parse_experience(job.get('experience'))
+        if job.get('salary_min') is None and job.get('salary_max') is None:
+            job.update(parse_salary(job.get('salary')))
+        if not job.get('cities') and not job.get('work_mode'):
+            job['cities'], job['work_mode'] = parse_location(job.get('location'))
+    return jobs
@@ -0,0 +1,481 @@
+"""
+BM25 ranking of jobs against a resume
+Keeps a sparse job x term matrix of field-weighted term frequencies over all
+active jobs and scores a resume's skills and text against every job with a
+handful of vectorized NumPy/SciPy operations.
+"""
+
+from typing import Dict, Iterator, List, Optional, Tuple
+from array import array
+import os
+import re
+import threading
+import numpy as np
+from scipy import sparse
+from .job_skill_index import JobSkillIndex
+from .job_normalization import parse_location, parse_location_query
+from .skill_dictionary import canonicalize_skills
+
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or our that the their this to was
+we will with you your who what which about all also any can do etc how if into more must not one
+other out over per should such than them then there these they us using via well work working
+job jobs role candidate candidates experience years year team teams company responsibilities
+requirements required skills skill ability good strong knowledge looking preferred
+""".split())
+
+# Term frequency multipliers per field (BM25F-style): a skill listed in
+# skills_required counts more than the same word in the title, which counts
+# more than a mention in the description
+FIELD_BOOSTS = {"skills": 3.0, "title": 2.0, "description": 1.0}
+
+# Query weights: dictionary skill terms, the words of a skill's name (for jobs
+# whose skill was not extracted) and words from the resume text
+SKILL_QUERY_WEIGHT = 1.0
+SKILL_WORD_QUERY_WEIGHT = 0.5
+TEXT_QUERY_WEIGHT = 0.2
+
+SKILL_PREFIX = "skill:"
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase word tokens without stopwords ("C++", "node.js" stay whole)"""
+    if not text:
+        return []
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+class JobRanker(JobSkillIndex):
+    """
+    BM25 over all active jobs.
+    The matrix stores field-weighted term frequencies; IDF and length
+    normalization are applied at query time to the query's columns only, so
+    adding jobs never rewrites existing weights. New jobs collect in a small
+    pending block that is merged into the main CSC matrix once it grows.
+    """
+
+    def __init__(
+        self,
+        storage=None,
+        cache=None,
+        rebuild_seconds: float = 3600,
+        k1: float = 1.2,
+        b: float = 0.75,
+        field_boosts: Optional[Dict[str, float]] = None
+    ):
+        """
+        Args:
+            storage (JobStorageBackend): Source of active jobs (default: configured backend)
+            cache (JobQueryCache): Used to notice writes made by other processes
+            rebuild_seconds (float): Age after which the next query rebuilds from scratch
+            k1 (float): BM25 term frequency saturation
+            b (float): BM25 length normalization strength
+            field_boosts (Dict[str, float]): Overrides for FIELD_BOOSTS
+        """
+        self.k1 = k1
+        self.b = b
+        self.field_boosts = dict(FIELD_BOOSTS, **(field_boosts or {}))
+        super().__init__(storage=storage, cache=cache, rebuild_seconds=rebuild_seconds)
+
+    def _reset(self) -> None:
+        super()._reset()
+        self.vocabulary: Dict[str, int] = {}
+        self.terms: List[str] = []
+        self.lengths = array('f')
+        # Domain and work mode values share one small code table
+        self.value_codes: Dict[Optional[str], int] = {None: 0}
+        self.domain_codes = array('h')
+        self.mode_codes = array('h')
+        self.city_docs: Dict[str, array] = {}
+        self.matrix = sparse.csc_matrix((0, 0), dtype=np.float32)
+        self._pending_indptr = array('q', [0])
+        self._pending_indices = array('i')
+        self._pending_data = array('f')
+
+    def _code(self, value: Optional[str]) -> int:
+        return self.value_codes.setdefault(value, len(self.value_codes))
+
+    def _index_job(self, doc: int, row: Dict, skills: List[str]) -> None:
+        weights: Dict[int, float] = {}
+
+        def add(term: str, weight: float) -> None:
+            column = self.vocabulary.get(term)
+            if column is None:
+                column = self.vocabulary[term] = len(self.terms)
+                self.terms.append(term)
+            weights[column] = weights.get(column, 0.0) + weight
+
+        for skill in skills:
+            add(SKILL_PREFIX + skill.lower(), self.field_boosts['skills'])
+        for token in tokenize(row.get('title')):
+            add(token, self.field_boosts['title'])
+        for token in tokenize(row.get('description')):
+            add(token, self.field_boosts['description'])
+
+        self._pending_indices.extend(weights.keys())
+        self._pending_data.extend(weights.values())
+        self._pending_indptr.append(len(self._pending_indices))
+        self.lengths.append(sum(weights.values()))
+
+        self.domain_codes.append(self._code(row.get('domain')))
+        self.mode_codes.append(self._code(row.get('work_mode')))
+        for city in self.records[doc].cities:
+            docs = self.city_docs.get(city)
+            if docs is None:
+                docs = self.city_docs[city] = array('I')
+            docs.append(doc)
+
+    def _pending_matrix(self) -> sparse.csc_matrix:
+        return sparse.csr_matrix(
+            (
+                np.array(self._pending_data, dtype=np.float32),
+                np.array(self._pending_indices, dtype=np.int32),
+                np.array(self._pending_indptr, dtype=np.int64)
+            ),
+            shape=(len(self._pending_indptr) - 1, len(self.vocabulary))
+        ).tocsc()
+
+    def _merge_pending(self) -> None:
+        pending = self._pending_matrix()
+        matrix = self.matrix
+        matrix.resize((matrix.shape[0], len(self.vocabulary)))
+        self.matrix = sparse.vstack([matrix, pending], format='csc', dtype=np.float32)
+        self._pending_indptr = array('q', [0])
+        self._pending_indices = array('i')
+        self._pending_data = array('f')
+
+    def _parts(self) -> List[Tuple[sparse.csc_matrix, int]]:
+        """Matrix blocks covering every job, with the doc number of their first row"""
+        pending_rows = len(self._pending_indptr) - 1
+        if pending_rows > max(1000, self.matrix.shape[0] // 20):
+            self._merge_pending()
+            pending_rows = 0
+
+        columns = len(self.vocabulary)
+        if self.matrix.shape[1] != columns:
+            self.matrix.resize((self.matrix.shape[0], columns))
+
+        parts = [(self.matrix, 0)]
+        if pending_rows:
+            parts.append((self._pending_matrix(), self.matrix.shape[0]))
+        return parts
+
+    def rebuild(self) -> None:
+        super().rebuild()
+        with self._lock:
+            self._merge_pending()
+
+    def _build_query(self, skills: List[str], text: Optional[str]) -> Tuple[Dict[int, float], Dict[int, str]]:
+        """Query weights by column, and the resume skill each skill column came from"""
+        weights: Dict[int, float] = {}
+        owners: Dict[int, str] = {}
+
+        def add(term: str, weight: float, owner: Optional[str] = None) -> None:
+            column = self.vocabulary.get(term)
+            if column is None:
+                return
+            if weight > weights.get(column, 0.0):
+                weights[column] = weight
+            if owner is not None:
+                owners.setdefault(column, owner)
+
+        for skill in skills or []:
+            if not isinstance(skill, str) or not skill.strip():
+                continue
+            canonical = canonicalize_skills([skill])[0]
+            add(SKILL_PREFIX + canonical.lower(), SKILL_QUERY_WEIGHT, skill)
+            words = tokenize(canonical)
+            for word in words:
+                add(word, SKILL_WORD_QUERY_WEIGHT / len(words), skill)
+
+        for token in set(tokenize(text)):
+            add(token, TEXT_QUERY_WEIGHT)
+
+        return weights, owners
+
+    def _filter_mask(self, domain: Optional[str], location: Optional[str]) -> Optional[np.ndarray]:
+        """Boolean mask of jobs passing the filters, or None if no job can pass"""
+        count = len(self.records)
+        mask = np.ones(count, dtype=bool)
+
+        if len(self.doc_by_id) != count:
+            mask &= np.fromiter((record is not None for record in self.records), dtype=bool, count=count)
+
+        if domain:
+            code = self.value_codes.get(domain)
+            if code is None:
+                return None
+            mask &= np.array(self.domain_codes, dtype=np.int16) == code
+
+        cities, work_mode = parse_location_query(location)
+        if location and not cities and not work_mode:
+            cities = parse_location(location)[0]
+
+        if work_mode:
+            code = self.value_codes.get(work_mode)
+            if code is None:
+                return None
+            mask &= np.array(self.mode_codes, dtype=np.int16) == code
+
+        if cities:
+            in_city = np.zeros(count, dtype=bool)
+            for city in cities:
+                docs = self.city_docs.get(city)
+                if docs:
+                    in_city[np.array(docs, dtype=np.int64)] = True
+            mask &= in_city
+
+        return mask
+
+    def _term_weights(self, columns: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        BM25 weight of every (job, term) entry in the given columns
+
+        Returns:
+            (doc numbers, positions in `columns`, weights) with one element per entry
+        """
+        count = len(self.records)
+        lengths = np.array(self.lengths, dtype=np.float32)
+        average_length = float(lengths.mean()) or 1.0
+
+        # Column slices of every block: one entry per (job, query term)
+        blocks = []
+        document_frequency = np.zeros(len(columns), dtype=np.float64)
+        for matrix, offset in self._parts():
+            block = matrix[:, columns]
+            document_frequency += np.diff(block.indptr)
+            blocks.append((block, offset))
+
+        idf = np.log1p((count - document_frequency + 0.5) / (document_frequency + 0.5))
+
+        entry_rows, entry_terms, entry_weights = [], [], []
+        for block, offset in blocks:
+            terms = np.repeat(np.arange(len(columns)), np.diff(block.indptr))
+            rows = block.indices.astype(np.int64) + offset
+            tf = block.data
+            norm = self.k1 * (1 - self.b + self.b * lengths[rows] / average_length)
+            entry_rows.append(rows)
+            entry_terms.append(terms)
+            entry_weights.append(idf[terms] * tf * (self.k1 + 1) / (tf + norm))
+
+        return np.concatenate(entry_rows), np.concatenate(entry_terms), np.concatenate(entry_weights)
+
+    def rank(
+        self,
+        skills: List[str],
+        text: Optional[str] = None,
+        domain: Optional[str] = None,
+        location: Optional[str] = None,
+        limit: int = 50
+    ) -> List[Dict]:
+        """
+        Score every active job against a resume and return the best ones
+
+        Args:
+            skills (List[str]): Resume skills as written
+            text (str): Optional resume text, weighted below skills
+            domain (str): Domain id filter
+            location (str): Location filter ("Bangalore", "Remote", ...)
+            limit (int): Maximum number of results
+
+        Returns:
+            Dicts with 'job_id', 'score' (BM25), 'matching_skills' (resume
+            skills that contributed, strongest first) and 'term_scores'
+            (contribution of each matched term), best first
+        """
+        with self._lock:
+            self._sync()
+
+            query, owners = self._build_query(skills, text)
+            count = len(self.records)
+            if not query or not count:
+                return []
+
+            mask = self._filter_mask(domain, location)
+            if mask is None:
+                return []
+
+            columns = np.fromiter(query.keys(), dtype=np.int64, count=len(query))
+            query_weights = np.fromiter(query.values(), dtype=np.float32, count=len(query))
+
+            rows, terms, weights = self._term_weights(columns)
+            contributions = weights * query_weights[terms]
+            scores = np.bincount(rows, weights=contributions, minlength=count)
+            scores[~mask] = 0
+
+            candidates = np.flatnonzero(scores > 0)
+            if len(candidates) > limit:
+                candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+            # Best score first, newest job (highest doc number) first among ties
+            top = candidates[np.lexsort((-candidates, -scores[candidates]))]
+
+            # Per-term contributions for the returned jobs only
+            position = {int(doc): index for index, doc in enumerate(top)}
+            entries: List[List[Tuple[str, Optional[str], float]]] = [[] for _ in top]
+            for entry in np.flatnonzero(np.isin(rows, top)):
+                column = int(columns[terms[entry]])
+                entries[position[int(rows[entry])]].append(
+                    (self.terms[column], owners.get(column), float(contributions[entry]))
+                )
+
+            return [
+                self._result(self.records[doc].job_id, float(scores[doc]), entries[index])
+                for index, doc in enumerate(int(doc) for doc in top)
+            ]
+
+    @staticmethod
+    def _result(job_id: str, score: float, entries: List[Tuple[str, Optional[str], float]]) -> Dict:
+        """Result dict from a job's (term, owning resume skill, contribution) entries"""
+        term_scores: Dict[str, float] = {}
+        skill_scores: Dict[str, float] = {}
+        for term, owner, value in entries:
+            term = term[len(SKILL_PREFIX):] if term.startswith(SKILL_PREFIX) else term
+            term_scores[term] = term_scores.get(term, 0.0) + value
+            if owner is not None:
+                skill_scores[owner] = skill_scores.get(owner, 0.0) + value
+
+        return {
+            "job_id": job_id,
+            "score": score,
+            "matching_skills": sorted(skill_scores, key=skill_scores.get, reverse=True),
+            "term_scores": {
+                term: round(value, 4)
+                for term, value in sorted(term_scores.items(), key=lambda item: -item[1])
+                if value > 0
+            }
+        }
+
+    def rank_many(self, profiles: List[Dict], limit: int = 10, max_scores: int = 8_000_000) -> Iterator[List[Dict]]:
+        """
+        Rank jobs for many resumes at once.
+        The BM25 weights of every term used by any profile are computed once
+        into a jobs x terms matrix, and each chunk of profiles is scored with
+        a single sparse product against its terms x profiles query matrix.
+
+        Args:
+            profiles (List[Dict]): Dicts with 'skills' and optional 'text', 'domain' and 'location'
+            limit (int): Maximum results per profile
+            max_scores (int): Upper bound on (job, profile) scores held per product;
+                              profiles are chunked so the score matrix stays within it
+
+        Yields:
+            For each profile, in order, the list rank() would return
+        """
+        with self._lock:
+            self._sync()
+
+            count = len(self.records)
+            records = self.records
+            queries = [self._build_query(profile.get('skills'), profile.get('text')) for profile in profiles]
+            masks: Dict[Tuple, Optional[np.ndarray]] = {}
+            for profile in profiles:
+                key = (profile.get('domain'), profile.get('location'))
+                if key not in masks:
+                    masks[key] = self._filter_mask(*key) if count else None
+
+            columns = np.array(sorted({column for query, _ in queries for column in query}), dtype=np.int64)
+            names = [self.terms[column] for column in columns]
+            weights = None
+            document_frequency = np.zeros(len(columns), dtype=np.int64)
+            if count and len(columns):
+                rows, terms, values = self._term_weights(columns)
+                weights = sparse.csr_matrix(
+                    (values, (rows, terms)), shape=(count, len(columns))
+                )
+                document_frequency = np.bincount(terms, minlength=len(columns))
+
+        position = {int(column): index for index, column in enumerate(columns)}
+
+        # Chunk boundaries: a profile can score at most the jobs containing its terms
+        boundaries = [0]
+        budget = 0
+        for index, (query, _) in enumerate(queries):
+            matches = min(count, int(sum(document_frequency[position[column]] for column in query)))
+            if budget and budget + matches > max_scores:
+                boundaries.append(index)
+                budget = 0
+            budget += matches
+        boundaries.append(len(queries))
+
+        for start, end in zip(boundaries, boundaries[1:]):
+            chunk = queries[start:end]
+            if weights is None:
+                for _ in chunk:
+                    yield []
+                continue
+
+            query_rows, query_columns, query_values = [], [], []
+            for index, (query, _) in enumerate(chunk):
+                for column, weight in query.items():
+                    query_rows.append(position[column])
+                    query_columns.append(index)
+                    query_values.append(weight)
+            query_matrix = sparse.csc_matrix(
+                (np.array(query_values, dtype=np.float64), (query_rows, query_columns)),
+                shape=(len(columns), len(chunk))
+            )
+            # jobs x profiles: every score of the chunk in one product
+            scores = (weights @ query_matrix).tocsc()
+
+            for index, (query, owners) in enumerate(chunk):
+                profile = profiles[start + index]
+                mask = masks[(profile.get('domain'), profile.get('location'))]
+                if mask is None or not query:
+                    yield []
+                    continue
+
+                docs = scores.indices[scores.indptr[index]:scores.indptr[index + 1]].astype(np.int64)
+                values = scores.data[scores.indptr[index]:scores.indptr[index + 1]]
+                keep = mask[docs] & (values > 0)
+                docs, values = docs[keep], values[keep]
+                if len(docs) > limit:
+                    best = np.argpartition(-values, limit - 1)[:limit]
+                    docs, values = docs[best], values[best]
+                # Best score first, newest job first among ties
+                order = np.lexsort((-docs, -values))
+
+                results = []
+                for doc, score in zip(docs[order].tolist(), values[order].tolist()):
+                    record = records[doc]
+                    if record is None:
+                        continue
+                    row = slice(weights.indptr[doc], weights.indptr[doc + 1])
+                    entries = []
+                    for term, weight in zip(weights.indices[row].tolist(), weights.data[row].tolist()):
+                        column = int(columns[term])
+                        if column in query:
+                            entries.append((names[term], owners.get(column), weight * query[column]))
+                    results.append(self._result(record.job_id, score, entries))
+                yield results
+
+    def stats(self) -> Dict:
+        stats = super().stats()
+        with self._lock:
+            stats.update({
+                "terms": len(self.vocabulary),
+                "matrix_nonzeros": int(self.matrix.nnz),
+                "pending_jobs": len(self._pending_indptr) - 1,
+                "matrix_bytes": int(
+                    self.matrix.data.nbytes + self.matrix.indices.nbytes + self.matrix.indptr.nbytes
+                )
+            })
+        return stats
+
+
+_ranker = None
+_ranker_lock = threading.Lock()
+
+
+def get_job_ranker() -> JobRanker:
+    """Get the process-wide ranker (built lazily on the first query)"""
+    global _ranker
+    if _ranker is None:
+        with _ranker_lock:
+            if _ranker is None:
+                _ranker = JobRanker(
+                    rebuild_seconds=float(os.getenv("JOB_INDEX_REBUILD_SECONDS", "3600"))
+                )
+    return _ranker
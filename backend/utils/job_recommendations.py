@@ -0,0 +1,289 @@
+"""
+Materialized job recommendations
+Scores each user's latest resume skills against active jobs and keeps the
+top N matches per user in the job_recommendations table, so reading a
+user's recommendations is one indexed query. Inserted jobs are scored only
+against existing profiles instead of recomputing every user, on a scoring
+thread so that storing jobs never waits for it.
+
+Run from the backend directory (e.g. after deploying, or on a schedule to
+pick up edited resumes):
+    python -m utils.job_recommendations refresh
+    python -m utils.job_recommendations refresh --user-id <uuid>
+    python -m utils.job_recommendations show --user-id <uuid>
+"""
+
+from typing import Dict, List, Optional
+import argparse
+import atexit
+import heapq
+import json
+import os
+import threading
+import time
+from .skill_dictionary import skill_profile
+
+
+# Resume profiles are re-read from storage at most this often when scoring new jobs
+PROFILE_REFRESH_SECONDS = 300
+
+# Inserted jobs waiting to be scored; beyond this the oldest are left to the next full refresh
+MAX_PENDING_JOBS = 20000
+
+
+class RecommendationMaterializer:
+    """
+    Maintains job_recommendations: a full refresh ranks all active jobs for
+    a user with the BM25 ranker, and new jobs are matched against every
+    profile's skills and merged into each user's top N.
+    match_score is the percent of the resume's skills a job requires, the
+    same meaning as in JobDatabase.recommend_jobs.
+    """
+
+    def __init__(self, storage=None, ranker=None, top_n: int = 100):
+        """
+        Args:
+            storage (JobStorageBackend): Source of profiles and target table (default: configured backend)
+            ranker (JobRanker): Ranker used for full refreshes (default: process-wide ranker)
+            top_n (int): Recommendations kept per user; 0 disables incremental scoring
+        """
+        self._storage = storage
+        self._ranker = ranker
+        self.top_n = top_n
+        self._lock = threading.Lock()
+        self._profiles: Optional[List[Dict]] = None
+        self._profiles_loaded_at = 0.0
+        # Jobs queued by schedule_new_jobs for the scoring thread
+        self._pending_jobs: List[Dict] = []
+        self._pending_changed = threading.Condition()
+        self._scoring = False
+        self._scorer: Optional[threading.Thread] = None
+
+    @property
+    def storage(self):
+        if self._storage is None:
+            from .job_storage import get_job_storage
+            self._storage = get_job_storage()
+        return self._storage
+
+    @property
+    def ranker(self):
+        if self._ranker is None:
+            from .job_ranking import get_job_ranker
+            self._ranker = get_job_ranker()
+        return self._ranker
+
+    def _row(self, profile: Dict, job_id: str, matching_skills: List[str]) -> Dict:
+        total = len(profile['wanted'])
+        return {
+            'user_id': profile['user_id'],
+            'job_id': job_id,
+            'resume_id': profile['resume_id'],
+            'match_score': round(len(matching_skills) / total * 100, 2),
+            'matching_skills': matching_skills,
+            'recommendation_reason': (
+                f"Matches {len(matching_skills)} of your {total} skills: {', '.join(matching_skills[:5])}"
+            )
+        }
+
+    def _load_profiles(self, user_ids: Optional[List[str]] = None) -> List[Dict]:
+        profiles = []
+        for profile in self.storage.get_resume_profiles(user_ids):
+            wanted = skill_profile(profile['skills'])
+            if wanted:
+                profiles.append({**profile, 'wanted': wanted})
+        return profiles
+
+    def _get_profiles(self) -> List[Dict]:
+        if self._profiles is None or time.time() - self._profiles_loaded_at > PROFILE_REFRESH_SECONDS:
+            self._profiles = self._load_profiles()
+            self._profiles_loaded_at = time.time()
+        return self._profiles
+
+    def refresh(self, user_ids: Optional[List[str]] = None) -> Dict:
+        """
+        Recompute the recommendations of some or all users from scratch
+
+        Users without a resume or skills get an empty list, still marked as
+        computed so reads do not refresh them again
+
+        Args:
+            user_ids (List[str]): Users to refresh (default: every user with a resume)
+
+        Returns:
+            Dict with the number of users and rows written and the time taken
+        """
+        started = time.perf_counter()
+        profiles = self._load_profiles(user_ids)
+        rows_written = 0
+        for profile in profiles:
+            matches = self.ranker.rank(list(profile['wanted'].values()), limit=self.top_n or 100)
+            rows = [
+                self._row(profile, match['job_id'], match['matching_skills'])
+                for match in matches
+                if match['matching_skills']
+            ]
+            rows_written += self.storage.replace_recommendations(profile['user_id'], rows)
+        for user_id in set(user_ids or ()) - {profile['user_id'] for profile in profiles}:
+            self.storage.replace_recommendations(user_id, [])
+
+        if user_ids is None:
+            with self._lock:
+                self._profiles = profiles
+                self._profiles_loaded_at = time.time()
+
+        return {
+            "users": len(profiles),
+            "rows": rows_written,
+            "seconds": round(time.perf_counter() - started, 3)
+        }
+
+    def score_new_jobs(self, jobs: List[Dict]) -> Dict:
+        """
+        Merge newly inserted jobs into every user's recommendations
+
+        Args:
+            jobs (List[Dict]): Inserted job rows with ids and canonical skills_required
+
+        Returns:
+            Dict with the number of users and rows written and the time taken
+        """
+        started = time.perf_counter()
+        report = {"users": 0, "rows": 0, "seconds": 0.0}
+        if self.top_n <= 0 or not jobs:
+            return report
+
+        # Canonical skill -> new jobs requiring it
+        jobs_by_skill: Dict[str, List[str]] = {}
+        for job in jobs:
+            if job.get('id') and job.get('is_active') is not False:
+                for skill in set(job.get('skills_required') or []):
+                    jobs_by_skill.setdefault(skill, []).append(job['id'])
+        if not jobs_by_skill:
+            return report
+
+        with self._lock:
+            profiles = self._get_profiles()
+
+        rows, user_ids = [], []
+        for profile in profiles:
+            matched: Dict[str, List[str]] = {}
+            for canonical, written in profile['wanted'].items():
+                for job_id in jobs_by_skill.get(canonical, ()):
+                    matched.setdefault(job_id, []).append(written)
+            if not matched:
+                continue
+            best = heapq.nlargest(self.top_n, matched.items(), key=lambda item: len(item[1]))
+            rows.extend(self._row(profile, job_id, skills) for job_id, skills in best)
+            user_ids.append(profile['user_id'])
+
+        if rows:
+            self.storage.upsert_recommendations(rows)
+            # New rows may push older ones out of a user's top N
+            self.storage.prune_recommendations(user_ids, self.top_n)
+
+        report.update({
+            "users": len(user_ids),
+            "rows": len(rows),
+            "seconds": round(time.perf_counter() - started, 3)
+        })
+        return report
+
+    def schedule_new_jobs(self, jobs: List[Dict]) -> None:
+        """
+        Queue newly inserted jobs for score_new_jobs on the scoring thread
+        Jobs queued while it is busy are scored together in its next pass,
+        so each user's rows are written once per pass instead of per insert.
+        """
+        if self.top_n <= 0 or not jobs:
+            return
+        with self._pending_changed:
+            self._pending_jobs.extend(jobs)
+            dropped = len(self._pending_jobs) - MAX_PENDING_JOBS
+            if dropped > 0:
+                print(f"⚠️  Recommendation scoring is behind, {dropped} jobs left to the next refresh")
+                del self._pending_jobs[:dropped]
+            if self._scorer is None:
+                scorer = threading.Thread(target=self._score_pending, name="recommendation-scorer", daemon=True)
+                scorer.start()
+                # Only a started thread counts: if start() fails the next call tries again
+                self._scorer = scorer
+            self._pending_changed.notify_all()
+
+    def _score_pending(self) -> None:
+        while True:
+            with self._pending_changed:
+                self._scoring = False
+                self._pending_changed.notify_all()
+                self._pending_changed.wait_for(lambda: self._pending_jobs)
+                jobs, self._pending_jobs = self._pending_jobs, []
+                self._scoring = True
+            try:
+                report = self.score_new_jobs(jobs)
+                if report["rows"]:
+                    print(f"🎯 Scored {len(jobs)} new jobs: {report['rows']} recommendations "
+                          f"for {report['users']} users in {report['seconds']}s")
+            except Exception as e:
+                # The jobs are stored; the next refresh picks them up
+                print(f"⚠️  Could not update job recommendations: {str(e)}")
+
+    def drain(self, timeout: Optional[float] = 30) -> bool:
+        """
+        Wait for queued jobs to be scored
+
+        Returns:
+            bool: True if nothing is left to score, False if the timeout expired first
+        """
+        with self._pending_changed:
+            drained = self._pending_changed.wait_for(
+                lambda: not self._pending_jobs and not self._scoring, timeout=timeout
+            )
+            pending = len(self._pending_jobs)
+        if not drained:
+            print(f"⚠️  {pending} jobs still waiting for recommendation scoring at shutdown")
+        return drained
+
+
+_materializer = None
+_materializer_lock = threading.Lock()
+
+
+def get_recommendation_materializer() -> RecommendationMaterializer:
+    """
+    Get the process-wide recommendation materializer, configured from the
+    environment: JOB_RECOMMENDATIONS_TOP_N (default 100) and
+    SHUTDOWN_DRAIN_SECONDS (default 25, the wait at exit for pending scoring)
+    """
+    global _materializer
+    if _materializer is None:
+        with _materializer_lock:
+            if _materializer is None:
+                _materializer = RecommendationMaterializer(
+                    top_n=int(os.getenv("JOB_RECOMMENDATIONS_TOP_N", "100"))
+                )
+                atexit.register(_materializer.drain, float(os.getenv("SHUTDOWN_DRAIN_SECONDS", "25")))
+    return _materializer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh and inspect materialized job recommendations")
+    parser.add_argument("command", choices=["refresh", "show"])
+    parser.add_argument("--user-id", action="append", help="Limit to this user (repeatable)")
+    parser.add_argument("--limit", type=int, default=10, help="Rows shown by 'show'")
+    args = parser.parse_args()
+
+    materializer = get_recommendation_materializer()
+    if args.command == "refresh":
+        print(json.dumps(materializer.refresh(args.user_id), indent=2))
+        return 0
+
+    if not args.user_id:
+        parser.error("show needs --user-id")
+    for user_id in args.user_id:
+        for job in materializer.storage.get_recommendations(user_id, limit=args.limit):
+            print(f"{job['match_score']:6.2f}  {job['title']} @ {job['company']}  ({job['id']})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,178 @@
+"""
+Job Retention Engine
+Moves expired jobs out of the hot jobs table into jobs_archive in bounded batches
+
+Run on a schedule (cron, systemd timer, CI job) from the backend directory:
+    python -m utils.job_retention --days 30 --batch-size 500
+    python -m utils.job_retention --days 30 --dry-run
+"""
+
+from typing import Dict, Optional
+from datetime import datetime, timedelta
+import argparse
+import json
+import time
+
+
+class JobRetentionEngine:
+    """
+    Archives expired jobs batch by batch so no single statement locks or
+    rewrites a large part of the jobs table
+    """
+
+    def __init__(
+        self,
+        db=None,
+        batch_size: int = 500,
+        max_batches: Optional[int] = None,
+        pause_seconds: float = 0.0
+    ):
+        """
+        Initialize the retention engine
+
+        Args:
+            db (JobDatabase): Database to archive from (created if None)
+            batch_size (int): Maximum rows moved per batch
+            max_batches (int): Stop after this many batches (None = until done)
+            pause_seconds (float): Sleep between batches to leave room for live traffic
+        """
+        if db is None:
+            from .job_database import JobDatabase
+            db = JobDatabase()
+
+        self.db = db
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self.pause_seconds = pause_seconds
+
+    def run(
+        self,
+        days: int = 30,
+        dry_run: bool = False,
+        archive_retention_days: Optional[int] = None
+    ) -> Dict:
+        """
+        Archive jobs scraped more than `days` days ago
+
+        Args:
+            days (int): Age after which a job is archived
+            dry_run (bool): Only count eligible jobs, move nothing
+            archive_retention_days (int): Also drop archive partitions older
+                                          than this many days (None = keep all)
+
+        Returns:
+            Dict with rows moved, per-batch timings and totals
+        """
+        start_time = datetime.now()
+        cutoff = (start_time - timedelta(days=days)).isoformat()
+
+        report = {
+            "success": True,
+            "dry_run": dry_run,
+            "cutoff": cutoff,
+            "batch_size": self.batch_size,
+            "eligible_count": 0,
+            "rows_moved": 0,
+            "rows_deactivated": 0,
+            "batches": [],
+            "partitions_dropped": 0
+        }
+
+        try:
+            report['eligible_count'] = self.db.count_expired_jobs(cutoff)
+            print(f"🗄️  {report['eligible_count']} jobs older than {days} days (cutoff {cutoff})")
+
+            if not dry_run:
+                self._archive_batches(cutoff, report)
+
+                if archive_retention_days is not None:
+                    purge_before = (start_time - timedelta(days=archive_retention_days)).date().isoformat()
+                    report['partitions_dropped'] = self.db.drop_archive_partitions(purge_before)
+                    print(f"🧹 Dropped {report['partitions_dropped']} archive partitions before {purge_before}")
+
+        except Exception as e:
+            print(f"❌ Error archiving jobs: {str(e)}")
+            report['success'] = False
+            report['error'] = str(e)
+
+        report['duration_seconds'] = (datetime.now() - start_time).total_seconds()
+        return report
+
+    def _archive_batches(self, cutoff: str, report: Dict) -> None:
+        """Archive batches until nothing is left or max_batches is reached"""
+        batch_number = 0
+
+        while self.max_batches is None or batch_number < self.max_batches:
+            batch_number += 1
+            batch_start = time.perf_counter()
+            result = self.db.archive_expired_jobs_batch(cutoff, self.batch_size)
+            duration_ms = (time.perf_counter() - batch_start) * 1000
+
+            if result['moved'] == 0 and result['deactivated'] == 0:
+                break
+
+            report['rows_moved'] += result['moved']
+            report['rows_deactivated'] += result['deactivated']
+            report['batches'].append({
+                "batch": batch_number,
+                "rows_moved": result['moved'],
+                "rows_deactivated": result['deactivated'],
+                "duration_ms": round(duration_ms, 2)
+            })
+            print(f"  Batch {batch_number}: moved {result['moved']}, "
+                  f"deactivated {result['deactivated']} in {duration_ms:.1f} ms")
+
+            if result['moved'] + result['deactivated'] < self.batch_size:
+                break
+
+            if self.pause_seconds:
+                time.sleep(self.pause_seconds)
+
+
+def run_retention(
+    days: int = 30,
+    batch_size: int = 500,
+    dry_run: bool = False,
+    max_batches: Optional[int] = None,
+    archive_retention_days: Optional[int] = None
+) -> Dict:
+    """
+    Schedulable entry point for the retention engine
+
+    Args:
+        days (int): Age after which a job is archived
+        batch_size (int): Maximum rows moved per batch
+        dry_run (bool): Only count eligible jobs
+        max_batches (int): Stop after this many batches
+        archive_retention_days (int): Drop archive partitions older than this
+
+    Returns:
+        Dict with the retention report
+    """
+    engine = JobRetentionEngine(batch_size=batch_size, max_batches=max_batches)
+    return engine.run(days=days, dry_run=dry_run, archive_retention_days=archive_retention_days)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive expired jobs in bounded batches")
+    parser.add_argument("--days", type=int, default=30, help="Archive jobs older than this many days")
+    parser.add_argument("--batch-size", type=int, default=500, help="Rows moved per batch")
+    parser.add_argument("--max-batches", type=int, default=None, help="Stop after this many batches")
+    parser.add_argument("--archive-retention-days", type=int, default=None,
+                        help="Drop archive partitions older than this many days")
+    parser.add_argument("--dry-run", action="store_true", help="Only report how many jobs would move")
+    args = parser.parse_args()
+
+    report = run_retention(
+        days=args.days,
+        batch_size=args.batch_size,
+        dry_run=args.dry_run,
+        max_batches=args.max_batches,
+        archive_retention_days=args.archive_retention_days
+    )
+    print(json.dumps(report, indent=2))
+    return 0 if report.get('success') else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
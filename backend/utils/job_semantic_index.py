@@ -0,0 +1,788 @@
+"""
+Semantic job index: hashed n-gram vectors in an IVF (inverted file) index
+Jobs and resumes are encoded offline-computably (no model download) into
+dense vectors from word unigrams and bigrams, canonical skills and the
+concepts those skills belong to, so "PyTorch" lands near "deep learning"
+and "React" near "frontend". Vectors are clustered into lists around k-means
+centroids and persisted as .npy files that are memory-mapped at startup;
+a query only scores the few lists closest to it.
+
+CLI (from backend/):
+    python -m utils.job_semantic_index build
+    python -m utils.job_semantic_index stats
+    python -m utils.job_semantic_index query "pytorch computer vision"
+"""
+
+from typing import Dict, List, Optional, Tuple
+from pathlib import Path
+import argparse
+import json
+import os
+import shutil
+import threading
+import time
+import zlib
+import numpy as np
+from .job_ranking import tokenize
+from .skill_dictionary import (
+    SKILL_CATEGORIES, SKILL_TO_CATEGORIES, canonicalize_skills, get_skill_extractor
+)
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process use only
+    fcntl = None
+
+
+DEFAULT_INDEX_PATH = Path(__file__).resolve().parents[1] / "data" / "semantic_index"
+
+ENCODE_COLUMNS = ['id', 'title', 'description', 'domain', 'skills_required', 'created_at']
+
+# Feature weights before L2 normalization
+WORD_WEIGHT = 1.0
+BIGRAM_WEIGHT = 0.5
+SKILL_WEIGHT = 2.0
+CONCEPT_WEIGHT = 1.5
+
+
+def _stable_hash(feature: str) -> int:
+    # Python's hash() is salted per process; vectors must match across runs
+    return zlib.crc32(feature.encode("utf-8"))
+
+
+class HashedNgramEncoder:
+    """
+    Encodes text and skill lists into L2-normalized vectors with the hashing
+    trick: each feature adds +/-weight to one of `dim` buckets
+    """
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+        self._bucket_cache: Dict[str, Tuple[int, float]] = {}
+
+    def _bucket(self, feature: str) -> Tuple[int, float]:
+        bucket = self._bucket_cache.get(feature)
+        if bucket is None:
+            value = _stable_hash(feature)
+            bucket = (value % self.dim, 1.0 if value & 0x80000000 else -1.0)
+            if len(self._bucket_cache) < 500_000:
+                self._bucket_cache[feature] = bucket
+        return bucket
+
+    def features(self, text: Optional[str], skills: Optional[List[str]] = None) -> Dict[str, float]:
+        """Weighted features of a text and its (canonical) skills"""
+        features: Dict[str, float] = {}
+
+        def add(feature: str, weight: float) -> None:
+            features[feature] = features.get(feature, 0.0) + weight
+
+        tokens = tokenize(text)
+        for token in tokens:
+            add(token, WORD_WEIGHT)
+        for first, second in zip(tokens, tokens[1:]):
+            add(f"{first} {second}", BIGRAM_WEIGHT)
+
+        if skills is None:
+            skills = get_skill_extractor().extract(text or "")
+        for skill in canonicalize_skills(skills):
+            add(f"skill:{skill.lower()}", SKILL_WEIGHT)
+            for category in SKILL_TO_CATEGORIES.get(skill, []):
+                add(f"concept:{category}", CONCEPT_WEIGHT)
+
+        lowered = f" {' '.join(tokens)} "
+        for category in SKILL_CATEGORIES:
+            if f" {category} " in lowered:
+                add(f"concept:{category}", CONCEPT_WEIGHT)
+
+        # Sublinear term frequency so repeated words do not dominate
+        return {feature: 1.0 + np.log(weight) if weight > 1 else weight for feature, weight in features.items()}
+
+    def encode(self, text: Optional[str], skills: Optional[List[str]] = None) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature, weight in self.features(text, skills).items():
+            bucket, sign = self._bucket(feature)
+            vector[bucket] += sign * weight
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def encode_job(self, job: Dict) -> np.ndarray:
+        text = f"{job.get('title') or ''}\n{job.get('title') or ''}\n{job.get('description') or ''}"
+        return self.encode(text, job.get('skills_required') or None)
+
+
+def _train_centroids(vectors: np.ndarray, nlist: int, iterations: int = 8, seed: int = 7) -> np.ndarray:
+    """Spherical k-means on a sample of the vectors"""
+    rng = np.random.default_rng(seed)
+    sample_size = min(len(vectors), max(nlist * 32, 10_000), 100_000)
+    sample = vectors[rng.choice(len(vectors), sample_size, replace=False)].astype(np.float32)
+    centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+
+    for _ in range(iterations):
+        assignment = _assign(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, sample)
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        empty = norms[:, 0] == 0
+        # Empty clusters are reseeded with random sample points
+        sums[empty] = sample[rng.choice(sample_size, int(empty.sum()), replace=False)]
+        norms[empty] = 1.0
+        centroids = sums / norms
+    return centroids.astype(np.float32)
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray, chunk: int = 65_536) -> np.ndarray:
+    return np.concatenate([
+        np.argmax(vectors[start:start + chunk].astype(np.float32) @ centroids.T, axis=1)
+        for start in range(0, len(vectors), chunk)
+    ]) if len(vectors) else np.zeros(0, dtype=np.int64)
+
+
+class JobSemanticIndex:
+    """
+    IVF index over active jobs, persisted under `path`:
+
+        CURRENT                 name of the active version directory
+        v<timestamp>/           centroids, list offsets, vectors (grouped by
+                                list so each list is one contiguous slice),
+                                job ids and domain codes
+        v<timestamp>/delta.*    jobs added since the version was built
+                                (append-only vectors and id log), searched
+                                exhaustively until the next compaction, and
+                                ids of jobs removed since (skipped by
+                                searches, dropped by the next compaction)
+
+    Writers take an exclusive flock on `path/.lock`; readers notice new
+    versions and deltas written by other processes and reload. The version
+    CURRENT pointed to before a switch is kept until the next one, so a
+    reader that has just read CURRENT can still load it. Searches never
+    build the index: a missing index is built on a background thread (or by
+    warm() at startup) and searches return nothing until it is loaded.
+    Compaction also runs on a background thread, never on the insert path.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        storage=None,
+        dim: int = 256,
+        nprobe: int = 16,
+        compact_ratio: float = 0.1,
+        compact_min_jobs: int = 1_000
+    ):
+        """
+        Args:
+            path (str): Index directory (default: backend/data/semantic_index)
+            storage (JobStorageBackend): Source of active jobs (default: configured backend)
+            dim (int): Vector size for newly built indexes
+            nprobe (int): Lists scored per query
+            compact_ratio (float): Merge the delta into the lists once it holds this share of jobs
+            compact_min_jobs (int): ...and at least this many added or removed jobs
+        """
+        self.path = Path(path or DEFAULT_INDEX_PATH)
+        self._storage = storage
+        self.dim = dim
+        self.nprobe = nprobe
+        self.compact_ratio = compact_ratio
+        self.compact_min_jobs = compact_min_jobs
+        self.encoder = HashedNgramEncoder(dim)
+        self._lock = threading.RLock()
+        self._build_thread: Optional[threading.Thread] = None
+        self._compact_thread: Optional[threading.Thread] = None
+        self._clear()
+
+    def _clear(self) -> None:
+        self.version = None
+        self.meta: Dict = {}
+        self.centroids = None
+        self.offsets = None
+        self.vectors = None
+        self.ids = None
+        self.domains = None
+        self.delta_vectors = np.zeros((0, self.dim), dtype=np.float32)
+        self.delta_ids: List[str] = []
+        self.delta_domains: List[int] = []
+        self.removed: set = set()
+        self._removed_ids = np.zeros(0, dtype="S1")
+        self._delta_stamp = None
+
+    @property
+    def storage(self):
+        if self._storage is None:
+            from .job_storage import get_job_storage
+            self._storage = get_job_storage()
+        return self._storage
+
+    # ---- persistence ----
+
+    def _file_lock(self):
+        self.path.mkdir(parents=True, exist_ok=True)
+        handle = open(self.path / ".lock", "a+")
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        return handle
+
+    def _current_version(self) -> Optional[str]:
+        try:
+            return (self.path / "CURRENT").read_text().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _delta_file_stamp(self, version: str) -> Optional[int]:
+        try:
+            return (self.path / version / "delta.jsonl").stat().st_size
+        except FileNotFoundError:
+            return None
+
+    def _load(self, version: str) -> None:
+        directory = self.path / version
+        meta = json.loads((directory / "meta.json").read_text())
+        self.version = version
+        self.meta = meta
+        self.dim = meta['dim']
+        self.encoder = HashedNgramEncoder(self.dim)
+        self.centroids = np.load(directory / "centroids.npy")
+        self.offsets = np.load(directory / "offsets.npy")
+        # Large arrays stay on disk and are paged in on demand
+        self.vectors = np.load(directory / "vectors.npy", mmap_mode='r')
+        self.ids = np.load(directory / "ids.npy", mmap_mode='r')
+        self.domains = np.load(directory / "domains.npy", mmap_mode='r')
+        self.delta_vectors = np.zeros((0, self.dim), dtype=np.float32)
+        self.delta_ids, self.delta_domains = [], []
+        self.removed = set()
+        self._removed_ids = np.zeros(0, dtype="S1")
+        self._delta_stamp = None
+        self._load_delta()
+
+    def _load_delta(self) -> None:
+        """Read delta entries appended since the last load"""
+        directory = self.path / self.version
+        try:
+            with open(directory / "delta.jsonl", "rb") as handle:
+                handle.seek(self._delta_stamp or 0)
+                data = handle.read()
+        except FileNotFoundError:
+            return
+
+        # Only complete lines: a writer may be mid-append
+        data = data[:data.rfind(b"\n") + 1]
+        entries = [json.loads(line) for line in data.splitlines() if line.strip()]
+        removed = [entry['id'] for entry in entries if entry.get('removed')]
+        entries = [entry for entry in entries if not entry.get('removed')]
+        if removed:
+            self.removed.update(removed)
+            self._removed_ids = np.array(sorted(self.removed), dtype=bytes)
+        if entries:
+            start = len(self.delta_ids)
+            vectors = np.fromfile(directory / "delta.vectors", dtype=np.float32).reshape(-1, self.dim)
+            self.delta_vectors = np.concatenate([
+                self.delta_vectors, vectors[start:start + len(entries)].astype(np.float32)
+            ])
+            for entry in entries:
+                self.delta_ids.append(entry['id'])
+                self.delta_domains.append(
+                    self.meta['domain_codes'].setdefault(entry['domain'], len(self.meta['domain_codes']))
+                )
+                self.meta['latest_created_at'] = max(self.meta.get('latest_created_at', ""), entry['created_at'])
+        self._delta_stamp = (self._delta_stamp or 0) + len(data)
+
+    def _refresh(self) -> bool:
+        """Pick up versions and deltas written by any process; False if no index exists"""
+        version = self._current_version()
+        if version is None:
+            return False
+        if version != self.version:
+            try:
+                self._load(version)
+            except FileNotFoundError:
+                # Two switches happened since CURRENT was read; the older version is gone
+                version = self._current_version()
+                if version is None:
+                    return False
+                self._load(version)
+        elif self._delta_file_stamp(version) != self._delta_stamp:
+            self._load_delta()
+        return True
+
+    def _append_log(self, entries: List[Dict]) -> None:
+        """Append entries to the delta id log (caller holds the file lock)"""
+        with open(self.path / self.version / "delta.jsonl", "ab") as handle:
+            handle.write("".join(json.dumps(entry) + "\n" for entry in entries).encode("utf-8"))
+            handle.flush()
+            os.fsync(handle.fileno())
+        self._load_delta()
+
+    def _append_delta(self, vectors: np.ndarray, rows: List[Dict]) -> None:
+        """Append jobs to the delta files (caller holds the file lock and is refreshed)"""
+        directory = self.path / self.version
+        # Vectors first: readers only use as many vectors as there are id lines
+        with open(directory / "delta.vectors", "ab") as handle:
+            handle.write(vectors.astype(np.float32).tobytes())
+            handle.flush()
+            os.fsync(handle.fileno())
+        self._append_log([
+            {"id": row['id'], "domain": row.get('domain') or "", "created_at": row.get('created_at') or ""}
+            for row in rows
+        ])
+
+    def _write_version(
+        self,
+        vectors: np.ndarray,
+        ids: List[str],
+        domains: np.ndarray,
+        domain_codes: Dict[str, int],
+        latest_created_at: str,
+        centroids: Optional[np.ndarray] = None
+    ) -> str:
+        """Write a version and make it current (caller holds the file lock)"""
+        version = self._write_files(vectors, ids, domains, domain_codes, latest_created_at, centroids)
+        self._publish(version)
+        return version
+
+    def _write_files(
+        self,
+        vectors: np.ndarray,
+        ids: List[str],
+        domains: np.ndarray,
+        domain_codes: Dict[str, int],
+        latest_created_at: str,
+        centroids: Optional[np.ndarray] = None
+    ) -> str:
+        """Write a version directory without switching to it; needs no lock"""
+        count = len(ids)
+        if centroids is None:
+            # ~sqrt(N) lists: about sqrt(N) jobs per list, nprobe lists scored per query
+            nlist = 1 if count < 1_000 else min(4096, int(np.sqrt(count)))
+            centroids = _train_centroids(vectors, nlist) if count else np.zeros((1, self.dim), np.float32)
+        assignment = _assign(vectors, centroids)
+        order = np.argsort(assignment, kind='stable')
+        counts = np.bincount(assignment, minlength=len(centroids))
+        offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+        version = f"v{time.time_ns()}"
+        directory = self.path / f".{version}.tmp"
+        directory.mkdir(parents=True)
+        np.save(directory / "centroids.npy", centroids.astype(np.float32))
+        np.save(directory / "offsets.npy", offsets)
+        np.save(directory / "vectors.npy", vectors[order].astype(np.float32))
+        id_width = max([len(job_id) for job_id in ids] + [1])
+        np.save(directory / "ids.npy", np.array(ids, dtype=f"S{id_width}")[order])
+        np.save(directory / "domains.npy", np.asarray(domains, dtype=np.int16)[order])
+        (directory / "meta.json").write_text(json.dumps({
+            "dim": self.dim,
+            "count": count,
+            "nlist": len(centroids),
+            "domain_codes": domain_codes,
+            "latest_created_at": latest_created_at,
+            "built_at": time.time()
+        }))
+        directory.rename(self.path / version)
+        return version
+
+    def _publish(self, version: str) -> None:
+        """Point CURRENT at a written version (caller holds the file lock)"""
+        previous = self._current_version()
+        current_tmp = self.path / "CURRENT.tmp"
+        current_tmp.write_text(version)
+        os.replace(current_tmp, self.path / "CURRENT")
+
+        # The replaced version stays for readers that read CURRENT just before
+        # the switch; older ones can go (processes mapping them keep their open files)
+        for old in self.path.glob("v*"):
+            if old.name not in (version, previous):
+                shutil.rmtree(old, ignore_errors=True)
+
+    # ---- building and updating ----
+
+    def build(self, batch_size: int = 2000) -> Dict:
+        """
+        Encode all active jobs and write a new index version
+
+        Returns:
+            Dict with 'jobs', 'lists' and 'seconds'
+        """
+        started = time.perf_counter()
+        encoded = self._encode_active(batch_size)
+        self.build_from_vectors(*encoded)
+        return self._report_build(len(encoded[1]), started)
+
+    def _encode_active(self, batch_size: int = 2000) -> Tuple[np.ndarray, List[str], np.ndarray, Dict[str, int], str]:
+        """Vectors, ids, domain codes and newest created_at of all active jobs"""
+        ids, domains, chunks = [], [], []
+        domain_codes: Dict[str, int] = {}
+        latest_created_at = ""
+        for rows in self.storage.iter_active_jobs(ENCODE_COLUMNS, batch_size=batch_size):
+            chunks.append(np.stack([self.encoder.encode_job(row) for row in rows]))
+            for row in rows:
+                ids.append(row['id'])
+                domains.append(domain_codes.setdefault(row.get('domain') or "", len(domain_codes)))
+                latest_created_at = max(latest_created_at, row.get('created_at') or "")
+
+        vectors = np.concatenate(chunks) if chunks else np.zeros((0, self.dim), dtype=np.float32)
+        return vectors, ids, np.array(domains), domain_codes, latest_created_at
+
+    def _report_build(self, count: int, started: float) -> Dict:
+        seconds = time.perf_counter() - started
+        print(f"✅ Semantic index built: {count} jobs, {self.meta['nlist']} lists in {seconds:.2f}s")
+        return {"jobs": count, "lists": self.meta['nlist'], "seconds": round(seconds, 2)}
+
+    def warm(self) -> bool:
+        """
+        Load the index, building it first if no process has built one yet
+
+        Returns:
+            bool: True once an index is loaded
+        """
+        with self._lock:
+            if self._refresh():
+                return True
+        started = time.perf_counter()
+        handle = self._file_lock()
+        try:
+            # Another worker may have built it while we waited for the lock
+            with self._lock:
+                if self._refresh():
+                    return True
+            # Encoding runs without the thread lock so searches keep answering
+            vectors, ids, domains, domain_codes, latest_created_at = self._encode_active()
+            with self._lock:
+                self.dim = vectors.shape[1]
+                version = self._write_version(
+                    vectors, ids, domains, dict(domain_codes or {"": 0}), latest_created_at
+                )
+                self._load(version)
+        finally:
+            handle.close()
+        self._report_build(len(ids), started)
+        return True
+
+    def warm_in_background(self) -> None:
+        """Start warm() on a daemon thread unless one is already running"""
+        def run():
+            try:
+                self.warm()
+            except Exception as e:
+                print(f"⚠️  Could not build the semantic index: {str(e)}")
+
+        with self._lock:
+            if self._build_thread is None or not self._build_thread.is_alive():
+                self._build_thread = threading.Thread(target=run, name="semantic-index-build", daemon=True)
+                self._build_thread.start()
+
+    def ready(self) -> bool:
+        """True if an index is loaded; otherwise start building one in the background"""
+        with self._lock:
+            if self._refresh():
+                return True
+        self.warm_in_background()
+        return False
+
+    def build_from_vectors(
+        self,
+        vectors: np.ndarray,
+        ids: List[str],
+        domains: Optional[np.ndarray] = None,
+        domain_codes: Optional[Dict[str, int]] = None,
+        latest_created_at: str = ""
+    ) -> None:
+        """
+        Write a new index version from already encoded jobs
+
+        Args:
+            vectors (np.ndarray): One L2-normalized row per job
+            ids (List[str]): Job ids, in row order
+            domains (np.ndarray): Domain code per row (default: all unknown)
+            domain_codes (Dict[str, int]): Domain id -> code
+            latest_created_at (str): Newest created_at among the jobs
+        """
+        if domains is None:
+            domains = np.zeros(len(ids), dtype=np.int16)
+        with self._lock:
+            handle = self._file_lock()
+            try:
+                self.dim = vectors.shape[1]
+                version = self._write_version(
+                    vectors, ids, domains, dict(domain_codes or {"": 0}), latest_created_at
+                )
+                self._load(version)
+            finally:
+                handle.close()
+
+    def _compaction_due(self) -> bool:
+        changed = len(self.delta_ids) + len(self.removed)
+        return changed > max(self.compact_min_jobs, self.compact_ratio * len(self.ids))
+
+    def compact(self) -> bool:
+        """
+        Fold the delta into the lists, keeping the trained centroids.
+        The new version is written without the file lock, so inserts keep
+        appending meanwhile; entries they add are carried over before the switch.
+
+        Returns:
+            bool: True if a compacted version was published
+        """
+        with self._lock:
+            if not self._refresh():
+                return False
+            version = self.version
+            delta_count = len(self.delta_ids)
+            removed = set(self.removed)
+            domain_codes = dict(self.meta['domain_codes'])
+            latest_created_at = self.meta.get('latest_created_at', "")
+            base_count = len(self.ids)
+            vectors = np.concatenate([np.asarray(self.vectors, dtype=np.float32), self.delta_vectors])
+            ids = [job_id.decode() for job_id in self.ids] + list(self.delta_ids)
+            domains = np.concatenate([np.asarray(self.domains), np.array(self.delta_domains, dtype=np.int16)])
+            centroids = self.centroids
+
+        if removed:
+            keep = np.array([job_id not in removed for job_id in ids], dtype=bool)
+            vectors, domains = vectors[keep], domains[keep]
+            ids = [job_id for job_id, kept in zip(ids, keep) if kept]
+        compacted = self._write_files(vectors, ids, domains, domain_codes, latest_created_at, centroids)
+
+        # Same lock order as add_jobs: thread lock, then file lock
+        with self._lock:
+            handle = self._file_lock()
+            try:
+                self._refresh()
+                if self.version != version:
+                    # Rebuilt or compacted by another process meanwhile
+                    shutil.rmtree(self.path / compacted, ignore_errors=True)
+                    return False
+                self._carry_over(compacted, delta_count, removed)
+                self._publish(compacted)
+                self._load(compacted)
+            finally:
+                handle.close()
+        print(f"✅ Semantic index compacted: {base_count} + {delta_count} - {len(removed)} jobs")
+        return True
+
+    def _carry_over(self, compacted: str, delta_count: int, removed: set) -> None:
+        """Copy delta entries appended after the compaction snapshot into the new version"""
+        names = {code: name for name, code in self.meta['domain_codes'].items()}
+        # Per-entry created_at is not kept in memory; the newest one is all readers use
+        latest_created_at = self.meta.get('latest_created_at', "")
+        rows = [
+            {"id": job_id, "domain": names.get(code, ""), "created_at": latest_created_at}
+            for job_id, code in zip(self.delta_ids[delta_count:], self.delta_domains[delta_count:])
+        ]
+        entries = list(rows)
+        entries += [{"id": job_id, "removed": True} for job_id in sorted(self.removed - removed)]
+        if not entries:
+            return
+        directory = self.path / compacted
+        if rows:
+            with open(directory / "delta.vectors", "ab") as handle:
+                handle.write(self.delta_vectors[delta_count:].astype(np.float32).tobytes())
+                handle.flush()
+                os.fsync(handle.fileno())
+        with open(directory / "delta.jsonl", "ab") as handle:
+            handle.write("".join(json.dumps(entry) + "\n" for entry in entries).encode("utf-8"))
+            handle.flush()
+            os.fsync(handle.fileno())
+
+    def _compact_in_background(self) -> None:
+        """Start compact() on a daemon thread unless one is already running"""
+        def run():
+            try:
+                self.compact()
+            except Exception as e:
+                # The delta keeps serving searches; the next insert retries
+                print(f"⚠️  Could not compact the semantic index: {str(e)}")
+
+        with self._lock:
+            if self._compact_thread is None or not self._compact_thread.is_alive():
+                self._compact_thread = threading.Thread(target=run, name="semantic-index-compact", daemon=True)
+                self._compact_thread.start()
+
+    def add_jobs(self, rows: List[Dict]) -> int:
+        """
+        Add newly inserted jobs (no-op until an index has been built)
+
+        Args:
+            rows (List[Dict]): Inserted job rows including their ids
+
+        Returns:
+            Number of jobs added
+        """
+        rows = [row for row in rows if row.get('id')]
+        if not rows or self._current_version() is None:
+            return 0
+
+        vectors = np.stack([self.encoder.encode_job(row) for row in rows])
+        with self._lock:
+            handle = self._file_lock()
+            try:
+                # Another process may have appended since we last looked
+                self._refresh()
+                self._append_delta(vectors, rows)
+                due = self._compaction_due()
+            finally:
+                handle.close()
+        if due:
+            self._compact_in_background()
+        return len(rows)
+
+    def remove_jobs(self, job_ids: List[str]) -> int:
+        """
+        Drop deactivated or archived jobs from search results (no-op until an
+        index has been built)
+
+        Args:
+            job_ids (List[str]): Ids of jobs that are no longer active
+
+        Returns:
+            Number of jobs newly removed
+        """
+        with self._lock:
+            if not job_ids or self._current_version() is None:
+                return 0
+            handle = self._file_lock()
+            try:
+                self._refresh()
+                job_ids = sorted(set(job_ids) - self.removed)
+                if job_ids:
+                    self._append_log([{"id": job_id, "removed": True} for job_id in job_ids])
+                due = self._compaction_due()
+            finally:
+                handle.close()
+        if due:
+            self._compact_in_background()
+        return len(job_ids)
+
+    # ---- querying ----
+
+    def search(
+        self,
+        text: Optional[str],
+        skills: Optional[List[str]] = None,
+        domain: Optional[str] = None,
+        limit: int = 50,
+        nprobe: Optional[int] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Approximate nearest jobs to a resume
+
+        Args:
+            text (str): Resume text (or any query text)
+            skills (List[str]): Resume skills
+            domain (str): Domain id filter
+            limit (int): Maximum number of results
+            nprobe (int): Lists to score (default: self.nprobe)
+
+        Returns:
+            (job_id, cosine similarity) pairs, most similar first
+        """
+        with self._lock:
+            if not self._refresh():
+                # Never build on a request thread: the first build encodes every active job
+                self.warm_in_background()
+                return []
+
+            query = self.encoder.encode(" ".join(skills or []) + "\n" + (text or ""), skills)
+            if not query.any():
+                return []
+
+            code = None
+            if domain:
+                code = self.meta['domain_codes'].get(domain)
+                if code is None:
+                    return []
+
+            candidate_ids, candidate_scores = [], []
+
+            if len(self.ids):
+                centroid_scores = self.centroids @ query
+                probe = min(nprobe or self.nprobe, len(self.centroids))
+                lists = np.argpartition(-centroid_scores, probe - 1)[:probe]
+                # Each list is a contiguous slice of the memory-mapped vectors
+                starts, scores = [], []
+                for index in lists:
+                    start, end = self.offsets[index], self.offsets[index + 1]
+                    if end > start:
+                        list_scores = self.vectors[start:end] @ query
+                        if code is not None:
+                            list_scores[np.asarray(self.domains[start:end]) != code] = -np.inf
+                        if self.removed:
+                            list_scores[np.isin(self.ids[start:end], self._removed_ids)] = -np.inf
+                        starts.append(np.arange(start, end))
+                        scores.append(list_scores)
+                if scores:
+                    rows = np.concatenate(starts)
+                    scores = np.concatenate(scores)
+                    keep = np.argpartition(-scores, min(limit, len(scores)) - 1)[:limit]
+                    keep = keep[np.isfinite(scores[keep])]
+                    candidate_ids.extend(job_id.decode() for job_id in self.ids[rows[keep]])
+                    candidate_scores.extend(scores[keep].tolist())
+
+            if self.delta_ids:
+                scores = self.delta_vectors @ query
+                if code is not None:
+                    scores = np.where(np.array(self.delta_domains) == code, scores, -np.inf)
+                if self.removed:
+                    scores = np.where([job_id in self.removed for job_id in self.delta_ids], -np.inf, scores)
+                keep = np.argpartition(-scores, min(limit, len(scores)) - 1)[:limit]
+                for index in keep:
+                    if np.isfinite(scores[index]):
+                        candidate_ids.append(self.delta_ids[index])
+                        candidate_scores.append(float(scores[index]))
+
+        best: Dict[str, float] = {}
+        for job_id, score in zip(candidate_ids, candidate_scores):
+            if score > 0 and score > best.get(job_id, -1.0):
+                best[job_id] = score
+        return sorted(best.items(), key=lambda item: -item[1])[:limit]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            self._refresh()
+            return {
+                "version": self.version,
+                "jobs": (len(self.ids) if self.ids is not None else 0) + len(self.delta_ids) - len(self.removed),
+                "delta_jobs": len(self.delta_ids),
+                "removed_jobs": len(self.removed),
+                "lists": self.meta.get('nlist', 0),
+                "dim": self.dim,
+                "nprobe": self.nprobe,
+                "path": str(self.path)
+            }
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_job_semantic_index() -> JobSemanticIndex:
+    """Get the process-wide semantic index (loaded from disk on first use)"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = JobSemanticIndex(
+                    path=os.getenv("JOB_SEMANTIC_INDEX_PATH") or None,
+                    dim=int(os.getenv("JOB_SEMANTIC_DIM", "256")),
+                    nprobe=int(os.getenv("JOB_SEMANTIC_NPROBE", "16"))
+                )
+    return _index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and inspect the semantic job index")
+    parser.add_argument("command", choices=["build", "stats", "query"])
+    parser.add_argument("text", nargs="?", default="", help="Query text for 'query'")
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    index = get_job_semantic_index()
+    if args.command == "build":
+        print(json.dumps(index.build(), indent=2))
+    elif args.command == "stats":
+        print(json.dumps(index.stats(), indent=2))
+    else:
+        for job_id, score in index.search(args.text, limit=args.limit):
+            print(f"{score:.3f}  {job_id}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
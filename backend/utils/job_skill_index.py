@@ -0,0 +1,198 @@
+"""
+In-memory inverted skill index over all active jobs
+Maps each normalized skill to a compact, sorted array of internal job
+numbers and keeps the per-job fields used to filter matches. JobRanker
+(job_ranking.py) builds its BM25 matrix on top of it.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+from array import array
+import threading
+import time
+from .skill_dictionary import canonicalize_skills, get_skill_extractor
+from .job_normalization import parse_location
+
+
+# Columns read to build the index; description is only used to extract
+# skills for jobs stored before enrichment
+INDEX_COLUMNS = [
+    'id', 'title', 'description', 'location', 'domain', 'skills_required',
+    'cities', 'work_mode', 'created_at'
+]
+
+
+def _skill_token(skill: str) -> str:
+    return skill.lower()
+
+
+class JobRecord:
+    """Per-job fields needed to filter and rank matches"""
+
+    __slots__ = ('job_id', 'domain', 'cities', 'work_mode', 'created_at')
+
+    def __init__(self, job_id: str, domain: Optional[str], cities: Tuple[str, ...],
+                 work_mode: Optional[str], created_at: str):
+        self.job_id = job_id
+        self.domain = domain
+        self.cities = cities
+        self.work_mode = work_mode
+        self.created_at = created_at
+
+
+class JobSkillIndex:
+    """
+    Inverted index from skill token to job numbers.
+    Jobs are numbered in insertion order, so appending keeps every postings
+    array sorted; a replaced job leaves a tombstone (None record) until the
+    next full rebuild.
+    """
+
+    def __init__(self, storage=None, cache=None, rebuild_seconds: float = 3600):
+        """
+        Args:
+            storage (JobStorageBackend): Source of active jobs (default: configured backend)
+            cache (JobQueryCache): Used to notice writes made by other processes
+            rebuild_seconds (float): Age after which the next query rebuilds from scratch
+        """
+        self._storage = storage
+        self._cache = cache
+        self.rebuild_seconds = rebuild_seconds
+        self._lock = threading.RLock()
+        self._reset()
+        self.built_at = None
+        self.generation = None
+        self.build_seconds = 0.0
+
+    def _reset(self) -> None:
+        self.records: List[Optional[JobRecord]] = []
+        self.postings: Dict[str, array] = {}
+        self.doc_by_id: Dict[str, int] = {}
+        self.latest_created_at = ""
+
+    @property
+    def storage(self):
+        if self._storage is None:
+            from .job_storage import get_job_storage
+            self._storage = get_job_storage()
+        return self._storage
+
+    @property
+    def cache(self):
+        if self._cache is None:
+            from .job_cache import get_job_cache
+            self._cache = get_job_cache()
+        return self._cache
+
+    def _add(self, rows: Iterable[Dict]) -> int:
+        extractor = get_skill_extractor()
+        added = 0
+        for row in rows:
+            job_id = row.get('id')
+            if not job_id or row.get('is_active') is False:
+                continue
+
+            skills = canonicalize_skills(row.get('skills_required') or [])
+            if not skills:
+                skills = extractor.extract(f"{row.get('title') or ''}\n{row.get('description') or ''}")
+            cities = row.get('cities')
+            if not cities:
+                # Rows stored before locations were parsed come back with no cities
+                cities = parse_location(row.get('location'))[0]
+
+            previous = self.doc_by_id.get(job_id)
+            if previous is not None:
+                self.records[previous] = None
+
+            doc = len(self.records)
+            created_at = row.get('created_at') or ""
+            self.records.append(JobRecord(
+                job_id, row.get('domain'), tuple(cities), row.get('work_mode'), created_at
+            ))
+            self.doc_by_id[job_id] = doc
+            for token in {_skill_token(skill) for skill in skills}:
+                postings = self.postings.get(token)
+                if postings is None:
+                    postings = self.postings[token] = array('I')
+                postings.append(doc)
+
+            self._index_job(doc, row, skills)
+
+            if created_at > self.latest_created_at:
+                self.latest_created_at = created_at
+            added += 1
+        return added
+
+    def _index_job(self, doc: int, row: Dict, skills: List[str]) -> None:
+        """Hook for subclasses that keep extra per-job structures"""
+
+    def rebuild(self) -> None:
+        """Rebuild the index from all active jobs"""
+        started = time.perf_counter()
+        with self._lock:
+            generation = self.cache.generation()
+            self._reset()
+            for rows in self.storage.iter_active_jobs(INDEX_COLUMNS):
+                self._add(rows)
+            self.generation = generation
+            self.built_at = time.time()
+            self.build_seconds = time.perf_counter() - started
+        print(f"✅ Skill index built: {len(self.doc_by_id)} jobs, "
+              f"{len(self.postings)} skills in {self.build_seconds:.2f}s")
+
+    def add_jobs(self, rows: List[Dict]) -> int:
+        """
+        Add newly inserted jobs to a built index (no-op before the first build).
+        Jobs other processes inserted since the last sync are picked up first,
+        so advancing the generation here never skips them.
+
+        Args:
+            rows (List[Dict]): Inserted job rows including their ids
+
+        Returns:
+            Number of jobs added
+        """
+        with self._lock:
+            if self.built_at is None:
+                return 0
+            before = len(self.doc_by_id)
+            self._catch_up()
+            # Rows the catch-up already read from storage are not added twice
+            self._add(row for row in rows if row.get('id') not in self.doc_by_id)
+            return len(self.doc_by_id) - before
+
+    def warm(self) -> None:
+        """Build the index now if it is not built, instead of on the first query"""
+        with self._lock:
+            self._sync()
+
+    def invalidate(self) -> None:
+        """Force a full rebuild on the next query (e.g. after jobs were archived)"""
+        with self._lock:
+            self.built_at = None
+
+    def _sync(self) -> None:
+        if self.built_at is None or time.time() - self.built_at > self.rebuild_seconds:
+            self.rebuild()
+            return
+        self._catch_up()
+
+    def _catch_up(self) -> None:
+        generation = self.cache.generation()
+        if generation != self.generation:
+            # Another process inserted jobs: catch up from the newest job we know
+            for rows in self.storage.iter_active_jobs(INDEX_COLUMNS, since=self.latest_created_at or None):
+                self._add(row for row in rows if row['id'] not in self.doc_by_id)
+            self.generation = generation
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "jobs": len(self.doc_by_id),
+                "skills": len(self.postings),
+                "postings": sum(len(postings) for postings in self.postings.values()),
+                "tombstones": len(self.records) - len(self.doc_by_id),
+                "built": self.built_at is not None,
+                "build_seconds": round(self.build_seconds, 3),
+                "generation": self.generation
+            }
+
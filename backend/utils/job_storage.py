@@ -0,0 +1,209 @@
+"""
+Storage backend interface for jobs
+JobDatabase talks to one of these; the backend is chosen with JOB_STORAGE_BACKEND
+"""
+
+from typing import Iterator, List, Dict, Optional
+import os
+import threading
+
+
+class JobStorageBackend:
+    """
+    Raw job storage operations. Implementations raise on failure; error
+    handling, caching and row preparation live in JobDatabase.
+    """
+
+    name = "base"
+
+    def insert_jobs(self, rows: List[Dict]) -> List[Dict]:
+        """
+        Insert prepared job rows
+
+        Args:
+            rows (List[Dict]): Rows with the jobs table columns
+
+        Returns:
+            The inserted rows, including their generated ids
+        """
+        raise NotImplementedError
+
+    def search_jobs(
+        self,
+        keyword: Optional[str] = None,
+        location: Optional[str] = None,
+        domain: Optional[str] = None,
+        source: Optional[str] = None,
+        skills: Optional[List[str]] = None,
+        job_type: Optional[str] = None,
+        cities: Optional[List[str]] = None,
+        work_mode: Optional[str] = None,
+        min_experience: Optional[int] = None,
+        max_experience: Optional[int] = None,
+        min_salary: Optional[int] = None,
+        max_salary: Optional[int] = None,
+        salary_currency: Optional[str] = None,
+        limit: int = 50,
+        location_fallback: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Active jobs matching every given filter, newest first.
+        `skills` matches jobs whose skills_required contains any of the given
+        canonical skill names and `cities` jobs in any of the given canonical
+        cities; `location` is a free-text match for places not in the city
+        table. Experience (years) and salary (annual amount) bounds keep jobs
+        whose parsed range overlaps the requested range; `salary_currency`
+        keeps jobs paying in that currency (salaries are never converted).
+        With `location_fallback`, jobs stored before locations were parsed
+        (cities is NULL) pass the cities and work_mode filters when their
+        location text contains it.
+        """
+        raise NotImplementedError
+
+    def get_job_by_id(self, job_id: str) -> Optional[Dict]:
+        raise NotImplementedError
+
+    def get_jobs_by_ids(self, job_ids: List[str]) -> List[Dict]:
+        """Active jobs with the given ids, in no particular order"""
+        raise NotImplementedError
+
+    def iter_active_jobs(
+        self,
+        columns: List[str],
+        since: Optional[str] = None,
+        batch_size: int = 1000
+    ) -> Iterator[List[Dict]]:
+        """
+        Page through all active jobs (keyset pagination on id)
+
+        Args:
+            columns (List[str]): Columns to read; 'id' is always included
+            since (str): Only jobs created at or after this ISO timestamp
+            batch_size (int): Rows per page
+
+        Yields:
+            Lists of job rows
+        """
+        raise NotImplementedError
+
+    def get_jobs_by_domain(self, domain: str, limit: int = 50) -> List[Dict]:
+        return self.search_jobs(domain=domain, limit=limit)
+
+    def get_recent_jobs(self, limit: int = 20) -> List[Dict]:
+        return self.search_jobs(limit=limit)
+
+    def get_job_stats(self) -> Dict:
+        """Dict with 'total_jobs' and 'jobs_by_source' for active jobs"""
+        raise NotImplementedError
+
+    def count_expired_jobs(self, cutoff: str) -> int:
+        raise NotImplementedError
+
+    def archive_expired_jobs_batch(self, cutoff: str, batch_size: int) -> Dict:
+        """Dict with 'moved' and 'deactivated' row counts"""
+        raise NotImplementedError
+
+    def drop_archive_partitions(self, before: str) -> int:
+        raise NotImplementedError
+
+    def get_resume_profiles(self, user_ids: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Latest resume with skills of each user
+
+        Args:
+            user_ids (List[str]): Only these users (default: all users)
+
+        Returns:
+            Dicts with 'user_id', 'resume_id' and 'skills'
+        """
+        raise NotImplementedError
+
+    def upsert_recommendations(self, rows: List[Dict]) -> int:
+        """
+        Insert or update job_recommendations rows, keyed by (user_id, job_id)
+
+        Args:
+            rows (List[Dict]): Rows with user_id, job_id, resume_id, match_score,
+                               matching_skills and recommendation_reason
+        """
+        raise NotImplementedError
+
+    def replace_recommendations(self, user_id: str, rows: List[Dict]) -> int:
+        """
+        Make `rows` the complete set of recommendations of one user and mark
+        the user's recommendations as computed (see recommendations_computed)
+        """
+        raise NotImplementedError
+
+    def prune_recommendations(self, user_ids: List[str], keep: int) -> int:
+        """Delete all but the `keep` best-scored recommendations of each user"""
+        raise NotImplementedError
+
+    def get_recommendations(self, user_id: str, limit: int = 50) -> List[Dict]:
+        """
+        A user's materialized recommendations, best first
+
+        Returns:
+            Active job rows with 'match_score', 'matching_skills' and
+            'recommendation_reason' added
+        """
+        raise NotImplementedError
+
+    def recommendations_computed(self, user_id: str) -> bool:
+        """Whether the user's recommendations were computed, even if none matched"""
+        raise NotImplementedError
+
+    def resume_belongs_to(self, resume_id: str, user_id: str) -> bool:
+        """Whether the resume exists and is owned by the user"""
+        raise NotImplementedError
+
+    def get_resume_analysis(self, resume_id: str, user_id: str) -> Dict:
+        """A user's resume's stored AI results (resumes.analysis), {} if none or not theirs"""
+        raise NotImplementedError
+
+    def save_resume_analysis(self, resume_id: str, user_id: str, analysis: Dict,
+                             parsed_text: Optional[str] = None) -> bool:
+        """
+        Merge keys into resumes.analysis and optionally set parsed_text
+
+        Returns:
+            False if the resume does not exist or is not owned by the user
+        """
+        raise NotImplementedError
+
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def create_job_storage(backend: Optional[str] = None) -> JobStorageBackend:
+    """
+    Create a storage backend
+
+    Args:
+        backend (str): 'supabase' or 'sqlite' (default: JOB_STORAGE_BACKEND, then 'supabase')
+
+    Returns:
+        JobStorageBackend instance
+    """
+    backend = (backend or os.getenv("JOB_STORAGE_BACKEND", "supabase")).lower()
+
+    if backend == "sqlite":
+        from .sqlite_job_storage import SQLiteJobStorage
+        return SQLiteJobStorage(os.getenv("JOB_SQLITE_PATH") or None)
+
+    if backend == "supabase":
+        from .supabase_job_storage import SupabaseJobStorage
+        return SupabaseJobStorage()
+
+    raise ValueError(f"Unknown job storage backend: {backend}")
+
+
+def get_job_storage() -> JobStorageBackend:
+    """Get the process-wide storage backend selected by configuration"""
+    global _storage
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                _storage = create_job_storage()
+    return _storage
@@ -0,0 +1,514 @@
+"""
+Write-behind buffer for scraped jobs
+Collects jobs from every concurrent scrape and inserts them in batches
+sized by job count, bytes or age. Every submitted job is appended to a
+spill file before submit() returns, so jobs that were not yet flushed when
+the process died are re-queued on the next start (delivery is at least once).
+A batch that still fails after max_attempts inserts is moved to a dead-letter
+file next to the spill file instead of being retried forever. Callers that
+need their own outcome pass a receipt to submit(); the buffer-wide stats mix
+every concurrent scrape.
+"""
+
+from typing import Dict, List, Optional
+from datetime import datetime, timezone
+from pathlib import Path
+import atexit
+import json
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: spill files are not locked
+    fcntl = None
+
+
+DEFAULT_SPILL_PATH = Path(__file__).resolve().parents[1] / "data" / "job_write_buffer.jsonl"
+
+
+class BufferedJobWriter:
+    """
+    Buffers job inserts and flushes them from a background thread
+    """
+
+    def __init__(
+        self,
+        db=None,
+        max_batch_jobs: int = 200,
+        max_batch_bytes: int = 1024 * 1024,
+        max_delay_seconds: float = 2.0,
+        max_pending_jobs: int = 5000,
+        spill_path: Optional[str] = None,
+        retry_seconds: float = 1.0,
+        max_attempts: int = 5
+    ):
+        """
+        Initialize the writer and re-queue jobs left in the spill file
+
+        Args:
+            db (JobDatabase): Database to insert into (created if None)
+            max_batch_jobs (int): Flush when this many jobs are pending
+            max_batch_bytes (int): Flush when pending jobs reach this JSON size
+            max_delay_seconds (float): Flush when the oldest pending job is this old
+            max_pending_jobs (int): submit() blocks while this many jobs are pending
+            spill_path (str): Append-only file holding unflushed jobs
+            retry_seconds (float): Initial delay before retrying a failed flush
+            max_attempts (int): Inserts of a batch before it is dead-lettered
+        """
+        if db is None:
+            from .job_database import JobDatabase
+            db = JobDatabase()
+
+        self.db = db
+        self.max_batch_jobs = max_batch_jobs
+        self.max_batch_bytes = max_batch_bytes
+        self.max_delay_seconds = max_delay_seconds
+        self.max_pending_jobs = max_pending_jobs
+        self.retry_seconds = retry_seconds
+        self.max_attempts = max(1, max_attempts)
+
+        self._pending = []  # (job, spill line bytes, enqueue time, receipt) tuples, oldest first
+        self._pending_bytes = 0
+        self._oldest_at = None
+        self._flush_requested = False
+        self._reserved = 0  # Jobs admitted by submit() but not yet enqueued
+        self._in_flight = 0
+        self._flushed_bytes = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        # Serializes spill file writes (and their fsync) without holding _condition;
+        # taken before _condition, never after it
+        self._spill_lock = threading.Lock()
+
+        self._stats = {
+            "jobs_submitted": 0,
+            "jobs_flushed": 0,
+            "batches_flushed": 0,
+            "flush_failures": 0,
+            "flush_latency_ms_total": 0.0,
+            "flush_latency_ms_max": 0.0,
+            "batch_size_max": 0,
+            "backpressure_waits": 0,
+            "backpressure_wait_seconds": 0.0,
+            "recovered_jobs": 0,
+            "jobs_dead_lettered": 0
+        }
+
+        self._spill = self._open_spill(Path(spill_path or DEFAULT_SPILL_PATH))
+        # Not "<stem>.*<suffix>", which _recover() would take for an orphaned spill file
+        self.dead_letter_path = self._base_spill_path.with_name(self._base_spill_path.name + ".dead")
+        self._recover()
+
+        self._thread = threading.Thread(target=self._run, name="job-write-buffer", daemon=True)
+        self._thread.start()
+
+    # ------------------------------------------------------------------
+    # Spill file
+    #
+    # Jobs are appended to the spill file in submit order and flushed in the
+    # same order, so the file is always [flushed prefix][pending jobs]. The
+    # byte length of the flushed prefix is checkpointed in a sidecar
+    # ".offset" file after every flush; the file is compacted whenever the
+    # buffer drains or the prefix grows past COMPACT_BYTES. Writes hold
+    # _spill_lock only, so a slow fsync does not block stats() or flush().
+    # ------------------------------------------------------------------
+
+    COMPACT_BYTES = 4 * 1024 * 1024
+
+    def _open_spill(self, path: Path):
+        """Open and lock the spill file; fall back to a per-process file if another process holds it"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._base_spill_path = path
+        for candidate in (path, path.with_name(f"{path.stem}.{os.getpid()}{path.suffix}")):
+            handle = open(candidate, "a+b")
+            if fcntl is None:
+                self.spill_path = candidate
+                return handle
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                self.spill_path = candidate
+                return handle
+            except OSError:
+                handle.close()
+        raise RuntimeError(f"Could not lock a spill file next to {path}")
+
+    @staticmethod
+    def _offset_path(spill_path: Path) -> Path:
+        return spill_path.with_name(spill_path.name + ".offset")
+
+    @classmethod
+    def _read_spill(cls, spill_path: Path, handle) -> List[bytes]:
+        """Unflushed lines of a spill file"""
+        try:
+            offset = int(cls._offset_path(spill_path).read_text() or 0)
+        except (OSError, ValueError):
+            offset = 0
+
+        handle.seek(offset)
+        lines = []
+        for line in handle:
+            if not line.endswith(b"\n"):
+                break  # A torn final line from a crash mid-append
+            if line.strip():
+                lines.append(line)
+        return lines
+
+    def _recover(self) -> None:
+        """Re-queue jobs from our spill file and from orphaned per-process spill files"""
+        lines = self._read_spill(self.spill_path, self._spill)
+        self._compact_spill(lines)
+
+        if fcntl is not None:
+            base = self._base_spill_path
+            for orphan in base.parent.glob(f"{base.stem}.*{base.suffix}"):
+                if orphan == self.spill_path:
+                    continue
+                with open(orphan, "a+b") as handle:
+                    try:
+                        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    except OSError:
+                        continue  # Owned by a live process
+                    orphan_lines = self._read_spill(orphan, handle)
+                    self._append_spill(orphan_lines)
+                    lines.extend(orphan_lines)
+                    orphan.unlink()
+                    self._offset_path(orphan).unlink(missing_ok=True)
+
+        recovered = 0
+        for line in lines:
+            try:
+                self._enqueue(json.loads(line), len(line))
+                recovered += 1
+            except ValueError:
+                continue
+
+        if recovered:
+            print(f"♻️  Re-queued {recovered} unflushed jobs from {self.spill_path}")
+        self._stats['recovered_jobs'] = recovered
+
+    def _append_spill(self, lines: List[bytes]) -> None:
+        if not lines:
+            return
+        self._spill.seek(0, os.SEEK_END)
+        self._spill.write(b"".join(lines))
+        self._spill.flush()
+        os.fsync(self._spill.fileno())
+
+    def _checkpoint_spill(self, flushed_bytes: int) -> None:
+        """Record that the first flushed_bytes of the spill file are out of the buffer"""
+        with self._spill_lock:
+            self._flushed_bytes += flushed_bytes
+            with self._condition:
+                drained = not self._pending
+            if drained or self._flushed_bytes >= self.COMPACT_BYTES:
+                self._compact_spill(None)
+                return
+
+            offset_path = self._offset_path(self.spill_path)
+            tmp_path = offset_path.with_name(offset_path.name + ".tmp")
+            tmp_path.write_text(str(self._flushed_bytes))
+            os.replace(tmp_path, offset_path)
+
+    def _compact_spill(self, lines: Optional[List[bytes]]) -> None:
+        """
+        Atomically replace the spill file with only the given (default: pending)
+        lines; callers other than _recover() hold _spill_lock
+        """
+        if lines is None:
+            # Holding _spill_lock, no submit() can enqueue between the snapshot and the rewrite
+            with self._condition:
+                pending = [job for job, _, _, _ in self._pending]
+            lines = [self._encode(job) for job in pending]
+
+        tmp_path = self.spill_path.with_name(self.spill_path.name + ".compact")
+        handle = open(tmp_path, "w+b")
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        handle.write(b"".join(lines))
+        handle.flush()
+        os.fsync(handle.fileno())
+
+        # Dropping the checkpoint first means a crash here replays jobs instead of losing them
+        self._offset_path(self.spill_path).unlink(missing_ok=True)
+        os.replace(tmp_path, self.spill_path)
+        previous, self._spill = self._spill, handle
+        previous.close()
+        self._flushed_bytes = 0
+
+    @staticmethod
+    def _encode(job: Dict) -> bytes:
+        return (json.dumps(job, default=str) + "\n").encode("utf-8")
+
+    def _dead_letter(self, jobs: List[Dict], error: Optional[str]) -> None:
+        """Append jobs that could not be inserted to the dead-letter file"""
+        failed_at = datetime.now(timezone.utc).isoformat()
+        lines = b"".join(
+            (json.dumps({"job": job, "error": error, "failed_at": failed_at}, default=str) + "\n").encode("utf-8")
+            for job in jobs
+        )
+        # Shared by every process using this spill path
+        with open(self.dead_letter_path, "ab") as handle:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+            handle.write(lines)
+            handle.flush()
+            os.fsync(handle.fileno())
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def new_receipt() -> Dict:
+        """Counters for one caller's jobs, filled in by the flusher thread"""
+        return {"jobs_saved": 0, "jobs_dead_lettered": 0}
+
+    def _enqueue(self, job: Dict, size: int, receipt: Optional[Dict] = None) -> None:
+        now = time.monotonic()
+        if not self._pending:
+            self._oldest_at = now
+        self._pending.append((job, size, now, receipt))
+        self._pending_bytes += size
+
+    def submit(self, jobs: List[Dict], timeout: Optional[float] = None, receipt: Optional[Dict] = None) -> int:
+        """
+        Queue jobs for insertion, blocking while the buffer is full
+
+        Args:
+            jobs (List[Dict]): Scraped jobs
+            timeout (float): Maximum seconds to wait for buffer space (None = wait)
+            receipt (Dict): From new_receipt(); counts how many of these jobs are
+                            saved or dead-lettered (read it after flush())
+
+        Returns:
+            int: Number of jobs queued
+        """
+        if not jobs:
+            return 0
+
+        lines = [self._encode(job) for job in jobs]
+
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Job write buffer is closed")
+
+            if len(self._pending) + self._reserved >= self.max_pending_jobs:
+                wait_start = time.monotonic()
+                self._stats['backpressure_waits'] += 1
+                has_space = self._condition.wait_for(
+                    lambda: len(self._pending) + self._reserved < self.max_pending_jobs or self._closed,
+                    timeout=timeout
+                )
+                self._stats['backpressure_wait_seconds'] += time.monotonic() - wait_start
+                if not has_space or self._closed:
+                    raise TimeoutError("Job write buffer is full; database is not keeping up")
+            self._reserved += len(jobs)
+
+        queued = False
+        try:
+            # Enqueueing under the spill lock keeps the buffer in spill file order
+            with self._spill_lock:
+                self._append_spill(lines)
+                with self._condition:
+                    self._reserved -= len(jobs)
+                    queued = True
+                    for job, line in zip(jobs, lines):
+                        self._enqueue(job, len(line), receipt)
+                    self._stats['jobs_submitted'] += len(jobs)
+                    self._condition.notify_all()
+        finally:
+            if not queued:
+                with self._condition:
+                    self._reserved -= len(jobs)
+                    self._condition.notify_all()
+
+        return len(jobs)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every submitted job has been inserted
+
+        Args:
+            timeout (float): Maximum seconds to wait (None = wait)
+
+        Returns:
+            bool: True if the buffer drained
+        """
+        with self._condition:
+            self._flush_requested = bool(self._pending)  # Flush without waiting for a full batch
+            self._condition.notify_all()
+            return self._condition.wait_for(
+                lambda: not self._pending and not self._in_flight,
+                timeout=timeout
+            )
+
+    def close(self, timeout: Optional[float] = 30) -> None:
+        """Flush remaining jobs and stop the background thread"""
+        drained = self.flush(timeout=timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout=timeout)
+        if not self._thread.is_alive():
+            self._spill.close()  # Releases the lock for the next writer
+        if not drained:
+            print(f"⚠️  {len(self._pending)} jobs left in {self.spill_path}; they will be re-queued on restart")
+
+    # ------------------------------------------------------------------
+    # Flusher thread
+    # ------------------------------------------------------------------
+
+    def _batch_ready(self) -> bool:
+        if not self._pending:
+            return False
+        return (
+            self._flush_requested
+            or len(self._pending) >= self.max_batch_jobs
+            or self._pending_bytes >= self.max_batch_bytes
+            or time.monotonic() - self._oldest_at >= self.max_delay_seconds
+        )
+
+    def _take_batch(self) -> List[tuple]:
+        count = 0
+        batch_bytes = 0
+        for _, size, _, _ in self._pending:
+            if count >= self.max_batch_jobs or (count and batch_bytes + size > self.max_batch_bytes):
+                break
+            count += 1
+            batch_bytes += size
+
+        batch = self._pending[:count]
+        del self._pending[:count]
+        self._pending_bytes -= batch_bytes
+        self._reset_oldest()
+        return batch
+
+    def _reset_oldest(self) -> None:
+        """Age the buffer from its oldest remaining job; nothing is due once it drains"""
+        if self._pending:
+            self._oldest_at = self._pending[0][2]
+        else:
+            self._oldest_at = None
+            self._flush_requested = False
+
+    def _run(self) -> None:
+        retry_delay = self.retry_seconds
+        attempts = 0
+
+        while True:
+            with self._condition:
+                while not self._closed and not self._batch_ready():
+                    if self._pending:
+                        remaining = self.max_delay_seconds - (time.monotonic() - self._oldest_at)
+                        self._condition.wait(timeout=max(remaining, 0.01))
+                    else:
+                        self._condition.wait()
+
+                if self._closed and not self._pending:
+                    return
+
+                flush_requested = self._flush_requested
+                batch = self._take_batch()
+                self._in_flight = len(batch)
+
+            jobs = [job for job, _, _, _ in batch]
+            batch_bytes = sum(size for _, size, _, _ in batch)
+            start = time.perf_counter()
+            result = self.db.insert_jobs(jobs)
+            latency_ms = (time.perf_counter() - start) * 1000
+            success = bool(result.get('success'))
+            attempts = 0 if success else attempts + 1
+            dead = not success and attempts >= self.max_attempts
+
+            if dead:
+                # The batch leaves the spill file only once it is in the dead-letter file
+                self._dead_letter(jobs, result.get('message'))
+                print(f"⚠️  Job batch insert failed {attempts} times; moved {len(jobs)} jobs "
+                      f"to {self.dead_letter_path}: {result.get('message')}")
+                attempts = 0
+
+            with self._condition:
+                if success:
+                    self._stats['jobs_flushed'] += len(batch)
+                    self._stats['batches_flushed'] += 1
+                    self._stats['flush_latency_ms_total'] += latency_ms
+                    self._stats['flush_latency_ms_max'] = max(self._stats['flush_latency_ms_max'], latency_ms)
+                    self._stats['batch_size_max'] = max(self._stats['batch_size_max'], len(batch))
+                else:
+                    self._stats['flush_failures'] += 1
+                if success or dead:
+                    field = 'jobs_saved' if success else 'jobs_dead_lettered'
+                    for _, _, _, receipt in batch:
+                        if receipt is not None:
+                            receipt[field] += 1
+                if dead:
+                    self._stats['jobs_dead_lettered'] += len(batch)
+                elif not success:
+                    # Put the batch back at the front and back off
+                    self._pending[:0] = batch
+                    self._pending_bytes += batch_bytes
+                    self._reset_oldest()
+                    # A waiting flush() still wants the retry right after the back-off
+                    self._flush_requested = self._flush_requested or flush_requested
+                    print(f"⚠️  Job batch insert failed (attempt {attempts} of {self.max_attempts}), "
+                          f"retrying in {retry_delay:.1f}s: {result.get('message')}")
+
+            if success or dead:
+                retry_delay = self.retry_seconds
+                self._checkpoint_spill(batch_bytes)
+
+            with self._condition:
+                # Cleared after the checkpoint so flush() returns with the spill file up to date
+                self._in_flight = 0
+                self._condition.notify_all()
+
+            if not success and not dead:
+                if self._closed:
+                    return
+                time.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, 60)
+
+    def stats(self) -> Dict:
+        """Flush latency, batch size and back-pressure metrics"""
+        with self._condition:
+            stats = dict(self._stats)
+            stats['pending_jobs'] = len(self._pending)
+            stats['pending_bytes'] = self._pending_bytes
+
+        batches = stats['batches_flushed']
+        stats['flush_latency_ms_avg'] = round(stats.pop('flush_latency_ms_total') / batches, 2) if batches else 0.0
+        stats['flush_latency_ms_max'] = round(stats['flush_latency_ms_max'], 2)
+        stats['batch_size_avg'] = round(stats['jobs_flushed'] / batches, 2) if batches else 0.0
+        stats['backpressure_wait_seconds'] = round(stats['backpressure_wait_seconds'], 3)
+        stats['spill_path'] = str(self.spill_path)
+        return stats
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_job_writer() -> BufferedJobWriter:
+    """
+    Get the process-wide write buffer, configured from the environment:
+    JOB_WRITE_BATCH_SIZE (default 200), JOB_WRITE_BATCH_BYTES (default 1 MB),
+    JOB_WRITE_MAX_DELAY_SECONDS (default 2), JOB_WRITE_MAX_PENDING (default 5000),
+    JOB_WRITE_MAX_ATTEMPTS (default 5) and JOB_WRITE_SPILL_PATH (default
+    backend/data/job_write_buffer.jsonl)
+    """
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = BufferedJobWriter(
+                    max_batch_jobs=int(os.getenv("JOB_WRITE_BATCH_SIZE", "200")),
+                    max_batch_bytes=int(os.getenv("JOB_WRITE_BATCH_BYTES", str(1024 * 1024))),
+                    max_delay_seconds=float(os.getenv("JOB_WRITE_MAX_DELAY_SECONDS", "2")),
+                    max_pending_jobs=int(os.getenv("JOB_WRITE_MAX_PENDING", "5000")),
+                    max_attempts=int(os.getenv("JOB_WRITE_MAX_ATTEMPTS", "5")),
+                    spill_path=os.getenv("JOB_WRITE_SPILL_PATH") or None
+                )
+                atexit.register(_writer.close)
+    return _writer
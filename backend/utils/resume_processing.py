@@ -0,0 +1,530 @@
+"""
+Resume processing pipeline
+process_resume_upload runs the stages of /api/upload-resume: text extraction,
+then candidate info. ResumeProcessingQueue runs them in a bounded pool of
+worker threads so the upload request returns 202 with a processing id right
+away. Job state is kept in a SQLite file shared by the worker processes on
+the host, so any worker can answer a poll or an event stream.
+ResumeBatch processes many uploads at once for /api/upload-resumes.
+"""
+
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+import atexit
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+
+
+DEFAULT_JOBS_PATH = Path(__file__).resolve().parents[1] / "data" / "resume_jobs.sqlite3"
+
+STAGES = ("queue", "extract", "candidate_info")
+
+# Latest timings kept per stage for percentiles
+TIMING_WINDOW = 1000
+
+RESUME_EXTENSIONS = (".pdf", ".doc", ".docx")
+
+# Largest resume file, uploaded alone or in a batch
+MAX_RESUME_BYTES = 10 * 1024 * 1024
+
+# Limits of /api/upload-resumes; the unpacked size guards against zip bombs
+MAX_BATCH_FILES = int(os.getenv("RESUME_BATCH_MAX_FILES", "500"))
+MAX_BATCH_UNPACKED_BYTES = int(os.getenv("RESUME_BATCH_MAX_UNPACKED_MB", "500")) * 1024 * 1024
+
+# Files of a batch read into memory per extraction worker, queued or extracting
+BATCH_FILES_PER_WORKER = 2
+
+
+class UnsupportedResumeError(ValueError):
+    """The file type cannot be read"""
+
+
+def process_resume_upload(
+    data: bytes,
+    filename: str,
+    resume_id: Optional[str] = None,
+    user_id: Optional[str] = None,
+    on_stage: Optional[Callable[[str, float], None]] = None
+) -> Dict:
+    """
+    Extract text and candidate info from an uploaded resume
+
+    Args:
+        data (bytes): File contents
+        filename (str): Original file name
+        resume_id (str): Optional resumes.id the AI result is stored on
+        user_id (str): Authenticated owner of resume_id; nothing is stored without it
+        on_stage (Callable): Called with each finished stage and its duration in ms
+
+    Returns:
+        Dict with filename, candidate_info and resume_text (the upload-resume response)
+
+    Raises:
+        UnsupportedResumeError: the file type cannot be read
+    """
+    from .extract_text import extract_text_from_bytes
+    from ai.extract_candidate_info import extract_candidate_info
+
+    started = time.perf_counter()
+    resume_text = extract_text_from_bytes(data, filename)
+    if on_stage:
+        on_stage("extract", (time.perf_counter() - started) * 1000)
+    if resume_text == "Unsupported file format.":
+        raise UnsupportedResumeError("Unsupported file format")
+
+    started = time.perf_counter()
+    candidate_info = extract_candidate_info(resume_text, resume_id=resume_id, user_id=user_id)
+    if on_stage:
+        on_stage("candidate_info", (time.perf_counter() - started) * 1000)
+
+    return {
+        "filename": filename,
+        "candidate_info": candidate_info,
+        "resume_text": resume_text  # Full text for matching
+    }
+
+
+def _extraction_error(resume_text: str) -> Optional[str]:
+    # extract_text reports failures in the returned text
+    if resume_text == "Unsupported file format.":
+        return "Unsupported file format"
+    if resume_text.startswith("Error extracting text"):
+        return resume_text
+    return None
+
+
+def read_bounded(stream: BinaryIO, filename: str, limit: Optional[int] = None) -> bytes:
+    """
+    Read a file of a batch upload, refusing files over MAX_RESUME_BYTES
+
+    Raises:
+        UnsupportedResumeError: the file is larger than the limit
+    """
+    limit = MAX_RESUME_BYTES if limit is None else limit
+    data = stream.read(limit + 1)
+    if len(data) > limit:
+        raise UnsupportedResumeError(f"{filename} is larger than {limit // (1024 * 1024)}MB")
+    return data
+
+
+def unpack_uploads(files: List[Tuple[str, BinaryIO]]) -> List[Tuple[str, Callable[[], bytes]]]:
+    """
+    Expand zip archives in a batch upload into the resumes they contain
+
+    Nothing is read or decompressed here: each resume comes with a function
+    that reads it when ResumeBatch is ready to extract it, so a batch never
+    holds more than a few files in memory. Archives are read in place from
+    the upload's (spooled) file, and each member is decompressed on its own.
+
+    Args:
+        files (list): (filename, file object) pairs; .zip files are expanded,
+                      other resume files are kept as they are
+
+    Returns:
+        list: (filename, read) pairs of PDF, DOC and DOCX files; read() returns
+              the contents, or raises UnsupportedResumeError over MAX_RESUME_BYTES
+
+    Raises:
+        UnsupportedResumeError: an archive is corrupt, or the batch is over
+                                MAX_BATCH_FILES files or MAX_BATCH_UNPACKED_BYTES
+    """
+    import zipfile
+
+    resumes = []
+    unpacked_bytes = 0
+    for filename, stream in files:
+        if not filename.lower().endswith(".zip"):
+            resumes.append((filename, lambda stream=stream, filename=filename: read_bounded(stream, filename)))
+            continue
+        try:
+            # Closed with the upload's file at the end of the request
+            archive = zipfile.ZipFile(stream)
+        except zipfile.BadZipFile:
+            raise UnsupportedResumeError(f"{filename} is not a valid zip archive")
+        for member in archive.infolist():
+            name = member.filename
+            # Skip folders and the resource forks macOS adds to archives
+            if member.is_dir() or name.startswith("__MACOSX/") or not name.lower().endswith(RESUME_EXTENSIONS):
+                continue
+            # zipfile never inflates a member past its declared size, so this bounds decompression
+            unpacked_bytes += member.file_size
+            if unpacked_bytes > MAX_BATCH_UNPACKED_BYTES:
+                raise UnsupportedResumeError(f"{filename} unpacks to more than {MAX_BATCH_UNPACKED_BYTES // (1024 * 1024)}MB")
+            resumes.append((Path(name).name, lambda archive=archive, member=member: _read_member(archive, member)))
+
+    if len(resumes) > MAX_BATCH_FILES:
+        raise UnsupportedResumeError(f"Too many resumes. Maximum is {MAX_BATCH_FILES} per batch")
+    return resumes
+
+
+def _read_member(archive, member) -> bytes:
+    import zipfile
+    try:
+        with archive.open(member) as stream:
+            return read_bounded(stream, Path(member.filename).name)
+    except (zipfile.BadZipFile, OSError, EOFError) as e:
+        raise UnsupportedResumeError(f"Could not unpack {member.filename}: {str(e)}")
+
+
+class ResumeBatch:
+    """
+    Text and candidate info for many uploads, yielded as each one finishes
+
+    Text is extracted in the batch process pool, separate from the pool that
+    splits long PDFs of single uploads, and only a few files per worker are
+    read and in flight at once. Candidate info runs on as many threads as
+    the model client has slots, so model calls stay within its concurrency
+    limit. After iteration, summary holds the counts and throughput.
+    """
+
+    def __init__(self, files: List[Tuple[str, Callable[[], bytes]]]):
+        """
+        Args:
+            files (list): (filename, read) pairs from unpack_uploads
+        """
+        self.files = files
+        self.summary: Dict = {}
+
+    def __iter__(self) -> Iterator[Dict]:
+        """
+        Yields:
+            Dict per file: index, filename, success, candidate_info and
+            resume_text (or error), and timings_ms per stage
+        """
+        from .extract_text import BATCH_EXTRACT_WORKERS, submit_extraction
+        from ai.extract_candidate_info import extract_candidate_info
+        from ai.llm_client import get_llm_client
+
+        started = time.perf_counter()
+        counts = {"succeeded": 0, "failed": 0}
+        llm_concurrency = get_llm_client().max_concurrency
+        threads = ThreadPoolExecutor(max_workers=llm_concurrency, thread_name_prefix="resume-batch")
+        # Files read and waiting for or in text extraction
+        window = BATCH_EXTRACT_WORKERS * BATCH_FILES_PER_WORKER
+        remaining = iter(enumerate(self.files))
+        timings = [{} for _ in self.files]
+        submitted_at = {}
+
+        def candidate_info(resume_text: str) -> Tuple[Dict, float]:
+            info_started = time.perf_counter()
+            return extract_candidate_info(resume_text), (time.perf_counter() - info_started) * 1000
+
+        def finish(index: int, **result) -> Dict:
+            counts["succeeded" if result.get("success") else "failed"] += 1
+            result.setdefault("success", False)
+            return {"index": index, "filename": self.files[index][0], **result}
+
+        # Each future maps to (stage, file index, resume text)
+        pending = {}
+
+        def fill() -> Iterator[Dict]:
+            # Read more files until the window is full; yields the ones that cannot be read
+            while len(submitted_at) < window:
+                index, (filename, read) = next(remaining, (None, (None, None)))
+                if index is None:
+                    return
+                try:
+                    data = read()
+                except Exception as e:
+                    yield finish(index, error=str(e), timings_ms=timings[index])
+                    continue
+                submitted_at[index] = time.perf_counter()
+                pending[submit_extraction(data, filename)] = ("extract", index, None)
+
+        try:
+            yield from fill()
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, index, resume_text = pending.pop(future)
+                    if stage == "extract":
+                        # Time from submission; includes waiting for a free process
+                        timings[index]["extract"] = round((time.perf_counter() - submitted_at.pop(index)) * 1000, 2)
+                    try:
+                        value = future.result()
+                    except Exception as e:
+                        print(f"Error processing {self.files[index][0]}: {str(e)}")
+                        yield finish(index, error=str(e), timings_ms=timings[index])
+                        continue
+
+                    if stage == "extract":
+                        error = _extraction_error(value)
+                        if error:
+                            yield finish(index, error=error, timings_ms=timings[index])
+                        else:
+                            pending[threads.submit(candidate_info, value)] = ("candidate_info", index, value)
+                    else:
+                        info, elapsed_ms = value
+                        timings[index]["candidate_info"] = round(elapsed_ms, 2)
+                        yield finish(
+                            index,
+                            success=True,
+                            candidate_info=info,
+                            resume_text=resume_text,
+                            timings_ms=timings[index]
+                        )
+                yield from fill()
+        finally:
+            # Stop queued work when the client goes away
+            for future in pending:
+                future.cancel()
+            threads.shutdown(wait=False, cancel_futures=True)
+
+            elapsed = time.perf_counter() - started
+            processed = counts["succeeded"] + counts["failed"]
+            self.summary = {
+                "files": len(self.files),
+                **counts,
+                "elapsed_ms": round(elapsed * 1000, 2),
+                "resumes_per_minute": round(processed / elapsed * 60, 1) if elapsed > 0 else 0.0,
+                "extract_workers": BATCH_EXTRACT_WORKERS,
+                "llm_concurrency": llm_concurrency
+            }
+
+
+class ResumeProcessingQueue:
+    """
+    Bounded queue of uploads processed by a fixed pool of worker threads.
+    Each job moves through queued -> running -> done | failed; its record
+    (status, stage, per-stage timings, result or error) is readable by id.
+    """
+
+    def __init__(self, workers: int = 4, max_queued: int = 100, path: Optional[str] = None,
+                 ttl_seconds: float = 3600):
+        """
+        Args:
+            workers (int): Threads processing uploads
+            max_queued (int): Uploads waiting before new ones are rejected
+            path (str): SQLite file holding job records (default: backend/data/resume_jobs.sqlite3)
+            ttl_seconds (float): Finished jobs are forgotten after this long
+        """
+        self.workers = workers
+        self.ttl_seconds = ttl_seconds
+        self.path = str(path or DEFAULT_JOBS_PATH)
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._queue = queue.Queue(maxsize=max_queued)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._changed = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._counts = {"submitted": 0, "rejected": 0, "completed": 0, "failed": 0}
+        self._timings = {stage: deque(maxlen=TIMING_WINDOW) for stage in STAGES + ("total",)}
+        self._running = 0
+
+        self._execute(
+            "CREATE TABLE IF NOT EXISTS resume_jobs ("
+            "id TEXT PRIMARY KEY, record TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._execute("CREATE INDEX IF NOT EXISTS idx_resume_jobs_updated_at ON resume_jobs(updated_at)")
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections cannot be shared between threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        return self._connection().execute(sql, params)
+
+    def _save(self, record: Dict) -> None:
+        record["updated_at"] = time.time()
+        record["version"] = record.get("version", 0) + 1
+        self._execute(
+            "INSERT OR REPLACE INTO resume_jobs (id, record, updated_at) VALUES (?, ?, ?)",
+            (record["id"], json.dumps(record), record["updated_at"])
+        )
+        with self._changed:
+            self._changed.notify_all()
+
+    def _start_workers(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            for number in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"resume-worker-{number}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, data: bytes, filename: str, resume_id: Optional[str] = None,
+               user_id: Optional[str] = None) -> Dict:
+        """
+        Queue an upload for processing
+
+        Args:
+            resume_id (str): Optional resumes.id the AI result is stored on
+            user_id (str): Authenticated caller; only they can read the job record
+
+        Returns:
+            The job record (status 'queued')
+
+        Raises:
+            queue.Full: max_queued uploads are already waiting
+        """
+        self._start_workers()
+        record = {
+            "id": uuid.uuid4().hex,
+            "status": "queued",
+            "stage": "queue",
+            "filename": filename,
+            "user_id": user_id,
+            "created_at": time.time(),
+            "timings_ms": {},
+            "result": None,
+            "error": None
+        }
+        # Saved before queueing so a worker's update is never overwritten
+        self._save(record)
+        try:
+            # The worker updates its own copy; the one returned stays 'queued'
+            self._queue.put_nowait((dict(record, timings_ms={}), data, resume_id, user_id))
+        except queue.Full:
+            self._execute("DELETE FROM resume_jobs WHERE id = ?", (record["id"],))
+            with self._lock:
+                self._counts["rejected"] += 1
+            raise
+        with self._lock:
+            self._counts["submitted"] += 1
+        self._forget_expired()
+        return record
+
+    def _work(self) -> None:
+        while True:
+            record, data, resume_id, user_id = self._queue.get()
+            with self._lock:
+                self._running += 1
+            try:
+                self._process(record, data, resume_id, user_id)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                self._queue.task_done()
+
+    def _process(self, record: Dict, data: bytes, resume_id: Optional[str], user_id: Optional[str]) -> None:
+        timings = record["timings_ms"]
+        timings["queue"] = round((time.time() - record["created_at"]) * 1000, 2)
+        record.update(status="running", stage="extract")
+        self._save(record)
+
+        def on_stage(stage: str, elapsed_ms: float) -> None:
+            timings[stage] = round(elapsed_ms, 2)
+            if stage == "extract":
+                record["stage"] = "candidate_info"
+                self._save(record)
+
+        try:
+            record["result"] = process_resume_upload(
+                data, record["filename"], resume_id=resume_id, user_id=user_id, on_stage=on_stage
+            )
+            record["status"] = "done"
+        except Exception as e:
+            print(f"Error processing resume {record['id']}: {str(e)}")
+            record["status"] = "failed"
+            record["error"] = str(e)
+
+        timings["total"] = round((time.time() - record["created_at"]) * 1000, 2)
+        record["stage"] = None
+        self._save(record)
+
+        with self._lock:
+            self._counts["completed" if record["status"] == "done" else "failed"] += 1
+            for stage, elapsed_ms in timings.items():
+                self._timings[stage].append(elapsed_ms)
+
+    def get(self, processing_id: str) -> Optional[Dict]:
+        """The job record, or None if unknown or expired"""
+        row = self._execute("SELECT record FROM resume_jobs WHERE id = ?", (processing_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def follow(self, processing_id: str, timeout: float = 300, poll_interval: float = 1.0) -> Iterator[Dict]:
+        """
+        Yield the job record each time it changes, until it is done or failed
+
+        Jobs run by this process wake the reader immediately; jobs run by
+        another worker process are picked up within poll_interval.
+        """
+        deadline = time.monotonic() + timeout
+        version = None
+        while time.monotonic() < deadline:
+            record = self.get(processing_id)
+            if record is None:
+                return
+            if record["version"] != version:
+                version = record["version"]
+                yield record
+                if record["status"] in ("done", "failed"):
+                    return
+            with self._changed:
+                self._changed.wait(poll_interval)
+
+    def _forget_expired(self) -> None:
+        self._execute("DELETE FROM resume_jobs WHERE updated_at < ?", (time.time() - self.ttl_seconds,))
+
+    def drain(self, timeout: Optional[float] = 30) -> bool:
+        """
+        Wait for queued and running uploads to finish
+
+        Returns:
+            bool: True if the queue is empty, False if the timeout expired first
+        """
+        with self._queue.all_tasks_done:
+            drained = self._queue.all_tasks_done.wait_for(lambda: not self._queue.unfinished_tasks, timeout=timeout)
+            unfinished = self._queue.unfinished_tasks
+        if not drained:
+            print(f"⚠️  {unfinished} resume uploads still processing at shutdown")
+        return drained
+
+    def stats(self) -> Dict:
+        """Queue depth, job counters and per-stage latency percentiles"""
+        with self._lock:
+            stats = dict(self._counts)
+            stats["queued"] = self._queue.qsize()
+            stats["running"] = self._running
+            timings = {stage: sorted(values) for stage, values in self._timings.items()}
+        stats["workers"] = self.workers
+        stats["max_queued"] = self._queue.maxsize
+        stats["stage_ms"] = {
+            stage: {
+                "avg": round(sum(values) / len(values), 2),
+                "p50": values[len(values) // 2],
+                "p95": values[min(len(values) - 1, int(len(values) * 0.95))]
+            }
+            for stage, values in timings.items()
+            if values
+        }
+        return stats
+
+
+_processing_queue = None
+_processing_queue_lock = threading.Lock()
+
+
+def get_resume_queue() -> ResumeProcessingQueue:
+    """
+    Get the process-wide resume processing queue, configured from the
+    environment: RESUME_WORKERS (default 4), RESUME_QUEUE_SIZE (default 100),
+    RESUME_JOBS_PATH, RESUME_JOB_TTL_SECONDS (default 3600) and
+    SHUTDOWN_DRAIN_SECONDS (default 25, the wait at exit)
+    """
+    global _processing_queue
+    if _processing_queue is None:
+        with _processing_queue_lock:
+            if _processing_queue is None:
+                _processing_queue = ResumeProcessingQueue(
+                    workers=int(os.getenv("RESUME_WORKERS", "4")),
+                    max_queued=int(os.getenv("RESUME_QUEUE_SIZE", "100")),
+                    path=os.getenv("RESUME_JOBS_PATH") or None,
+                    ttl_seconds=float(os.getenv("RESUME_JOB_TTL_SECONDS", "3600"))
+                )
+                atexit.register(_processing_queue.drain, float(os.getenv("SHUTDOWN_DRAIN_SECONDS", "25")))
+    return _processing_queue
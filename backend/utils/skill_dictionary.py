@@ -0,0 +1,419 @@
+"""
+Curated skill dictionary and skill extraction
+Maps the many spellings of a skill found in job postings and resumes
+(e.g. "js", "ReactJS", "k8s") to one canonical name.
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+
+# Canonical skill name -> lowercase aliases (the canonical name itself is always an alias).
+SKILL_ALIASES: Dict[str, List[str]] = {
+    # Programming languages
+    "Python": ["python", "python3"],
+    "Java": ["java", "core java", "java 8"],
+    "JavaScript": ["javascript", "js", "es6", "ecmascript"],
+    "TypeScript": ["typescript"],
+    "C++": ["c++", "cpp"],
+    "C#": ["c#", "csharp", "c sharp"],
+    "C": ["c programming", "c language"],
+    "Go": ["golang", "go lang"],
+    "Rust": ["rust"],
+    "Kotlin": ["kotlin"],
+    "Swift": ["swift"],
+    "PHP": ["php"],
+    "Ruby": ["ruby"],
+    "Scala": ["scala"],
+    "R": ["r programming", "rstudio", "r language"],
+    "MATLAB": ["matlab"],
+    "Dart": ["dart"],
+    "Bash": ["bash", "shell scripting", "shell script"],
+    "SQL": ["sql", "t-sql", "pl/sql", "plsql"],
+
+    # Frontend
+    "HTML": ["html", "html5"],
+    "CSS": ["css", "css3"],
+    "React": ["react", "reactjs", "react.js"],
+    "Angular": ["angular", "angularjs", "angular.js"],
+    "Vue.js": ["vue", "vuejs", "vue.js"],
+    "Next.js": ["next.js", "nextjs"],
+    "Redux": ["redux"],
+    "Tailwind CSS": ["tailwind", "tailwindcss", "tailwind css"],
+    "Bootstrap": ["bootstrap"],
+    "jQuery": ["jquery"],
+
+    # Backend and frameworks
+    "Node.js": ["node.js", "nodejs", "node"],
+    "Express.js": ["express.js", "expressjs"],
+    "Django": ["django"],
+    "Flask": ["flask"],
+    "FastAPI": ["fastapi"],
+    "Spring Boot": ["spring boot", "springboot", "spring framework"],
+    "Hibernate": ["hibernate"],
+    ".NET": [".net", "dotnet", "asp.net", ".net core"],
+    "Laravel": ["laravel"],
+    "Ruby on Rails": ["ruby on rails", "rails"],
+    "REST APIs": ["rest api", "rest apis", "restful", "restful api", "restful apis"],
+    "GraphQL": ["graphql"],
+    "Microservices": ["microservices", "micro services", "microservice"],
+
+    # Mobile
+    "Android": ["android"],
+    "iOS": ["ios"],
+    "Flutter": ["flutter"],
+    "React Native": ["react native"],
+
+    # Data and databases
+    "MySQL": ["mysql"],
+    "PostgreSQL": ["postgresql", "postgres"],
+    "MongoDB": ["mongodb", "mongo"],
+    "Redis": ["redis"],
+    "Oracle": ["oracle", "oracle db"],
+    "SQL Server": ["sql server", "mssql", "ms sql"],
+    "Elasticsearch": ["elasticsearch", "elastic search"],
+    "Cassandra": ["cassandra"],
+    "Firebase": ["firebase"],
+    "Supabase": ["supabase"],
+    "Snowflake": ["snowflake"],
+    "Excel": ["excel", "ms excel", "microsoft excel", "advanced excel"],
+    "Power BI": ["power bi", "powerbi"],
+    "Tableau": ["tableau"],
+    "Pandas": ["pandas"],
+    "NumPy": ["numpy"],
+    "Spark": ["spark", "apache spark", "pyspark"],
+    "Hadoop": ["hadoop"],
+    "Kafka": ["kafka", "apache kafka"],
+    "Airflow": ["airflow", "apache airflow"],
+    "ETL": ["etl"],
+    "Data Analysis": ["data analysis", "data analytics"],
+    "Data Visualization": ["data visualization", "data visualisation"],
+    "Statistics": ["statistics", "statistical analysis"],
+
+    # Machine learning and AI
+    "Machine Learning": ["machine learning", "ml"],
+    "Deep Learning": ["deep learning"],
+    "NLP": ["nlp", "natural language processing"],
+    "Computer Vision": ["computer vision", "opencv"],
+    "TensorFlow": ["tensorflow"],
+    "PyTorch": ["pytorch"],
+    "Keras": ["keras"],
+    "scikit-learn": ["scikit-learn", "sklearn", "scikit learn"],
+    "Generative AI": ["generative ai", "genai", "gen ai"],
+    "LLM": ["llm", "llms", "large language models"],
+
+    # Cloud and DevOps
+    "AWS": ["aws", "amazon web services"],
+    "Azure": ["azure", "microsoft azure"],
+    "GCP": ["gcp", "google cloud", "google cloud platform"],
+    "Docker": ["docker"],
+    "Kubernetes": ["kubernetes", "k8s"],
+    "Terraform": ["terraform"],
+    "Ansible": ["ansible"],
+    "Jenkins": ["jenkins"],
+    "CI/CD": ["ci/cd", "ci cd", "cicd", "continuous integration"],
+    "Git": ["git", "github", "gitlab"],
+    "Linux": ["linux", "unix"],
+
+    # Security
+    "Cybersecurity": ["cybersecurity", "cyber security", "information security", "infosec"],
+    "Network Security": ["network security", "firewall", "firewalls"],
+    "Penetration Testing": ["penetration testing", "pen testing", "pentesting", "ethical hacking"],
+    "SIEM": ["siem", "splunk"],
+    "Networking": ["networking", "tcp/ip", "ccna"],
+
+    # Testing
+    "Selenium": ["selenium"],
+    "Manual Testing": ["manual testing"],
+    "Automation Testing": ["automation testing", "test automation"],
+    "JUnit": ["junit"],
+    "Jest": ["jest"],
+
+    # Design
+    "Figma": ["figma"],
+    "Adobe XD": ["adobe xd"],
+    "Photoshop": ["photoshop", "adobe photoshop"],
+    "Illustrator": ["illustrator", "adobe illustrator"],
+    "UI Design": ["ui design", "user interface design", "ui"],
+    "UX Design": ["ux design", "user experience", "ux", "ux research"],
+    "Wireframing": ["wireframing", "wireframes", "prototyping"],
+    "Graphic Design": ["graphic design"],
+
+    # Business, product and marketing
+    "Product Management": ["product management", "product roadmap"],
+    "Agile": ["agile", "scrum", "kanban"],
+    "JIRA": ["jira"],
+    "Business Analysis": ["business analysis", "requirement gathering", "requirements gathering"],
+    "Digital Marketing": ["digital marketing", "online marketing"],
+    "SEO": ["seo", "search engine optimization"],
+    "SEM": ["sem", "google ads", "ppc"],
+    "Social Media Marketing": ["social media marketing", "smm"],
+    "Content Writing": ["content writing", "copywriting"],
+    "Sales": ["sales", "business development", "lead generation"],
+    "CRM": ["crm", "salesforce"],
+    "Financial Analysis": ["financial analysis", "financial modelling", "financial modeling"],
+    "Accounting": ["accounting", "tally", "gst"],
+
+    # HR
+    "Recruitment": ["recruitment", "recruiting", "talent acquisition"],
+    "Payroll": ["payroll"],
+    "HR Operations": ["hr operations", "hrms", "employee onboarding"],
+
+    # Healthcare
+    "Clinical Research": ["clinical research", "clinical trials"],
+    "Pharmacovigilance": ["pharmacovigilance"],
+    "Medical Coding": ["medical coding"],
+    "Nursing": ["nursing", "patient care"],
+
+    # Soft skills
+    "Communication": ["communication", "communication skills"],
+    "Leadership": ["leadership", "team leadership"],
+    "Problem Solving": ["problem solving", "problem-solving"],
+}
+
+
+# Broader concepts a skill belongs to, used to relate skills that never
+# share a word ("PyTorch" and "deep learning", "React" and "frontend").
+# Concept names are matched as phrases in free text as well.
+SKILL_CATEGORIES: Dict[str, List[str]] = {
+    "frontend": [
+        "JavaScript", "TypeScript", "HTML", "CSS", "React", "Angular", "Vue.js", "Next.js",
+        "Redux", "Tailwind CSS", "Bootstrap", "jQuery"
+    ],
+    "backend": [
+        "Java", "Python", "Go", "C#", "PHP", "Ruby", "Node.js", "Express.js", "Django", "Flask",
+        "FastAPI", "Spring Boot", "Hibernate", ".NET", "Laravel", "Ruby on Rails", "REST APIs",
+        "GraphQL", "Microservices"
+    ],
+    "mobile": ["Android", "iOS", "Flutter", "React Native", "Kotlin", "Swift", "Dart"],
+    "databases": [
+        "SQL", "MySQL", "PostgreSQL", "MongoDB", "Redis", "Oracle", "SQL Server", "Cassandra",
+        "Elasticsearch", "Firebase", "Supabase"
+    ],
+    "data analysis": [
+        "SQL", "Excel", "Power BI", "Tableau", "Pandas", "NumPy", "Data Analysis",
+        "Data Visualization", "Statistics", "R"
+    ],
+    "data engineering": ["Spark", "Hadoop", "Kafka", "Airflow", "ETL", "Snowflake"],
+    "machine learning": [
+        "Machine Learning", "Deep Learning", "NLP", "Computer Vision", "TensorFlow", "PyTorch",
+        "Keras", "scikit-learn", "Generative AI", "LLM"
+    ],
+    "deep learning": ["Deep Learning", "TensorFlow", "PyTorch", "Keras", "Computer Vision", "NLP", "LLM"],
+    "cloud": ["AWS", "Azure", "GCP"],
+    "devops": ["Docker", "Kubernetes", "Terraform", "Ansible", "Jenkins", "CI/CD", "Linux", "Bash", "Git"],
+    "security": ["Cybersecurity", "Network Security", "Penetration Testing", "SIEM", "Networking"],
+    "testing": ["Selenium", "Manual Testing", "Automation Testing", "JUnit", "Jest"],
+    "design": [
+        "Figma", "Adobe XD", "Photoshop", "Illustrator", "UI Design", "UX Design",
+        "Wireframing", "Graphic Design"
+    ],
+    "marketing": ["Digital Marketing", "SEO", "SEM", "Social Media Marketing", "Content Writing"],
+    "product": ["Product Management", "Agile", "JIRA", "Business Analysis"],
+    "finance": ["Financial Analysis", "Accounting", "Excel"],
+    "human resources": ["Recruitment", "Payroll", "HR Operations"],
+    "healthcare": ["Clinical Research", "Pharmacovigilance", "Medical Coding", "Nursing"],
+}
+
+# Canonical skill -> concepts
+SKILL_TO_CATEGORIES: Dict[str, List[str]] = {}
+for _category, _skills in SKILL_CATEGORIES.items():
+    for _skill in _skills:
+        SKILL_TO_CATEGORIES.setdefault(_skill, []).append(_category)
+
+
+def _build_alias_index() -> Dict[str, str]:
+    index = {}
+    for canonical, aliases in SKILL_ALIASES.items():
+        for alias in [canonical.lower()] + aliases:
+            index.setdefault(alias, canonical)
+    return index
+
+
+# Lowercase alias -> canonical name
+ALIAS_TO_SKILL: Dict[str, str] = _build_alias_index()
+
+# Names that are fine in a skill list but too ambiguous to look for in free
+# text ("Grade C", "R&D", "go to market"); text matching uses the longer aliases
+TEXT_EXCLUDED_ALIASES = {"c", "r", "go"}
+
+
+def normalize_skill(skill: str) -> Optional[str]:
+    """
+    Map a skill as written by a user or a job posting to its canonical name
+
+    Args:
+        skill (str): e.g. "reactjs", "K8s", " Python "
+
+    Returns:
+        Canonical skill name, or None if the skill is not in the dictionary
+    """
+    if not skill:
+        return None
+    return ALIAS_TO_SKILL.get(" ".join(skill.lower().split()))
+
+
+def canonicalize_skills(skills: Iterable[str]) -> List[str]:
+    """
+    Canonicalize and de-duplicate a skill list, keeping order.
+    Skills not in the dictionary are kept as written (trimmed).
+    """
+    result = []
+    seen = set()
+    for skill in skills or []:
+        if not isinstance(skill, str) or not skill.strip():
+            continue
+        canonical = normalize_skill(skill) or " ".join(skill.split())
+        key = canonical.lower()
+        if key not in seen:
+            seen.add(key)
+            result.append(canonical)
+    return result
+
+
+def skill_profile(skills: Iterable[str]) -> Dict[str, str]:
+    """
+    Canonical skill -> the skill as written, for a resume's skill list.
+    Skills not in the dictionary are keyed by their lowercased text, so
+    lists that differ only in order or spelling have the same keys.
+    """
+    profile = {}
+    for skill in skills or []:
+        if isinstance(skill, str) and skill.strip():
+            profile.setdefault(normalize_skill(skill) or " ".join(skill.lower().split()), skill)
+    return profile
+
+
+# Characters that continue a token: an alias must not be glued to them
+_WORD_CHARS = frozenset("abcdefghijklmnopqrstuvwxyz0123456789_+#")
+
+
+def _is_word_char(char: str) -> bool:
+    return char in _WORD_CHARS or (char.isalnum() and not char.isascii())
+
+
+class SkillExtractor:
+    """
+    Finds dictionary skills in free text in one pass with an Aho-Corasick
+    automaton over all aliases.
+    Aliases only match as whole tokens, so "Java" is not found in
+    "JavaScript" and "js" is not found in "node.js"; overlapping matches
+    resolve to the leftmost, then longest alias ("react native" over "react").
+    """
+
+    def __init__(self, alias_to_skill: Optional[Dict[str, str]] = None):
+        self.alias_to_skill = alias_to_skill or {
+            alias: skill for alias, skill in ALIAS_TO_SKILL.items()
+            if alias not in TEXT_EXCLUDED_ALIASES
+        }
+        self._build(self.alias_to_skill)
+
+    def _build(self, alias_to_skill: Dict[str, str]) -> None:
+        # Trie: goto[state][char] -> state; outputs[state] -> [(alias length, skill)]
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[tuple]] = [[]]
+        for alias, skill in alias_to_skill.items():
+            state = 0
+            for char in alias:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    outputs.append([])
+                state = next_state
+            outputs[state].append((len(alias), skill))
+
+        # Failure links in breadth-first order, folded into a complete
+        # transition table so scanning never follows a failure link
+        alphabet = {char for transitions in goto for char in transitions}
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [dict() for _ in goto]
+        delta[0] = dict(goto[0])
+        queue = list(goto[0].values())
+        position = 0
+        while position < len(queue):
+            state = queue[position]
+            position += 1
+            outputs[state] = outputs[state] + outputs[fail[state]]
+            for char in alphabet:
+                next_state = goto[state].get(char)
+                if next_state is not None:
+                    fail[next_state] = delta[fail[state]].get(char, 0)
+                    delta[state][char] = next_state
+                    queue.append(next_state)
+                else:
+                    target = delta[fail[state]].get(char, 0)
+                    if target:
+                        delta[state][char] = target
+
+        self._delta = delta
+        self._outputs = outputs
+        self._output_states = frozenset(state for state, found in enumerate(outputs) if found)
+
+    def _matches(self, text: str) -> List[tuple]:
+        """(start, end, skill) for every alias occurrence that respects token boundaries"""
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # Case folding changed the length (e.g. "İ"); positions must line up
+            lowered = "".join(char.lower()[0] for char in text)
+
+        delta = self._delta
+        output_states = self._output_states
+        found = []
+        state = 0
+        for end, char in enumerate(lowered, 1):
+            state = delta[state].get(char, 0)
+            if state in output_states:
+                for length, skill in self._outputs[state]:
+                    start = end - length
+                    if start > 0 and (_is_word_char(lowered[start - 1]) or lowered[start - 1] == "."):
+                        continue
+                    if end < len(lowered):
+                        following = lowered[end]
+                        if _is_word_char(following):
+                            continue
+                        if following == "." and end + 1 < len(lowered) and _is_word_char(lowered[end + 1]):
+                            continue
+                    found.append((start, end, skill))
+        return found
+
+    def extract(self, text: str) -> List[str]:
+        """
+        Canonical skills mentioned in the text, in order of first mention
+
+        Args:
+            text (str): Job description, title or resume text
+
+        Returns:
+            List of canonical skill names
+        """
+        if not text:
+            return []
+
+        skills = []
+        seen = set()
+        covered_until = 0
+        # Leftmost first, longest first at the same start; skip overlaps
+        for start, end, skill in sorted(self._matches(text), key=lambda match: (match[0], -match[1])):
+            if start < covered_until:
+                continue
+            covered_until = end
+            if skill not in seen:
+                seen.add(skill)
+                skills.append(skill)
+        return skills
+
+    def extract_many(self, texts: Iterable[str]) -> List[List[str]]:
+        """Extract skills from a batch of texts"""
+        return [self.extract(text) for text in texts]
+
+
+_extractor = None
+
+
+def get_skill_extractor() -> SkillExtractor:
+    """Get the shared extractor (the pattern is compiled once per process)"""
+    global _extractor
+    if _extractor is None:
+        _extractor = SkillExtractor()
+    return _extractor
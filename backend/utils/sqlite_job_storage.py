@@ -0,0 +1,679 @@
+"""
+Embedded SQLite storage backend for jobs
+Single-file database with WAL mode, covering indexes and FTS5 full-text
+search over title and description. Used for development, tests, benchmarks
+and single-node deployments that do not need Supabase.
+"""
+
+from typing import Iterator, List, Dict, Optional
+from datetime import datetime, timezone
+from pathlib import Path
+import contextlib
+import json
+import sqlite3
+import threading
+import uuid
+from .job_storage import JobStorageBackend
+
+
+DEFAULT_SQLITE_PATH = Path(__file__).resolve().parents[1] / "data" / "jobs.sqlite3"
+
+JOB_COLUMNS = [
+    'id', 'title', 'company', 'description', 'location', 'experience', 'salary',
+    'url', 'source', 'domain', 'skills_required', 'job_type',
+    'experience_min', 'experience_max', 'salary_min', 'salary_max',
+    'salary_currency', 'salary_period', 'cities', 'work_mode', 'is_active',
+    'keyword', 'scraped_at', 'created_at', 'updated_at'
+]
+
+# Columns added after the first release, with their types; added to older
+# database files on open
+ADDED_COLUMNS = {
+    'experience_min': 'INTEGER',
+    'experience_max': 'INTEGER',
+    'salary_min': 'INTEGER',
+    'salary_max': 'INTEGER',
+    'salary_currency': 'TEXT',
+    'salary_period': 'TEXT',
+    'cities': 'TEXT',
+    'work_mode': 'TEXT',
+}
+
+# Columns added to resumes after the table was first created
+RESUME_ADDED_COLUMNS = {
+    'parsed_text': 'TEXT',
+    'analysis': 'TEXT',
+}
+
+# Columns stored as JSON text because SQLite has no array type
+JSON_COLUMNS = {'skills_required', 'cities', 'matching_skills'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+  id TEXT PRIMARY KEY,
+  title TEXT NOT NULL,
+  company TEXT NOT NULL,
+  description TEXT,
+  location TEXT,
+  experience TEXT,
+  salary TEXT,
+  url TEXT,
+  source TEXT NOT NULL,
+  domain TEXT,
+  skills_required TEXT,
+  job_type TEXT,
+  experience_min INTEGER,
+  experience_max INTEGER,
+  salary_min INTEGER,
+  salary_max INTEGER,
+  salary_currency TEXT,
+  salary_period TEXT,
+  cities TEXT,
+  work_mode TEXT,
+  is_active INTEGER DEFAULT 1,
+  keyword TEXT,
+  scraped_at TEXT,
+  created_at TEXT,
+  updated_at TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_active_created ON jobs(is_active, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_jobs_domain ON jobs(domain, is_active, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_jobs_source ON jobs(source, is_active);
+CREATE INDEX IF NOT EXISTS idx_jobs_retention ON jobs(COALESCE(scraped_at, created_at));
+CREATE INDEX IF NOT EXISTS idx_jobs_job_type ON jobs(job_type, is_active);
+
+-- One row per (job, skill): the indexed equivalent of the GIN index on
+-- skills_required in PostgreSQL
+CREATE TABLE IF NOT EXISTS job_skills (
+  job_id TEXT NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+  skill TEXT NOT NULL,
+  PRIMARY KEY (skill, job_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_job_skills_job_id ON job_skills(job_id);
+
+-- One row per (job, canonical city), mirroring the GIN index on cities
+CREATE TABLE IF NOT EXISTS job_cities (
+  job_id TEXT NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+  city TEXT NOT NULL,
+  PRIMARY KEY (city, job_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_job_cities_job_id ON job_cities(job_id);
+
+CREATE TABLE IF NOT EXISTS jobs_archive (
+  id TEXT PRIMARY KEY,
+  title TEXT NOT NULL,
+  company TEXT NOT NULL,
+  description TEXT,
+  location TEXT,
+  experience TEXT,
+  salary TEXT,
+  url TEXT,
+  source TEXT NOT NULL,
+  domain TEXT,
+  skills_required TEXT,
+  job_type TEXT,
+  experience_min INTEGER,
+  experience_max INTEGER,
+  salary_min INTEGER,
+  salary_max INTEGER,
+  salary_currency TEXT,
+  salary_period TEXT,
+  cities TEXT,
+  work_mode TEXT,
+  is_active INTEGER DEFAULT 0,
+  keyword TEXT,
+  scraped_at TEXT,
+  created_at TEXT,
+  updated_at TEXT,
+  archived_at TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_archive_scraped_at ON jobs_archive(scraped_at);
+
+-- The resumes columns used for recommendations and cached AI results
+-- (skills and analysis as JSON text)
+CREATE TABLE IF NOT EXISTS resumes (
+  id TEXT PRIMARY KEY,
+  user_id TEXT,
+  file_name TEXT,
+  skills TEXT,
+  parsed_text TEXT,
+  analysis TEXT,
+  created_at TEXT,
+  updated_at TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_resumes_user_id ON resumes(user_id, updated_at DESC);
+
+-- Materialized top matches per user (see utils/job_recommendations.py)
+CREATE TABLE IF NOT EXISTS job_recommendations (
+  user_id TEXT NOT NULL,
+  job_id TEXT NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+  resume_id TEXT,
+  match_score REAL,
+  matching_skills TEXT,
+  recommendation_reason TEXT,
+  created_at TEXT,
+  PRIMARY KEY (user_id, job_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_recommendations_user_score ON job_recommendations(user_id, match_score DESC);
+CREATE INDEX IF NOT EXISTS idx_recommendations_job_id ON job_recommendations(job_id);
+
+-- Users whose recommendations were fully computed, including those with no matches
+CREATE TABLE IF NOT EXISTS recommendation_refreshes (
+  user_id TEXT PRIMARY KEY,
+  refreshed_at TEXT
+) WITHOUT ROWID;
+"""
+
+# Indexes on ADDED_COLUMNS, created after older files are migrated
+ADDED_COLUMN_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_jobs_experience_min ON jobs(experience_min);
+CREATE INDEX IF NOT EXISTS idx_jobs_experience_max ON jobs(experience_max);
+-- Salary bounds are only compared within one currency
+DROP INDEX IF EXISTS idx_jobs_salary_min;
+DROP INDEX IF EXISTS idx_jobs_salary_max;
+CREATE INDEX IF NOT EXISTS idx_jobs_currency_salary_min ON jobs(salary_currency, salary_min);
+CREATE INDEX IF NOT EXISTS idx_jobs_currency_salary_max ON jobs(salary_currency, salary_max);
+CREATE INDEX IF NOT EXISTS idx_jobs_work_mode ON jobs(work_mode, is_active);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+  title, description, content='jobs', content_rowid='rowid'
+);
+
+CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+  INSERT INTO jobs_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description);
+END;
+
+CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+  INSERT INTO jobs_fts(jobs_fts, rowid, title, description) VALUES ('delete', old.rowid, old.title, old.description);
+END;
+
+CREATE TRIGGER IF NOT EXISTS jobs_fts_update AFTER UPDATE OF title, description ON jobs BEGIN
+  INSERT INTO jobs_fts(jobs_fts, rowid, title, description) VALUES ('delete', old.rowid, old.title, old.description);
+  INSERT INTO jobs_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description);
+END;
+"""
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _chunks(values: List, size: int = 500) -> Iterator[List]:
+    """Split values so IN lists stay under SQLite's bound parameter limit"""
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _fts_query(keyword: str) -> str:
+    """Quote each term so user input is never parsed as FTS5 syntax"""
+    terms = [term.replace('"', '""') for term in keyword.split()]
+    return " ".join(f'"{term}"' for term in terms)
+
+
+class SQLiteJobStorage(JobStorageBackend):
+    """
+    Stores jobs in a local SQLite database file
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Open (and create if needed) the database
+
+        Args:
+            path (str): Database file, or ':memory:' (default: backend/data/jobs.sqlite3)
+        """
+        self.path = str(path or DEFAULT_SQLITE_PATH)
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._local = threading.local()
+        # An in-memory database exists per connection, so one connection is
+        # shared (and serialized) across threads; files get one per thread
+        self._shared_conn = None
+        self._lock = contextlib.nullcontext()
+        if self.path == ":memory:":
+            self._shared_conn = self._connect()
+            self._lock = threading.RLock()
+
+        conn = self._connection()
+        conn.executescript(SCHEMA)
+        self._add_missing_columns(conn)
+        conn.executescript(ADDED_COLUMN_INDEXES)
+        try:
+            conn.executescript(FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5: keyword search falls back to LIKE
+            print("⚠️  SQLite FTS5 not available, keyword search will use LIKE")
+            self.has_fts = False
+
+    @staticmethod
+    def _add_missing_columns(conn: sqlite3.Connection) -> None:
+        for table in ('jobs', 'jobs_archive'):
+            existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+            for column, column_type in ADDED_COLUMNS.items():
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(resumes)")}
+        for column, column_type in RESUME_ADDED_COLUMNS.items():
+            if column not in existing:
+                conn.execute(f"ALTER TABLE resumes ADD COLUMN {column} {column_type}")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-65536")  # 64 MB page cache
+        conn.execute("PRAGMA mmap_size=268435456")  # 256 MB memory map
+        return conn
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._shared_conn is not None:
+            return self._shared_conn
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+        return conn
+
+    def _query(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._connection().execute(sql, params).fetchall()
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict:
+        job = dict(row)
+        for column in JSON_COLUMNS:
+            if column in job:
+                job[column] = json.loads(job[column]) if job[column] else []
+        if 'is_active' in job:
+            job['is_active'] = bool(job['is_active'])
+        return job
+
+    def insert_jobs(self, rows: List[Dict]) -> List[Dict]:
+        now = _now()
+        inserted = []
+        for row in rows:
+            job = {column: row.get(column) for column in JOB_COLUMNS}
+            job['id'] = job['id'] or str(uuid.uuid4())
+            job['is_active'] = True if job['is_active'] is None else job['is_active']
+            job['created_at'] = job['created_at'] or now
+            job['updated_at'] = now
+            inserted.append(job)
+
+        placeholders = ", ".join("?" for _ in JOB_COLUMNS)
+        values = [
+            tuple(
+                json.dumps(job[column]) if column in JSON_COLUMNS and job[column] is not None
+                else int(job[column]) if column == 'is_active'
+                else job[column]
+                for column in JOB_COLUMNS
+            )
+            for job in inserted
+        ]
+
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(f"INSERT INTO jobs ({', '.join(JOB_COLUMNS)}) VALUES ({placeholders})", values)
+                conn.executemany(
+                    "INSERT OR IGNORE INTO job_skills (job_id, skill) VALUES (?, ?)",
+                    [(job['id'], skill) for job in inserted for skill in job['skills_required'] or []]
+                )
+                conn.executemany(
+                    "INSERT OR IGNORE INTO job_cities (job_id, city) VALUES (?, ?)",
+                    [(job['id'], city) for job in inserted for city in job['cities'] or []]
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        return inserted
+
+    def search_jobs(
+        self,
+        keyword: Optional[str] = None,
+        location: Optional[str] = None,
+        domain: Optional[str] = None,
+        source: Optional[str] = None,
+        skills: Optional[List[str]] = None,
+        job_type: Optional[str] = None,
+        cities: Optional[List[str]] = None,
+        work_mode: Optional[str] = None,
+        min_experience: Optional[int] = None,
+        max_experience: Optional[int] = None,
+        min_salary: Optional[int] = None,
+        max_salary: Optional[int] = None,
+        salary_currency: Optional[str] = None,
+        limit: int = 50,
+        location_fallback: Optional[str] = None
+    ) -> List[Dict]:
+        clauses = ["j.is_active = 1"]
+        params = []
+
+        if keyword:
+            if self.has_fts and _fts_query(keyword):
+                clauses.append("j.rowid IN (SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH ?)")
+                params.append(_fts_query(keyword))
+            else:
+                clauses.append("(j.title LIKE ? OR j.description LIKE ?)")
+                params.extend([f"%{keyword}%", f"%{keyword}%"])
+
+        if location:
+            clauses.append("j.location LIKE ?")
+            params.append(f"%{location}%")
+
+        place_clauses, place_params = [], []
+        if cities:
+            place_clauses.append(
+                f"j.id IN (SELECT job_id FROM job_cities WHERE city IN ({', '.join('?' for _ in cities)}))"
+            )
+            place_params.extend(cities)
+
+        if work_mode:
+            place_clauses.append("j.work_mode = ?")
+            place_params.append(work_mode)
+
+        if place_clauses and location_fallback:
+            # Rows stored before locations were parsed only have the text
+            clauses.append(f"(({' AND '.join(place_clauses)}) OR (j.cities IS NULL AND j.location LIKE ?))")
+            params.extend(place_params + [f"%{location_fallback}%"])
+        else:
+            clauses.extend(place_clauses)
+            params.extend(place_params)
+
+        if domain:
+            clauses.append("j.domain = ?")
+            params.append(domain)
+
+        if source:
+            clauses.append("j.source = ?")
+            params.append(source)
+
+        if skills:
+            clauses.append(
+                f"j.id IN (SELECT job_id FROM job_skills WHERE skill IN ({', '.join('?' for _ in skills)}))"
+            )
+            params.extend(skills)
+
+        if job_type:
+            clauses.append("j.job_type = ?")
+            params.append(job_type)
+
+        # Range filters keep jobs whose range overlaps the requested one
+        if min_experience is not None:
+            clauses.append("(j.experience_max >= ? OR (j.experience_max IS NULL AND j.experience_min IS NOT NULL))")
+            params.append(min_experience)
+
+        if max_experience is not None:
+            clauses.append("j.experience_min <= ?")
+            params.append(max_experience)
+
+        if salary_currency:
+            clauses.append("j.salary_currency = ?")
+            params.append(salary_currency)
+
+        if min_salary is not None:
+            clauses.append("j.salary_max >= ?")
+            params.append(min_salary)
+
+        if max_salary is not None:
+            clauses.append("j.salary_min <= ?")
+            params.append(max_salary)
+
+        sql = (
+            f"SELECT j.* FROM jobs j WHERE {' AND '.join(clauses)} "
+            "ORDER BY j.created_at DESC LIMIT ?"
+        )
+        params.append(limit)
+        return [self._to_dict(row) for row in self._query(sql, tuple(params))]
+
+    def get_job_by_id(self, job_id: str) -> Optional[Dict]:
+        rows = self._query("SELECT * FROM jobs WHERE id = ?", (job_id,))
+        return self._to_dict(rows[0]) if rows else None
+
+    def get_jobs_by_ids(self, job_ids: List[str]) -> List[Dict]:
+        if not job_ids:
+            return []
+        rows = self._query(
+            f"SELECT * FROM jobs WHERE is_active = 1 AND id IN ({', '.join('?' for _ in job_ids)})",
+            tuple(job_ids)
+        )
+        return [self._to_dict(row) for row in rows]
+
+    def iter_active_jobs(
+        self,
+        columns: List[str],
+        since: Optional[str] = None,
+        batch_size: int = 1000
+    ) -> Iterator[List[Dict]]:
+        select = ", ".join(column for column in dict.fromkeys(['id'] + list(columns)) if column in JOB_COLUMNS)
+        last_id = ""
+        while True:
+            clauses = ["is_active = 1", "id > ?"]
+            params = [last_id]
+            if since:
+                clauses.append("created_at >= ?")
+                params.append(since)
+            rows = self._query(
+                f"SELECT {select} FROM jobs WHERE {' AND '.join(clauses)} ORDER BY id LIMIT ?",
+                tuple(params + [batch_size])
+            )
+            if not rows:
+                return
+            yield [self._to_dict(row) for row in rows]
+            if len(rows) < batch_size:
+                return
+            last_id = rows[-1]['id']
+
+    def get_job_stats(self) -> Dict:
+        rows = self._query(
+            "SELECT source, COUNT(*) AS count FROM jobs WHERE is_active = 1 GROUP BY source"
+        )
+        source_counts = {row['source']: row['count'] for row in rows}
+        return {
+            "total_jobs": sum(source_counts.values()),
+            "jobs_by_source": source_counts
+        }
+
+    def count_expired_jobs(self, cutoff: str) -> int:
+        rows = self._query(
+            "SELECT COUNT(*) FROM jobs WHERE COALESCE(scraped_at, created_at) < ?", (cutoff,)
+        )
+        return rows[0][0]
+
+    def archive_expired_jobs_batch(self, cutoff: str, batch_size: int) -> Dict:
+        columns = ", ".join(JOB_COLUMNS)
+        archived_values = ", ".join(
+            "0" if column == 'is_active'
+            else "COALESCE(scraped_at, created_at)" if column == 'scraped_at'
+            else column
+            for column in JOB_COLUMNS
+        )
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("CREATE TEMP TABLE IF NOT EXISTS archive_batch_ids (id TEXT PRIMARY KEY)")
+                conn.execute("DELETE FROM archive_batch_ids")
+                conn.execute(
+                    "INSERT INTO archive_batch_ids SELECT id FROM jobs "
+                    "WHERE COALESCE(scraped_at, created_at) < ? "
+                    "ORDER BY COALESCE(scraped_at, created_at) LIMIT ?",
+                    (cutoff, batch_size)
+                )
+                conn.execute(
+                    f"INSERT OR REPLACE INTO jobs_archive ({columns}, archived_at) "
+                    f"SELECT {archived_values}, ? "
+                    "FROM jobs WHERE id IN (SELECT id FROM archive_batch_ids)",
+                    (_now(),)
+                )
+                moved = conn.execute(
+                    "DELETE FROM jobs WHERE id IN (SELECT id FROM archive_batch_ids)"
+                ).rowcount
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        return {"moved": moved, "deactivated": 0}
+
+    def drop_archive_partitions(self, before: str) -> int:
+        # No partitions in SQLite: purge archived rows older than the date instead
+        with self._lock:
+            return self._connection().execute(
+                "DELETE FROM jobs_archive WHERE scraped_at < ?", (before,)
+            ).rowcount
+
+    def get_resume_profiles(self, user_ids: Optional[List[str]] = None) -> List[Dict]:
+        sql = (
+            "SELECT r.id, r.user_id, r.skills FROM resumes r "
+            "WHERE r.id = (SELECT r2.id FROM resumes r2 "
+            "              WHERE r2.user_id = r.user_id AND r2.skills IS NOT NULL "
+            "              ORDER BY r2.updated_at DESC LIMIT 1)"
+        )
+        if user_ids:
+            rows = [
+                row
+                for chunk in _chunks(list(user_ids))
+                for row in self._query(
+                    f"{sql} AND r.user_id IN ({', '.join('?' for _ in chunk)})", tuple(chunk)
+                )
+            ]
+        else:
+            rows = self._query(sql)
+
+        profiles = []
+        for row in rows:
+            skills = json.loads(row['skills']) if row['skills'] else []
+            if skills:
+                profiles.append({'user_id': row['user_id'], 'resume_id': row['id'], 'skills': skills})
+        return profiles
+
+    @staticmethod
+    def _upsert_recommendations(conn: sqlite3.Connection, rows: List[Dict]) -> None:
+        now = _now()
+        conn.executemany(
+            "INSERT INTO job_recommendations "
+            "(user_id, job_id, resume_id, match_score, matching_skills, recommendation_reason, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(user_id, job_id) DO UPDATE SET "
+            "resume_id = excluded.resume_id, match_score = excluded.match_score, "
+            "matching_skills = excluded.matching_skills, "
+            "recommendation_reason = excluded.recommendation_reason",
+            [
+                (
+                    row['user_id'], row['job_id'], row.get('resume_id'), row['match_score'],
+                    json.dumps(row.get('matching_skills') or []), row.get('recommendation_reason'), now
+                )
+                for row in rows
+            ]
+        )
+
+    def upsert_recommendations(self, rows: List[Dict]) -> int:
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._upsert_recommendations(conn, rows)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def replace_recommendations(self, user_id: str, rows: List[Dict]) -> int:
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("DELETE FROM job_recommendations WHERE user_id = ?", (user_id,))
+                self._upsert_recommendations(conn, rows)
+                conn.execute(
+                    "INSERT OR REPLACE INTO recommendation_refreshes (user_id, refreshed_at) VALUES (?, ?)",
+                    (user_id, _now())
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def prune_recommendations(self, user_ids: List[str], keep: int) -> int:
+        pruned = 0
+        with self._lock:
+            conn = self._connection()
+            for chunk in _chunks(list(user_ids)):
+                pruned += conn.execute(
+                    "DELETE FROM job_recommendations WHERE (user_id, job_id) IN ("
+                    "  SELECT user_id, job_id FROM ("
+                    "    SELECT user_id, job_id, ROW_NUMBER() OVER ("
+                    "      PARTITION BY user_id ORDER BY match_score DESC, created_at DESC"
+                    "    ) AS position"
+                    f"    FROM job_recommendations WHERE user_id IN ({', '.join('?' for _ in chunk)})"
+                    "  ) WHERE position > ?"
+                    ")",
+                    tuple(chunk) + (keep,)
+                ).rowcount
+        return pruned
+
+    def get_recommendations(self, user_id: str, limit: int = 50) -> List[Dict]:
+        rows = self._query(
+            "SELECT j.*, r.match_score, r.matching_skills, r.recommendation_reason "
+            "FROM job_recommendations r JOIN jobs j ON j.id = r.job_id "
+            "WHERE r.user_id = ? AND j.is_active = 1 "
+            "ORDER BY r.match_score DESC LIMIT ?",
+            (user_id, limit)
+        )
+        return [self._to_dict(row) for row in rows]
+
+    def recommendations_computed(self, user_id: str) -> bool:
+        return bool(self._query("SELECT 1 FROM recommendation_refreshes WHERE user_id = ?", (user_id,)))
+
+    def resume_belongs_to(self, resume_id: str, user_id: str) -> bool:
+        return bool(self._query("SELECT 1 FROM resumes WHERE id = ? AND user_id = ?", (resume_id, user_id)))
+
+    def get_resume_analysis(self, resume_id: str, user_id: str) -> Dict:
+        rows = self._query("SELECT analysis FROM resumes WHERE id = ? AND user_id = ?", (resume_id, user_id))
+        if not rows or not rows[0]['analysis']:
+            return {}
+        return json.loads(rows[0]['analysis'])
+
+    def save_resume_analysis(self, resume_id: str, user_id: str, analysis: Dict,
+                             parsed_text: Optional[str] = None) -> bool:
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT analysis FROM resumes WHERE id = ? AND user_id = ?", (resume_id, user_id)
+                ).fetchone()
+                if row is None:
+                    conn.execute("ROLLBACK")
+                    return False
+                merged = {**json.loads(row['analysis'] or '{}'), **analysis}
+                conn.execute(
+                    "UPDATE resumes SET analysis = ?, parsed_text = COALESCE(?, parsed_text) "
+                    "WHERE id = ? AND user_id = ?",
+                    (json.dumps(merged), parsed_text, resume_id, user_id)
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return True
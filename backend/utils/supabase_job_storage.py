@@ -0,0 +1,341 @@
+"""
+Supabase (PostgreSQL) storage backend for jobs
+"""
+
+from datetime import datetime, timezone
+from typing import Iterator, List, Dict, Optional
+from .supabase_client import get_supabase_client
+from .job_storage import JobStorageBackend
+
+
+RESUME_PAGE_SIZE = 1000
+# Rows per upsert request
+RECOMMENDATION_WRITE_BATCH = 500
+
+
+def _pg_array_items(values: List[str]) -> List[str]:
+    """Quote values for a PostgreSQL array literal (skills contain spaces, '+', '/', ...)"""
+    return ['"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"' for value in values]
+
+
+class SupabaseJobStorage(JobStorageBackend):
+    """
+    Stores jobs in the Supabase jobs table (see database/schema.sql)
+    """
+
+    name = "supabase"
+
+    def __init__(self):
+        self.supabase = get_supabase_client()
+
+    def insert_jobs(self, rows: List[Dict]) -> List[Dict]:
+        response = self.supabase.table('jobs').insert(rows).execute()
+        return response.data
+
+    def search_jobs(
+        self,
+        keyword: Optional[str] = None,
+        location: Optional[str] = None,
+        domain: Optional[str] = None,
+        source: Optional[str] = None,
+        skills: Optional[List[str]] = None,
+        job_type: Optional[str] = None,
+        cities: Optional[List[str]] = None,
+        work_mode: Optional[str] = None,
+        min_experience: Optional[int] = None,
+        max_experience: Optional[int] = None,
+        min_salary: Optional[int] = None,
+        max_salary: Optional[int] = None,
+        salary_currency: Optional[str] = None,
+        limit: int = 50,
+        location_fallback: Optional[str] = None
+    ) -> List[Dict]:
+        query = self.supabase.table('jobs').select('*').eq('is_active', True)
+
+        # Apply filters
+        if keyword:
+            # Search in title and description
+            query = query.or_(f"title.ilike.%{keyword}%,description.ilike.%{keyword}%")
+
+        if location:
+            query = query.ilike('location', f'%{location}%')
+
+        if location_fallback and (cities or work_mode):
+            # Rows stored before locations were parsed only have the text
+            place = []
+            if cities:
+                place.append(f"cities.ov.{{{','.join(_pg_array_items(cities))}}}")
+            if work_mode:
+                place.append(f"work_mode.eq.{work_mode}")
+            pattern = _pg_array_items([f"*{location_fallback}*"])[0]
+            query = query.or_(f"and({','.join(place)}),and(cities.is.null,location.ilike.{pattern})")
+        else:
+            if cities:
+                # Array overlap (&&), served by the GIN index on cities
+                query = query.ov('cities', _pg_array_items(cities))
+
+            if work_mode:
+                query = query.eq('work_mode', work_mode)
+
+        if domain:
+            query = query.eq('domain', domain)
+
+        if source:
+            query = query.eq('source', source)
+
+        if skills:
+            # Array overlap (&&), served by the GIN index on skills_required
+            query = query.ov('skills_required', _pg_array_items(skills))
+
+        if job_type:
+            query = query.eq('job_type', job_type)
+
+        # Range filters keep jobs whose range overlaps the requested one (btree indexes)
+        if min_experience is not None:
+            query = query.or_(
+                f"experience_max.gte.{int(min_experience)},"
+                f"and(experience_max.is.null,experience_min.not.is.null)"
+            )
+
+        if max_experience is not None:
+            query = query.lte('experience_min', int(max_experience))
+
+        if salary_currency:
+            query = query.eq('salary_currency', salary_currency)
+
+        if min_salary is not None:
+            query = query.gte('salary_max', int(min_salary))
+
+        if max_salary is not None:
+            query = query.lte('salary_min', int(max_salary))
+
+        # Order by created_at descending and limit
+        query = query.order('created_at', desc=True).limit(limit)
+
+        return query.execute().data
+
+    def get_job_by_id(self, job_id: str) -> Optional[Dict]:
+        response = self.supabase.table('jobs').select('*').eq('id', job_id).execute()
+        return response.data[0] if response.data else None
+
+    def get_jobs_by_ids(self, job_ids: List[str]) -> List[Dict]:
+        if not job_ids:
+            return []
+        response = self.supabase.table('jobs')\
+            .select('*')\
+            .in_('id', job_ids)\
+            .eq('is_active', True)\
+            .execute()
+
+        return response.data
+
+    def iter_active_jobs(
+        self,
+        columns: List[str],
+        since: Optional[str] = None,
+        batch_size: int = 1000
+    ) -> Iterator[List[Dict]]:
+        select = ','.join(dict.fromkeys(['id'] + list(columns)))
+        last_id = None
+        while True:
+            query = self.supabase.table('jobs').select(select).eq('is_active', True)
+            if since:
+                query = query.gte('created_at', since)
+            if last_id:
+                query = query.gt('id', last_id)
+            rows = query.order('id').limit(batch_size).execute().data
+            if not rows:
+                return
+            yield rows
+            if len(rows) < batch_size:
+                return
+            last_id = rows[-1]['id']
+
+    def get_jobs_by_domain(self, domain: str, limit: int = 50) -> List[Dict]:
+        response = self.supabase.table('jobs')\
+            .select('*')\
+            .eq('domain', domain)\
+            .eq('is_active', True)\
+            .order('created_at', desc=True)\
+            .limit(limit)\
+            .execute()
+
+        return response.data
+
+    def get_recent_jobs(self, limit: int = 20) -> List[Dict]:
+        response = self.supabase.table('jobs')\
+            .select('*')\
+            .eq('is_active', True)\
+            .order('created_at', desc=True)\
+            .limit(limit)\
+            .execute()
+
+        return response.data
+
+    def get_job_stats(self) -> Dict:
+        # Total active jobs
+        total_response = self.supabase.table('jobs')\
+            .select('id', count='exact')\
+            .eq('is_active', True)\
+            .execute()
+
+        # Jobs by source
+        sources_response = self.supabase.table('jobs')\
+            .select('source')\
+            .eq('is_active', True)\
+            .execute()
+
+        source_counts = {}
+        for job in sources_response.data:
+            source = job['source']
+            source_counts[source] = source_counts.get(source, 0) + 1
+
+        return {
+            "total_jobs": total_response.count,
+            "jobs_by_source": source_counts
+        }
+
+    def count_expired_jobs(self, cutoff: str) -> int:
+        response = self.supabase.table('jobs')\
+            .select('id', count='exact')\
+            .or_(f"scraped_at.lt.{cutoff},and(scraped_at.is.null,created_at.lt.{cutoff})")\
+            .limit(1)\
+            .execute()
+
+        return response.count or 0
+
+    def archive_expired_jobs_batch(self, cutoff: str, batch_size: int) -> Dict:
+        # One transaction per batch inside archive_jobs_batch() (database/schema.sql)
+        response = self.supabase.rpc('archive_jobs_batch', {
+            'p_cutoff': cutoff,
+            'p_batch_size': batch_size
+        }).execute()
+
+        row = response.data[0] if response.data else {}
+        return {
+            "moved": row.get('moved_rows', 0) or 0,
+            "deactivated": row.get('deactivated_rows', 0) or 0
+        }
+
+    def drop_archive_partitions(self, before: str) -> int:
+        response = self.supabase.rpc('drop_jobs_archive_partitions', {'p_before': before}).execute()
+        return response.data or 0
+
+    def get_resume_profiles(self, user_ids: Optional[List[str]] = None) -> List[Dict]:
+        latest = {}
+        last_id = None
+        while True:
+            query = self.supabase.table('resumes')\
+                .select('id,user_id,skills,updated_at')\
+                .not_.is_('skills', 'null')
+            if user_ids:
+                query = query.in_('user_id', user_ids)
+            if last_id:
+                query = query.gt('id', last_id)
+            rows = query.order('id').limit(RESUME_PAGE_SIZE).execute().data
+
+            for row in rows:
+                current = latest.get(row['user_id'])
+                if row['user_id'] and (current is None or (row['updated_at'] or '') > (current['updated_at'] or '')):
+                    latest[row['user_id']] = row
+
+            if len(rows) < RESUME_PAGE_SIZE:
+                break
+            last_id = rows[-1]['id']
+
+        return [
+            {'user_id': user_id, 'resume_id': row['id'], 'skills': row['skills']}
+            for user_id, row in latest.items()
+            if row['skills']
+        ]
+
+    def upsert_recommendations(self, rows: List[Dict]) -> int:
+        for start in range(0, len(rows), RECOMMENDATION_WRITE_BATCH):
+            self.supabase.table('job_recommendations')\
+                .upsert(rows[start:start + RECOMMENDATION_WRITE_BATCH], on_conflict='user_id,job_id')\
+                .execute()
+        return len(rows)
+
+    def replace_recommendations(self, user_id: str, rows: List[Dict]) -> int:
+        # Upsert first, then drop the rest, so readers never see an empty list
+        self.upsert_recommendations(rows)
+        query = self.supabase.table('job_recommendations').delete().eq('user_id', user_id)
+        if rows:
+            query = query.not_.in_('job_id', [row['job_id'] for row in rows])
+        query.execute()
+        self.supabase.table('recommendation_refreshes')\
+            .upsert({'user_id': user_id, 'refreshed_at': datetime.now(timezone.utc).isoformat()}, on_conflict='user_id')\
+            .execute()
+        return len(rows)
+
+    def prune_recommendations(self, user_ids: List[str], keep: int) -> int:
+        if not user_ids:
+            return 0
+        response = self.supabase.rpc('prune_job_recommendations', {
+            'p_user_ids': user_ids,
+            'p_keep': keep
+        }).execute()
+        return response.data or 0
+
+    def get_recommendations(self, user_id: str, limit: int = 50) -> List[Dict]:
+        # One query on idx_recommendations_user_score with the job rows embedded
+        response = self.supabase.table('job_recommendations')\
+            .select('match_score,matching_skills,recommendation_reason,jobs!inner(*)')\
+            .eq('user_id', user_id)\
+            .eq('jobs.is_active', True)\
+            .order('match_score', desc=True)\
+            .limit(limit)\
+            .execute()
+
+        jobs = []
+        for row in response.data:
+            job = row['jobs']
+            job['match_score'] = float(row['match_score'])
+            job['matching_skills'] = row['matching_skills'] or []
+            job['recommendation_reason'] = row['recommendation_reason']
+            jobs.append(job)
+        return jobs
+
+    def recommendations_computed(self, user_id: str) -> bool:
+        response = self.supabase.table('recommendation_refreshes')\
+            .select('user_id')\
+            .eq('user_id', user_id)\
+            .limit(1)\
+            .execute()
+        return bool(response.data)
+
+    def resume_belongs_to(self, resume_id: str, user_id: str) -> bool:
+        response = self.supabase.table('resumes')\
+            .select('id')\
+            .eq('id', resume_id)\
+            .eq('user_id', user_id)\
+            .limit(1)\
+            .execute()
+        return bool(response.data)
+
+    def get_resume_analysis(self, resume_id: str, user_id: str) -> Dict:
+        # The service key bypasses row-level security, so scope by owner here
+        response = self.supabase.table('resumes')\
+            .select('analysis')\
+            .eq('id', resume_id)\
+            .eq('user_id', user_id)\
+            .limit(1)\
+            .execute()
+        return (response.data[0]['analysis'] or {}) if response.data else {}
+
+    def save_resume_analysis(self, resume_id: str, user_id: str, analysis: Dict,
+                             parsed_text: Optional[str] = None) -> bool:
+        response = self.supabase.table('resumes')\
+            .select('analysis')\
+            .eq('id', resume_id)\
+            .eq('user_id', user_id)\
+            .limit(1)\
+            .execute()
+        if not response.data:
+            return False
+
+        update = {'analysis': {**(response.data[0]['analysis'] or {}), **analysis}}
+        if parsed_text is not None:
+            update['parsed_text'] = parsed_text
+        self.supabase.table('resumes').update(update).eq('id', resume_id).eq('user_id', user_id).execute()
+        return True
@@ -0,0 +1,12 @@
+"""
+Production entry point
+Run with gunicorn, which reads gunicorn.conf.py from this folder:
+
+    gunicorn wsgi:app
+
+`python app.py` starts the Flask development server instead.
+"""
+
+from app import app
+
+application = app
@@ -53,6 +53,14 @@ CREATE TABLE IF NOT EXISTS jobs (
   domain TEXT, -- 'tech', 'design', 'business', etc.
   skills_required TEXT[],
   job_type TEXT, -- 'Full-time', 'Part-time', 'Contract', 'Internship'
+  experience_min INTEGER, -- years, parsed from experience at ingest
+  experience_max INTEGER, -- NULL for open-ended ranges ('5+ years')
+  salary_min BIGINT, -- annual amount in salary_currency, parsed from salary at ingest
+  salary_max BIGINT,
+  salary_currency TEXT, -- 'INR', 'USD', ...
+  salary_period TEXT, -- period stated in the posting: 'year', 'month', 'week', 'day', 'hour'
+  cities TEXT[], -- canonical city names parsed from location at ingest ('Bengaluru', ...)
+  work_mode TEXT, -- 'remote', 'hybrid', 'onsite'
   is_active BOOLEAN DEFAULT true,
   keyword TEXT, -- Search keyword used to find this job
   scraped_at TIMESTAMP WITH TIME ZONE,
@@ -60,6 +68,16 @@ CREATE TABLE IF NOT EXISTS jobs (
   updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+-- Columns added after the first release (no-ops on fresh installs)
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS experience_min INTEGER;
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS experience_max INTEGER;
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS salary_min BIGINT;
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS salary_max BIGINT;
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS salary_currency TEXT;
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS salary_period TEXT;
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS cities TEXT[];
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS work_mode TEXT;
+
 -- Create indexes for better query performance
 CREATE INDEX IF NOT EXISTS idx_jobs_title ON jobs(title);
 CREATE INDEX IF NOT EXISTS idx_jobs_company ON jobs(company);
@@ -68,6 +86,18 @@ CREATE INDEX IF NOT EXISTS idx_jobs_domain ON jobs(domain);
 CREATE INDEX IF NOT EXISTS idx_jobs_source ON jobs(source);
 CREATE INDEX IF NOT EXISTS idx_jobs_is_active ON jobs(is_active);
 CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON jobs(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_jobs_retention ON jobs((COALESCE(scraped_at, created_at)));
+CREATE INDEX IF NOT EXISTS idx_jobs_skills_required ON jobs USING GIN (skills_required);
+CREATE INDEX IF NOT EXISTS idx_jobs_job_type ON jobs(job_type);
+CREATE INDEX IF NOT EXISTS idx_jobs_experience_min ON jobs(experience_min);
+CREATE INDEX IF NOT EXISTS idx_jobs_experience_max ON jobs(experience_max);
+-- Salary bounds are only compared within one currency
+DROP INDEX IF EXISTS idx_jobs_salary_min;
+DROP INDEX IF EXISTS idx_jobs_salary_max;
+CREATE INDEX IF NOT EXISTS idx_jobs_currency_salary_min ON jobs(salary_currency, salary_min);
+CREATE INDEX IF NOT EXISTS idx_jobs_currency_salary_max ON jobs(salary_currency, salary_max);
+CREATE INDEX IF NOT EXISTS idx_jobs_cities ON jobs USING GIN (cities);
+CREATE INDEX IF NOT EXISTS idx_jobs_work_mode ON jobs(work_mode);
 
 -- Enable Row Level Security
 ALTER TABLE jobs ENABLE ROW LEVEL SECURITY;
@@ -85,6 +115,57 @@ CREATE POLICY "Service role can update jobs"
   ON jobs FOR UPDATE
   USING (true);
 
+-- ============================================
+-- JOBS ARCHIVE TABLE
+-- ============================================
+-- Expired jobs are moved here in bounded batches by archive_jobs_batch()
+-- (see backend/utils/job_retention.py). The archive is range-partitioned
+-- by month of scraped_at so old data is dropped with DROP TABLE instead of
+-- a large DELETE. The hot jobs table is not partitioned because
+-- job_applications, saved_jobs and job_recommendations reference jobs(id),
+-- which a partitioned table cannot expose as a standalone unique key.
+CREATE TABLE IF NOT EXISTS jobs_archive (
+  id UUID NOT NULL,
+  title TEXT NOT NULL,
+  company TEXT NOT NULL,
+  description TEXT,
+  location TEXT,
+  experience TEXT,
+  salary TEXT,
+  url TEXT,
+  source TEXT NOT NULL,
+  domain TEXT,
+  skills_required TEXT[],
+  job_type TEXT,
+  experience_min INTEGER,
+  experience_max INTEGER,
+  salary_min BIGINT,
+  salary_max BIGINT,
+  salary_currency TEXT,
+  salary_period TEXT,
+  cities TEXT[],
+  work_mode TEXT,
+  is_active BOOLEAN DEFAULT false,
+  keyword TEXT,
+  scraped_at TIMESTAMP WITH TIME ZONE NOT NULL,
+  created_at TIMESTAMP WITH TIME ZONE,
+  updated_at TIMESTAMP WITH TIME ZONE,
+  archived_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+  PRIMARY KEY (id, scraped_at)
+) PARTITION BY RANGE (scraped_at);
+
+ALTER TABLE jobs_archive ADD COLUMN IF NOT EXISTS experience_min INTEGER;
+ALTER TABLE jobs_archive ADD COLUMN IF NOT EXISTS experience_max INTEGER;
+ALTER TABLE jobs_archive ADD COLUMN IF NOT EXISTS salary_min BIGINT;
+ALTER TABLE jobs_archive ADD COLUMN IF NOT EXISTS salary_max BIGINT;
+ALTER TABLE jobs_archive ADD COLUMN IF NOT EXISTS salary_currency TEXT;
+ALTER TABLE jobs_archive ADD COLUMN IF NOT EXISTS salary_period TEXT;
+ALTER TABLE jobs_archive ADD COLUMN IF NOT EXISTS cities TEXT[];
+ALTER TABLE jobs_archive ADD COLUMN IF NOT EXISTS work_mode TEXT;
+
+-- Archived jobs are not exposed to clients
+ALTER TABLE jobs_archive ENABLE ROW LEVEL SECURITY;
+
 -- ============================================
 -- RESUMES TABLE
 -- ============================================
@@ -214,6 +295,10 @@ CREATE TABLE IF NOT EXISTS job_recommendations (
 -- Create indexes
 CREATE INDEX IF NOT EXISTS idx_recommendations_user_id ON job_recommendations(user_id);
 CREATE INDEX IF NOT EXISTS idx_recommendations_match_score ON job_recommendations(match_score DESC);
+-- One row per user and job, upserted by backend/utils/job_recommendations.py
+CREATE UNIQUE INDEX IF NOT EXISTS idx_recommendations_user_job ON job_recommendations(user_id, job_id);
+-- A user's recommendations, best first, as one index range scan
+CREATE INDEX IF NOT EXISTS idx_recommendations_user_score ON job_recommendations(user_id, match_score DESC);
 
 -- Enable Row Level Security
 ALTER TABLE job_recommendations ENABLE ROW LEVEL SECURITY;
@@ -223,6 +308,15 @@ CREATE POLICY "Users can view own recommendations"
   ON job_recommendations FOR SELECT
   USING (auth.uid() = user_id);
 
+-- Users whose recommendations were fully computed, so a user with no
+-- matches is not recomputed on every read (backend/utils/job_recommendations.py)
+CREATE TABLE IF NOT EXISTS recommendation_refreshes (
+  user_id UUID PRIMARY KEY REFERENCES auth.users ON DELETE CASCADE,
+  refreshed_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+ALTER TABLE recommendation_refreshes ENABLE ROW LEVEL SECURITY;
+
 -- ============================================
 -- FUNCTIONS
 -- ============================================
@@ -249,6 +343,136 @@ CREATE TRIGGER update_resumes_updated_at BEFORE UPDATE ON resumes
 CREATE TRIGGER update_applications_updated_at BEFORE UPDATE ON job_applications
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
+-- ============================================
+-- RETENTION FUNCTIONS
+-- ============================================
+
+-- Create the monthly jobs_archive partition covering p_month (idempotent)
+CREATE OR REPLACE FUNCTION ensure_jobs_archive_partition(p_month DATE)
+RETURNS TEXT AS $$
+DECLARE
+    month_start DATE := date_trunc('month', p_month)::DATE;
+    partition_name TEXT := 'jobs_archive_' || to_char(p_month, 'YYYY_MM');
+BEGIN
+    EXECUTE format(
+        'CREATE TABLE IF NOT EXISTS %I PARTITION OF jobs_archive FOR VALUES FROM (%L) TO (%L)',
+        partition_name, month_start, (month_start + INTERVAL '1 month')::DATE
+    );
+    RETURN partition_name;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Move at most p_batch_size expired jobs into jobs_archive in one transaction.
+-- Jobs that users applied to or saved are only marked inactive, since deleting
+-- them would cascade into job_applications and saved_jobs.
+-- Returns the rows moved out of the hot table and the rows only deactivated.
+CREATE OR REPLACE FUNCTION archive_jobs_batch(p_cutoff TIMESTAMP WITH TIME ZONE, p_batch_size INTEGER)
+RETURNS TABLE(moved_rows INTEGER, deactivated_rows INTEGER) AS $$
+DECLARE
+    batch_month DATE;
+    moved_count INTEGER;
+    deactivated_count INTEGER;
+BEGIN
+    CREATE TEMP TABLE IF NOT EXISTS archive_batch_ids (id UUID PRIMARY KEY) ON COMMIT DROP;
+    TRUNCATE archive_batch_ids;
+
+    INSERT INTO archive_batch_ids
+    SELECT j.id FROM jobs j
+    WHERE COALESCE(j.scraped_at, j.created_at) < p_cutoff
+      AND NOT EXISTS (SELECT 1 FROM job_applications ja WHERE ja.job_id = j.id)
+      AND NOT EXISTS (SELECT 1 FROM saved_jobs sj WHERE sj.job_id = j.id)
+    ORDER BY COALESCE(j.scraped_at, j.created_at)
+    LIMIT p_batch_size
+    FOR UPDATE SKIP LOCKED;
+
+    FOR batch_month IN
+        SELECT DISTINCT date_trunc('month', COALESCE(j.scraped_at, j.created_at))::DATE
+        FROM jobs j JOIN archive_batch_ids b ON b.id = j.id
+    LOOP
+        PERFORM ensure_jobs_archive_partition(batch_month);
+    END LOOP;
+
+    WITH moved AS (
+        DELETE FROM jobs j USING archive_batch_ids b
+        WHERE j.id = b.id
+        RETURNING j.*
+    )
+    INSERT INTO jobs_archive (
+        id, title, company, description, location, experience, salary, url, source,
+        domain, skills_required, job_type, experience_min, experience_max,
+        salary_min, salary_max, salary_currency, salary_period, cities, work_mode,
+        is_active, keyword, scraped_at, created_at, updated_at
+    )
+    SELECT
+        id, title, company, description, location, experience, salary, url, source,
+        domain, skills_required, job_type, experience_min, experience_max,
+        salary_min, salary_max, salary_currency, salary_period, cities, work_mode,
+        false, keyword, COALESCE(scraped_at, created_at), created_at, updated_at
+    FROM moved;
+    GET DIAGNOSTICS moved_count = ROW_COUNT;
+
+    -- Referenced jobs stay in place but drop out of every is_active read
+    UPDATE jobs SET is_active = false
+    WHERE id IN (
+        SELECT j.id FROM jobs j
+        WHERE j.is_active = true
+          AND COALESCE(j.scraped_at, j.created_at) < p_cutoff
+        LIMIT p_batch_size
+    );
+    GET DIAGNOSTICS deactivated_count = ROW_COUNT;
+
+    RETURN QUERY SELECT moved_count, deactivated_count;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Drop whole archive partitions whose range ends on or before p_before
+CREATE OR REPLACE FUNCTION drop_jobs_archive_partitions(p_before DATE)
+RETURNS INTEGER AS $$
+DECLARE
+    part RECORD;
+    dropped INTEGER := 0;
+BEGIN
+    FOR part IN
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        JOIN pg_class p ON p.oid = i.inhparent
+        WHERE p.relname = 'jobs_archive'
+          AND c.relname ~ '^jobs_archive_[0-9]{4}_[0-9]{2}$'
+          AND (to_date(substring(c.relname from '[0-9]{4}_[0-9]{2}$'), 'YYYY_MM') + INTERVAL '1 month')::DATE <= p_before
+    LOOP
+        EXECUTE format('DROP TABLE IF EXISTS %I', part.relname);
+        dropped := dropped + 1;
+    END LOOP;
+    RETURN dropped;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================
+-- RECOMMENDATION FUNCTIONS
+-- ============================================
+
+-- Keep only the p_keep best recommendations of each given user after new
+-- jobs were scored into job_recommendations. Returns the rows deleted.
+CREATE OR REPLACE FUNCTION prune_job_recommendations(p_user_ids UUID[], p_keep INTEGER)
+RETURNS INTEGER AS $$
+DECLARE
+    pruned_count INTEGER;
+BEGIN
+    DELETE FROM job_recommendations r
+    USING (
+        SELECT id, row_number() OVER (
+            PARTITION BY user_id ORDER BY match_score DESC, created_at DESC
+        ) AS position
+        FROM job_recommendations
+        WHERE user_id = ANY(p_user_ids)
+    ) ranked
+    WHERE r.id = ranked.id AND ranked.position > p_keep;
+    GET DIAGNOSTICS pruned_count = ROW_COUNT;
+    RETURN pruned_count;
+END;
+$$ LANGUAGE plpgsql;
+
 -- ============================================
 -- VIEWS
 -- ============================================